@@ -18,15 +18,16 @@ warnings.filterwarnings("ignore", message=".*unauthenticated requests.*HF Hub.*"
 print("⏳ Initializing VTSearch...", flush=True)
 
 import hashlib
+import threading
 
-print("⏳ Importing ML libraries (this may take a few seconds)...", flush=True)
+print("⏳ Importing libraries...", flush=True)
 
 from flask import Flask
 
 # Import refactored modules
-from config import DATA_DIR, NUM_CLIPS
+from config import DATA_DIR, NUM_CLIPS, STARTUP_WARM_MEDIA_TYPES
 from vtsearch.audio import generate_wav
-from vtsearch.models import embed_audio_file, initialize_models
+from vtsearch.models import embed_audio_file, initialize_models, warm_models
 from vtsearch.routes import (
     clips_bp,
     datasets_bp,
@@ -39,7 +40,7 @@ from vtsearch.routes import (
     sorting_bp,
 )
 from vtsearch.media import set_progress_callback
-from vtsearch.utils import clips, update_progress
+from vtsearch.utils import clips, get_progress, update_progress
 
 # Wire media types into the Flask app's progress reporting system.
 # Without this call, media types use a silent no-op callback and can run
@@ -135,6 +136,31 @@ def init_clips():
 # Model initialization is now handled by vtsearch.models.initialize_models()
 
 
+def warm_models_in_background() -> threading.Thread:
+    """Load the embedders of ``STARTUP_WARM_MEDIA_TYPES`` on a daemon thread.
+
+    Used by ``--fast-start`` so the server answers requests while the
+    models load.
+    """
+
+    def run():
+        try:
+            warmed = warm_models(STARTUP_WARM_MEDIA_TYPES)
+        except Exception as e:
+            print(f"\u26a0\ufe0f Could not warm embedding models: {e}", flush=True)
+            return
+        # Loading an embedder reports "Loading ... embedder"; clear that unless
+        # a dataset load has reported progress since
+        progress = get_progress()
+        if progress["status"] == "loading" and "embedder" in progress["message"]:
+            update_progress("idle", "Ready")
+        print(f"\u2705 Embedding models warm: {', '.join(warmed) or 'none'}", flush=True)
+
+    thread = threading.Thread(target=run, name="warm-models", daemon=True)
+    thread.start()
+    return thread
+
+
 # ---------------------------------------------------------------------------
 # Register Blueprints
 # ---------------------------------------------------------------------------
@@ -159,12 +185,19 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="VTSearch \u2014 media explorer web app")
     parser.add_argument("--local", action="store_true", help="Run in local development mode")
+    parser.add_argument(
+        "--fast-start",
+        action="store_true",
+        help="Start serving immediately and load embedding models in the background",
+    )
     parser.add_argument(
         "--autodetect",
         action="store_true",
         help="Run a detector on a dataset from the command line and print predicted-Good items",
     )
-    parser.add_argument("--dataset", type=str, help="Path to a dataset pickle file (used with --autodetect)")
+    parser.add_argument(
+        "--dataset", type=str, help="Path to a .vtds (or legacy .pkl) dataset file (used with --autodetect)"
+    )
     parser.add_argument("--detector", type=str, help="Path to a detector JSON file (used with --autodetect)")
     parser.add_argument(
         "--importer",
@@ -176,6 +209,22 @@ if __name__ == "__main__":
         type=str,
         help="Name of the results exporter to use (e.g. file, email_smtp, gui). Used with --autodetect.",
     )
+    parser.add_argument(
+        "--export-dataset",
+        type=str,
+        metavar="PATH",
+        help="Load a dataset (--dataset <file> or --importer <name>) and write it to PATH as a .vtds file.",
+    )
+    parser.add_argument(
+        "--no-media",
+        action="store_true",
+        help="Leave media out of the file written by --export-dataset (embeddings and metadata only).",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=["zstd"],
+        help="Compress the file written by --export-dataset (needs requirements-zstd.txt).",
+    )
     parser.add_argument(
         "--import-labels",
         action="store_true",
@@ -221,7 +270,7 @@ if __name__ == "__main__":
     label_importer = None
     proc_importer = None
 
-    if args.autodetect and args.importer:
+    if (args.autodetect or args.export_dataset) and args.importer:
         from vtsearch.datasets.importers import get_importer, list_importers
 
         importer = get_importer(args.importer)
@@ -281,11 +330,27 @@ if __name__ == "__main__":
         field_values = {f.key: getattr(args, f.key, f.default or None) for f in proc_importer.fields}
         import_processor_main(args.processor_importer, field_values, proc_name)
 
+    elif args.export_dataset:
+        if not (args.dataset or args.importer):
+            parser.error("--export-dataset requires either --dataset <file> or --importer <name>")
+
+        from vtsearch.cli import export_dataset_main
+
+        field_values = {f.key: getattr(args, f.key, f.default or None) for f in importer.fields} if importer else None
+        export_dataset_main(
+            args.export_dataset,
+            dataset_path=None if importer else args.dataset,
+            importer_name=args.importer,
+            field_values=field_values,
+            include_media=not args.no_media,
+            compress=args.compress,
+        )
+
     elif getattr(args, "import_labels", False):
         if not getattr(args, "label_importer", None):
             parser.error("--import-labels requires --label-importer <name>")
         if not args.dataset:
-            parser.error("--import-labels requires --dataset <file.pkl>")
+            parser.error("--import-labels requires --dataset <file.vtds>")
 
         from vtsearch.cli import import_labels_main
 
@@ -311,7 +376,7 @@ if __name__ == "__main__":
             autodetect_importer_main(args.importer, field_values, args.detector, args.exporter, exporter_field_values)
 
         elif args.dataset:
-            # Legacy pickle-file path
+            # Dataset-file path
             if not args.detector:
                 parser.error("--autodetect requires --detector")
 
@@ -320,16 +385,20 @@ if __name__ == "__main__":
             autodetect_main(args.dataset, args.detector, args.exporter, exporter_field_values)
 
         else:
-            parser.error("--autodetect requires either --dataset <file.pkl> or --importer <name>")
+            parser.error("--autodetect requires either --dataset <file.vtds> or --importer <name>")
 
     elif args.local:
         # Local development mode
         print("\U0001f680 Running in LOCAL mode (accessible from other devices)", flush=True)
+        if args.fast_start:
+            warm_models_in_background()
         app.run(host="0.0.0.0", port=5000, debug=False, threaded=True)
     else:
         # Production mode \u2014 models load lazily when the first dataset is loaded
         print("\U0001f680 Running in PRODUCTION mode", flush=True)
         initialize_models()
+        if args.fast_start:
+            warm_models_in_background()
 
         print("\u2705 VTSearch is ready!", flush=True)
         print("\U0001f310 Open http://localhost:5000 in your browser", flush=True)
@@ -35,8 +35,111 @@ TEXTS_PER_CATEGORY = 50
 # Training
 TRAIN_EPOCHS = 200
 
+# Warm-started (incremental) training: fine-tune the previous model for at
+# most WARM_START_MAX_EPOCHS, stopping once the loss has not improved by
+# WARM_START_MIN_DELTA for WARM_START_PATIENCE epochs.  If more than
+# WARM_START_MAX_LABEL_CHANGE of the labels differ from the previous run the
+# model is retrained from scratch instead.
+WARM_START_MAX_EPOCHS = 50
+WARM_START_PATIENCE = 5
+WARM_START_MIN_DELTA = 1e-4
+WARM_START_MAX_LABEL_CHANGE = 0.25
+
+# Background retraining: after a vote or label import, wait until no further
+# vote has arrived for BACKGROUND_TRAINING_DEBOUNCE seconds, then retrain the
+# learned-sort model and progress cache off the request thread.  While a run
+# is pending, endpoints answer from the previous run (flagged stale) and only
+# train synchronously when no run has finished yet.
+BACKGROUND_TRAINING = True
+BACKGROUND_TRAINING_DEBOUNCE = 0.25
+
+# Prediction stability (labelling progress) is tracked over every clip by
+# default.  Set STABILITY_SAMPLE_SIZE to estimate flip counts from a fixed
+# random sample of that many clips on datasets larger than it.
+STABILITY_SAMPLE_SIZE: int | None = None
+
 # Model IDs
 CLAP_MODEL_ID = "laion/clap-htsat-unfused"
 XCLIP_MODEL_ID = "microsoft/xclip-base-patch32"
 CLIP_MODEL_ID = "openai/clip-vit-base-patch32"
 E5_MODEL_ID = "intfloat/e5-base-v2"
+
+# Embedding batch sizes: the loaders pass files to each media type's
+# embedding model this many at a time (see MediaType.embed_media_batch).
+AUDIO_EMBED_BATCH_SIZE = 8
+IMAGE_EMBED_BATCH_SIZE = 32
+VIDEO_EMBED_BATCH_SIZE = 4
+TEXT_EMBED_BATCH_SIZE = 32
+
+# Fast startup (python app.py --fast-start): the server starts answering at
+# once and the embedding models of STARTUP_WARM_MEDIA_TYPES are loaded on a
+# background thread, so the first dataset load does not wait for them.
+STARTUP_WARM_MEDIA_TYPES: tuple[str, ...] = ("audio",)
+
+# Embedding model memory: once the loaded models' weights exceed
+# MODEL_MEMORY_BUDGET_BYTES (None = no limit), the least recently used models
+# that have been idle for at least MODEL_EVICT_MIN_IDLE_SECONDS are unloaded
+# to make room.  Any model unused for MODEL_IDLE_UNLOAD_SECONDS (None = never)
+# is unloaded too.  Unloaded models are reloaded on their next use.
+MODEL_MEMORY_BUDGET_BYTES: int | None = None
+MODEL_IDLE_UNLOAD_SECONDS: float | None = 30 * 60
+MODEL_EVICT_MIN_IDLE_SECONDS = 60.0
+
+# Inference backend: "torch" runs the models as loaded; "onnx" exports each
+# encoder to ONNX_MODELS_DIR on first use (int8-quantised with ONNX_QUANTIZE)
+# and runs it with ONNX Runtime on CPU.  An encoder whose first batch agrees
+# with torch below ONNX_PARITY_MIN_COSINE stays on torch, so cached torch
+# embeddings remain comparable.  Needs requirements-onnx.txt.
+EMBEDDING_BACKEND = "torch"
+ONNX_QUANTIZE = True
+ONNX_MODELS_DIR = MODELS_CACHE_DIR / "onnx"
+ONNX_PARITY_MIN_COSINE = 0.99
+
+# Long audio: files longer than one CLAP input (10 s) are streamed from disk
+# AUDIO_STREAM_BLOCK_SECONDS at a time and embedded as 10 s windows starting
+# every AUDIO_SEGMENT_HOP_SECONDS.  The window embeddings are stored on the
+# clip (text sort reports the best-matching offset) and their mean is the
+# clip's embedding.
+AUDIO_SEGMENT_HOP_SECONDS = 5.0
+AUDIO_STREAM_BLOCK_SECONDS = 30.0
+
+# Long text: passages longer than the E5 window (512 tokens) are split into
+# chunks that overlap by TEXT_CHUNK_OVERLAP_TOKENS, embedded in the same
+# length-sorted batches as short passages, and averaged.  With
+# TEXT_CHUNK_EMBEDDINGS the chunk embeddings are also stored on the clip so
+# text sort can match (and point at) a single chunk.
+TEXT_CHUNK_OVERLAP_TOKENS = 64
+TEXT_CHUNK_EMBEDDINGS = False
+
+# Ingest pipeline: audio, image and video files are decoded in a pool of
+# INGEST_DECODE_WORKERS processes (None = all CPUs but one; 0 or 1 decodes
+# in-process) and handed to the single embedding model over shared memory.
+# At most INGEST_QUEUE_SIZE decoded files wait for the model at a time.
+INGEST_DECODE_WORKERS: int | None = None
+INGEST_QUEUE_SIZE = 64
+
+# Text queries: the embeddings of the QUERY_CACHE_SIZE most recently used
+# queries are kept in memory (0 disables the cache); with QUERY_CACHE_PERSIST
+# they are also stored in the persistent embedding cache below.  The last
+# SIMILARITY_RESULT_CACHE_SIZE rankings of the loaded dataset are cached too,
+# so repeating a query skips both the text encoder and the similarity pass.
+QUERY_CACHE_SIZE = 1024
+QUERY_CACHE_PERSIST = False
+SIMILARITY_RESULT_CACHE_SIZE = 32
+
+# Media store: the loaders write each clip's media bytes once into the
+# append-only pack file MEDIA_STORE_PATH (deduplicated by content MD5) and
+# clips keep only its offset, length and MD5; media is served from a memory
+# map of the pack.  With MEDIA_STORE_ENABLED off, clips keep their bytes in
+# memory as before.
+MEDIA_STORE_ENABLED = True
+MEDIA_STORE_PATH = DATA_DIR / "media" / "media.pack"
+
+# Persistent embedding cache: media embeddings are stored on disk keyed by
+# (content MD5, embedding model ID, preprocessing parameters) so re-importing
+# the same files skips model inference.  Least recently used entries are
+# evicted once the stored vectors exceed EMBEDDING_CACHE_MAX_BYTES.
+EMBEDDING_CACHE_ENABLED = True
+EMBEDDING_CACHE_PATH = EMBEDDINGS_DIR / "embedding_cache.sqlite3"
+EMBEDDING_CACHE_MAX_BYTES = 2 * 1024**3
+EMBEDDING_CACHE_LOOKUP_BATCH = 500
@@ -187,6 +187,7 @@
   const burgerBtn = document.getElementById("burger-btn");
   const burgerDropdown = document.getElementById("burger-dropdown");
   const menuDatasetExport = document.getElementById("menu-dataset-export");
+  const menuDatasetExportEmbeddings = document.getElementById("menu-dataset-export-embeddings");
   const menuDatasetChange = document.getElementById("menu-dataset-change");
   const menuLabelsExport = document.getElementById("menu-labels-export");
   const menuLabelsImport = document.getElementById("menu-labels-import");
@@ -665,6 +666,12 @@
       burgerDropdown.classList.remove("show");
     });
   }
+  if (menuDatasetExportEmbeddings && burgerDropdown) {
+    menuDatasetExportEmbeddings.addEventListener("click", () => {
+      window.location.href = "/api/dataset/export?media=0";
+      burgerDropdown.classList.remove("show");
+    });
+  }
 
   // Dataset change
   if (menuDatasetChange && burgerDropdown) {
@@ -1607,9 +1614,9 @@
     // Render media player based on media type
     let playerHTML = '';
     if (mediaType === "video") {
-      playerHTML = `<video controls loop autoplay src="/api/clips/${c.id}/video" id="clip-video" style="width: 600px; max-height: 400px; border: 1px solid #2a2d3a; border-radius: 8px; background: #1a1d27;"></video>`;
+      playerHTML = `<video controls loop autoplay src="${clipMediaUrl(c, "video")}" id="clip-video" style="width: 600px; max-height: 400px; border: 1px solid #2a2d3a; border-radius: 8px; background: #1a1d27;"></video>`;
     } else if (mediaType === "image") {
-      playerHTML = `<div style="flex: 1; min-height: 0; width: 100%; display: flex; align-items: center; justify-content: center;"><img src="/api/clips/${c.id}/image" id="clip-image" style="max-width: 100%; max-height: 100%; object-fit: contain; border: 1px solid #2a2d3a; border-radius: 8px; background: #1a1d27;"></div>`;
+      playerHTML = `<div style="flex: 1; min-height: 0; width: 100%; display: flex; align-items: center; justify-content: center;"><img src="${clipMediaUrl(c, "image")}" id="clip-image" style="max-width: 100%; max-height: 100%; object-fit: contain; border: 1px solid #2a2d3a; border-radius: 8px; background: #1a1d27;"></div>`;
     } else if (mediaType === "paragraph") {
       playerHTML = `
         <div id="clip-paragraph" style="max-width: 600px; max-height: 400px; overflow-y: auto; padding: 16px; border: 1px solid #2a2d3a; border-radius: 8px; background: #1a1d27; white-space: pre-wrap; line-height: 1.6; text-align: left;">
@@ -1619,7 +1626,7 @@
       // Audio/Sound
       playerHTML = `
         <canvas id="waveform-canvas" width="600" height="120"></canvas>
-        <audio controls loop autoplay src="/api/clips/${c.id}/audio" id="clip-audio"></audio>`;
+        <audio controls loop autoplay src="${clipMediaUrl(c, "audio")}" id="clip-audio"></audio>`;
     }
 
     center.innerHTML = `
@@ -1684,7 +1691,7 @@
 
     // Draw waveform only for audio clips
     if (mediaType === "audio") {
-      drawWaveform(c.id);
+      drawWaveform(c);
       const audioEl = document.getElementById("clip-audio");
       if (audioEl) {
         audioEl.volume = audioVolume;
@@ -1727,7 +1734,14 @@
     }
   }
 
-  async function drawWaveform(clipId) {
+  // Media URLs carry the clip's MD5, so the server can let the browser
+  // cache them for good: the same URL never names different bytes, even
+  // after another dataset reuses the clip ID.
+  function clipMediaUrl(c, kind) {
+    return `/api/clips/${c.id}/${kind}?v=${c.md5}`;
+  }
+
+  async function drawWaveform(c) {
     const canvas = document.getElementById("waveform-canvas");
     if (!canvas) return;
 
@@ -1741,7 +1755,7 @@
 
     try {
       // Fetch audio data
-      const response = await fetch(`/api/clips/${clipId}/audio`);
+      const response = await fetch(clipMediaUrl(c, "audio"));
       const arrayBuffer = await response.arrayBuffer();
 
       // Decode audio data
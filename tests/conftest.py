@@ -1,3 +1,6 @@
+import tempfile
+from pathlib import Path
+
 import pytest
 
 import config
@@ -6,14 +9,20 @@ import config
 # for the tiny MLP to converge on the small test dataset).
 config.TRAIN_EPOCHS = 30
 
+# Keep the persistent embedding cache and media store out of the real data directory.
+config.EMBEDDING_CACHE_PATH = Path(tempfile.mkdtemp(prefix="vtsearch-test-")) / "embedding_cache.sqlite3"
+config.MEDIA_STORE_PATH = config.EMBEDDING_CACHE_PATH.parent / "media.pack"
+
 import app as app_module
 
 # Import refactored modules and make them accessible through app_module
 from config import NUM_CLIPS, SAMPLE_RATE
 from vtsearch.audio import generate_wav
 from vtsearch.models import initialize_models, train_and_score
-from vtsearch.models.progress import clear_progress_cache
-from vtsearch.utils import bad_votes, clips, good_votes, label_history
+from vtsearch.models.query_cache import clear_query_cache
+from vtsearch.models.training import clear_warm_start_cache
+from vtsearch.routes.background import background_trainer, response_memo
+from vtsearch.utils import bad_votes, clear_votes, clips, good_votes
 
 # Attach to app_module for backward compatibility with existing tests
 app_module.NUM_CLIPS = NUM_CLIPS
@@ -31,11 +40,26 @@ app_module.init_clips()
 
 @pytest.fixture(autouse=True)
 def reset_votes():
-    """Reset vote state and progress cache before each test."""
-    good_votes.clear()
-    bad_votes.clear()
-    label_history.clear()
-    clear_progress_cache()
+    """Reset vote state and cached query embeddings before each test.
+
+    Goes through ``clear_votes()`` so the state version moves on; tests then
+    set votes directly, which the first request of the test sees.
+    """
+    clear_votes()
+    clear_query_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_background():
+    """Stop the background trainer and drop its result, memoised responses and warm-start state.
+
+    Keeps a model trained (or a response memoised) in one test from being
+    served, even as a stale result, in the next.
+    """
+    background_trainer.stop()
+    background_trainer.clear()
+    response_memo.clear()
+    clear_warm_start_cache()
 
 
 @pytest.fixture
@@ -0,0 +1,152 @@
+"""Tests for the background trainer (vtsearch.models.background).
+
+Covers:
+- A burst of notifications is coalesced into one training run
+- result_for() waits for a run in flight and matches on the state key
+- result_for() serves the previous result, flagged stale, while a run is pending
+- result_for() returns None when nothing is scheduled
+- clear() drops the published result and that of a run in flight
+- Failed runs do not publish a result or kill the worker
+"""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import pytest
+
+from vtsearch.models.background import BackgroundTrainer, TrainingSnapshot
+
+
+def _clips(n: int = 30, dim: int = 8) -> dict:
+    rng = np.random.RandomState(0)
+    return {i: {"id": i, "embedding": rng.randn(dim).astype(np.float32)} for i in range(1, n + 1)}
+
+
+class _State:
+    """Mutable fake of the global state, snapshotted by the trainer."""
+
+    def __init__(self):
+        self.clips = _clips()
+        self.good: dict[int, None] = {}
+        self.bad: dict[int, None] = {}
+        self.history: list[tuple[int, str, float]] = []
+        self.version = 0
+        self.snapshots = 0
+
+    def vote(self, cid: int, label: str) -> None:
+        (self.good if label == "good" else self.bad)[cid] = None
+        self.history.append((cid, label, float(len(self.history))))
+        self.version += 1
+
+    def snapshot(self) -> TrainingSnapshot | None:
+        self.snapshots += 1
+        if not self.good and not self.bad:
+            return None
+        return TrainingSnapshot(
+            key=self.version,
+            clips=self.clips,
+            good_votes=dict(self.good),
+            bad_votes=dict(self.bad),
+            label_history=list(self.history),
+            inclusion=0,
+        )
+
+
+@pytest.fixture
+def state():
+    return _State()
+
+
+@pytest.fixture
+def trainer(state):
+    t = BackgroundTrainer(state.snapshot, debounce=0.05)
+    yield t
+    t.stop(timeout=10)
+
+
+class TestBackgroundTrainer:
+    def test_burst_is_coalesced(self, state, trainer):
+        for cid in range(1, 7):
+            state.vote(cid, "good" if cid % 2 else "bad")
+            trainer.notify()
+
+        result = trainer.result_for(state.version, timeout=30)
+        assert result is not None
+        assert result.key == state.version
+        assert state.snapshots == 1
+        assert len(result.results) == len(state.clips)
+        assert 0.0 <= result.threshold <= 1.0
+        assert result.status["good_count"] == 3
+        assert result.status["bad_count"] == 3
+
+    def test_stale_key_is_not_served(self, state, trainer):
+        state.vote(1, "good")
+        state.vote(2, "bad")
+        trainer.notify()
+        assert trainer.result_for(state.version, timeout=30) is not None
+        assert trainer.result_for(state.version - 1) is None
+
+        state.vote(3, "good")
+        # No notification: nothing in flight, so the caller must train itself
+        assert trainer.result_for(state.version, timeout=5) is None
+
+    def test_previous_result_is_served_stale_while_training(self, state, trainer):
+        state.vote(1, "good")
+        state.vote(2, "bad")
+        trainer.notify()
+        first = trainer.result_for(state.version, timeout=30)
+        assert first is not None and not first.stale
+
+        state.vote(3, "good")
+        trainer.notify()
+        stale = trainer.result_for(state.version)
+        assert stale is not None and stale.stale
+        assert stale.key == first.key and stale.results == first.results
+
+        fresh = trainer.result_for(state.version, timeout=30)
+        assert fresh.key == state.version and not fresh.stale
+
+    def test_clear_drops_results(self, state, trainer):
+        state.vote(1, "good")
+        state.vote(2, "bad")
+        trainer.notify()
+        assert trainer.result_for(state.version, timeout=30) is not None
+        trainer.clear()
+        state.vote(3, "good")
+        trainer.notify()
+        assert trainer.result_for(state.version) is None
+
+    def test_idle_trainer_returns_none_immediately(self, trainer):
+        assert trainer.result_for(0, timeout=30) is None
+
+    def test_single_class_publishes_status_only(self, state, trainer):
+        state.vote(1, "good")
+        trainer.notify()
+        result = trainer.result_for(state.version, timeout=30)
+        assert result is not None
+        assert result.results is None
+        assert result.threshold is None
+        assert result.status["status"] == "red"
+
+    def test_failed_run_keeps_worker_alive(self, state):
+        calls = threading.Event()
+
+        def broken():
+            calls.set()
+            raise RuntimeError("boom")
+
+        trainer = BackgroundTrainer(broken, debounce=0.01)
+        try:
+            trainer.notify()
+            assert calls.wait(10)
+            assert trainer.result_for(0, timeout=5) is None
+
+            trainer._snapshot = state.snapshot
+            state.vote(1, "good")
+            state.vote(2, "bad")
+            trainer.notify()
+            assert trainer.result_for(state.version, timeout=30) is not None
+        finally:
+            trainer.stop(timeout=10)
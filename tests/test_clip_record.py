@@ -0,0 +1,121 @@
+"""Tests for compact clip records (vtsearch.utils.clip_record).
+
+Covers:
+- ClipRecord behaves like a dict: missing keys, extra keys, deletion, iteration, equality
+- Type and category strings are interned
+- Records pickle and copy
+- ClipStore stores dicts as records and shares equal origin dicts
+"""
+
+from __future__ import annotations
+
+import copy
+import pickle
+import sys
+
+import numpy as np
+import pytest
+
+from vtsearch.utils.clip_record import ClipRecord
+from vtsearch.utils.clip_store import ClipStore
+
+
+def _clip(cid: int, **extra) -> dict:
+    return {
+        "id": cid,
+        "type": "audio",
+        "md5": f"{cid:032x}",
+        "embedding": np.full(4, float(cid), dtype=np.float32),
+        "category": "dog",
+        "origin": {"importer": "folder", "params": {"path": "/data"}},
+        **extra,
+    }
+
+
+class TestClipRecord:
+    def test_reads_like_a_dict(self):
+        record = ClipRecord(_clip(1, wav_bytes=None))
+        assert record["id"] == 1
+        assert record.get("wav_bytes", "absent") is None
+        assert "wav_bytes" in record
+        assert "width" not in record
+        assert record.get("width") is None
+        with pytest.raises(KeyError):
+            record["width"]
+        assert len(record) == 7
+        assert dict(record) == {**_clip(1, wav_bytes=None), "embedding": record["embedding"]}
+
+    def test_extra_keys(self):
+        record = ClipRecord(_clip(1), title="Bark", source_url="http://x")
+        assert record["title"] == "Bark"
+        assert set(record) >= {"id", "title", "source_url"}
+        del record["title"]
+        assert "title" not in record
+        with pytest.raises(KeyError):
+            del record["title"]
+
+    def test_mutation(self):
+        record = ClipRecord(_clip(1))
+        record["width"] = 32
+        record.update(height=16, category="cat")
+        assert (record["width"], record["height"], record["category"]) == (32, 16, "cat")
+        assert record.pop("width") == 32
+        assert "width" not in record
+        with pytest.raises(KeyError):
+            del record["width"]
+        assert record.setdefault("word_count", 3) == 3
+
+    def test_equality_with_dict(self):
+        plain = {"id": 1, "type": "image", "filename": "a.png"}
+        assert ClipRecord(plain) == plain
+        assert ClipRecord(plain) != {**plain, "id": 2}
+
+    def test_strings_are_interned(self):
+        prefix = "para"
+        a = ClipRecord(type=f"{prefix}graph", category=f"{prefix[:0]}sport")
+        assert a["type"] is sys.intern("paragraph")
+        assert a["category"] is sys.intern("sport")
+
+    def test_pickle_and_copy(self):
+        record = ClipRecord(_clip(1), title="x")
+        restored = pickle.loads(pickle.dumps(record))
+        assert isinstance(restored, ClipRecord)
+        assert restored["title"] == "x"
+        assert restored["md5"] == record["md5"]
+        duplicate = record.copy()
+        duplicate["id"] = 2
+        assert record["id"] == 1
+        assert copy.deepcopy(record)["origin"] == record["origin"]
+
+    def test_has_no_instance_dict(self):
+        record = ClipRecord(_clip(1))
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(AttributeError):
+            record.title = "x"
+
+
+class TestClipStoreRecords:
+    def test_dicts_are_stored_as_records(self):
+        store = ClipStore({1: _clip(1)})
+        store[2] = _clip(2)
+        assert isinstance(store[1], ClipRecord)
+        assert isinstance(store[2], ClipRecord)
+        store[2]["category"] = "cat"
+        assert store[2]["category"] == "cat"
+
+    def test_equal_origins_are_shared(self):
+        store = ClipStore()
+        for cid in range(1, 4):
+            store[cid] = _clip(cid)
+        store[4] = _clip(4, origin={"importer": "folder", "params": {"path": "/other"}})
+        assert store[1]["origin"] is store[2]["origin"] is store[3]["origin"]
+        assert store[4]["origin"] is not store[1]["origin"]
+
+    def test_unhashable_origin_is_kept(self):
+        origin = {"importer": "x", "params": {"shape": {1, 2}}}
+        store = ClipStore({1: _clip(1, origin=origin)})
+        assert store[1]["origin"] is origin
+
+    def test_other_values_untouched(self):
+        store = ClipStore({1: "not a clip"})
+        assert store[1] == "not a clip"
@@ -0,0 +1,157 @@
+"""Tests for the columnar clip store (vtsearch.utils.clip_store).
+
+Covers:
+- ClipStore behaves like a dict and keeps its embedding matrix in sync
+- Appends, replacements, deletions, clear(), update()
+- embedding_matrix / gather_embeddings on ClipStore and plain dicts
+"""
+
+from __future__ import annotations
+
+import pickle
+
+import numpy as np
+import pytest
+
+from vtsearch.utils.clip_store import ClipStore, embedding_matrix, gather_embeddings
+
+
+def _clip(cid: int, dim: int = 4) -> dict:
+    return {"id": cid, "embedding": np.full(dim, float(cid), dtype=np.float64)}
+
+
+def _assert_aligned(store: ClipStore) -> None:
+    ids, X = store.embedding_matrix()
+    assert list(ids) == list(store.keys())
+    for row, cid in enumerate(ids):
+        np.testing.assert_array_equal(X[row], store[int(cid)]["embedding"])
+
+
+class TestClipStore:
+    def test_is_a_dict(self):
+        store = ClipStore({1: _clip(1)})
+        assert isinstance(store, dict)
+        assert store[1]["id"] == 1
+        assert len(store) == 1
+
+    def test_empty_matrix(self):
+        ids, X = ClipStore().embedding_matrix()
+        assert ids.shape == (0,)
+        assert X.shape == (0, 0)
+
+    def test_matrix_is_float32_in_insertion_order(self):
+        store = ClipStore()
+        for cid in (5, 2, 9):
+            store[cid] = _clip(cid)
+        ids, X = store.embedding_matrix()
+        assert ids.dtype == np.int64
+        assert X.dtype == np.float32
+        assert list(ids) == [5, 2, 9]
+        _assert_aligned(store)
+
+    def test_append_after_read(self):
+        store = ClipStore()
+        for cid in range(1, 4):
+            store[cid] = _clip(cid)
+        _, before = store.embedding_matrix()
+        snapshot = before.copy()
+        for cid in range(4, 200):
+            store[cid] = _clip(cid)
+        _, X = store.embedding_matrix()
+        assert X.shape == (199, 4)
+        _assert_aligned(store)
+        # Previously handed-out views are never overwritten
+        np.testing.assert_array_equal(before, snapshot)
+
+    def test_replace_existing_clip(self):
+        store = ClipStore({1: _clip(1), 2: _clip(2)})
+        store.embedding_matrix()
+        store[1] = {"id": 1, "embedding": np.zeros(4)}
+        _, X = store.embedding_matrix()
+        np.testing.assert_array_equal(X[0], np.zeros(4))
+        _assert_aligned(store)
+
+    def test_delete_and_pop(self):
+        store = ClipStore({cid: _clip(cid) for cid in range(1, 6)})
+        store.embedding_matrix()
+        del store[2]
+        store.pop(4)
+        store.pop(99, None)
+        ids, _ = store.embedding_matrix()
+        assert list(ids) == [1, 3, 5]
+        _assert_aligned(store)
+
+    def test_clear(self):
+        store = ClipStore({cid: _clip(cid) for cid in range(1, 6)})
+        store.embedding_matrix()
+        store.clear()
+        ids, _ = store.embedding_matrix()
+        assert len(ids) == 0
+        store[7] = _clip(7, dim=8)
+        ids, X = store.embedding_matrix()
+        assert list(ids) == [7]
+        assert X.shape == (1, 8)
+
+    def test_update_tracks_new_clips(self):
+        store = ClipStore()
+        store.update({1: _clip(1), 2: _clip(2)})
+        store |= {3: _clip(3)}
+        store.setdefault(4, _clip(4))
+        assert list(store.embedding_matrix()[0]) == [1, 2, 3, 4]
+        _assert_aligned(store)
+
+    def test_invalidate_picks_up_in_place_edit(self):
+        store = ClipStore({1: _clip(1)})
+        store.embedding_matrix()
+        store[1]["embedding"] = np.ones(4)
+        store.invalidate()
+        np.testing.assert_array_equal(store.embedding_matrix()[1][0], np.ones(4))
+
+    def test_version_increments(self):
+        store = ClipStore()
+        v0 = store.version
+        store[1] = _clip(1)
+        assert store.version > v0
+
+    def test_dimension_mismatch_raises(self):
+        store = ClipStore({1: _clip(1)})
+        store.embedding_matrix()
+        store[2] = _clip(2, dim=3)
+        with pytest.raises(ValueError):
+            store.embedding_matrix()
+
+    def test_row_indices(self):
+        store = ClipStore({cid: _clip(cid) for cid in (10, 20, 30)})
+        assert list(store.row_indices([30, 10])) == [2, 0]
+        with pytest.raises(KeyError):
+            store.row_indices([99])
+
+    def test_pickle_roundtrip(self):
+        store = ClipStore({1: _clip(1)})
+        restored = pickle.loads(pickle.dumps(store))
+        assert isinstance(restored, ClipStore)
+        _assert_aligned(restored)
+
+
+class TestHelpers:
+    @pytest.mark.parametrize("factory", [dict, ClipStore])
+    def test_embedding_matrix(self, factory):
+        clips = factory({cid: _clip(cid) for cid in (3, 1, 2)})
+        ids, X = embedding_matrix(clips)
+        assert list(ids) == [3, 1, 2]
+        assert X.dtype == np.float32
+        np.testing.assert_array_equal(X[:, 0], [3.0, 1.0, 2.0])
+
+    @pytest.mark.parametrize("factory", [dict, ClipStore])
+    def test_gather_embeddings(self, factory):
+        clips = factory({cid: _clip(cid) for cid in (3, 1, 2)})
+        X = gather_embeddings(clips, [2, 3])
+        assert X.shape == (2, 4)
+        assert X.dtype == np.float32
+        np.testing.assert_array_equal(X[:, 0], [2.0, 3.0])
+
+    @pytest.mark.parametrize("factory", [dict, ClipStore])
+    def test_gather_missing_raises(self, factory):
+        clips = factory({1: _clip(1)})
+        with pytest.raises(KeyError):
+            gather_embeddings(clips, [2])
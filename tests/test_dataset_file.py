@@ -0,0 +1,343 @@
+"""Tests for the ``.vtds`` dataset file format (vtsearch.datasets.dataset_file).
+
+Covers:
+- Clips, embeddings, segments and creation_info round-trip through a file
+- A failed write never leaves a partial file that loads as a dataset
+- Embeddings are read through a memory map and partial loads read only the selected IDs
+- Media goes from the file into the media store; ``media_dir`` datasets read it from disk
+- Files can be written to unseekable streams and streamed in chunks (media in
+  bounded slices), optionally zstd-compressed or without media
+- ``/api/dataset/export`` streams the file
+- ``--export-dataset`` loads media into a temporary store, not the app's pack
+- Legacy pickles still load; newer format versions are refused
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import pickle
+import zipfile
+
+import numpy as np
+import pytest
+from flask import Flask
+
+from vtsearch.datasets.dataset_file import (
+    DatasetReader,
+    DatasetWriter,
+    is_dataset_file,
+    iter_dataset,
+    write_dataset,
+)
+from vtsearch.datasets.loader import load_dataset_from_file
+from vtsearch.routes.datasets import datasets_bp
+from vtsearch.utils import clips as app_clips
+from vtsearch.utils import media_store
+from vtsearch.utils.media_store import MediaStore, clip_media_bytes
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = MediaStore(tmp_path / "media.pack")
+    monkeypatch.setattr(media_store, "_store", store)
+    monkeypatch.setattr(media_store, "MEDIA_STORE_ENABLED", True)
+    yield store
+    store.close()
+
+
+def _clip(clip_id: int, media: bytes, **extra) -> dict:
+    return {
+        "id": clip_id,
+        "type": "audio",
+        "duration": 1.5,
+        "file_size": len(media),
+        "md5": hashlib.md5(media).hexdigest(),
+        "embedding": np.full(4, clip_id, dtype=np.float32),
+        "wav_bytes": media,
+        "video_bytes": None,
+        "filename": f"clip_{clip_id}.wav",
+        "category": "dog" if clip_id % 2 else "cat",
+        "origin": {"importer": "folder", "params": {"path": "/x"}},
+        **extra,
+    }
+
+
+@pytest.fixture
+def clips() -> dict:
+    return {i: _clip(i, f"RIFF{i}".encode() * 10) for i in range(1, 6)}
+
+
+class TestRoundTrip:
+    def test_load(self, store, tmp_path, clips):
+        path = tmp_path / "data.vtds"
+        info = {"importer": "folder", "params": {"path": "/x"}}
+        write_dataset(path, clips, creation_info=info)
+        assert is_dataset_file(path)
+
+        loaded: dict = {}
+        assert load_dataset_from_file(path, loaded) == info
+        assert list(loaded) == [1, 2, 3, 4, 5]
+        for cid, clip in loaded.items():
+            np.testing.assert_array_equal(clip["embedding"], clips[cid]["embedding"])
+            assert clip["category"] == clips[cid]["category"]
+            assert clip["origin"] == clips[cid]["origin"]
+            assert clip["wav_bytes"] is None
+            assert bytes(clip_media_bytes(clip)) == clips[cid]["wav_bytes"]
+
+    def test_manifest(self, tmp_path, clips):
+        path = tmp_path / "data.vtds"
+        write_dataset(path, clips, name="sounds")
+        with zipfile.ZipFile(path) as zf:
+            manifest = json.loads(zf.read("manifest.json"))
+            assert all(info.compress_type == zipfile.ZIP_STORED for info in zf.infolist())
+        assert manifest == {"format": "vtsearch-dataset", "version": 1, "name": "sounds", "clips": 5, "dim": 4}
+
+    def test_segments(self, store, tmp_path):
+        text = {
+            "id": 1,
+            "type": "paragraph",
+            "md5": "0" * 32,
+            "text_content": "one. two.",
+            "embedding": np.ones(3, dtype=np.float32),
+            "segment_offsets": np.array([0.0, 5.0], dtype=np.float32),
+            "segment_embeddings": np.arange(6, dtype=np.float32).reshape(2, 3),
+        }
+        path = tmp_path / "text.vtds"
+        write_dataset(path, {1: text})
+        loaded: dict = {}
+        load_dataset_from_file(path, loaded)
+        assert loaded[1]["text_content"] == "one. two."
+        np.testing.assert_array_equal(loaded[1]["segment_offsets"], [0.0, 5.0])
+        np.testing.assert_array_equal(loaded[1]["segment_embeddings"], text["segment_embeddings"])
+        assert len(store) == 0
+
+    def test_media_from_store_is_exported(self, store, tmp_path, clips):
+        for clip in clips.values():
+            media_store.store_clip_media(clip)
+        path = tmp_path / "data.vtds"
+        write_dataset(path, clips)
+        with DatasetReader(path) as reader:
+            view = reader.media(3)
+            assert bytes(view) == b"RIFF3" * 10
+            view.release()
+
+    def test_dimension_mismatch(self, tmp_path, clips):
+        clips[2]["embedding"] = np.zeros(7)
+        with pytest.raises(ValueError):
+            write_dataset(tmp_path / "bad.vtds", clips)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failed_write_keeps_previous_file(self, tmp_path, clips):
+        path = tmp_path / "data.vtds"
+        write_dataset(path, clips)
+        clips[4]["embedding"] = np.zeros(7)
+        with pytest.raises(ValueError):
+            write_dataset(path, clips)
+        assert [p.name for p in tmp_path.iterdir()] == ["data.vtds"]
+        with DatasetReader(path) as reader:
+            assert len(reader) == 5
+
+    def test_writer_aborts_on_error(self, tmp_path, clips):
+        path = tmp_path / "data.vtds"
+        with pytest.raises(RuntimeError), DatasetWriter(path) as writer:
+            writer.add(clips[1])
+            raise RuntimeError("interrupted")
+        assert not is_dataset_file(path)
+
+
+class TestReader:
+    def test_embeddings_are_mapped(self, tmp_path, clips):
+        path = tmp_path / "data.vtds"
+        write_dataset(path, clips)
+        with DatasetReader(path) as reader:
+            assert reader.ids == [1, 2, 3, 4, 5]
+            assert not reader.embeddings.flags.owndata
+            assert not reader.embeddings.flags.writeable
+            np.testing.assert_array_equal(reader.embedding(4), np.full(4, 4.0))
+            gathered = reader.gather_embeddings([5, 1])
+            assert gathered.flags.owndata
+            np.testing.assert_array_equal(gathered[:, 0], [5.0, 1.0])
+
+    def test_partial_load(self, store, tmp_path, clips):
+        path = tmp_path / "data.vtds"
+        write_dataset(path, clips)
+        loaded: dict = {}
+        load_dataset_from_file(path, loaded, ids=[4, 2, 99])
+        assert sorted(loaded) == [2, 4]
+        assert len(store) == 2
+
+    def test_media_dir(self, store, tmp_path, clips):
+        media_dir = tmp_path / "audio"
+        media_dir.mkdir()
+        for clip in clips.values():
+            (media_dir / clip["filename"]).write_bytes(clip["wav_bytes"])
+        (media_dir / "clip_5.wav").unlink()
+        path = tmp_path / "data.vtds"
+        write_dataset(path, clips, media_dir=media_dir)
+        with zipfile.ZipFile(path) as zf:
+            assert "media.bin" not in zf.namelist()
+
+        loaded: dict = {}
+        load_dataset_from_file(path, loaded)
+        assert sorted(loaded) == [1, 2, 3, 4]
+        assert loaded[2]["wav_bytes"] is None and len(store) == 4
+        assert bytes(clip_media_bytes(loaded[2])) == clips[2]["wav_bytes"]
+
+    def test_newer_version_is_refused(self, tmp_path, clips):
+        path = tmp_path / "future.vtds"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("manifest.json", json.dumps({"format": "vtsearch-dataset", "version": 99}))
+        with pytest.raises(ValueError, match="version 99"):
+            DatasetReader(path)
+
+    def test_not_a_dataset(self, tmp_path):
+        path = tmp_path / "other.zip"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("readme.txt", "hi")
+        assert not is_dataset_file(path)
+        with pytest.raises(ValueError):
+            DatasetReader(path)
+
+
+class _Unseekable(io.RawIOBase):
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.chunks.append(bytes(b))
+        return len(b)
+
+
+class TestStreamingWrite:
+    def test_unseekable_target(self, store, tmp_path, clips):
+        sink = _Unseekable()
+        with DatasetWriter(sink, creation_info={"importer": "demo"}) as writer:
+            for clip in clips.values():
+                writer.add(clip)
+        path = tmp_path / "streamed.vtds"
+        path.write_bytes(b"".join(sink.chunks))
+
+        loaded: dict = {}
+        assert load_dataset_from_file(path, loaded) == {"importer": "demo"}
+        assert bytes(clip_media_bytes(loaded[5])) == clips[5]["wav_bytes"]
+
+
+class TestIterDataset:
+    def test_chunks_follow_clips(self, store, tmp_path, clips):
+        chunks = list(iter_dataset(clips.values()))
+        assert len(chunks) > len(clips)
+        assert max(len(c) for c in chunks) < 4096
+        path = tmp_path / "streamed.vtds"
+        path.write_bytes(b"".join(chunks))
+        loaded: dict = {}
+        load_dataset_from_file(path, loaded)
+        assert sorted(loaded) == [1, 2, 3, 4, 5]
+
+    def test_large_media_is_streamed_in_slices(self, store, tmp_path, monkeypatch):
+        monkeypatch.setattr("vtsearch.datasets.dataset_file._MEDIA_CHUNK_BYTES", 1024)
+        big = _clip(1, bytes(range(256)) * 256)
+        media_store.store_clip_media(big)
+        chunks = list(iter_dataset([big]))
+        assert max(len(c) for c in chunks) < 2048
+        path = tmp_path / "big.vtds"
+        path.write_bytes(b"".join(chunks))
+        with DatasetReader(path) as reader:
+            view = reader.media(1)
+            assert bytes(view) == bytes(range(256)) * 256
+            view.release()
+
+    def test_embeddings_only(self, store, tmp_path, clips):
+        path = tmp_path / "vectors.vtds"
+        write_dataset(path, clips, include_media=False)
+        with DatasetReader(path) as reader:
+            assert reader.embeddings_only
+            assert reader.media(1) is None
+        loaded: dict = {}
+        load_dataset_from_file(path, loaded)
+        assert sorted(loaded) == [1, 2, 3, 4, 5]
+        assert clip_media_bytes(loaded[1]) is None
+        assert len(store) == 0
+
+    def test_unknown_compression_fails_eagerly(self, clips):
+        with pytest.raises(ValueError, match="brotli"):
+            iter_dataset(clips.values(), compress="brotli")
+
+    def test_zstd_round_trip(self, store, tmp_path, clips):
+        pytest.importorskip("zstandard")
+        path = tmp_path / "data.vtds.zst"
+        write_dataset(path, clips, creation_info={"importer": "x"}, compress="zstd")
+        assert not is_dataset_file(path)
+        loaded: dict = {}
+        assert load_dataset_from_file(path, loaded) == {"importer": "x"}
+        assert bytes(clip_media_bytes(loaded[2])) == clips[2]["wav_bytes"]
+
+
+@pytest.fixture
+def client(clips):
+    app = Flask(__name__)
+    app.register_blueprint(datasets_bp)
+    saved = dict(app_clips)
+    app_clips.clear()
+    app_clips.update(clips)
+    yield app.test_client()
+    app_clips.clear()
+    app_clips.update(saved)
+
+
+class TestExportRoute:
+    def test_streams_dataset(self, store, client, tmp_path):
+        response = client.get("/api/dataset/export")
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert "vtsearch_dataset.vtds" in response.headers["Content-Disposition"]
+        path = tmp_path / "export.vtds"
+        path.write_bytes(response.data)
+        loaded: dict = {}
+        load_dataset_from_file(path, loaded)
+        assert bytes(clip_media_bytes(loaded[4])) == b"RIFF4" * 10
+
+    def test_embeddings_only(self, client, tmp_path):
+        path = tmp_path / "export.vtds"
+        path.write_bytes(client.get("/api/dataset/export?media=0").data)
+        with DatasetReader(path) as reader:
+            assert reader.embeddings_only
+            assert len(reader) == 5
+
+    def test_bad_compression(self, client):
+        response = client.get("/api/dataset/export?compress=brotli")
+        assert response.status_code == 400
+        assert "brotli" in response.get_json()["error"]
+
+
+class TestExportCli:
+    def test_export_uses_a_temporary_store(self, store, tmp_path, clips):
+        from vtsearch.cli import export_dataset_main
+
+        source = tmp_path / "old.pkl"
+        source.write_bytes(pickle.dumps({"clips": clips, "creation_info": {"importer": "x"}}))
+        target = tmp_path / "new.vtds"
+        export_dataset_main(str(target), dataset_path=str(source))
+        assert len(store) == 0
+        with DatasetReader(target) as reader:
+            assert reader.creation_info == {"importer": "x"}
+            view = reader.media(2)
+            assert bytes(view) == clips[2]["wav_bytes"]
+            view.release()
+
+
+class TestLegacyPickle:
+    def test_pickle_still_loads(self, store, tmp_path, clips):
+        path = tmp_path / "old.pkl"
+        legacy = {cid: {**clip, "embedding": clip["embedding"].tolist()} for cid, clip in clips.items()}
+        path.write_bytes(pickle.dumps({"clips": legacy, "creation_info": {"importer": "x"}}))
+        assert not is_dataset_file(path)
+
+        loaded: dict = {}
+        assert load_dataset_from_file(path, loaded, ids=[1, 3]) == {"importer": "x"}
+        assert sorted(loaded) == [1, 3]
+        assert bytes(clip_media_bytes(loaded[3])) == clips[3]["wav_bytes"]
@@ -0,0 +1,229 @@
+"""Tests for the decode-then-embed ingest pipeline (vtsearch.decoding).
+
+Covers:
+- decode_and_embed() returns every file's embedding at its own index,
+  both through the worker pool and the in-process fallback
+- Files that fail to decode come back as None without stopping the rest
+- Per-stage progress reaches the totals
+- Shared memory is released, including when the consumer stops early
+- embed_files_cached() routes media types with a decoder through the pipeline
+- sliding_windows() and stream_audio() cut long audio into overlapping windows
+- decode_video_frames() picks the same frames grabbing forward as seeking, shrunk
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from vtsearch.decoding import Decoded, decode_and_embed, decode_video_frames, sliding_windows, stream_audio
+
+
+def _read_bytes(file_path, data=None):
+    """Decoder for the tests: the file's bytes, with their count as clip info.
+
+    Worker processes import this module to unpickle it, so the module only
+    imports vtsearch.decoding at the top.
+    """
+    array = np.fromfile(file_path, dtype=np.uint8)
+    return Decoded(array, {"size": int(array.size)})
+
+
+def _sum_rows(arrays):
+    return [np.array([float(a.sum())], dtype=np.float32) for a in arrays]
+
+
+def _shm_entries() -> set[str]:
+    shm = Path("/dev/shm")
+    return set(os.listdir(shm)) if shm.is_dir() else set()
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for i in range(7):
+        path = tmp_path / f"{i}.bin"
+        path.write_bytes(bytes([i + 1]) * (i + 1))
+        paths.append(path)
+    return paths
+
+
+def _collect(batches, total):
+    out: list = [None] * total
+    seen = []
+    for indices, embeddings, infos in batches:
+        assert len(indices) == len(embeddings) == len(infos)
+        seen.extend(indices)
+        for i, embedding in zip(indices, embeddings):
+            out[i] = embedding
+    assert sorted(seen) == list(range(total))
+    return out
+
+
+class TestDecodeAndEmbed:
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_results_line_up_with_files(self, files, workers):
+        out = _collect(decode_and_embed(_read_bytes, _sum_rows, files, batch_size=2, workers=workers), len(files))
+        for i, vec in enumerate(out):
+            assert vec[0] == (i + 1) ** 2
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_failed_decode_yields_none(self, files, workers):
+        files[3] = files[3].with_name("missing.bin")
+        out = _collect(decode_and_embed(_read_bytes, _sum_rows, files, batch_size=2, workers=workers), len(files))
+        assert out[3] is None
+        assert all(vec is not None for i, vec in enumerate(out) if i != 3)
+
+    def test_batches_respect_batch_size(self, files):
+        sizes = []
+
+        def embed(arrays):
+            sizes.append(len(arrays))
+            return _sum_rows(arrays)
+
+        list(decode_and_embed(_read_bytes, embed, files, batch_size=3, workers=2, max_pending=4))
+        assert max(sizes) <= 3
+        assert sum(sizes) == len(files)
+
+    def test_infos_come_from_the_same_decode(self, files):
+        infos: dict[int, dict] = {}
+        for indices, _embeddings, batch_infos in decode_and_embed(
+            _read_bytes, _sum_rows, files, batch_size=2, workers=2
+        ):
+            infos.update(zip(indices, batch_infos))
+        assert infos == {i: {"size": i + 1} for i in range(len(files))}
+
+    def test_stage_progress_reaches_totals(self, files):
+        stages: dict[str, int] = {}
+        batches = decode_and_embed(
+            _read_bytes,
+            _sum_rows,
+            files,
+            batch_size=2,
+            workers=2,
+            on_stage=lambda stage, done, total: stages.__setitem__(stage, done),
+        )
+        list(batches)
+        assert stages == {"decoded": len(files), "embedded": len(files)}
+
+    def test_shared_memory_is_released(self, files):
+        before = _shm_entries()
+        list(decode_and_embed(_read_bytes, _sum_rows, files, batch_size=2, workers=2))
+        assert _shm_entries() <= before
+
+    def test_early_stop_releases_shared_memory(self, files):
+        before = _shm_entries()
+        batches = decode_and_embed(_read_bytes, _sum_rows, files, batch_size=1, workers=2, max_pending=4)
+        next(batches)
+        batches.close()
+        assert _shm_entries() <= before
+
+
+class _DecodingMediaType:
+    """Media type whose files are decoded by the pipeline."""
+
+    type_id = "audio"
+    embedding_model_id = "fake-model"
+    embed_batch_size = 2
+    decoder = staticmethod(_read_bytes)
+
+    def __init__(self):
+        self.embedding_params: dict = {}
+        self.decoded_batches: list[int] = []
+
+    def embed_decoded_batch(self, arrays):
+        self.decoded_batches.append(len(arrays))
+        return _sum_rows(arrays)
+
+    def embed_media_batch(self, file_paths):
+        raise AssertionError("files should be decoded by the pipeline")
+
+
+class TestEmbedFilesCachedPipeline:
+    def test_decoder_types_use_pipeline(self, files, monkeypatch):
+        from vtsearch.models import embedding_cache
+        from vtsearch.models.embedding_cache import embed_files_cached
+
+        monkeypatch.setattr(embedding_cache, "get_embedding_cache", lambda: None)
+        mt = _DecodingMediaType()
+        decoded = []
+        out = embed_files_cached(mt, files, on_decode=lambda done, total: decoded.append(done))
+        assert [vec[0] for vec in out] == [(i + 1) ** 2 for i in range(len(files))]
+        assert sum(mt.decoded_batches) == len(files)
+        assert decoded[-1] == len(files)
+
+
+class TestSlidingWindows:
+    def _blocks(self, n, size):
+        signal = np.arange(n, dtype=np.float32)
+        return signal, [signal[i : i + size] for i in range(0, n, size)]
+
+    @pytest.mark.parametrize("block", [3, 7, 100])
+    def test_windows_overlap_by_window_minus_hop(self, block):
+        signal, blocks = self._blocks(25, block)
+        windows = list(sliding_windows(blocks, window=10, hop=5))
+        assert [start for start, _ in windows] == [0, 5, 10, 15]
+        for start, samples in windows:
+            np.testing.assert_array_equal(samples, signal[start : start + 10])
+
+    def test_last_window_may_be_short(self):
+        _signal, blocks = self._blocks(27, 4)
+        windows = list(sliding_windows(blocks, window=10, hop=5))
+        assert [start for start, _ in windows] == [0, 5, 10, 15, 20]
+        assert len(windows[-1][1]) == 7
+
+    def test_signal_shorter_than_window(self):
+        _signal, blocks = self._blocks(4, 2)
+        windows = list(sliding_windows(blocks, window=10, hop=5))
+        assert [(start, len(samples)) for start, samples in windows] == [(0, 4)]
+
+
+class TestStreamAudio:
+    def test_resampled_blocks_add_up_to_the_signal(self, tmp_path):
+        import soundfile as sf
+
+        path = tmp_path / "long.wav"
+        sf.write(str(path), np.zeros((44100 * 3, 2), dtype=np.float32), 44100)
+        blocks = list(stream_audio(path, 48000, block_frames=44100))
+        assert len(blocks) >= 3
+        assert all(block.ndim == 1 for block in blocks)
+        assert sum(len(block) for block in blocks) == pytest.approx(48000 * 3, abs=2)
+
+
+class TestDecodeVideoFrames:
+    @pytest.fixture
+    def video(self, tmp_path):
+        cv2 = pytest.importorskip("cv2")
+        path = tmp_path / "ramp.avi"
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+        for i in range(40):
+            # Frame i is a flat grey of brightness 6 * i
+            writer.write(np.full((48, 64, 3), 6 * i, dtype=np.uint8))
+        writer.release()
+        return path
+
+    def test_picks_evenly_spaced_frames(self, video):
+        decoded = decode_video_frames(video, num_frames=8)
+        assert decoded.array.shape == (8, 48, 64, 3)
+        expected = 6 * np.linspace(0, 39, 8, dtype=int)
+        np.testing.assert_allclose(decoded.array.mean(axis=(1, 2, 3)), expected, atol=3)
+        assert decoded.info["duration"] == pytest.approx(4.0)
+
+    def test_seeking_over_long_gaps_picks_the_same_frames(self, video, monkeypatch):
+        from vtsearch.decoding import decoders
+
+        sequential = decode_video_frames(video, num_frames=8).array
+        monkeypatch.setattr(decoders, "_should_seek", lambda gap, grab_cost, seek_cost: True)
+        seeked = decode_video_frames(video, num_frames=8).array
+        np.testing.assert_allclose(seeked.mean(axis=(1, 2, 3)), sequential.mean(axis=(1, 2, 3)), atol=3)
+
+    def test_frames_are_shrunk_to_size(self, video):
+        decoded = decode_video_frames(video, num_frames=2, size=24)
+        assert decoded.array.shape == (2, 24, 32, 3)
+
+    def test_short_video_returns_every_frame(self, video):
+        decoded = decode_video_frames(video, num_frames=100)
+        assert len(decoded.array) == 40
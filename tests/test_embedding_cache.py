@@ -0,0 +1,462 @@
+"""Tests for the persistent embedding cache (vtsearch.models.embedding_cache).
+
+Covers:
+- Round trips, batched lookups and persistence across reopening
+- LRU eviction once the size bound is exceeded
+- Hit-rate statistics
+- Keys depend on the model ID and preprocessing parameters
+- embed_file_cached() and load_dataset_from_folder() skip the model on a hit
+- embed_files_cached() embeds misses in micro-batches of embed_batch_size
+- ingest_files_cached() and MediaType.ingest() read and decode each file once
+- ingest_files_cached() copies media files into the media store instead of holding them
+- Long audio is embedded as overlapping windows whose segments are cached
+"""
+
+from __future__ import annotations
+
+import hashlib
+import wave
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from vtsearch.models import embedding_cache
+from vtsearch.models.embedding_cache import (
+    EmbeddingCache,
+    cache_key,
+    embed_file_cached,
+    embed_files_cached,
+    file_md5,
+    ingest_files_cached,
+    pack_segments,
+    unpack_segments,
+)
+from vtsearch.utils import media_store
+
+
+class _FakeMediaType:
+    """Minimal media type that counts embed_media() calls."""
+
+    type_id = "audio"
+    file_extensions = ("*.wav",)
+    embedding_model_id = "fake-model"
+
+    def __init__(self, params=None):
+        self.embedding_params = params or {"sample_rate": 48000}
+        self.embed_batch_size = 2
+        self.calls = 0
+        self.batches: list[int] = []
+
+    def embed_media(self, file_path):
+        self.calls += 1
+        return np.frombuffer(file_path.read_bytes()[:16].ljust(16, b"\0"), dtype=np.uint8).astype(np.float32)
+
+    def embed_media_batch(self, file_paths):
+        self.batches.append(len(file_paths))
+        return [self.embed_media(p) for p in file_paths]
+
+    def load_clip_data(self, file_path):
+        return {"duration": 1.0}
+
+    def clip_data_from(self, file_path, data, info=None):
+        return self.load_clip_data(file_path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = EmbeddingCache(tmp_path / "cache.sqlite3", max_bytes=1 << 20)
+    embedding_cache.set_embedding_cache(c)
+    yield c
+    embedding_cache.set_embedding_cache(None)
+    c.close()
+
+
+class TestEmbeddingCache:
+    def test_round_trip_preserves_dtype(self, cache):
+        vec = np.arange(5, dtype=np.float32)
+        cache.put("k", vec)
+        out = cache.get("k")
+        np.testing.assert_array_equal(out, vec)
+        assert out.dtype == np.float32
+        assert cache.get("missing") is None
+
+    def test_get_many_returns_only_hits(self, cache):
+        cache.put_many({f"k{i}": np.full(3, i, dtype=np.float32) for i in range(4)})
+        found = cache.get_many(["k0", "k2", "nope"])
+        assert set(found) == {"k0", "k2"}
+        np.testing.assert_array_equal(found["k2"], np.full(3, 2, dtype=np.float32))
+
+    def test_persists_across_reopen(self, tmp_path):
+        path = tmp_path / "cache.sqlite3"
+        first = EmbeddingCache(path)
+        first.put("k", np.ones(4, dtype=np.float32))
+        first.close()
+        second = EmbeddingCache(path)
+        try:
+            assert len(second) == 1
+            np.testing.assert_array_equal(second.get("k"), np.ones(4, dtype=np.float32))
+        finally:
+            second.close()
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        vec = np.zeros(25, dtype=np.float32)  # 100 bytes
+        c = EmbeddingCache(tmp_path / "cache.sqlite3", max_bytes=300)
+        try:
+            c.put("a", vec)
+            c.put("b", vec)
+            c.put("c", vec)
+            c.get("a")  # "b" is now the least recently used
+            c.put("d", vec)
+            assert c.get("b") is None
+            assert {"a", "c", "d"} <= set(c.get_many(["a", "c", "d"]))
+            stats = c.stats()
+            assert stats["entries"] == 3
+            assert stats["bytes"] <= 300
+            assert stats["evictions"] == 1
+        finally:
+            c.close()
+
+    def test_stats_report_hit_rate(self, cache):
+        assert cache.stats()["hit_rate"] == 0.0
+        cache.put("k", np.ones(2, dtype=np.float32))
+        cache.get_many(["k", "x", "y", "k"])
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+
+class TestCacheKey:
+    def test_depends_on_model_and_params(self):
+        base = cache_key("abc", "model-a", {"sr": 48000})
+        assert base == cache_key("abc", "model-a", {"sr": 48000})
+        assert base != cache_key("abc", "model-b", {"sr": 48000})
+        assert base != cache_key("abc", "model-a", {"sr": 16000})
+        assert base != cache_key("abd", "model-a", {"sr": 48000})
+
+
+class TestEmbedFileCached:
+    def test_second_call_skips_model(self, cache, tmp_path):
+        path = tmp_path / "a.wav"
+        path.write_bytes(b"RIFF-some-audio-bytes")
+        mt = _FakeMediaType()
+
+        first = embed_file_cached(mt, path)
+        second = embed_file_cached(mt, path)
+        assert mt.calls == 1
+        np.testing.assert_array_equal(first, second)
+
+    def test_same_content_under_another_name_hits(self, cache, tmp_path):
+        (tmp_path / "a.wav").write_bytes(b"identical")
+        (tmp_path / "b.wav").write_bytes(b"identical")
+        mt = _FakeMediaType()
+        embed_file_cached(mt, tmp_path / "a.wav")
+        embed_file_cached(mt, tmp_path / "b.wav")
+        assert mt.calls == 1
+
+    def test_changed_params_miss(self, cache, tmp_path):
+        path = tmp_path / "a.wav"
+        path.write_bytes(b"audio")
+        embed_file_cached(_FakeMediaType({"sample_rate": 48000}), path)
+        other = _FakeMediaType({"sample_rate": 16000})
+        embed_file_cached(other, path)
+        assert other.calls == 1
+
+    def test_failures_are_not_cached(self, cache, tmp_path):
+        path = tmp_path / "a.wav"
+        path.write_bytes(b"audio")
+        mt = _FakeMediaType()
+        mt.embed_media = mock.Mock(return_value=None)
+        assert embed_file_cached(mt, path) is None
+        assert len(cache) == 0
+
+    def test_types_without_model_id_bypass_cache(self, cache, tmp_path):
+        path = tmp_path / "a.wav"
+        path.write_bytes(b"audio")
+        mt = _FakeMediaType()
+        mt.embedding_model_id = None
+        embed_file_cached(mt, path)
+        embed_file_cached(mt, path)
+        assert mt.calls == 2
+        assert len(cache) == 0
+
+
+class TestEmbedFilesCached:
+    def test_misses_are_embedded_in_micro_batches(self, cache, tmp_path):
+        paths = []
+        for i in range(5):
+            paths.append(tmp_path / f"{i}.wav")
+            paths[-1].write_bytes(f"clip-{i}".encode())
+        mt = _FakeMediaType()
+        embed_file_cached(mt, paths[1])
+        mt.calls = 0
+
+        progress = []
+        out = embed_files_cached(mt, paths, on_batch=lambda done, total: progress.append((done, total)))
+        assert mt.calls == 4
+        assert mt.batches[-2:] == [2, 2]
+        assert progress == [(1, 5), (3, 5), (5, 5)]
+        for path, vec in zip(paths, out):
+            np.testing.assert_array_equal(vec, mt.embed_media(path))
+
+    def test_second_pass_is_all_hits(self, cache, tmp_path):
+        paths = [tmp_path / "a.wav", tmp_path / "b.wav"]
+        for p in paths:
+            p.write_bytes(p.name.encode())
+        mt = _FakeMediaType()
+        embed_files_cached(mt, paths)
+        mt.batches.clear()
+        embed_files_cached(mt, paths)
+        assert mt.batches == []
+
+    def test_works_without_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(embedding_cache, "get_embedding_cache", lambda: None)
+        paths = [tmp_path / "a.wav", tmp_path / "b.wav", tmp_path / "c.wav"]
+        for p in paths:
+            p.write_bytes(p.name.encode())
+        mt = _FakeMediaType()
+        out = embed_files_cached(mt, paths)
+        assert mt.batches == [2, 1]
+        assert all(vec is not None for vec in out)
+
+
+class _DecodingFakeMediaType(_FakeMediaType):
+    """Fake whose files go through a decoder, reporting their size as clip info."""
+
+    def __init__(self):
+        super().__init__()
+        self.decoded: list[str] = []
+        self.given: list = []
+        self.infos: list = []
+
+    def decoder(self, file_path, data=None):
+        from vtsearch.decoding import Decoded
+
+        self.decoded.append(file_path.name)
+        self.given.append(type(data))
+        if file_path.name.startswith("bad"):
+            return None
+        array = np.frombuffer(bytes(data) if data is not None else file_path.read_bytes(), dtype=np.uint8)
+        return Decoded(array, {"size": int(array.size)})
+
+    def embed_decoded_batch(self, arrays):
+        self.batches.append(len(arrays))
+        return [a[:16].astype(np.float32) for a in arrays]
+
+    def clip_data_from(self, file_path, data, info=None):
+        self.infos.append(info)
+        return {"duration": 1.0, "size": info["size"] if info else len(data)}
+
+
+class TestIngestFilesCached:
+    @pytest.fixture(autouse=True)
+    def _in_process(self, monkeypatch):
+        monkeypatch.setattr("vtsearch.decoding.pipeline.default_workers", lambda: 0)
+
+    @pytest.fixture(autouse=True)
+    def store(self, tmp_path, monkeypatch):
+        store = media_store.MediaStore(tmp_path / "media.pack")
+        monkeypatch.setattr(media_store, "_store", store)
+        monkeypatch.setattr(media_store, "MEDIA_STORE_ENABLED", True)
+        yield store
+        store.close()
+
+    def _write(self, tmp_path, names):
+        paths = [tmp_path / name for name in names]
+        for p in paths:
+            p.write_bytes(p.name.encode() * 3)
+        return paths
+
+    def test_returns_bytes_hash_and_clip_fields(self, cache, tmp_path):
+        paths = self._write(tmp_path, ["a.wav", "b.wav"])
+        mt = _DecodingFakeMediaType()
+        out = ingest_files_cached(mt, paths)
+        for path, item in zip(paths, out):
+            assert item.data == path.read_bytes()
+            assert item.md5 == hashlib.md5(item.data).hexdigest()
+            assert item.clip_data["size"] == len(item.data)
+        assert mt.decoded == ["a.wav", "b.wav"]
+        assert mt.infos == [{"size": 15}, {"size": 15}]
+
+    def test_cache_hits_are_not_decoded(self, cache, tmp_path):
+        paths = self._write(tmp_path, ["a.wav", "b.wav"])
+        ingest_files_cached(_DecodingFakeMediaType(), paths)
+        mt = _DecodingFakeMediaType()
+        out = ingest_files_cached(mt, paths)
+        assert mt.decoded == []
+        assert mt.infos == [None, None]
+        assert all(item.embedding is not None for item in out)
+
+    def test_known_embeddings_skip_the_model(self, cache, tmp_path):
+        paths = self._write(tmp_path, ["a.wav", "b.wav"])
+        mt = _DecodingFakeMediaType()
+        known = np.ones(3, dtype=np.float32)
+        out = ingest_files_cached(mt, paths, [known, None])
+        assert mt.decoded == ["b.wav"]
+        np.testing.assert_array_equal(out[0].embedding, known)
+
+    def test_media_is_stored_as_it_is_read(self, cache, store, tmp_path):
+        paths = self._write(tmp_path, ["a.wav", "b.wav"])
+        out = ingest_files_cached(_DecodingFakeMediaType(), paths)
+        assert len(store) == 2
+        for path, item in zip(paths, out):
+            assert isinstance(item.data, memoryview)
+            assert item.clip_data["wav_bytes"] is None
+            assert item.clip_data["media_ref"].md5 == item.md5
+            assert store.read(item.clip_data["media_ref"]) == path.read_bytes()
+
+    def test_files_are_read_once(self, cache, store, tmp_path, monkeypatch):
+        def no_second_read(path, chunk_size=0):
+            raise AssertionError(f"{path} hashed separately")
+
+        monkeypatch.setattr("vtsearch.models.embedding_cache.file_md5", no_second_read)
+        mt = _DecodingFakeMediaType()
+        out = ingest_files_cached(mt, self._write(tmp_path, ["a.wav", "b.wav"]))
+        assert mt.given == [memoryview, memoryview]
+        assert all(item.embedding is not None for item in out)
+
+    def test_failed_files_leave_no_blob(self, cache, store, tmp_path):
+        paths = self._write(tmp_path, ["a.wav", "bad.wav"])
+        out = ingest_files_cached(_DecodingFakeMediaType(), paths)
+        assert out[1].embedding is None and out[1].clip_data == {}
+        assert len(store) == 1 and out[1].md5 not in store
+        reopened = media_store.MediaStore(store.path)
+        assert len(reopened) == 1
+        reopened.close()
+
+    def test_disabled_store_reads_bytes(self, cache, store, tmp_path, monkeypatch):
+        monkeypatch.setattr(media_store, "MEDIA_STORE_ENABLED", False)
+        out = ingest_files_cached(_DecodingFakeMediaType(), self._write(tmp_path, ["a.wav"]))
+        assert isinstance(out[0].data, bytes)
+        assert "media_ref" not in out[0].clip_data
+        assert len(store) == 0
+
+    def test_unreadable_file_is_none(self, cache, tmp_path):
+        paths = self._write(tmp_path, ["a.wav"]) + [tmp_path / "gone.wav"]
+        out = ingest_files_cached(_DecodingFakeMediaType(), paths)
+        assert out[0] is not None
+        assert out[1] is None
+
+
+class TestMediaTypeIngest:
+    def test_audio_decodes_once(self, tmp_path):
+        import librosa
+
+        from vtsearch.media.audio.media_type import AudioMediaType
+
+        path = tmp_path / "tone.wav"
+        with wave.open(str(path), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(48000)
+            wf.writeframes(np.zeros(24000, dtype=np.int16).tobytes())
+
+        mt = AudioMediaType()
+        mt.embed_decoded_batch = lambda arrays: [np.ones(4, dtype=np.float32) for _ in arrays]
+        with mock.patch.object(librosa, "load", wraps=librosa.load) as load:
+            item = mt.ingest(path)
+        assert load.call_count == 1
+        assert item.data == path.read_bytes()
+        assert item.md5 == file_md5(path)
+        assert item.clip_data["duration"] == pytest.approx(0.5)
+        assert item.clip_data["wav_bytes"] == item.data
+        assert item.decoded.shape == (24000,)
+        np.testing.assert_array_equal(item.embedding, np.ones(4, dtype=np.float32))
+
+
+def _write_tone(path, seconds, rate=48000):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(np.zeros(int(seconds * rate), dtype=np.int16).tobytes())
+
+
+class TestSegments:
+    def test_pack_round_trip(self):
+        from vtsearch.media.base import Segments
+
+        segments = Segments(
+            offsets=np.array([0.0, 5.0], dtype=np.float32),
+            embeddings=np.arange(8, dtype=np.float32).reshape(2, 4),
+            duration=12.5,
+        )
+        out = unpack_segments(pack_segments(segments))
+        np.testing.assert_array_equal(out.offsets, segments.offsets)
+        np.testing.assert_array_equal(out.embeddings, segments.embeddings)
+        assert out.duration == 12.5
+        # Mean direction, at the windows' mean length
+        mean = np.array([2.0, 3.0, 4.0, 5.0])
+        np.testing.assert_allclose(out.pooled / np.linalg.norm(out.pooled), mean / np.linalg.norm(mean), rtol=1e-6)
+        assert np.linalg.norm(out.pooled) == pytest.approx(np.linalg.norm(segments.embeddings, axis=1).mean())
+
+    def _audio(self):
+        from vtsearch.media.audio.media_type import AudioMediaType
+
+        mt = AudioMediaType()
+        mt.windows = []
+
+        def embed(arrays):
+            mt.windows.extend(len(a) for a in arrays)
+            return [np.full(4, len(mt.windows), dtype=np.float32) for _ in arrays]
+
+        mt.embed_decoded_batch = embed
+        return mt
+
+    def test_long_audio_is_windowed(self, tmp_path):
+        path = tmp_path / "long.wav"
+        _write_tone(path, 25)
+        mt = self._audio()
+        assert mt.needs_segments(path)
+        segments = mt.embed_segments(path)
+        assert segments.offsets.tolist() == [0.0, 5.0, 10.0, 15.0]
+        assert segments.embeddings.shape == (4, 4)
+        assert segments.duration == pytest.approx(25.0)
+        assert mt.windows == [480000] * 4
+
+    def test_short_audio_is_not_windowed(self, tmp_path):
+        path = tmp_path / "short.wav"
+        _write_tone(path, 2)
+        assert not self._audio().needs_segments(path)
+
+    def test_segments_are_cached_with_the_clip(self, cache, tmp_path):
+        path = tmp_path / "long.wav"
+        _write_tone(path, 25)
+        first = ingest_files_cached(self._audio(), [path])[0]
+        assert first.clip_data["segment_offsets"].tolist() == [0.0, 5.0, 10.0, 15.0]
+
+        mt = self._audio()
+        again = ingest_files_cached(mt, [path])[0]
+        assert mt.windows == []
+        np.testing.assert_array_equal(again.embedding, first.embedding)
+        np.testing.assert_array_equal(again.clip_data["segment_embeddings"], first.clip_data["segment_embeddings"])
+        assert again.clip_data["duration"] == pytest.approx(25.0)
+
+
+class TestFolderImportUsesCache:
+    def test_reimport_does_not_embed_again(self, cache, tmp_path):
+        from vtsearch.datasets.loader import load_dataset_from_folder
+
+        for name in ("a.wav", "b.wav", "c.wav"):
+            (tmp_path / name).write_bytes(name.encode() * 4)
+        mt = _FakeMediaType()
+
+        def _noop(*a):
+            return None
+
+        first: dict = {}
+        with mock.patch("vtsearch.media.get_by_folder_name", return_value=mt):
+            load_dataset_from_folder(tmp_path, "sounds", first, on_progress=_noop)
+        assert mt.calls == 3
+
+        second: dict = {}
+        with mock.patch("vtsearch.media.get_by_folder_name", return_value=mt):
+            load_dataset_from_folder(tmp_path, "sounds", second, on_progress=_noop)
+        assert mt.calls == 3
+        assert cache.stats()["hits"] == 3
+
+        by_name = {c["filename"]: c for c in second.values()}
+        for clip in first.values():
+            np.testing.assert_array_equal(by_name[clip["filename"]]["embedding"], clip["embedding"])
+            assert by_name[clip["filename"]]["md5"] == file_md5(tmp_path / clip["filename"])
@@ -324,13 +324,11 @@ class TestEvalTextSort:
             EvalQuery("a dog", "dog"),
         ]
 
-        # Mock embed_text_query to return the cluster centre
-        def mock_embed(text, media_type):
-            if "cat" in text:
-                return cat_dir.copy()
-            return dog_dir.copy()
+        # Mock embed_text_queries to return the cluster centres
+        def mock_embed(texts, media_type):
+            return [cat_dir.copy() if "cat" in text else dog_dir.copy() for text in texts]
 
-        with patch("vtsearch.models.embeddings.embed_text_query", side_effect=mock_embed):
+        with patch("vtsearch.models.embeddings.embed_text_queries", side_effect=mock_embed):
             results = eval_text_sort(clips, queries, "image", k_values=[5, 10])
 
         assert len(results) == 2
@@ -343,7 +341,7 @@ class TestEvalTextSort:
         clips, cat_dir, _ = self._make_synthetic_clips()
         queries = [EvalQuery("a cat", "cat")]
 
-        with patch("vtsearch.models.embeddings.embed_text_query", return_value=cat_dir.copy()):
+        with patch("vtsearch.models.embeddings.embed_text_queries", return_value=[cat_dir.copy()]):
             results = eval_text_sort(clips, queries, "image", k_values=[5])
 
         qm = results[0]
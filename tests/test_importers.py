@@ -375,7 +375,10 @@ class TestLoadDatasetContentVectors:
         mt.type_id = "audio"
         mt.file_extensions = ["*.wav"]
         mt.embed_media.return_value = embed_return
+        mt.embed_batch_size = 1
+        mt.embed_media_batch.side_effect = lambda paths: [mt.embed_media(p) for p in paths]
         mt.load_clip_data.return_value = {"duration": 1.0}
+        mt.clip_data_from.side_effect = lambda path, data, info=None: mt.load_clip_data(path)
         return mt
 
     def test_uses_content_vector_when_provided(self, tmp_path):
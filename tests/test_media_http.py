@@ -0,0 +1,90 @@
+"""Tests for byte-range and conditional requests on the media endpoints.
+
+Covers:
+- Whole-body responses advertise ranges and carry the clip's MD5 as a strong ETag
+- ``Range`` returns 206 with only the requested bytes; past-the-end ranges 416
+- ``If-Range`` with a stale validator falls back to the whole body
+- ``If-None-Match`` returns 304 with no body
+- Only URLs that carry the clip's MD5 are cached long-term
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+import numpy as np
+import pytest
+from flask import Flask
+
+from vtsearch.routes.clips import clips_bp
+from vtsearch.utils import clips
+
+DATA = bytes(range(256)) * 4
+MD5 = hashlib.md5(DATA).hexdigest()
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(clips_bp)
+    saved = dict(clips)
+    clips.clear()
+    clips[3] = {
+        "id": 3,
+        "type": "video",
+        "filename": "clip.mp4",
+        "md5": MD5,
+        "embedding": np.zeros(2),
+        "video_bytes": DATA,
+    }
+    yield app.test_client()
+    clips.clear()
+    clips.update(saved)
+
+
+@pytest.mark.parametrize("route", ["video", "media"])
+class TestMediaHttp:
+    def test_whole_body(self, client, route):
+        response = client.get(f"/api/clips/3/{route}")
+        assert response.status_code == 200
+        assert response.data == DATA
+        assert response.headers["Accept-Ranges"] == "bytes"
+        assert response.headers["ETag"] == f'"{MD5}"'
+
+    def test_range(self, client, route):
+        response = client.get(f"/api/clips/3/{route}", headers={"Range": "bytes=100-199"})
+        assert response.status_code == 206
+        assert response.data == DATA[100:200]
+        assert response.headers["Content-Range"] == f"bytes 100-199/{len(DATA)}"
+        assert response.content_length == 100
+
+    def test_open_and_suffix_ranges(self, client, route):
+        assert client.get(f"/api/clips/3/{route}", headers={"Range": "bytes=1000-"}).data == DATA[1000:]
+        assert client.get(f"/api/clips/3/{route}", headers={"Range": "bytes=-24"}).data == DATA[-24:]
+
+    def test_unsatisfiable_range(self, client, route):
+        response = client.get(f"/api/clips/3/{route}", headers={"Range": "bytes=5000-6000"})
+        assert response.status_code == 416
+        assert response.headers["Content-Range"] == f"bytes */{len(DATA)}"
+
+    def test_if_range(self, client, route):
+        headers = {"Range": "bytes=0-9", "If-Range": f'"{MD5}"'}
+        assert client.get(f"/api/clips/3/{route}", headers=headers).status_code == 206
+        headers["If-Range"] = '"stale"'
+        response = client.get(f"/api/clips/3/{route}", headers=headers)
+        assert response.status_code == 200
+        assert response.data == DATA
+
+    def test_if_none_match(self, client, route):
+        response = client.get(f"/api/clips/3/{route}", headers={"If-None-Match": f'"{MD5}"'})
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.headers["ETag"] == f'"{MD5}"'
+        assert client.get(f"/api/clips/3/{route}", headers={"If-None-Match": '"other"'}).status_code == 200
+
+    def test_cache_control(self, client, route):
+        assert client.get(f"/api/clips/3/{route}").headers["Cache-Control"] == "no-cache"
+        versioned = client.get(f"/api/clips/3/{route}?v={MD5}")
+        assert "immutable" in versioned.headers["Cache-Control"]
+        stale = client.get(f"/api/clips/3/{route}?v=0123")
+        assert stale.headers["Cache-Control"] == "no-cache"
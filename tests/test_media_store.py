@@ -0,0 +1,243 @@
+"""Tests for the disk-backed media store (vtsearch.utils.media_store).
+
+Covers:
+- Blobs round-trip through the pack file and are deduplicated by MD5
+- Files are hashed as they are copied into the pack in slices
+- Discarded blobs and dropped duplicate copies are not indexed again
+- Reads are zero-copy views of the memory-mapped pack
+- A reopened pack is re-indexed, dropping a record cut short by a crash
+- Stores sharing a pack (e.g. the app and a CLI run) index each other's appends
+- Clips keep only a MediaRef once their media is stored
+- A temporary store replaces the process-wide one for a block
+- Pickle import stores media and pickle export reads it back in
+- The media routes stream media from the store
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import pickle
+
+import numpy as np
+import pytest
+from flask import Flask
+
+from vtsearch.datasets.loader import export_dataset_to_file, load_dataset_from_pickle
+from vtsearch.routes.clips import clips_bp
+from vtsearch.utils import clips as app_clips
+from vtsearch.utils import media_store
+from vtsearch.utils.media_store import (
+    MediaRef,
+    MediaStore,
+    attach_clip_file,
+    clip_media_bytes,
+    inline_media,
+    store_clip_media,
+)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = MediaStore(tmp_path / "media.pack")
+    monkeypatch.setattr(media_store, "_store", store)
+    monkeypatch.setattr(media_store, "MEDIA_STORE_ENABLED", True)
+    yield store
+    store.close()
+
+
+def _md5(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
+
+
+class TestMediaStore:
+    def test_round_trip(self, store):
+        ref = store.put(b"hello world")
+        assert ref == MediaRef(ref.offset, 11, _md5(b"hello world"))
+        view = store.view(ref)
+        assert isinstance(view, memoryview)
+        assert view.readonly
+        assert bytes(view) == b"hello world"
+        assert store.read(store.put(b"second")) == b"second"
+
+    def test_duplicates_are_stored_once(self, store):
+        first = store.put(b"same bytes")
+        size = store.stats()["bytes"]
+        assert store.put(b"same bytes") == first
+        assert store.stats()["bytes"] == size
+        assert store.stats()["dedup_hits"] == 1
+        assert len(store) == 1
+
+    def test_reopen_reindexes(self, store):
+        ref = store.put(b"abc")
+        store.put(b"defg")
+        reopened = MediaStore(store.path)
+        assert _md5(b"abc") in reopened and len(reopened) == 2
+        assert reopened.read(ref) == b"abc"
+        assert reopened.put(b"defg").offset > ref.offset  # found, not appended
+        assert reopened.stats()["bytes"] == store.stats()["bytes"]
+        reopened.close()
+
+    def test_truncated_record_is_dropped(self, store):
+        ref = store.put(b"whole")
+        end = store.stats()["bytes"]
+        store.put(b"cut short by a crash")
+        store.close()
+        with open(store.path, "r+b") as f:
+            f.truncate(end + 30)
+        reopened = MediaStore(store.path)
+        assert len(reopened) == 1
+        assert reopened.stats()["bytes"] == end
+        assert reopened.read(ref) == b"whole"
+        assert reopened.read(reopened.put(b"next")) == b"next"
+        reopened.close()
+
+    def test_stores_sharing_a_pack(self, store, tmp_path):
+        other = MediaStore(store.path)
+        first = store.put(b"from the app")
+        (tmp_path / "cli.wav").write_bytes(b"from the cli")
+        second, _added = other.put_file(tmp_path / "cli.wav")
+        third = store.put(b"from the app again")
+        assert second.offset > first.offset and third.offset > second.offset
+        assert other.read(second) == b"from the cli"
+        assert store.read(third) == b"from the app again"
+        assert store.put(b"from the cli") == second
+        assert other.put(b"from the app again") == third
+        other.close()
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "not-a-pack"
+        path.write_bytes(b"something else")
+        with pytest.raises(ValueError):
+            MediaStore(path)
+
+    def test_ref_outside_pack(self, store):
+        with pytest.raises(ValueError):
+            store.view(MediaRef(0, 5, "0" * 32))
+
+    def test_put_file_copies_in_slices(self, store, tmp_path, monkeypatch):
+        monkeypatch.setattr(media_store, "_COPY_CHUNK_BYTES", 7)
+        data = bytes(range(256)) * 3
+        path = tmp_path / "clip.wav"
+        path.write_bytes(data)
+        ref, added = store.put_file(path)
+        assert added and ref.md5 == _md5(data)
+        assert store.read(ref) == data
+        assert store.put(data) == ref
+        assert store.put_file(path, _md5(data)) == (ref, False)
+        assert store.stats()["dedup_hits"] == 2
+
+    def test_put_file_drops_duplicate_copy(self, store, tmp_path):
+        ref = store.put(b"already here")
+        size = store.stats()["bytes"]
+        (tmp_path / "copy.wav").write_bytes(b"already here")
+        assert store.put_file(tmp_path / "copy.wav") == (ref, False)
+        assert store.stats()["bytes"] == size
+        assert store.read(store.put(b"next")) == b"next"
+
+    def test_put_file_failure_leaves_pack_intact(self, store, tmp_path):
+        size = store.stats()["bytes"]
+        with pytest.raises(OSError):
+            store.put_file(tmp_path / "missing.wav")
+        assert store.stats()["bytes"] == size
+        assert len(store) == 0
+
+    def test_discarded_blob_is_not_reindexed(self, store):
+        dropped = store.put(b"failed to import")
+        kept = store.put(b"imported")
+        store.discard(dropped)
+        assert _md5(b"failed to import") not in store
+        assert store.read(kept) == b"imported"
+        reopened = MediaStore(store.path)
+        assert len(reopened) == 1 and reopened.read(kept) == b"imported"
+        assert reopened.put(b"failed to import").offset > kept.offset
+        reopened.close()
+
+
+class TestClipHelpers:
+    def test_store_clip_media(self, store):
+        clip = {"id": 1, "type": "audio", "md5": _md5(b"RIFF...."), "wav_bytes": b"RIFF....", "video_bytes": None}
+        store_clip_media(clip)
+        assert clip["wav_bytes"] is None
+        assert clip["media_ref"].length == 8
+        assert bytes(clip_media_bytes(clip)) == b"RIFF...."
+        assert inline_media(clip) == {"wav_bytes": b"RIFF....", "video_bytes": None, "image_bytes": None}
+
+    def test_attach_clip_file(self, store, tmp_path, monkeypatch):
+        (tmp_path / "a.png").write_bytes(b"\x89PNG....")
+        clip = attach_clip_file({"type": "image", "image_bytes": None}, tmp_path / "a.png")
+        assert clip["media_ref"].md5 == _md5(b"\x89PNG....")
+        assert bytes(clip_media_bytes(clip)) == b"\x89PNG...."
+        monkeypatch.setattr(media_store, "MEDIA_STORE_ENABLED", False)
+        assert attach_clip_file({"type": "image"}, tmp_path / "a.png") == {
+            "type": "image",
+            "image_bytes": b"\x89PNG....",
+        }
+
+    def test_inline_clips_are_served_as_is(self, store):
+        clip = {"id": 1, "type": "image", "image_bytes": b"\x89PNG"}
+        assert clip_media_bytes(clip) == b"\x89PNG"
+        assert clip_media_bytes({"id": 2, "type": "paragraph", "text_content": "hi"}) is None
+
+    def test_temporary_store(self, store):
+        with media_store.temporary_media_store() as temp:
+            clip = store_clip_media({"type": "audio", "wav_bytes": b"RIFF", "md5": _md5(b"RIFF")})
+            assert media_store.get_media_store() is temp
+            assert bytes(clip_media_bytes(clip)) == b"RIFF"
+        assert media_store.get_media_store() is store
+        assert len(store) == 0
+        assert not temp.path.exists()
+
+    def test_disabled_store_keeps_bytes_inline(self, store, monkeypatch):
+        monkeypatch.setattr(media_store, "MEDIA_STORE_ENABLED", False)
+        clip = {"type": "audio", "wav_bytes": b"RIFF"}
+        assert store_clip_media(clip) == {"type": "audio", "wav_bytes": b"RIFF"}
+        assert len(store) == 0
+
+
+class TestLoaderRoundTrip:
+    def test_pickle_import_and_export(self, store, tmp_path):
+        wav = b"RIFF" + bytes(range(200))
+        path = tmp_path / "dataset.pkl"
+        with open(path, "wb") as f:
+            pickle.dump({"clips": {1: {"type": "audio", "embedding": [1.0, 0.0], "wav_bytes": wav}}}, f)
+        loaded: dict = {}
+        load_dataset_from_pickle(path, loaded)
+        assert loaded[1]["wav_bytes"] is None
+        assert loaded[1]["media_ref"] == MediaRef(loaded[1]["media_ref"].offset, len(wav), _md5(wav))
+        exported = pickle.loads(export_dataset_to_file(loaded))
+        assert exported["clips"][1]["wav_bytes"] == wav
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(clips_bp)
+    saved = dict(app_clips)
+    yield app.test_client()
+    app_clips.clear()
+    app_clips.update(saved)
+
+
+class TestServing:
+    @pytest.mark.parametrize(
+        ("clip_type", "field", "route"),
+        [("audio", "wav_bytes", "audio"), ("video", "video_bytes", "video"), ("image", "image_bytes", "media")],
+    )
+    def test_routes_stream_from_store(self, store, client, monkeypatch, clip_type, field, route):
+        monkeypatch.setattr("vtsearch.routes.clips._MEDIA_CHUNK_BYTES", 7)
+        data = bytes(range(50))
+        clip = {"id": 9, "type": clip_type, "filename": f"x.{clip_type}", "embedding": np.zeros(2), field: data}
+        app_clips.clear()
+        app_clips[9] = store_clip_media(clip)
+        response = client.get(f"/api/clips/9/{route}")
+        assert response.status_code == 200
+        assert response.content_length == 50
+        assert response.data == data
+        assert "clip_9" in response.headers["Content-Disposition"]
+
+    def test_export_bytes_are_bytes(self, store):
+        clip = store_clip_media({"id": 1, "type": "image", "image_bytes": b"img", "embedding": np.zeros(2)})
+        clip.update(duration=0, file_size=3, md5=_md5(b"img"))
+        exported = pickle.load(io.BytesIO(export_dataset_to_file({1: clip})))
+        assert type(exported["clips"][1]["image_bytes"]) is bytes
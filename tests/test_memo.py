@@ -0,0 +1,118 @@
+"""Tests for the state version and the versioned memo.
+
+Covers:
+- VersionedMemo hits, misses, version advancement and stale writes
+- get_state_version() moves on votes, clears, inclusion and clip changes
+- memoized() does not keep answers built from a stale background result
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from vtsearch.routes import background
+from vtsearch.utils import state
+from vtsearch.utils.memo import VersionedMemo
+
+
+class TestVersionedMemo:
+    def test_compute_once_per_version(self):
+        memo = VersionedMemo()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        assert memo.get_or_compute("a", 1, compute) == 1
+        assert memo.get_or_compute("a", 1, compute) == 1
+        assert len(calls) == 1
+        assert memo.get_or_compute("a", 2, compute) == 2
+        assert len(calls) == 2
+
+    def test_newer_version_drops_older_entries(self):
+        memo = VersionedMemo()
+        memo.put("a", 1, "x")
+        memo.put("b", 2, "y")
+        assert memo.get("a", 2) is None
+        assert memo.get("b", 2) == "y"
+
+    def test_stale_version_is_ignored(self):
+        memo = VersionedMemo()
+        memo.put("a", 5, "new")
+        memo.put("a", 4, "old")
+        assert memo.get("a", 5) == "new"
+        assert memo.get("a", 4, "missing") == "missing"
+
+    def test_exception_is_not_stored(self):
+        memo = VersionedMemo()
+
+        def boom():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            memo.get_or_compute("a", 1, boom)
+        assert memo.get_or_compute("a", 1, lambda: "ok") == "ok"
+
+    def test_clear(self):
+        memo = VersionedMemo()
+        memo.put("a", 3, "x")
+        memo.clear()
+        assert memo.get("a", 3) is None
+
+
+class TestStateVersion:
+    @pytest.fixture(autouse=True)
+    def _restore(self):
+        inclusion = state.get_inclusion()
+        yield
+        state.set_inclusion(inclusion)
+        state.good_votes.clear()
+        state.bad_votes.clear()
+        state.label_history.clear()
+        state.clips.pop(-1, None)
+
+    def test_label_bumps_version(self):
+        v = state.get_state_version()
+        state.add_label_to_history(1, "good")
+        assert state.get_state_version() > v
+
+    def test_clear_votes_bumps_version(self):
+        v = state.get_state_version()
+        state.clear_votes()
+        assert state.get_state_version() > v
+
+    def test_inclusion_change_bumps_version(self):
+        state.set_inclusion(0)
+        v = state.get_state_version()
+        state.set_inclusion(0)
+        assert state.get_state_version() == v
+        state.set_inclusion(3)
+        assert state.get_state_version() > v
+
+    def test_clip_change_bumps_version(self):
+        v = state.get_state_version()
+        state.clips[-1] = {"id": -1, "embedding": np.zeros(4, dtype=np.float32)}
+        assert state.get_state_version() > v
+
+
+class TestMemoized:
+    @pytest.fixture(autouse=True)
+    def _clear(self):
+        background.response_memo.clear()
+        yield
+        background.response_memo.clear()
+
+    def test_stale_values_are_not_kept(self):
+        answers = iter([{"stale": True}, {"stale": False}, {"stale": None}])
+
+        def compute():
+            return next(answers)
+
+        def keep(value):
+            return not value["stale"]
+
+        assert background.memoized("status", compute, keep) == {"stale": True}
+        assert background.memoized("status", compute, keep) == {"stale": False}
+        assert background.memoized("status", compute, keep) == {"stale": False}
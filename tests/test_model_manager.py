@@ -0,0 +1,146 @@
+"""Tests for the embedding model manager (vtsearch.media.ModelManager).
+
+Covers:
+- Models load on first use and report their parameter bytes
+- Loading past the memory budget unloads the least recently used idle model
+- Models in recent use are never unloaded to make room
+- Idle models are unloaded after the idle timeout and reload on demand
+- The report lists every media type, loaded or not
+"""
+
+from __future__ import annotations
+
+import torch
+
+from vtsearch.media import ModelManager
+from vtsearch.media.base import MediaType
+
+
+class _FakeMediaType(MediaType):
+    """A media type whose 'model' is a float32 tensor of *params* values."""
+
+    def __init__(self, type_id: str, params: int):
+        self._type_id = type_id
+        self._params = params
+        self._model = None
+        self.loads = 0
+
+    type_id = property(lambda self: self._type_id)
+    name = property(lambda self: self._type_id)
+    icon = property(lambda self: "")
+    file_extensions = property(lambda self: [])
+    loops = property(lambda self: False)
+    demo_datasets = property(lambda self: [])
+    embedding_model_id = property(lambda self: f"fake/{self._type_id}")
+
+    def load_models(self):
+        if self._model is None:
+            self.loads += 1
+            self._model = torch.nn.Linear(self._params, 1, bias=False)
+
+    def embed_media(self, file_path):
+        return None
+
+    def embed_text(self, text):
+        self.ensure_models()
+
+    def load_clip_data(self, file_path):
+        return {}
+
+    def clip_response(self, clip):
+        return None
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _manager(clock, **kwargs):
+    kwargs.setdefault("idle_unload_seconds", None)
+    kwargs.setdefault("min_idle_seconds", 10)
+    return ModelManager(clock=clock, **kwargs)
+
+
+def _register(manager, *types):
+    for mt in types:
+        mt._model_manager = manager
+    return types
+
+
+class TestModelManager:
+    def test_loads_on_first_use(self):
+        manager = _manager(_Clock())
+        (mt,) = _register(manager, _FakeMediaType("audio", 100))
+        mt.embed_text("x")
+        mt.embed_text("y")
+        assert mt.loads == 1
+        assert manager.resident_bytes() == 400
+
+    def test_budget_unloads_least_recently_used(self):
+        clock = _Clock()
+        manager = _manager(clock, budget_bytes=1000)
+        a, b, c = _register(manager, _FakeMediaType("a", 100), _FakeMediaType("b", 100), _FakeMediaType("c", 100))
+        a.embed_text("x")
+        clock.now += 20
+        b.embed_text("x")
+        clock.now += 20
+        c.embed_text("x")  # 1200 bytes > 1000: a is the oldest
+        assert (a.models_loaded, b.models_loaded, c.models_loaded) == (False, True, True)
+        assert manager.resident_bytes() == 800
+
+    def test_recently_used_models_are_kept(self):
+        clock = _Clock()
+        manager = _manager(clock, budget_bytes=500)
+        a, b = _register(manager, _FakeMediaType("a", 100), _FakeMediaType("b", 100))
+        a.embed_text("x")
+        clock.now += 5  # a is still busy
+        b.embed_text("x")
+        assert a.models_loaded and b.models_loaded
+
+    def test_reload_makes_room_first(self):
+        clock = _Clock()
+        manager = _manager(clock, budget_bytes=500)
+        a, b = _register(manager, _FakeMediaType("a", 100), _FakeMediaType("b", 100))
+        a.embed_text("x")
+        clock.now += 20
+        b.embed_text("x")
+        clock.now += 20
+        a.embed_text("x")  # a's size is known, so b goes before a loads
+        assert a.loads == 2 and not b.models_loaded
+
+    def test_idle_models_are_unloaded_and_reloaded(self):
+        clock = _Clock()
+        manager = _manager(clock, idle_unload_seconds=60)
+        a, b = _register(manager, _FakeMediaType("a", 100), _FakeMediaType("b", 100))
+        a.embed_text("x")
+        clock.now += 50
+        b.embed_text("x")
+        clock.now += 20
+        assert manager.unload_idle() == ["a"]
+        a.embed_text("x")
+        assert a.loads == 2
+        assert manager.report()["models"][0]["unloads"] == 1
+
+    def test_report_covers_unused_types(self):
+        clock = _Clock()
+        manager = _manager(clock)
+        a, b = _register(manager, _FakeMediaType("a", 100), _FakeMediaType("b", 100))
+        a.embed_text("x")
+        clock.now += 3
+        report = manager.report([a, b])
+        assert report["resident_bytes"] == 400
+        assert report["models"][0] == {
+            "media_type": "a",
+            "model_id": "fake/a",
+            "loaded": True,
+            "bytes": 400,
+            "idle_seconds": 3,
+            "loads": 1,
+            "unloads": 0,
+        }
+        assert report["models"][1]["loaded"] is False
+        assert report["models"][1]["idle_seconds"] is None
@@ -0,0 +1,103 @@
+"""Tests for the optional ONNX Runtime encoder backend (vtsearch.media.onnx_backend).
+
+Covers:
+- Cosine agreement between two embedding batches
+- The torch backend never touches ONNX
+- A missing onnxruntime falls back to torch
+- Sessions are only used when their first batch matches torch
+"""
+
+from __future__ import annotations
+
+import sys
+import types
+
+import numpy as np
+import pytest
+import torch
+
+from vtsearch.media import onnx_backend
+from vtsearch.media.onnx_backend import BATCH, OnnxEncoder, cosine_agreement, embed_with_backend
+
+
+def _encode(model, **inputs):
+    return model(inputs["x"])
+
+
+def _fake_onnxruntime(output):
+    """A stand-in onnxruntime whose sessions return *output* for every batch."""
+    module = types.ModuleType("onnxruntime")
+    module.SessionOptions = lambda: types.SimpleNamespace()
+    module.GraphOptimizationLevel = types.SimpleNamespace(ORT_ENABLE_ALL=99)
+
+    class InferenceSession:
+        def __init__(self, path, options, providers):
+            self.calls = 0
+
+        def run(self, output_names, feed):
+            self.calls += 1
+            return [output]
+
+    module.InferenceSession = InferenceSession
+    return module
+
+
+@pytest.fixture
+def encoder(tmp_path, monkeypatch):
+    monkeypatch.setattr(onnx_backend, "EMBEDDING_BACKEND", "onnx")
+    monkeypatch.setattr(onnx_backend, "ONNX_MODELS_DIR", tmp_path)
+    enc = OnnxEncoder("org/model", "text", lambda: torch.nn.Identity(), ["x"], {"x": BATCH})
+    enc.path.touch()  # already exported
+    return enc
+
+
+INPUTS = {"x": torch.tensor([[1.0, 0.0], [0.0, 1.0]])}
+EXPECTED = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+
+
+class TestCosineAgreement:
+    def test_identical_batches(self):
+        result = cosine_agreement(EXPECTED, EXPECTED * 3)
+        assert result == pytest.approx({"min_cosine": 1.0, "mean_cosine": 1.0})
+
+    def test_reports_worst_row(self):
+        result = cosine_agreement(EXPECTED, np.array([[1.0, 0.0], [1.0, 1.0]]))
+        assert result["min_cosine"] == pytest.approx(np.sqrt(0.5))
+        assert result["mean_cosine"] == pytest.approx((1 + np.sqrt(0.5)) / 2)
+
+
+class TestFallback:
+    def test_torch_backend_skips_onnx(self, monkeypatch):
+        monkeypatch.setattr(onnx_backend, "EMBEDDING_BACKEND", "torch")
+        enc = OnnxEncoder("org/model", "text", lambda: torch.nn.Identity(), ["x"], {"x": BATCH})
+        assert enc.run(INPUTS, lambda: pytest.fail("reference should not run")) is None
+        assert enc.status == "not used"
+
+    def test_embed_with_torch_backend(self, monkeypatch):
+        monkeypatch.setattr(onnx_backend, "EMBEDDING_BACKEND", "torch")
+        out = embed_with_backend("org/model", "text", torch.nn.Identity(), _encode, INPUTS, {"x": BATCH})
+        np.testing.assert_array_equal(out, EXPECTED)
+
+    def test_missing_onnxruntime_uses_torch(self, encoder, monkeypatch):
+        monkeypatch.setitem(sys.modules, "onnxruntime", None)
+        np.testing.assert_array_equal(encoder.run(INPUTS, lambda: EXPECTED), EXPECTED)
+        assert encoder.status == "failed"
+        assert encoder.run(INPUTS, lambda: EXPECTED) is None
+
+
+class TestParity:
+    def test_matching_session_is_used(self, encoder, monkeypatch):
+        onnx_out = EXPECTED * 0.999
+        monkeypatch.setitem(sys.modules, "onnxruntime", _fake_onnxruntime(onnx_out))
+        np.testing.assert_array_equal(encoder.run(INPUTS, lambda: EXPECTED), onnx_out)
+        assert encoder.status == "onnx"
+        assert encoder.parity["min_cosine"] == pytest.approx(1.0)
+        # Later batches skip the torch reference
+        np.testing.assert_array_equal(encoder.run(INPUTS, lambda: pytest.fail("reference ran")), onnx_out)
+
+    def test_disagreeing_session_is_dropped(self, encoder, monkeypatch):
+        monkeypatch.setitem(sys.modules, "onnxruntime", _fake_onnxruntime(EXPECTED[::-1].copy()))
+        np.testing.assert_array_equal(encoder.run(INPUTS, lambda: EXPECTED), EXPECTED)
+        assert encoder.status == "torch"
+        assert encoder.run(INPUTS, lambda: EXPECTED) is None
+        assert encoder.report()["parity"]["min_cosine"] == pytest.approx(0.0)
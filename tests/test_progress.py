@@ -0,0 +1,166 @@
+"""Tests for the labelling-progress cache (vtsearch.models.progress).
+
+Covers:
+- Batched error-cost evaluation matches scoring each step model on its own
+- The stacked parameters pick up steps cached after the first evaluation
+- start/end restrict the evaluated steps
+- Prediction stability (flip counts) over the clip matrix rows, exact and sampled
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import torch
+
+from vtsearch.models import progress
+from vtsearch.models.training import _new_mlp
+
+
+def _reference(clips, good, bad, inclusion, steps):
+    """Per-model error cost, computed the straightforward way."""
+    fpr_w, fnr_w = (1.0, 2.0**inclusion) if inclusion >= 0 else (2.0**-inclusion, 1.0)
+    ids = list(good) + list(bad)
+    labels = [1] * len(good) + [0] * len(bad)
+    X = torch.tensor(np.stack([clips[i]["embedding"] for i in ids]))
+    out = []
+    for t, step in enumerate(steps):
+        if step["model"] is None:
+            continue
+        with torch.no_grad():
+            scores = step["model"](X).squeeze(1).tolist()
+        fp = sum(1 for s, y in zip(scores, labels) if s >= step["threshold"] and y == 0)
+        fn = sum(1 for s, y in zip(scores, labels) if s < step["threshold"] and y == 1)
+        fpr, fnr = fp / labels.count(0), fn / labels.count(1)
+        out.append((t, round(fpr_w * fpr + fnr_w * fnr, 4), round(fpr, 4), round(fnr, 4)))
+    return out
+
+
+def _step(rng, dim, with_model=True):
+    model = _new_mlp(dim).eval() if with_model else None
+    return {
+        "model": model,
+        "threshold": float(rng.uniform(0.3, 0.7)) if with_model else None,
+        "good_ids": [1],
+        "bad_ids": [2],
+    }
+
+
+@pytest.fixture
+def setup():
+    torch.manual_seed(0)
+    rng = np.random.RandomState(0)
+    dim = 16
+    clips = {i: {"id": i, "embedding": rng.randn(dim).astype(np.float32)} for i in range(60)}
+    good = {i: None for i in range(0, 40, 2)}
+    bad = {i: None for i in range(1, 40, 2)}
+    progress.clear_progress_cache()
+    yield rng, dim, clips, good, bad
+    progress.clear_progress_cache()
+
+
+def _as_tuples(entries):
+    return [(e["time_index"], e["error_cost"], e["fpr"], e["fnr"]) for e in entries]
+
+
+class TestEvalCachedModels:
+    @pytest.mark.parametrize("inclusion", [-3, 0, 2])
+    def test_matches_per_model_scoring(self, setup, inclusion):
+        rng, dim, clips, good, bad = setup
+        progress._cached_steps.extend(_step(rng, dim, t % 4 != 0) for t in range(25))
+        got = progress._eval_cached_models(clips, good, bad, inclusion)
+        assert _as_tuples(got) == _reference(clips, good, bad, inclusion, progress._cached_steps)
+
+    def test_picks_up_new_steps(self, setup):
+        rng, dim, clips, good, bad = setup
+        progress._cached_steps.extend(_step(rng, dim) for _ in range(5))
+        assert len(progress._eval_cached_models(clips, good, bad, 0)) == 5
+        progress._cached_steps.extend(_step(rng, dim) for _ in range(3))
+        got = progress._eval_cached_models(clips, good, bad, 0)
+        assert _as_tuples(got) == _reference(clips, good, bad, 0, progress._cached_steps)
+
+    def test_start_end_window(self, setup):
+        rng, dim, clips, good, bad = setup
+        progress._cached_steps.extend(_step(rng, dim, t != 4) for t in range(10))
+        got = progress._eval_cached_models(clips, good, bad, 0, 3, 7)
+        assert [e["time_index"] for e in got] == [3, 5, 6]
+
+    def test_chunked_scoring(self, setup, monkeypatch):
+        rng, dim, clips, good, bad = setup
+        monkeypatch.setattr(progress, "_STACK_EVAL_MAX_ELEMENTS", 1)
+        progress._cached_steps.extend(_step(rng, dim) for _ in range(7))
+        got = progress._eval_cached_models(clips, good, bad, 1)
+        assert _as_tuples(got) == _reference(clips, good, bad, 1, progress._cached_steps)
+
+    def test_no_models(self, setup):
+        rng, dim, clips, good, bad = setup
+        progress._cached_steps.extend(_step(rng, dim, False) for _ in range(3))
+        assert progress._eval_cached_models(clips, good, bad, 0) == []
+
+
+def _history(rng, n=40, max_clip=25):
+    labels = ["good", "bad", "good", "bad", "unlabel"]
+    return [(int(rng.randint(1, max_clip)), labels[rng.randint(len(labels))], float(t)) for t in range(n)]
+
+
+def _reference_stability(clips, history, steps):
+    """Flip counts recomputed from the cached models with per-clip dicts."""
+    good: set[int] = set()
+    bad: set[int] = set()
+    prev = None
+    out = []
+    for (cid, label, _), step in zip(history, steps):
+        good.discard(cid)
+        bad.discard(cid)
+        if label == "good":
+            good.add(cid)
+        elif label == "bad":
+            bad.add(cid)
+        if step["model"] is None:
+            continue
+        unlabeled = [c for c in clips if c not in good | bad]
+        if not unlabeled:
+            out.append(0)
+            continue
+        X = torch.tensor(np.stack([clips[c]["embedding"] for c in unlabeled]))
+        with torch.no_grad():
+            scores = step["model"](X).squeeze(1).tolist()
+        pred = {c: s >= step["threshold"] for c, s in zip(unlabeled, scores)}
+        out.append(0 if prev is None else sum(pred[c] != prev[c] for c in pred.keys() & prev.keys()))
+        prev = pred
+    return out
+
+
+class TestPredictionStability:
+    def test_flips_match_reference(self, setup):
+        rng, _, clips, _, _ = setup
+        history = _history(rng)
+        progress._ensure_cache(clips, history, 0)
+        got = [s["num_flips"] for s in (st["stability"] for st in progress._cached_steps) if s is not None]
+        assert got == _reference_stability(clips, history, progress._cached_steps)
+
+    def test_incremental_matches_backfill(self, setup):
+        rng, _, clips, _, _ = setup
+        history = _history(rng, n=25)
+        for n in range(1, len(history) + 1):
+            progress._ensure_cache(clips, history[:n], 0)
+        got = [s["num_flips"] for s in (st["stability"] for st in progress._cached_steps) if s is not None]
+        assert got == _reference_stability(clips, history, progress._cached_steps)
+
+    def test_num_unlabeled(self, setup):
+        _, _, clips, _, _ = setup
+        history = [(1, "good", 0.0), (2, "bad", 1.0), (3, "good", 2.0), (3, "unlabel", 3.0)]
+        progress._ensure_cache(clips, history, 0)
+        counts = [st["stability"]["num_unlabeled"] for st in progress._cached_steps if st["stability"]]
+        assert counts == [len(clips) - 2, len(clips) - 3, len(clips) - 2]
+
+    def test_sampled_mode(self, setup, monkeypatch):
+        rng, _, clips, _, _ = setup
+        monkeypatch.setattr(progress, "STABILITY_SAMPLE_SIZE", 20)
+        history = _history(rng, n=15)
+        progress._ensure_cache(clips, history, 0)
+        entries = [st["stability"] for st in progress._cached_steps if st["stability"]]
+        assert entries
+        for entry in entries:
+            assert entry["sample_size"] == 20
+            assert 0 <= entry["num_flips"] <= entry["num_unlabeled"]
@@ -0,0 +1,121 @@
+"""Tests for the text-query embedding cache (vtsearch.models.query_cache).
+
+Covers:
+- LRU order, eviction and hit/miss counters
+- Keys ignore whitespace differences but not case, media type or model
+- Only distinct uncached queries reach the text encoder, in batches
+- Failed embeddings are not cached
+- Queries survive a fresh in-memory cache when persistence is on
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from vtsearch.models import embedding_cache, query_cache
+from vtsearch.models.embedding_cache import EmbeddingCache
+from vtsearch.models.query_cache import QueryCache, embed_queries_cached, normalize_query, query_key
+
+
+class _FakeMediaType:
+    type_id = "audio"
+    embedding_model_id = "fake-model"
+    embed_batch_size = 2
+
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    def embed_text_batch(self, texts):
+        self.batches.append(list(texts))
+        return [None if text == "fail" else np.array([len(text), 1.0], dtype=np.float32) for text in texts]
+
+
+@pytest.fixture
+def cache():
+    c = QueryCache(max_entries=3)
+    query_cache.set_query_cache(c)
+    yield c
+    query_cache.set_query_cache(None)
+
+
+class TestQueryCache:
+    def test_lru_eviction(self):
+        c = QueryCache(max_entries=2)
+        for name in ("a", "b"):
+            c.put(("audio", "m", name), np.zeros(2))
+        assert c.get(("audio", "m", "a")) is not None  # a is now most recent
+        c.put(("audio", "m", "c"), np.zeros(2))
+        assert c.get(("audio", "m", "b")) is None
+        assert len(c) == 2
+
+    def test_stats_count_hits_and_misses(self):
+        c = QueryCache(max_entries=2)
+        c.put(("audio", "m", "a"), np.zeros(2))
+        c.get(("audio", "m", "a"))
+        c.get(("audio", "m", "x"))
+        stats = c.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+    def test_returns_copies(self):
+        c = QueryCache()
+        c.put(("audio", "m", "a"), np.zeros(2))
+        c.get(("audio", "m", "a"))[0] = 5
+        assert c.get(("audio", "m", "a"))[0] == 0
+
+
+class TestQueryKey:
+    def test_whitespace_is_collapsed(self):
+        assert normalize_query("  dog \t barking\n") == "dog barking"
+
+    def test_case_media_type_and_model_matter(self):
+        mt = _FakeMediaType()
+        other = _FakeMediaType()
+        other.embedding_model_id = "other-model"
+        keys = {query_key(mt, "Dog"), query_key(mt, "dog"), query_key(other, "dog")}
+        assert len(keys) == 3
+
+
+class TestEmbedQueriesCached:
+    def test_repeats_skip_the_encoder(self, cache):
+        mt = _FakeMediaType()
+        first = embed_queries_cached(mt, ["dog", "cat", "dog "])
+        again = embed_queries_cached(mt, ["cat", "dog"])
+        assert mt.batches == [["dog", "cat"]]
+        np.testing.assert_array_equal(first[0], first[2])
+        np.testing.assert_array_equal(again[1], first[0])
+        assert cache.stats()["hits"] == 2
+
+    def test_misses_are_batched(self, cache):
+        mt = _FakeMediaType()
+        embed_queries_cached(mt, ["a", "bb", "ccc"])
+        assert mt.batches == [["a", "bb"], ["ccc"]]
+
+    def test_failures_are_not_cached(self, cache):
+        mt = _FakeMediaType()
+        assert embed_queries_cached(mt, ["fail"]) == [None]
+        embed_queries_cached(mt, ["fail"])
+        assert mt.batches == [["fail"], ["fail"]]
+
+    def test_persisted_queries_survive_a_new_cache(self, cache, tmp_path, monkeypatch):
+        store = EmbeddingCache(tmp_path / "cache.sqlite3")
+        embedding_cache.set_embedding_cache(store)
+        monkeypatch.setattr(query_cache, "QUERY_CACHE_PERSIST", True)
+        try:
+            embed_queries_cached(_FakeMediaType(), ["dog"])
+            query_cache.set_query_cache(QueryCache())
+            mt = _FakeMediaType()
+            (vector,) = embed_queries_cached(mt, ["dog"])
+            assert mt.batches == []
+            np.testing.assert_array_equal(vector, [3.0, 1.0])
+        finally:
+            embedding_cache.set_embedding_cache(None)
+            store.close()
+
+    def test_disabled_cache_still_embeds(self, monkeypatch):
+        query_cache.set_query_cache(None)
+        monkeypatch.setattr(query_cache, "QUERY_CACHE_SIZE", 0)
+        mt = _FakeMediaType()
+        embed_queries_cached(mt, ["dog"])
+        embed_queries_cached(mt, ["dog"])
+        assert mt.batches == [["dog"], ["dog"]]
@@ -0,0 +1,165 @@
+"""Tests for the vectorised cosine-similarity engine (vtsearch.models.similarity)."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from vtsearch.models.similarity import (
+    clear_similarity_cache,
+    cosine_similarities,
+    normalized_embeddings,
+    best_segments,
+    rank_by_similarity,
+    similarity_cache_stats,
+    similarity_sort,
+)
+from vtsearch.utils.clip_store import ClipStore
+
+
+def _reference_sort(clips: dict, query: np.ndarray) -> list[dict]:
+    """The original per-clip loop used by /api/sort."""
+    results = []
+    for clip_id, clip in clips.items():
+        vec = clip["embedding"]
+        norm_product = np.linalg.norm(vec) * np.linalg.norm(query)
+        similarity = 0.0 if norm_product == 0 else float(np.dot(vec, query) / norm_product)
+        results.append({"id": clip_id, "similarity": round(similarity, 4)})
+    results.sort(key=lambda x: x["similarity"], reverse=True)
+    return results
+
+
+@pytest.fixture(params=[dict, ClipStore])
+def clips(request):
+    rng = np.random.RandomState(0)
+    data = {cid: {"id": cid, "embedding": rng.randn(16).astype(np.float32)} for cid in range(1, 301)}
+    # Duplicates produce exact ties; a zero vector must score 0.
+    data[301] = {"id": 301, "embedding": data[7]["embedding"].copy()}
+    data[302] = {"id": 302, "embedding": np.zeros(16, dtype=np.float32)}
+    clear_similarity_cache()
+    return request.param(data)
+
+
+class TestCosineSimilarities:
+    def test_matches_reference_loop(self, clips):
+        query = np.random.RandomState(1).randn(16).astype(np.float32)
+        results, _ = similarity_sort(clips, query)
+        expected = _reference_sort(clips, query)
+        assert [r["id"] for r in results] == [r["id"] for r in expected]
+        np.testing.assert_allclose([r["similarity"] for r in results], [r["similarity"] for r in expected], atol=1e-4)
+
+    def test_zero_vectors_score_zero(self, clips):
+        ids, sims = cosine_similarities(clips, np.ones(16))
+        assert sims[list(ids).index(302)] == 0.0
+        _, sims = cosine_similarities(clips, np.zeros(16))
+        assert not sims.any()
+
+    def test_empty(self):
+        ids, sims = cosine_similarities({}, np.ones(4))
+        assert len(ids) == 0 and len(sims) == 0
+
+    def test_cache_follows_store_version(self):
+        store = ClipStore({1: {"id": 1, "embedding": np.array([1.0, 0.0])}})
+        _, first = normalized_embeddings(store)
+        assert normalized_embeddings(store)[1] is first
+        store[2] = {"id": 2, "embedding": np.array([0.0, 2.0])}
+        ids, Xn = normalized_embeddings(store)
+        assert list(ids) == [1, 2]
+        np.testing.assert_allclose(Xn, [[1.0, 0.0], [0.0, 1.0]])
+
+
+class TestRankBySimilarity:
+    def test_full_order_is_stable(self):
+        sims = np.array([0.5, 0.9, 0.5, 0.1, 0.9])
+        assert list(rank_by_similarity(sims)) == [1, 4, 0, 2, 3]
+
+    @pytest.mark.parametrize("k", [1, 2, 3, 4, 5, 10])
+    def test_top_k_is_prefix_of_full_order(self, k):
+        sims = np.array([0.5, 0.9, 0.5, 0.1, 0.9])
+        assert list(rank_by_similarity(sims, k)) == list(rank_by_similarity(sims))[:k]
+
+    def test_top_k_random(self):
+        sims = np.round(np.random.RandomState(2).rand(1000), 2)
+        full = rank_by_similarity(sims)
+        for k in (1, 17, 500, 999):
+            assert list(rank_by_similarity(sims, k)) == list(full[:k])
+
+    def test_top_k_zero(self):
+        assert len(rank_by_similarity(np.array([0.1, 0.2]), 0)) == 0
+
+
+class TestSegmentSearch:
+    @pytest.fixture(params=[dict, ClipStore])
+    def segmented(self, request):
+        clear_similarity_cache()
+        data = {
+            1: {"id": 1, "embedding": np.array([1.0, 0.0, 0.0], dtype=np.float32)},
+            2: {
+                "id": 2,
+                # Pooled embedding points away from the query; one segment matches it
+                "embedding": np.array([0.0, 1.0, 0.0], dtype=np.float32),
+                "segment_offsets": np.array([0.0, 5.0, 10.0], dtype=np.float32),
+                "segment_embeddings": np.array([[0, 1, 0], [0, 0, 1], [0, 1, 1]], dtype=np.float32),
+            },
+        }
+        return request.param(data)
+
+    def test_best_segment_and_offset(self, segmented):
+        ids = np.array(list(segmented), dtype=np.int64)
+        rows, sims, offsets = best_segments(segmented, ids, np.array([0.0, 0.0, 1.0]))
+        assert rows.tolist() == [1]
+        assert sims[0] == pytest.approx(1.0)
+        assert offsets.tolist() == [5.0]
+
+    def test_sort_ranks_by_best_segment(self, segmented):
+        results, sims = similarity_sort(segmented, np.array([0.1, 0.0, 1.0]))
+        assert [r["id"] for r in results] == [2, 1]
+        assert results[0]["offset"] == 5.0
+        assert "offset" not in results[1]
+        assert sims[1] == pytest.approx(results[0]["similarity"], abs=1e-4)
+
+    def test_pooled_embedding_still_counts(self, segmented):
+        results, _ = similarity_sort(segmented, np.array([0.0, 1.0, 0.0]))
+        assert results[0] == {"id": 2, "similarity": 1.0, "offset": 0.0}
+
+
+class TestRankingCache:
+    @pytest.fixture
+    def store(self):
+        clear_similarity_cache()
+        rng = np.random.RandomState(1)
+        return ClipStore({cid: {"id": cid, "embedding": rng.randn(8).astype(np.float32)} for cid in range(1, 51)})
+
+    def test_repeated_query_hits(self, store):
+        query = np.ones(8, dtype=np.float32)
+        first, sims = similarity_sort(store, query, 5)
+        again, sims_again = similarity_sort(store, query.copy(), 5)
+        assert again == first
+        assert sims_again is sims
+        assert not sims.flags.writeable
+        assert similarity_cache_stats()["hits"] == 1
+
+    def test_top_k_and_version_are_part_of_the_key(self, store):
+        query = np.ones(8, dtype=np.float32)
+        similarity_sort(store, query, 5)
+        assert len(similarity_sort(store, query, 10)[0]) == 10
+        store[51] = {"id": 51, "embedding": np.ones(8, dtype=np.float32)}
+        results, _ = similarity_sort(store, query, 5)
+        assert results[0]["id"] == 51
+        assert similarity_cache_stats()["hits"] == 0
+
+    def test_callers_cannot_change_cached_results(self, store):
+        query = np.ones(8, dtype=np.float32)
+        results, _ = similarity_sort(store, query, 5)
+        results[0]["similarity"] = -1.0
+        results.clear()
+        again, _ = similarity_sort(store, query, 5)
+        assert len(again) == 5
+        assert again[0]["similarity"] != -1.0
+
+    def test_plain_dicts_are_not_cached(self):
+        clear_similarity_cache()
+        clips = {1: {"id": 1, "embedding": np.ones(4, dtype=np.float32)}}
+        similarity_sort(clips, np.ones(4))
+        similarity_sort(clips, np.ones(4))
+        assert similarity_cache_stats()["entries"] == 0
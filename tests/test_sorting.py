@@ -50,6 +50,16 @@ class TestSortClips:
         resp = client.post("/api/sort", json={"text": "   "})
         assert resp.status_code == 400
 
+    def test_top_k_returns_prefix_of_full_order(self, client):
+        full = client.post("/api/sort", json={"text": "a beeping sound"}).get_json()
+        top = client.post("/api/sort", json={"text": "a beeping sound", "top_k": 5}).get_json()
+        assert top["results"] == full["results"][:5]
+        assert top["threshold"] == full["threshold"]
+
+    def test_invalid_top_k_returns_400(self, client):
+        resp = client.post("/api/sort", json={"text": "beep", "top_k": 0})
+        assert resp.status_code == 400
+
 
 class TestTrainAndScore:
     def test_returns_list_of_scored_clips(self):
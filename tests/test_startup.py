@@ -0,0 +1,62 @@
+"""Import-time budget for starting the app.
+
+Covers:
+- ``import app`` leaves the model libraries (transformers,
+  sentence-transformers, scikit-learn, librosa) unimported
+- ``import app`` finishes within STARTUP_IMPORT_BUDGET_SECONDS
+
+Each check runs in a fresh interpreter so earlier imports in the test
+session cannot hide a regression.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Generous next to the ~2 s this takes on a laptop (mostly torch); the model
+# libraries alone used to add 5-10 s more.
+STARTUP_IMPORT_BUDGET_SECONDS = 6.0
+
+LAZY_MODULES = ("transformers", "sentence_transformers", "sklearn", "librosa")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in sys.argv[1:] if m in sys.modules]}))
+"""
+
+
+def _import_app() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, *LAZY_MODULES],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        timeout=300,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def startup() -> dict:
+    # Best of two, so a cold disk cache on the first run does not count
+    runs = [_import_app() for _ in range(2)]
+    return min(runs, key=lambda run: run["seconds"])
+
+
+class TestStartupImports:
+    def test_model_libraries_load_lazily(self, startup):
+        assert startup["loaded"] == []
+
+    def test_import_within_budget(self, startup):
+        assert startup["seconds"] < STARTUP_IMPORT_BUDGET_SECONDS, (
+            f"import app took {startup['seconds']:.1f}s (budget {STARTUP_IMPORT_BUDGET_SECONDS}s)"
+        )
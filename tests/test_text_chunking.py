@@ -0,0 +1,112 @@
+"""Tests for chunked, length-sorted passage embedding (TextMediaType).
+
+Covers:
+- Passages that fit the model window are embedded whole, as before
+- Long passages are split into overlapping chunks and pooled
+- Chunks from every passage are embedded in batches sorted by token count
+- Chunk embeddings reach the clip only when there is more than one chunk
+"""
+
+from __future__ import annotations
+
+import re
+
+import numpy as np
+import pytest
+
+from vtsearch.media.text import media_type as text_media_type
+from vtsearch.media.text.media_type import TextMediaType
+
+
+class _WhitespaceTokenizer:
+    """One token per word, with character offsets like a fast tokenizer."""
+
+    def __call__(self, texts, add_special_tokens=True, return_offsets_mapping=False, verbose=True):
+        single = isinstance(texts, str)
+        spans = [[m.span() for m in re.finditer(r"\S+", text)] for text in ([texts] if single else texts)]
+        out = {"input_ids": [list(range(len(s))) for s in spans], "offset_mapping": spans}
+        return {k: v[0] for k, v in out.items()} if single else out
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 2
+
+
+class _FakeE5:
+    """Embeds a passage as the unit vector along (word count, 1)."""
+
+    max_seq_length = 20
+
+    def __init__(self):
+        self.tokenizer = _WhitespaceTokenizer()
+        self.batches: list[list[int]] = []
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False):
+        words = [len(text.split()) - 1 for text in texts]  # minus the "passage:" prefix
+        self.batches.append(words)
+        vecs = np.array([[n, 1.0] for n in words], dtype=np.float32)
+        return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def mt(monkeypatch):
+    monkeypatch.setattr(text_media_type, "_CHUNK_MARGIN", 0)
+    monkeypatch.setattr(text_media_type, "TEXT_CHUNK_OVERLAP_TOKENS", 4)
+    mt = TextMediaType()
+    mt._model = _FakeE5()
+    mt.embed_batch_size = 2
+    return mt
+
+
+def _words(n, start=0):
+    return " ".join(f"w{i}" for i in range(start, start + n))
+
+
+class TestEmbedPassageChunks:
+    def test_short_passage_is_one_chunk(self, mt):
+        (segments,) = mt.embed_passage_chunks([_words(5)])
+        assert segments.offsets.tolist() == [0.0]
+        np.testing.assert_allclose(segments.pooled, np.array([5, 1]) / np.hypot(5, 1), rtol=1e-6)
+
+    def test_long_passage_is_chunked_with_overlap(self, mt):
+        # 20 tokens minus 1 prefix and 2 special = 17 per chunk, hop 13
+        text = _words(40)
+        (segments,) = mt.embed_passage_chunks([text])
+        starts = [text.index(f"w{i} ") for i in (0, 13, 26)]
+        assert segments.offsets.tolist() == starts
+        assert mt._model.batches == [[14, 17], [17]]
+        assert np.linalg.norm(segments.pooled) == pytest.approx(1.0)
+
+    def test_batches_are_sorted_by_length(self, mt):
+        mt.embed_passage_chunks([_words(9), _words(2), _words(12), _words(3)])
+        assert mt._model.batches == [[2, 3], [9, 12]]
+
+    def test_pooled_matches_embed_text_passages(self, mt):
+        texts = [_words(3), _words(40)]
+        pooled = mt.embed_text_passages(texts)
+        for vec, segments in zip(pooled, mt.embed_passage_chunks(texts)):
+            np.testing.assert_array_equal(vec, segments.pooled)
+
+    def test_progress_counts_chunks(self, mt):
+        seen = []
+        mt.embed_passage_chunks([_words(40), _words(2)], on_batch=lambda done, total: seen.append((done, total)))
+        assert seen == [(2, 4), (4, 4)]
+
+
+class TestClipData:
+    def test_single_chunk_adds_no_segments(self, mt):
+        (segments,) = mt.embed_passage_chunks([_words(5)])
+        data = mt.clip_data_from(None, _words(5).encode(), {"duration": 0.0, "segments": segments})
+        assert "segment_embeddings" not in data
+        assert data["word_count"] == 5
+
+    def test_chunks_are_kept_on_the_clip(self, mt):
+        text = _words(40)
+        (segments,) = mt.embed_passage_chunks([text])
+        data = mt.clip_data_from(None, text.encode(), {"duration": 0.0, "segments": segments})
+        assert data["segment_offsets"].tolist() == segments.offsets.tolist()
+        assert data["segment_embeddings"].shape == (3, 2)
+
+    def test_crlf_reads_like_text_mode(self, mt, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_bytes(b"one\r\ntwo\r\n")
+        assert mt.load_clip_data(path)["text_content"] == "one\ntwo"
@@ -0,0 +1,88 @@
+"""Tests for threshold search (vtsearch.models.training.find_optimal_threshold[s])."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from vtsearch.models.training import find_optimal_threshold, find_optimal_thresholds
+
+
+def _brute_force(scores: list[float], labels: list[float], inclusion_value: int = 0) -> float:
+    """Quadratic reference: try every score and keep the first (highest) best one."""
+    if inclusion_value >= 0:
+        fpr_weight, fnr_weight = 1.0, 2.0**inclusion_value
+    else:
+        fpr_weight, fnr_weight = 2.0 ** (-inclusion_value), 1.0
+    total_pos = sum(1 for lbl in labels if lbl == 1)
+    total_neg = len(labels) - total_pos
+    best_threshold, best_cost = 0.5, float("inf")
+    for threshold in sorted(scores, reverse=True):
+        fp = sum(1 for s, lbl in zip(scores, labels) if s >= threshold and lbl == 0)
+        fn = sum(1 for s, lbl in zip(scores, labels) if s < threshold and lbl == 1)
+        fpr = fp / total_neg if total_neg > 0 else 0
+        fnr = fn / total_pos if total_pos > 0 else 0
+        cost = fpr_weight * fpr + fnr_weight * fnr
+        if cost < best_cost:
+            best_threshold, best_cost = threshold, cost
+    return best_threshold
+
+
+class TestFindOptimalThreshold:
+    def test_empty_returns_default(self):
+        assert find_optimal_threshold([], []) == 0.5
+
+    def test_perfect_separation(self):
+        assert find_optimal_threshold([0.9, 0.8, 0.2, 0.1], [1.0, 1.0, 0.0, 0.0]) == 0.8
+
+    def test_returns_python_float(self):
+        assert isinstance(find_optimal_threshold(np.array([0.3, 0.7]), np.array([0.0, 1.0])), float)
+
+    @pytest.mark.parametrize("inclusion", [-10, -3, -1, 0, 1, 3, 10])
+    def test_matches_brute_force(self, inclusion):
+        rng = np.random.RandomState(inclusion + 10)
+        for _ in range(50):
+            n = rng.randint(1, 40)
+            # Coarse rounding produces plenty of tied scores
+            scores = np.round(rng.rand(n), rng.choice([1, 2, 6])).tolist()
+            labels = (rng.rand(n) < rng.rand()).astype(float).tolist()
+            assert find_optimal_threshold(scores, labels, inclusion) == _brute_force(scores, labels, inclusion)
+
+    def test_single_class(self):
+        assert find_optimal_threshold([0.4, 0.6], [1.0, 1.0]) == 0.4
+        assert find_optimal_threshold([0.4, 0.6], [0.0, 0.0]) == 0.6
+
+
+class TestFindOptimalThresholds:
+    def test_scalar_inclusion_shape(self):
+        assert find_optimal_thresholds([0.1, 0.9], [0.0, 1.0]).shape == ()
+
+    def test_many_inclusions(self):
+        rng = np.random.RandomState(0)
+        scores = np.round(rng.rand(60), 2)
+        labels = (rng.rand(60) > 0.5).astype(float)
+        inclusions = list(range(-10, 11))
+        result = find_optimal_thresholds(scores, labels, inclusions)
+        assert result.shape == (len(inclusions),)
+        for value, inc in zip(result, inclusions):
+            assert value == find_optimal_threshold(scores, labels, inc)
+
+    def test_many_score_vectors(self):
+        rng = np.random.RandomState(1)
+        scores = np.round(rng.rand(5, 30), 1)
+        labels = (rng.rand(30) > 0.5).astype(float)
+        result = find_optimal_thresholds(scores, labels, [0, 2])
+        assert result.shape == (5, 2)
+        for b in range(5):
+            assert result[b, 0] == find_optimal_threshold(scores[b], labels, 0)
+            assert result[b, 1] == find_optimal_threshold(scores[b], labels, 2)
+
+    def test_per_vector_labels(self):
+        scores = np.array([[0.9, 0.1], [0.9, 0.1]])
+        labels = np.array([[1.0, 0.0], [0.0, 1.0]])
+        assert list(find_optimal_thresholds(scores, labels)) == [0.9, 0.1]
+
+    def test_empty_vectors(self):
+        result = find_optimal_thresholds(np.empty((3, 0)), np.empty(0), [0, 1])
+        assert result.shape == (3, 2)
+        assert (result == 0.5).all()
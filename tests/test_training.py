@@ -0,0 +1,163 @@
+"""Tests for the batched and warm-started MLP trainers in vtsearch.models.training."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import torch
+
+from config import TRAIN_EPOCHS, WARM_START_MAX_EPOCHS
+from vtsearch.models.training import (
+    calculate_cross_calibration_threshold,
+    train_and_score,
+    train_calibrated_models,
+    train_model,
+    train_model_incremental,
+    train_models,
+)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.RandomState(0)
+    X = torch.tensor(rng.randn(40, 8), dtype=torch.float32)
+    y = (X[:, 0] > 0).to(torch.float32)
+    return X, y
+
+
+def _predict(model, X):
+    with torch.no_grad():
+        return model(X).squeeze(1)
+
+
+class TestTrainModels:
+    @pytest.mark.parametrize("inclusion", [-2, 0, 3])
+    def test_matches_sequential_training(self, data, inclusion):
+        X, y = data
+        subsets = [torch.arange(0, 10), torch.arange(5, 40), torch.arange(40)]
+        masks = torch.zeros((3, 40), dtype=torch.bool)
+        for i, rows in enumerate(subsets):
+            masks[i, rows] = True
+
+        torch.manual_seed(0)
+        expected = [train_model(X[rows], y[rows].unsqueeze(1), 8, inclusion) for rows in subsets]
+        torch.manual_seed(0)
+        batched = train_models(X, y, masks, 8, inclusion, chunk_size=2)
+
+        assert len(batched) == 3
+        for a, b in zip(expected, batched):
+            torch.testing.assert_close(_predict(a, X), _predict(b, X), atol=1e-4, rtol=0)
+            assert not b.training
+
+    def test_per_model_labels_and_inclusion(self, data):
+        X, y = data
+        masks = torch.ones((2, 40), dtype=torch.bool)
+        labels = torch.stack([y, 1 - y])
+        m_pos, m_neg = train_models(X, labels, masks, 8, [0, 1])
+        scores_pos, scores_neg = _predict(m_pos, X), _predict(m_neg, X)
+        assert scores_pos[y == 1].mean() > scores_pos[y == 0].mean()
+        assert scores_neg[y == 0].mean() > scores_neg[y == 1].mean()
+
+    def test_shape_errors(self, data):
+        X, y = data
+        with pytest.raises(ValueError):
+            train_models(X, y, torch.ones((2, 39), dtype=torch.bool), 8)
+        with pytest.raises(ValueError):
+            train_models(X, y, torch.ones((2, 40), dtype=torch.bool), 8, [0, 1, 2])
+        with pytest.raises(ValueError):
+            train_models(X, torch.zeros((3, 40)), torch.ones((2, 40), dtype=torch.bool), 8)
+
+
+class TestTrainCalibratedModels:
+    def test_matches_cross_calibration_then_train_model(self, data):
+        X, y = data
+        X_np, y_list = X.numpy(), y.tolist()
+
+        torch.manual_seed(1)
+        expected_threshold = calculate_cross_calibration_threshold(X_np, y_list, 8, 0, rng=np.random.RandomState(2))
+        expected_model = train_model(X, y.unsqueeze(1), 8, 0)
+
+        torch.manual_seed(1)
+        ((model, threshold),) = train_calibrated_models(
+            X_np, y_list, [np.arange(40)], 8, 0, rng=np.random.RandomState(2)
+        )
+
+        assert threshold == pytest.approx(expected_threshold, abs=1e-3)
+        torch.testing.assert_close(_predict(model, X), _predict(expected_model, X), atol=1e-4, rtol=0)
+
+    def test_small_subsets_get_default_threshold(self, data):
+        X, y = data
+        results = train_calibrated_models(X.numpy(), y.numpy(), [[0, 1, 2], np.arange(20)], 8)
+        assert results[0][1] == 0.5
+        assert all(model is not None for model, _ in results)
+
+    def test_without_final_model(self, data):
+        X, y = data
+        ((model, threshold),) = train_calibrated_models(X.numpy(), y.numpy(), [np.arange(40)], 8, train_final=False)
+        assert model is None
+        assert 0.0 <= threshold <= 1.0
+
+
+class TestTrainModelIncremental:
+    def _first(self, X, y, inclusion=0):
+        ids = list(range(len(y)))
+        return ids, train_model_incremental(X, y.unsqueeze(1), ids, 8, inclusion)
+
+    def test_cold_start_without_previous(self, data):
+        X, y = data
+        _, state = self._first(X, y)
+        assert not state.warm_started
+        assert state.epochs == TRAIN_EPOCHS
+        assert state.optimizer_state is not None
+
+    def test_small_change_warm_starts(self, data):
+        X, y = data
+        ids, first = self._first(X[:39], y[:39])
+        before = {k: v.clone() for k, v in first.model.state_dict().items()}
+
+        second = train_model_incremental(X, y.unsqueeze(1), ids + [39], 8, 0, previous=first)
+        assert second.warm_started
+        assert 0 < second.epochs <= WARM_START_MAX_EPOCHS
+        assert second.model is not first.model
+        # The previous model is left untouched
+        for k, v in first.model.state_dict().items():
+            torch.testing.assert_close(v, before[k])
+        scores = _predict(second.model, X)
+        assert scores[y == 1].mean() > scores[y == 0].mean()
+
+    def test_drastic_change_falls_back_to_cold_start(self, data):
+        X, y = data
+        _, first = self._first(X[:10], y[:10])
+        second = train_model_incremental(X, y.unsqueeze(1), list(range(40)), 8, 0, previous=first)
+        assert not second.warm_started
+        assert second.epochs == TRAIN_EPOCHS
+
+    def test_inclusion_change_forces_cold_start(self, data):
+        X, y = data
+        ids, first = self._first(X, y)
+        second = train_model_incremental(X, y.unsqueeze(1), ids, 8, 2, previous=first)
+        assert not second.warm_started
+
+    def test_unchanged_labels_stop_early(self, data):
+        X, y = data
+        ids, first = self._first(X, y)
+        second = train_model_incremental(X, y.unsqueeze(1), ids, 8, 0, previous=first)
+        assert second.warm_started
+        assert second.epochs < WARM_START_MAX_EPOCHS
+
+
+class TestTrainAndScoreWarmStart:
+    def test_warm_start_ranks_like_cold_start(self, data):
+        X, y = data
+        clips = {i: {"id": i, "embedding": X[i].numpy()} for i in range(40)}
+        good = {i: None for i in range(39) if y[i] == 1}
+        bad = {i: None for i in range(39) if y[i] == 0}
+
+        train_and_score(clips, good, bad, warm_start=True)
+        (good if y[39] == 1 else bad)[39] = None
+        results, threshold = train_and_score(clips, good, bad, warm_start=True)
+
+        assert 0.0 <= threshold <= 1.0
+        assert len(results) == 40
+        top = [r["id"] for r in results[: int(y.sum())]]
+        assert np.mean([y[i] == 1 for i in top]) > 0.8
@@ -11,7 +11,9 @@ import numpy as np
 import torch
 from torch import nn
 
-from vtsearch.datasets.loader import load_dataset_from_pickle
+from vtsearch.datasets.loader import load_dataset_from_file
+from vtsearch.utils.clip_store import embedding_matrix
+from vtsearch.utils.media_store import temporary_media_store
 
 
 def _score_clips_with_detector(
@@ -65,31 +67,31 @@ def _score_clips_with_detector(
     model.eval()
 
     # Score all clips
-    all_ids = sorted(clips.keys())
-    all_embs = np.array([clips[cid]["embedding"] for cid in all_ids])
-    X_all = torch.tensor(all_embs, dtype=torch.float32)
+    all_ids, all_embs = embedding_matrix(clips)
 
     with torch.no_grad():
-        scores = model(X_all).squeeze(1).tolist()
+        scores = model(torch.from_numpy(all_embs)).squeeze(1).numpy().astype(np.float64)
 
-    # Collect positive hits (score >= threshold)
+    # Collect positive hits (score >= threshold) in ascending ID order
+    hit_rows = np.flatnonzero(scores >= threshold)
+    hit_rows = hit_rows[np.argsort(all_ids[hit_rows], kind="stable")]
     positive_hits = []
-    for cid, score in zip(all_ids, scores):
-        if score >= threshold:
-            clip = clips[cid]
-            hit: dict[str, Any] = {
-                "id": cid,
-                "filename": clip.get("filename", f"clip_{cid}"),
-                "category": clip.get("category", "unknown"),
-                "score": round(score, 4),
-            }
-            if clip.get("origin") is not None:
-                hit["origin"] = clip["origin"]
-            if clip.get("origin_name"):
-                hit["origin_name"] = clip["origin_name"]
-            if clip.get("md5"):
-                hit["md5"] = clip["md5"]
-            positive_hits.append(hit)
+    for row in hit_rows:
+        cid, score = int(all_ids[row]), float(scores[row])
+        clip = clips[cid]
+        hit: dict[str, Any] = {
+            "id": cid,
+            "filename": clip.get("filename", f"clip_{cid}"),
+            "category": clip.get("category", "unknown"),
+            "score": round(score, 4),
+        }
+        if clip.get("origin") is not None:
+            hit["origin"] = clip["origin"]
+        if clip.get("origin_name"):
+            hit["origin_name"] = clip["origin_name"]
+        if clip.get("md5"):
+            hit["md5"] = clip["md5"]
+        positive_hits.append(hit)
 
     # Sort by score descending
     positive_hits.sort(key=lambda x: x["score"], reverse=True)
@@ -101,7 +103,7 @@ def run_autodetect(dataset_path: str, detector_path: str) -> list[dict[str, Any]
     """Load a dataset and detector, run the detector, and return positive hits.
 
     Args:
-        dataset_path: Path to a pickle file containing the dataset.
+        dataset_path: Path to a ``.vtds`` (or legacy pickle) dataset file.
         detector_path: Path to a JSON file containing detector weights and threshold.
 
     Returns:
@@ -117,14 +119,15 @@ def run_autodetect(dataset_path: str, detector_path: str) -> list[dict[str, Any]
     if not dataset_file.exists():
         raise FileNotFoundError(f"Dataset file not found: {dataset_path}")
 
-    # Load dataset
-    clips: dict[int, dict[str, Any]] = {}
-    load_dataset_from_pickle(dataset_file, clips)
+    # Load dataset; its media goes to a temporary store, not the app's pack
+    with temporary_media_store():
+        clips: dict[int, dict[str, Any]] = {}
+        load_dataset_from_file(dataset_file, clips)
 
-    if not clips:
-        raise ValueError(f"No clips loaded from dataset: {dataset_path}")
+        if not clips:
+            raise ValueError(f"No clips loaded from dataset: {dataset_path}")
 
-    return _score_clips_with_detector(clips, detector_path)
+        return _score_clips_with_detector(clips, detector_path)
 
 
 def run_autodetect_with_importer(
@@ -159,13 +162,14 @@ def run_autodetect_with_importer(
 
     importer.validate_cli_field_values(field_values)
 
-    clips: dict[int, dict[str, Any]] = {}
-    importer.run_cli(field_values, clips)
+    with temporary_media_store():
+        clips: dict[int, dict[str, Any]] = {}
+        importer.run_cli(field_values, clips)
 
-    if not clips:
-        raise ValueError(f"No clips loaded by importer '{importer_name}'")
+        if not clips:
+            raise ValueError(f"No clips loaded by importer '{importer_name}'")
 
-    return _score_clips_with_detector(clips, detector_path)
+        return _score_clips_with_detector(clips, detector_path)
 
 
 def _list_importer_names() -> list[str]:
@@ -285,28 +289,29 @@ def autodetect_main(
     Exits with code 0 on success, 1 on error.
 
     Args:
-        dataset_path: Path to the dataset pickle file.
+        dataset_path: Path to the ``.vtds`` (or legacy pickle) dataset file.
         detector_path: Path to the detector JSON file.
         exporter_name: Optional registered exporter name.
         exporter_field_values: Optional exporter field values.
     """
     try:
-        _import_favorite_processors()
+        with temporary_media_store():
+            _import_favorite_processors()
 
-        dataset_file = Path(dataset_path)
-        if not dataset_file.exists():
-            raise FileNotFoundError(f"Dataset file not found: {dataset_path}")
+            dataset_file = Path(dataset_path)
+            if not dataset_file.exists():
+                raise FileNotFoundError(f"Dataset file not found: {dataset_path}")
 
-        clips: dict[int, dict[str, Any]] = {}
-        load_dataset_from_pickle(dataset_file, clips)
-        if not clips:
-            raise ValueError(f"No clips loaded from dataset: {dataset_path}")
+            clips: dict[int, dict[str, Any]] = {}
+            load_dataset_from_file(dataset_file, clips)
+            if not clips:
+                raise ValueError(f"No clips loaded from dataset: {dataset_path}")
 
-        hits = _score_clips_with_detector(clips, detector_path)
+            hits = _score_clips_with_detector(clips, detector_path)
 
-        media_type = _detect_media_type(clips)
-        results = _build_results_dict(hits, detector_path, media_type)
-        _run_exporter(exporter_name or "gui", exporter_field_values or {}, results)
+            media_type = _detect_media_type(clips)
+            results = _build_results_dict(hits, detector_path, media_type)
+            _run_exporter(exporter_name or "gui", exporter_field_values or {}, results)
     except (FileNotFoundError, ValueError) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -330,89 +335,90 @@ def import_labels_main(
     the prompt (``True`` to always import, ``False`` to always skip).
 
     Args:
-        dataset_path: Path to the dataset pickle file.
+        dataset_path: Path to the ``.vtds`` (or legacy pickle) dataset file.
         label_importer_name: Registered name of the label importer.
         field_values: Mapping of label importer field keys to their CLI values.
         auto_import_missing: If ``True``/``False``, skip the interactive
             prompt and automatically import/skip missing entries.
     """
     try:
-        from vtsearch.labels.importers import get_label_importer
-
-        label_importer = get_label_importer(label_importer_name)
-        if label_importer is None:
-            from vtsearch.labels.importers import list_label_importers
-
-            available = ", ".join(imp.name for imp in list_label_importers())
-            raise ValueError(f"Unknown label importer: {label_importer_name}. Available: {available}")
-
-        label_importer.validate_cli_field_values(field_values)
-
-        dataset_file = Path(dataset_path)
-        if not dataset_file.exists():
-            raise FileNotFoundError(f"Dataset file not found: {dataset_path}")
-
-        clips: dict[int, dict[str, Any]] = {}
-        load_dataset_from_pickle(dataset_file, clips)
-        if not clips:
-            raise ValueError(f"No clips loaded from dataset: {dataset_path}")
-
-        label_entries = label_importer.run_cli(field_values)
-        if not isinstance(label_entries, list):
-            raise ValueError("Label importer did not return a list of label dicts.")
-
-        # Apply labels by origin+origin_name and md5 matching (union)
-        from vtsearch.utils import build_clip_lookup, find_missing_entries, resolve_clip_ids
-
-        origin_lookup, md5_lookup = build_clip_lookup(clips)
-        applied = 0
-        skipped = 0
-        for entry in label_entries:
-            label = entry.get("label", "")
-            if label not in ("good", "bad"):
-                skipped += 1
-                continue
-            cids = resolve_clip_ids(entry, origin_lookup, md5_lookup)
-            if not cids:
-                skipped += 1
-                continue
-            applied += 1
-
-        # Detect entries not matched by origin+name or md5
-        missing = find_missing_entries(label_entries, origin_lookup, md5_lookup)
-        skipped -= len(missing)
-
-        print(f"Applied {applied} label(s), skipped {skipped}.")
-
-        if missing:
-            should_import = auto_import_missing
-            if should_import is None:
-                # Interactive prompt
-                answer = input(
-                    f"{len(missing)} element(s) not found in dataset. "
-                    "Import them from their origins? [y/N] "
-                ).strip().lower()
-                should_import = answer in ("y", "yes")
-
-            if should_import:
-                from vtsearch.datasets.ingest import ingest_missing_clips
-
-                def _cli_progress(status: str, message: str, current: int, total: int) -> None:
-                    if message:
-                        print(message)
-
-                ingested = ingest_missing_clips(missing, clips, on_progress=_cli_progress)
-
-                # Apply labels to the newly ingested clips
-                origin_lookup2, md5_lookup2 = build_clip_lookup(clips)
-                extra_applied = 0
-                for entry in missing:
-                    cids = resolve_clip_ids(entry, origin_lookup2, md5_lookup2)
-                    if cids:
-                        extra_applied += 1
-                print(f"Ingested {ingested} clip(s), applied {extra_applied} additional label(s).")
-            else:
-                print(f"Skipped {len(missing)} missing element(s).")
+        with temporary_media_store():
+            from vtsearch.labels.importers import get_label_importer
+
+            label_importer = get_label_importer(label_importer_name)
+            if label_importer is None:
+                from vtsearch.labels.importers import list_label_importers
+
+                available = ", ".join(imp.name for imp in list_label_importers())
+                raise ValueError(f"Unknown label importer: {label_importer_name}. Available: {available}")
+
+            label_importer.validate_cli_field_values(field_values)
+
+            dataset_file = Path(dataset_path)
+            if not dataset_file.exists():
+                raise FileNotFoundError(f"Dataset file not found: {dataset_path}")
+
+            clips: dict[int, dict[str, Any]] = {}
+            load_dataset_from_file(dataset_file, clips)
+            if not clips:
+                raise ValueError(f"No clips loaded from dataset: {dataset_path}")
+
+            label_entries = label_importer.run_cli(field_values)
+            if not isinstance(label_entries, list):
+                raise ValueError("Label importer did not return a list of label dicts.")
+
+            # Apply labels by origin+origin_name and md5 matching (union)
+            from vtsearch.utils import build_clip_lookup, find_missing_entries, resolve_clip_ids
+
+            origin_lookup, md5_lookup = build_clip_lookup(clips)
+            applied = 0
+            skipped = 0
+            for entry in label_entries:
+                label = entry.get("label", "")
+                if label not in ("good", "bad"):
+                    skipped += 1
+                    continue
+                cids = resolve_clip_ids(entry, origin_lookup, md5_lookup)
+                if not cids:
+                    skipped += 1
+                    continue
+                applied += 1
+
+            # Detect entries not matched by origin+name or md5
+            missing = find_missing_entries(label_entries, origin_lookup, md5_lookup)
+            skipped -= len(missing)
+
+            print(f"Applied {applied} label(s), skipped {skipped}.")
+
+            if missing:
+                should_import = auto_import_missing
+                if should_import is None:
+                    # Interactive prompt
+                    answer = input(
+                        f"{len(missing)} element(s) not found in dataset. "
+                        "Import them from their origins? [y/N] "
+                    ).strip().lower()
+                    should_import = answer in ("y", "yes")
+
+                if should_import:
+                    from vtsearch.datasets.ingest import ingest_missing_clips
+
+                    def _cli_progress(status: str, message: str, current: int, total: int) -> None:
+                        if message:
+                            print(message)
+
+                    ingested = ingest_missing_clips(missing, clips, on_progress=_cli_progress)
+
+                    # Apply labels to the newly ingested clips
+                    origin_lookup2, md5_lookup2 = build_clip_lookup(clips)
+                    extra_applied = 0
+                    for entry in missing:
+                        cids = resolve_clip_ids(entry, origin_lookup2, md5_lookup2)
+                        if cids:
+                            extra_applied += 1
+                    print(f"Ingested {ingested} clip(s), applied {extra_applied} additional label(s).")
+                else:
+                    print(f"Skipped {len(missing)} missing element(s).")
 
     except (FileNotFoundError, ValueError) as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -441,32 +447,104 @@ def autodetect_importer_main(
         exporter_field_values: Optional exporter field values.
     """
     try:
-        _import_favorite_processors()
+        with temporary_media_store():
+            _import_favorite_processors()
 
-        from vtsearch.datasets.importers import get_importer
+            from vtsearch.datasets.importers import get_importer
 
-        importer = get_importer(importer_name)
-        if importer is None:
-            available = _list_importer_names()
-            raise ValueError(f"Unknown importer: {importer_name}. Available: {', '.join(available)}")
+            importer = get_importer(importer_name)
+            if importer is None:
+                available = _list_importer_names()
+                raise ValueError(f"Unknown importer: {importer_name}. Available: {', '.join(available)}")
 
-        importer.validate_cli_field_values(field_values)
+            importer.validate_cli_field_values(field_values)
 
-        clips: dict[int, dict[str, Any]] = {}
-        importer.run_cli(field_values, clips)
-        if not clips:
-            raise ValueError(f"No clips loaded by importer '{importer_name}'")
+            clips: dict[int, dict[str, Any]] = {}
+            importer.run_cli(field_values, clips)
+            if not clips:
+                raise ValueError(f"No clips loaded by importer '{importer_name}'")
+
+            hits = _score_clips_with_detector(clips, detector_path)
+
+            media_type = _detect_media_type(clips)
+            results = _build_results_dict(hits, detector_path, media_type)
+            _run_exporter(exporter_name or "gui", exporter_field_values or {}, results)
+    except (FileNotFoundError, ValueError, NotADirectoryError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
-        hits = _score_clips_with_detector(clips, detector_path)
 
-        media_type = _detect_media_type(clips)
-        results = _build_results_dict(hits, detector_path, media_type)
-        _run_exporter(exporter_name or "gui", exporter_field_values or {}, results)
+def export_dataset_main(
+    target_path: str,
+    *,
+    dataset_path: str | None = None,
+    importer_name: str | None = None,
+    field_values: dict[str, Any] | None = None,
+    include_media: bool = True,
+    compress: str | None = None,
+) -> None:
+    """CLI entry point: load a dataset and write it to *target_path* as a ``.vtds`` file.
+
+    The dataset comes from *dataset_path* (an existing dataset file, e.g. a
+    legacy pickle to convert) or from the importer *importer_name*.  The
+    file is streamed to disk a clip at a time.  Media is held in a
+    temporary media store for the run, so the export does not add to
+    ``MEDIA_STORE_PATH``.  Exits with code 0 on success, 1 on error.
+
+    Args:
+        target_path: Output file.
+        dataset_path: Dataset file to load.
+        importer_name: Registered importer to load with instead.
+        field_values: Mapping of importer field keys to their CLI values.
+        include_media: When ``False``, write an embeddings-only file.
+        compress: ``"zstd"`` to compress the output, or ``None``.
+    """
+    try:
+        with temporary_media_store():
+            _export_dataset(target_path, dataset_path, importer_name, field_values, include_media, compress)
     except (FileNotFoundError, ValueError, NotADirectoryError) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
 
+def _export_dataset(
+    target_path: str,
+    dataset_path: str | None,
+    importer_name: str | None,
+    field_values: dict[str, Any] | None,
+    include_media: bool,
+    compress: str | None,
+) -> None:
+    """Body of :func:`export_dataset_main`, run against a temporary media store."""
+    from vtsearch.datasets.dataset_file import write_dataset
+
+    clips: dict[int, dict[str, Any]] = {}
+    creation_info: dict[str, Any] | None = None
+    if importer_name is not None:
+        from vtsearch.datasets.importers import get_importer
+
+        importer = get_importer(importer_name)
+        if importer is None:
+            available = _list_importer_names()
+            raise ValueError(f"Unknown importer: {importer_name}. Available: {', '.join(available)}")
+        importer.validate_cli_field_values(field_values or {})
+        importer.run_cli(field_values or {}, clips)
+        creation_info = importer.build_creation_info(field_values or {})
+    elif dataset_path is not None:
+        dataset_file = Path(dataset_path)
+        if not dataset_file.exists():
+            raise FileNotFoundError(f"Dataset file not found: {dataset_path}")
+        creation_info = load_dataset_from_file(dataset_file, clips)
+    else:
+        raise ValueError("Exporting a dataset needs a dataset file or an importer")
+
+    if not clips:
+        raise ValueError("No clips loaded")
+
+    write_dataset(target_path, clips, creation_info, include_media=include_media, compress=compress)
+    print(f"Wrote {len(clips)} clips to {target_path}")
+
+
 def import_processor_main(
     processor_importer_name: str,
     field_values: dict[str, Any],
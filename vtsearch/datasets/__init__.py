@@ -1,6 +1,15 @@
 """Dataset configuration and management."""
 
 from vtsearch.datasets.config import DEMO_DATASETS
+from vtsearch.datasets.dataset_file import (
+    COMPRESSION_SUFFIXES,
+    DATASET_SUFFIX,
+    DatasetReader,
+    DatasetWriter,
+    is_dataset_file,
+    iter_dataset,
+    write_dataset,
+)
 from vtsearch.datasets.downloader import (
     download_20newsgroups,
     download_cifar10,
@@ -12,8 +21,10 @@ from vtsearch.datasets.importers import get_importer, list_importers
 from vtsearch.datasets.importers.base import DatasetImporter, ImporterField
 from vtsearch.datasets.labelset import LabelSet, LabeledElement
 from vtsearch.datasets.loader import (
+    demo_cache_file,
     export_dataset_to_file,
     load_cifar10_batch,
+    load_dataset_from_file,
     load_dataset_from_folder,
     load_dataset_from_pickle,
     load_demo_dataset,
@@ -49,9 +60,19 @@ __all__ = [
     "load_image_metadata_from_folders",
     "load_paragraph_metadata_from_folders",
     "load_dataset_from_folder",
+    "load_dataset_from_file",
     "load_dataset_from_pickle",
     "load_demo_dataset",
+    "demo_cache_file",
     "export_dataset_to_file",
+    # Dataset file format
+    "DATASET_SUFFIX",
+    "COMPRESSION_SUFFIXES",
+    "DatasetReader",
+    "DatasetWriter",
+    "write_dataset",
+    "iter_dataset",
+    "is_dataset_file",
     # Split utilities
     "split_dataset",
 ]
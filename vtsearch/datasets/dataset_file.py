@@ -0,0 +1,596 @@
+"""Versioned, chunked binary dataset format (``.vtds``).
+
+The legacy export pickled every clip, with its embedding as a Python list
+and its media bytes inline, into one in-memory ``bytes``; loading it
+unpickled the whole file and rebuilt every array.  A ``.vtds`` file is an
+uncompressed (``ZIP_STORED``) zip archive holding:
+
+``manifest.json``
+    ``{"format": "vtsearch-dataset", "version": 1, "clips": N, "dim": D}``
+    plus the dataset's ``creation_info``, an optional ``name`` and an
+    optional ``media_dir`` (see below).
+``clips.jsonl``
+    One JSON object per clip with its metadata (``id``, ``type``,
+    ``filename``, ``md5``, ``origin`` ...), its ``row`` in the embedding
+    matrix, the ``media`` ``[offset, length]`` of its bytes in
+    ``media.bin`` (or ``null``) and, for long audio or chunked text, the
+    ``segments`` ``[start, count]`` of its rows in ``segments.npy``.
+``embeddings.npy``
+    The ``(N, D)`` ``float32`` embedding matrix.
+``media.bin``
+    Every clip's media bytes, back to back.
+``segments.npy``
+    The ``float32`` segment embeddings of all clips, back to back.
+
+Because the members are stored uncompressed, :class:`DatasetReader` maps
+the file once and reads ``embeddings.npy`` as a read-only array over the
+map and each blob as a :class:`memoryview`, so a reader only touches the
+clips it is asked for.  :class:`DatasetWriter` streams clips in one at a
+time (media is written in 1 MiB slices as it arrives) and also works on
+unseekable outputs.
+
+Datasets whose media lives in a local directory (the audio and video demo
+caches) set ``media_dir`` instead of copying the media in; their clips then
+have ``"media": null`` and are read from ``media_dir / filename``.  An
+embeddings-only file (``"embeddings_only": true`` in the manifest) has no
+media at all.
+
+:func:`iter_dataset` yields a file as a stream of chunks (for HTTP
+responses), optionally as a zstd frame (``.vtds.zst``; needs the optional
+``zstandard`` package, see ``requirements-zstd.txt``).  A compressed file is
+decompressed to a temporary file by :func:`uncompressed_path` before it is
+mapped.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any
+
+import numpy as np
+
+from vtsearch.utils.media_store import MEDIA_FIELDS, clip_media_bytes
+
+FORMAT_NAME = "vtsearch-dataset"
+FORMAT_VERSION = 1
+DATASET_SUFFIX = ".vtds"
+
+#: Compression accepted by :func:`iter_dataset` / :func:`write_dataset`,
+#: mapped to the suffix appended to :data:`DATASET_SUFFIX`.
+COMPRESSION_SUFFIXES = {"zstd": ".zst"}
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Clip keys that are stored outside clips.jsonl (or not at all)
+_NON_METADATA_KEYS = {"embedding", "media_ref", "segment_offsets", "segment_embeddings", *MEDIA_FIELDS.values()}
+
+# Embedding rows are written this many at a time
+_WRITE_ROWS = 4096
+
+# Media is written (and streamed by iter_dataset) in slices of this many bytes
+_MEDIA_CHUNK_BYTES = 1 << 20
+
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, Path):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _write_npy(zf: zipfile.ZipFile, name: str, rows: list[np.ndarray], dim: int) -> None:
+    """Write *rows* (1-D ``float32`` arrays of length *dim*) as an ``(len(rows), dim)`` .npy member."""
+    with zf.open(name, "w", force_zip64=True) as out:
+        header = {"descr": "<f4", "fortran_order": False, "shape": (len(rows), dim)}
+        np.lib.format.write_array_header_1_0(out, header)
+        for start in range(0, len(rows), _WRITE_ROWS):
+            out.write(np.asarray(rows[start : start + _WRITE_ROWS], dtype="<f4").tobytes())
+
+
+class DatasetWriter:
+    """Write a ``.vtds`` file one clip at a time.
+
+    Media bytes go to the file as each clip is added; embeddings and
+    metadata are written when the writer is closed.  Use as a context
+    manager::
+
+        with DatasetWriter(path, creation_info=info) as writer:
+            for clip in clips.values():
+                writer.add(clip)
+
+    If the block raises, the writer is aborted (see :meth:`abort`) rather
+    than closed, so a failed write never looks like a complete dataset.
+
+    Args:
+        target: Output path, or a binary file object (which may be
+            unseekable, e.g. an HTTP response stream).
+        creation_info: Provenance dict stored in the manifest.
+        name: Optional dataset name stored in the manifest.
+        media_dir: When set, media bytes are not written; readers load each
+            clip's media from ``media_dir / filename`` instead.
+        include_media: When ``False``, no media is written at all and the
+            file is marked embeddings-only.
+
+    Raises:
+        ValueError: From :meth:`add`, if a clip's embedding dimension
+            differs from the first clip's.
+    """
+
+    def __init__(
+        self,
+        target: Path | str | IO[bytes],
+        creation_info: dict[str, Any] | None = None,
+        name: str | None = None,
+        media_dir: Path | str | None = None,
+        include_media: bool = True,
+    ) -> None:
+        self._zf = zipfile.ZipFile(target, "w", compression=zipfile.ZIP_STORED)
+        self._manifest: dict[str, Any] = {"format": FORMAT_NAME, "version": FORMAT_VERSION}
+        if creation_info is not None:
+            self._manifest["creation_info"] = creation_info
+        if name is not None:
+            self._manifest["name"] = name
+        if not include_media:
+            self._manifest["embeddings_only"] = True
+        elif media_dir is not None:
+            self._manifest["media_dir"] = str(media_dir)
+        writes_media = include_media and media_dir is None
+        self._media = self._zf.open("media.bin", "w", force_zip64=True) if writes_media else None
+        self._media_size = 0
+        self._rows: list[dict[str, Any]] = []
+        self._embeddings: list[np.ndarray] = []
+        self._segments: list[np.ndarray] = []
+        self._dim: int | None = None
+        self._closed = False
+
+    def add(self, clip: dict[str, Any]) -> None:
+        """Append *clip* (a clip dict as held in the app's ``clips``)."""
+        for _ in self._add_steps(clip):
+            pass
+
+    def _add_steps(self, clip: dict[str, Any]) -> Iterator[None]:
+        """:meth:`add` *clip*, pausing after each slice of its media is written."""
+        embedding = np.asarray(clip["embedding"], dtype=np.float32).reshape(-1)
+        if self._dim is None:
+            self._dim = embedding.size
+        elif embedding.size != self._dim:
+            raise ValueError(f"Embedding dimension mismatch: {embedding.size} != {self._dim} (clip {clip['id']})")
+
+        row = {k: v for k, v in clip.items() if k not in _NON_METADATA_KEYS}
+        row["row"] = len(self._embeddings)
+        row["media"] = None
+        if self._media is not None:
+            data = clip_media_bytes(clip)
+            if data is not None:
+                view = memoryview(data)
+                for start in range(0, len(view), _MEDIA_CHUNK_BYTES):
+                    self._media.write(view[start : start + _MEDIA_CHUNK_BYTES])
+                    yield
+                row["media"] = [self._media_size, len(view)]
+                self._media_size += len(view)
+
+        segments = clip.get("segment_embeddings")
+        if segments is not None:
+            segments = np.asarray(segments, dtype=np.float32).reshape(-1, self._dim)
+            row["segments"] = [len(self._segments), len(segments)]
+            row["segment_offsets"] = np.asarray(clip["segment_offsets"], dtype=np.float32).tolist()
+            self._segments.extend(segments)
+
+        self._rows.append(row)
+        self._embeddings.append(embedding)
+
+    def add_all(self, clips: Iterable[dict[str, Any]]) -> None:
+        """:meth:`add` every clip in *clips*, in order."""
+        for clip in clips:
+            self.add(clip)
+
+    def close(self) -> None:
+        """Write the embeddings, metadata and manifest and finish the archive."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._media is not None:
+            self._media.close()
+        dim = self._dim or 0
+        _write_npy(self._zf, "embeddings.npy", self._embeddings, dim)
+        _write_npy(self._zf, "segments.npy", self._segments, dim)
+        with self._zf.open("clips.jsonl", "w", force_zip64=True) as out:
+            for row in self._rows:
+                out.write(json.dumps(row, default=_json_default).encode("utf-8") + b"\n")
+        self._manifest.update(clips=len(self._rows), dim=dim)
+        self._zf.writestr("manifest.json", json.dumps(self._manifest, default=_json_default))
+        self._zf.close()
+
+    def abort(self) -> None:
+        """Finish the archive without the embeddings, metadata or manifest.
+
+        The output is then not a dataset file (:class:`DatasetReader`
+        refuses it), rather than a valid-looking file holding only the clips
+        added so far.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._media is not None:
+            self._media.close()
+        self._zf.close()
+
+    def __enter__(self) -> DatasetWriter:  # noqa: PYI034
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable output that collects what is written until :meth:`drain`, compressing it if asked."""
+
+    def __init__(self, compressor: Any = None) -> None:
+        self._chunks: list[bytes] = []
+        self._compressor = compressor
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        data = self._compressor.compress(b) if self._compressor is not None else bytes(b)
+        if data:
+            self._chunks.append(data)
+        return len(b)
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        yield from chunks
+
+    def finish(self) -> Iterator[bytes]:
+        if self._compressor is not None:
+            self._chunks.append(self._compressor.flush())
+        yield from self.drain()
+
+
+def _zstd_compressor(compress: str | None) -> Any:
+    """Return a streaming compressor for *compress* (``None`` or ``"zstd"``), or ``None``.
+
+    Raises:
+        ValueError: If *compress* is unknown or ``zstandard`` is not installed.
+    """
+    if compress is None:
+        return None
+    if compress not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown compression: {compress!r} (supported: {', '.join(COMPRESSION_SUFFIXES)})")
+    try:
+        import zstandard  # optional dependency
+    except ImportError as e:
+        raise ValueError("zstd compression needs the zstandard package (pip install -r requirements-zstd.txt)") from e
+    return zstandard.ZstdCompressor().compressobj()
+
+
+def iter_dataset(
+    clips: Iterable[dict[str, Any]],
+    creation_info: dict[str, Any] | None = None,
+    name: str | None = None,
+    include_media: bool = True,
+    compress: str | None = None,
+) -> Iterator[bytes]:
+    """Yield a ``.vtds`` file of *clips* as a stream of byte chunks.
+
+    Media is yielded in slices of at most 1 MiB as it is written, so memory
+    use does not grow with the size of any clip; what is held until the end
+    is one reference per embedding plus the metadata rows.
+
+    Args:
+        clips: Clip dicts, written in order.
+        creation_info: Provenance dict stored in the manifest.
+        name: Optional dataset name stored in the manifest.
+        include_media: When ``False``, write an embeddings-only file.
+        compress: ``"zstd"`` to compress the stream, or ``None``.
+
+    Raises:
+        ValueError: Immediately (not on first iteration) if *compress* is
+            unknown or its package is not installed.
+    """
+    sink = _ChunkSink(_zstd_compressor(compress))
+    return _iter_chunks(sink, clips, creation_info, name, include_media)
+
+
+def _iter_chunks(
+    sink: _ChunkSink,
+    clips: Iterable[dict[str, Any]],
+    creation_info: dict[str, Any] | None,
+    name: str | None,
+    include_media: bool,
+) -> Iterator[bytes]:
+    with DatasetWriter(sink, creation_info=creation_info, name=name, include_media=include_media) as writer:
+        for clip in clips:
+            for _ in writer._add_steps(clip):
+                yield from sink.drain()
+            yield from sink.drain()
+    yield from sink.finish()
+
+
+def write_dataset(
+    target: Path | str | IO[bytes],
+    clips: dict[int, dict[str, Any]],
+    creation_info: dict[str, Any] | None = None,
+    name: str | None = None,
+    media_dir: Path | str | None = None,
+    include_media: bool = True,
+    compress: str | None = None,
+) -> None:
+    """Write every clip of *clips* to *target* as a ``.vtds`` file.
+
+    See :class:`DatasetWriter` for the arguments; *compress* is as for
+    :func:`iter_dataset` (and cannot be combined with *media_dir*).  A path
+    *target* is written under a temporary name in the same directory and
+    renamed into place once complete, so a failed write leaves any earlier
+    file untouched and never leaves a partial one behind.
+    """
+    if compress is not None:
+        if media_dir is not None:
+            raise ValueError("media_dir cannot be combined with compression")
+        # Fail on an unknown compression before any file is created
+        _zstd_compressor(compress)
+    if not isinstance(target, (str, Path)):
+        _write_to(target, clips, creation_info, name, media_dir, include_media, compress)
+        return
+
+    target = Path(target)
+    partial = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        with open(partial, "wb") as out:
+            _write_to(out, clips, creation_info, name, media_dir, include_media, compress)
+        os.replace(partial, target)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+
+def _write_to(
+    out: IO[bytes],
+    clips: dict[int, dict[str, Any]],
+    creation_info: dict[str, Any] | None,
+    name: str | None,
+    media_dir: Path | str | None,
+    include_media: bool,
+    compress: str | None,
+) -> None:
+    if compress is None:
+        with DatasetWriter(
+            out, creation_info=creation_info, name=name, media_dir=media_dir, include_media=include_media
+        ) as writer:
+            writer.add_all(clips.values())
+    else:
+        out.writelines(
+            iter_dataset(clips.values(), creation_info, name, include_media=include_media, compress=compress)
+        )
+
+
+class DatasetReader:
+    """Memory-mapped reader of a ``.vtds`` file.
+
+    Opening the file reads only the manifest and the metadata; embeddings
+    and media are read from a map of the file when asked for.  Use as a
+    context manager, and release the views returned by :meth:`media`
+    before closing.
+
+    Args:
+        path: A file written by :class:`DatasetWriter`.
+
+    Raises:
+        ValueError: If *path* is not a ``.vtds`` file, was written by a
+            newer version, or has compressed members.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        try:
+            self._zf = zipfile.ZipFile(self.path)
+            self.manifest = json.loads(self._zf.read("manifest.json"))
+        except (zipfile.BadZipFile, KeyError, json.JSONDecodeError) as e:
+            raise ValueError(f"{self.path} is not a VTSearch dataset file") from e
+        if self.manifest.get("format") != FORMAT_NAME:
+            raise ValueError(f"{self.path} is not a VTSearch dataset file")
+        if self.manifest.get("version", 0) > FORMAT_VERSION:
+            raise ValueError(
+                f"{self.path} uses dataset format version {self.manifest['version']}; "
+                f"this version of VTSearch reads up to {FORMAT_VERSION}"
+            )
+
+        self._file = open(self.path, "rb")  # noqa: SIM115 - closed in close()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._rows: dict[int, dict[str, Any]] = {}
+        for line in self._zf.read("clips.jsonl").splitlines():
+            row = json.loads(line)
+            self._rows[int(row["id"])] = row
+        self.embeddings = self._load_npy("embeddings.npy")
+        self.segments = self._load_npy("segments.npy")
+        self._media_offset = self._member_offset("media.bin") if "media.bin" in self._zf.namelist() else None
+
+    def _member_offset(self, name: str) -> int:
+        """Return the file offset of the (uncompressed) data of member *name*."""
+        info = self._zf.getinfo(name)
+        if info.compress_type != zipfile.ZIP_STORED:
+            raise ValueError(f"{self.path}: member {name} is compressed")
+        fields = _LOCAL_HEADER.unpack_from(self._map, info.header_offset)
+        return info.header_offset + _LOCAL_HEADER.size + fields[9] + fields[10]
+
+    def _load_npy(self, name: str) -> np.ndarray:
+        """Return member *name* as a read-only ``float32`` matrix over the file map."""
+        offset = self._member_offset(name)
+        with io.BytesIO(self._map[offset : offset + 4096]) as head:
+            version = np.lib.format.read_magic(head)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(head)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(head)
+            data_offset = offset + head.tell()
+        if fortran_order or dtype != np.dtype("<f4") or len(shape) != 2:
+            raise ValueError(f"{self.path}: unexpected layout of {name}")
+        count = shape[0] * shape[1]
+        return np.frombuffer(self._map, dtype="<f4", count=count, offset=data_offset).reshape(shape)
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    @property
+    def ids(self) -> list[int]:
+        """Clip IDs in file order."""
+        return list(self._rows)
+
+    @property
+    def creation_info(self) -> dict[str, Any] | None:
+        return self.manifest.get("creation_info")
+
+    @property
+    def embeddings_only(self) -> bool:
+        """Whether the file was written without media."""
+        return bool(self.manifest.get("embeddings_only", False))
+
+    @property
+    def media_dir(self) -> Path | None:
+        media_dir = self.manifest.get("media_dir")
+        return Path(media_dir) if media_dir else None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, clip_id: object) -> bool:
+        return clip_id in self._rows
+
+    def metadata(self, clip_id: int) -> dict[str, Any]:
+        """Return the stored metadata of *clip_id* (a copy, without the file offsets)."""
+        row = self._rows[clip_id]
+        return {k: v for k, v in row.items() if k not in ("row", "media", "segments", "segment_offsets")}
+
+    def embedding(self, clip_id: int) -> np.ndarray:
+        """Return the embedding of *clip_id* as a read-only view of the mapped matrix."""
+        return self.embeddings[self._rows[clip_id]["row"]]
+
+    def gather_embeddings(self, ids: Iterable[int]) -> np.ndarray:
+        """Return a new in-memory ``(len(ids), D)`` matrix with the embeddings of *ids*."""
+        rows = [self._rows[cid]["row"] for cid in ids]
+        return np.array(self.embeddings[rows], dtype=np.float32)
+
+    def segments_of(self, clip_id: int) -> tuple[np.ndarray, np.ndarray] | None:
+        """Return ``(offsets, embeddings)`` of *clip_id*'s segments, or ``None``."""
+        row = self._rows[clip_id]
+        if row.get("segments") is None:
+            return None
+        start, count = row["segments"]
+        return (
+            np.asarray(row["segment_offsets"], dtype=np.float32),
+            np.array(self.segments[start : start + count], dtype=np.float32),
+        )
+
+    def media(self, clip_id: int) -> memoryview | None:
+        """Return a view of *clip_id*'s media bytes in the file, or ``None``.
+
+        ``None`` for clips without media (paragraphs) and for datasets that
+        keep their media in :attr:`media_dir`.
+        """
+        location = self._rows[clip_id].get("media")
+        if location is None or self._media_offset is None:
+            return None
+        start = self._media_offset + location[0]
+        return memoryview(self._map)[start : start + location[1]]
+
+    def iter_ids(self, ids: Iterable[int] | None = None) -> Iterator[int]:
+        """Yield *ids* that are in the file (all IDs, in file order, when ``None``)."""
+        if ids is None:
+            yield from self._rows
+            return
+        for cid in ids:
+            if cid in self._rows:
+                yield cid
+
+    # ------------------------------------------------------------------
+    # Housekeeping
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        """Close the file.
+
+        The map is released now unless arrays or views taken from the reader
+        are still alive; it is then released with the last of them.
+        """
+        self.embeddings = self.segments = np.empty((0, 0), dtype=np.float32)
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+        self._file.close()
+        self._zf.close()
+
+    def __enter__(self) -> DatasetReader:  # noqa: PYI034
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def is_dataset_file(path: Path | str) -> bool:
+    """Return whether *path* is a ``.vtds`` file (judged by its contents, not its name)."""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            return json.loads(zf.read("manifest.json")).get("format") == FORMAT_NAME
+    except (OSError, zipfile.BadZipFile, KeyError, ValueError):
+        return False
+
+
+def is_compressed_dataset(path: Path | str) -> bool:
+    """Return whether *path* starts with a zstd frame (a ``.vtds.zst`` file)."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(4) == _ZSTD_MAGIC
+    except OSError:
+        return False
+
+
+@contextmanager
+def uncompressed_path(path: Path | str) -> Iterator[Path]:
+    """Yield a path to an uncompressed copy of *path*.
+
+    Files that are not zstd-compressed are yielded as they are; compressed
+    ones are streamed into a temporary file, which is deleted on exit.
+
+    Raises:
+        ValueError: If *path* is compressed and ``zstandard`` is not installed.
+    """
+    path = Path(path)
+    if not is_compressed_dataset(path):
+        yield path
+        return
+    try:
+        import zstandard  # optional dependency
+    except ImportError as e:
+        raise ValueError(f"{path} is zstd-compressed; install zstandard (requirements-zstd.txt) to read it") from e
+
+    with (
+        tempfile.NamedTemporaryFile(suffix=DATASET_SUFFIX, delete=False) as tmp,
+        open(path, "rb") as src,
+        zstandard.ZstdDecompressor().stream_reader(src) as reader,
+    ):
+        shutil.copyfileobj(reader, tmp)
+    try:
+        yield Path(tmp.name)
+    finally:
+        Path(tmp.name).unlink(missing_ok=True)
@@ -1,4 +1,4 @@
-"""Pickle-file importer \u2013 loads a previously exported ``.pkl`` dataset.
+"""Dataset-file importer \u2013 loads a previously exported ``.vtds`` (or legacy ``.pkl``) dataset.
 
 No additional pip packages are required; everything needed is already in
 the core requirements.
@@ -11,7 +11,7 @@ from typing import Any
 
 from config import DATA_DIR
 from vtsearch.datasets.importers.base import DatasetImporter, ImporterField
-from vtsearch.datasets.loader import load_dataset_from_pickle
+from vtsearch.datasets.loader import load_dataset_from_file
 
 
 def _get_progress():
@@ -21,27 +21,29 @@ def _get_progress():
 
 
 class PickleDatasetImporter(DatasetImporter):
-    """Load a dataset from a ``.pkl`` file exported by VTSearch.
+    """Load a dataset from a ``.vtds`` file exported by VTSearch.
 
     The user picks the file via the browser's file-upload input.  The file
     is streamed to a temporary path on the server, deserialized, and then
-    the temporary file is deleted.
+    the temporary file is deleted.  Pickle files written by earlier versions
+    are still accepted; the importer keeps the name ``"pickle"`` so saved
+    ``creation_info`` from those versions can still be replayed.
 
-    If the pickle file contains embedded ``creation_info`` (i.e. it was
+    If the file contains embedded ``creation_info`` (i.e. it was
     exported from a dataset that recorded its provenance), that info is
     restored into the global state so the provenance chain is preserved.
     """
 
     name = "pickle"
-    display_name = "Pickle File"
-    description = "Load a previously exported .pkl dataset file."
+    display_name = "Dataset File"
+    description = "Load a previously exported .vtds (or older .pkl) dataset file."
     fields = [
         ImporterField(
             key="file",
             label="Dataset File",
             field_type="file",
-            description="A .pkl file that was exported from VTSearch.",
-            accept=".pkl",
+            description="A .vtds or .pkl file that was exported from VTSearch.",
+            accept=".vtds,.pkl",
         ),
     ]
 
@@ -51,11 +53,11 @@ class PickleDatasetImporter(DatasetImporter):
         file_obj = field_values["file"]  # werkzeug FileStorage
         progress = _get_progress()
         progress("loading", "Loading dataset from file...", 0, 0)
-        temp_path = DATA_DIR / "temp_upload.pkl"
+        temp_path = DATA_DIR / "temp_upload.dataset"
         DATA_DIR.mkdir(exist_ok=True)
         file_obj.save(temp_path)
         try:
-            creation_info = load_dataset_from_pickle(temp_path, clips)
+            creation_info = load_dataset_from_file(temp_path, clips)
         finally:
             temp_path.unlink(missing_ok=True)
         if creation_info:
@@ -63,13 +65,13 @@ class PickleDatasetImporter(DatasetImporter):
         progress("idle", f"Loaded {len(clips)} clips from file")
 
     def run_cli(self, field_values: dict[str, Any], clips: dict) -> None:
-        """Load from a pickle file path (string) instead of FileStorage."""
+        """Load from a dataset file path (string) instead of FileStorage."""
         from vtsearch.utils import set_dataset_creation_info
 
         file_path = Path(field_values["file"])
         if not file_path.exists():
             raise FileNotFoundError(f"Dataset file not found: {file_path}")
-        creation_info = load_dataset_from_pickle(file_path, clips)
+        creation_info = load_dataset_from_file(file_path, clips)
         if creation_info:
             set_dataset_creation_info(creation_info)
 
@@ -12,14 +12,29 @@ import csv
 import hashlib
 import io
 import pickle
+from collections.abc import Iterable, Iterator, Sequence
 from pathlib import Path
 from typing import Any, Callable, Optional
 
 import numpy as np
 from PIL import Image
 
-from config import EMBEDDINGS_DIR, IMAGES_PER_CALTECH101_CATEGORY, IMAGES_PER_CIFAR10_CATEGORY, TEXTS_PER_CATEGORY
+from config import (
+    EMBEDDING_CACHE_LOOKUP_BATCH,
+    EMBEDDINGS_DIR,
+    IMAGES_PER_CALTECH101_CATEGORY,
+    IMAGES_PER_CIFAR10_CATEGORY,
+    TEXT_CHUNK_EMBEDDINGS,
+    TEXTS_PER_CATEGORY,
+)
 from vtsearch.datasets.config import DEMO_DATASETS
+from vtsearch.datasets.dataset_file import (
+    DATASET_SUFFIX,
+    DatasetReader,
+    is_dataset_file,
+    uncompressed_path,
+    write_dataset,
+)
 from vtsearch.datasets.downloader import (
     download_20newsgroups,
     download_caltech101,
@@ -27,6 +42,14 @@ from vtsearch.datasets.downloader import (
     download_esc50,
     download_ucf101_subset,
 )
+from vtsearch.models.embedding_cache import ingest_files_cached
+from vtsearch.utils.media_store import (
+    MEDIA_FIELDS,
+    attach_clip_file,
+    attach_clip_media,
+    inline_media,
+    store_clip_media,
+)
 
 ProgressCallback = Callable[[str, str, int, int], None]
 
@@ -38,6 +61,43 @@ def _default_progress() -> ProgressCallback:
     return update_progress
 
 
+def _embedding_progress(
+    on_progress: ProgressCallback, label: str, offset: int = 0, overall: Optional[int] = None
+) -> dict[str, Callable[[int, int], None]]:
+    """Return ``on_batch``/``on_decode`` callbacks for :func:`ingest_files_cached`.
+
+    Both stages are reported in one message, e.g. ``Embedding images
+    (40/200, 96 decoded)``.  *offset* and *overall* place a call that covers
+    only part of the files within the whole import.
+    """
+    counts = {"embedded": 0, "decoded": 0}
+
+    def report(stage: str, done: int, total: int) -> None:
+        counts[stage] = offset + done
+        whole = overall if overall is not None else total
+        decoded = f", {counts['decoded']} decoded" if counts["decoded"] > counts["embedded"] else ""
+        on_progress(
+            "embedding", f"Embedding {label} ({counts['embedded']}/{whole}{decoded})", counts["embedded"], whole
+        )
+
+    return {
+        "on_batch": lambda done, total: report("embedded", done, total),
+        "on_decode": lambda done, total: report("decoded", done, total),
+    }
+
+
+def _ingest_in_blocks(mt: Any, file_paths: Sequence[Path], on_progress: ProgressCallback, label: str) -> Iterator[Any]:
+    """Yield :func:`ingest_files_cached` results for *file_paths*, in order.
+
+    The files are ingested ``EMBEDDING_CACHE_LOOKUP_BATCH`` at a time, so
+    only one block's results are held while the caller builds its clips.
+    """
+    total = len(file_paths)
+    for start in range(0, total, EMBEDDING_CACHE_LOOKUP_BATCH):
+        block = file_paths[start : start + EMBEDDING_CACHE_LOOKUP_BATCH]
+        yield from ingest_files_cached(mt, block, **_embedding_progress(on_progress, label, start, total))
+
+
 def load_esc50_metadata(esc50_dir: Path) -> dict[str, dict[str, Any]]:
     """Load clip metadata from the ESC-50 ``esc50.csv`` metadata file.
 
@@ -254,8 +314,13 @@ def load_dataset_from_folder(
     Files whose basename appears in ``content_vectors`` will use the supplied
     embedding instead of running the embedding model.  This allows importers
     that already provide content vectors to avoid redundant computation.
+    Other files are looked up by content hash in the persistent embedding
+    cache (:mod:`vtsearch.models.embedding_cache`) in batches, so only
+    files that were never embedded by the current model are run through it.
 
-    The ``clips`` dict is cleared before loading begins.
+    The ``clips`` dict is cleared before loading begins.  Each file is
+    copied into the media store (:mod:`vtsearch.utils.media_store`) as it is
+    read, so only the embeddings and metadata stay in memory.
 
     ``media_type`` is looked up in the media type registry by
     :attr:`~vtsearch.media.base.MediaType.folder_import_name` (e.g.
@@ -305,49 +370,46 @@ def load_dataset_from_folder(
     clip_id = 1
     total_files = len(media_files)
 
-    for i, file_path in enumerate(media_files):
-        on_progress(
-            "embedding",
-            f"Embedding {media_type} {file_path.name}...",
-            i + 1,
-            total_files,
+    for start in range(0, total_files, EMBEDDING_CACHE_LOOKUP_BATCH):
+        # Read each file in a block once: its bytes give the hash and the
+        # stored contents, and files without a content vector are embedded
+        # (cache hits first, the rest decoded once and batched through the model)
+        block = media_files[start : start + EMBEDDING_CACHE_LOOKUP_BATCH]
+        known: list[Optional[np.ndarray]] = [content_vectors.get(p.name) if content_vectors else None for p in block]
+        skipped = start + sum(embedding is not None for embedding in known)
+        ingested = ingest_files_cached(
+            mt, block, known, **_embedding_progress(on_progress, f"{media_type} files", skipped, total_files)
         )
 
-        if content_vectors and file_path.name in content_vectors:
-            embedding = content_vectors[file_path.name]
-        else:
-            embedding = mt.embed_media(file_path)
-            if embedding is None:
+        for file_path, item in zip(block, ingested):
+            if item is None or item.embedding is None:
                 continue
 
-        with open(file_path, "rb") as f:
-            file_bytes = f.read()
-
-        # Build the base clip dict
-        clip_data: dict[str, Any] = {
-            "id": clip_id,
-            "type": mt.type_id,
-            "file_size": len(file_bytes),
-            "md5": hashlib.md5(file_bytes).hexdigest(),
-            "embedding": embedding,
-            "filename": file_path.name,
-            "category": "custom",
-            "origin": origin,
-            "origin_name": file_path.name,
-            # Null-out all optional media fields so clips from different types
-            # stored in the same dict have consistent keys.
-            "wav_bytes": None,
-            "video_bytes": None,
-            "image_bytes": None,
-            "text_content": None,
-            "duration": 0,
-        }
+            # Build the base clip dict
+            clip_data: dict[str, Any] = {
+                "id": clip_id,
+                "type": mt.type_id,
+                "file_size": len(item.data),
+                "md5": item.md5,
+                "embedding": item.embedding,
+                "filename": file_path.name,
+                "category": "custom",
+                "origin": origin,
+                "origin_name": file_path.name,
+                # Null-out all optional media fields so clips from different types
+                # stored in the same dict have consistent keys.
+                "wav_bytes": None,
+                "video_bytes": None,
+                "image_bytes": None,
+                "text_content": None,
+                "duration": 0,
+            }
 
-        # Merge in media-specific fields from the media type
-        clip_data.update(mt.load_clip_data(file_path))
+            # Merge in media-specific fields from the media type
+            clip_data.update(item.clip_data)
 
-        clips[clip_id] = clip_data
-        clip_id += 1
+            clips[clip_id] = store_clip_media(clip_data)
+            clip_id += 1
 
     on_progress("idle", f"Loaded {len(clips)} {media_type} clips from folder")
 
@@ -372,7 +434,9 @@ def load_dataset_from_pickle(
     no media bytes can be resolved are silently skipped (a warning is printed to
     stdout after loading).
 
-    The ``clips`` dict is cleared before loading begins.
+    The ``clips`` dict is cleared before loading begins.  Media bytes are
+    moved into the media store (:mod:`vtsearch.utils.media_store`) clip by
+    clip.
 
     Args:
         file_path: Path to a ``.pkl`` file previously created by
@@ -496,8 +560,102 @@ def load_dataset_from_pickle(
             elif media_type == "paragraph":
                 clip_data["word_count"] = clip_info.get("word_count")
                 clip_data["character_count"] = clip_info.get("character_count")
+            # Windowed embeddings of long audio, for segment-level search
+            if clip_info.get("segment_embeddings") is not None:
+                clip_data["segment_offsets"] = np.asarray(clip_info["segment_offsets"], dtype=np.float32)
+                clip_data["segment_embeddings"] = np.asarray(clip_info["segment_embeddings"], dtype=np.float32)
+
+            clips[clip_id] = store_clip_media(clip_data)
+
+    if missing_media > 0:
+        print(f"WARNING: {missing_media} media files missing from {file_path}", flush=True)
+
+    return creation_info
+
+
+def load_dataset_from_file(
+    file_path: Path,
+    clips: dict[int, dict[str, Any]],
+    ids: Optional[Iterable[int]] = None,
+) -> dict[str, Any] | None:
+    """Load a dataset file into the clips dict in-place.
+
+    Reads the binary ``.vtds`` format (:mod:`vtsearch.datasets.dataset_file`)
+    and, for files in the legacy pickle format, falls back to
+    :func:`load_dataset_from_pickle`; the format is judged by the contents,
+    not the extension.
+
+    A ``.vtds`` file is read through a memory map: the embeddings of the
+    loaded clips are copied into one matrix, each clip's media goes straight
+    from the file into the media store and stored MD5s are used as they are.
+    Clips whose media lives in the file's ``media_dir`` and is missing there
+    are skipped, as for pickles; clips of an embeddings-only file are loaded
+    without media.  A zstd-compressed ``.vtds.zst`` is first decompressed to
+    a temporary file.
+
+    The ``clips`` dict is cleared before loading begins.
+
+    Args:
+        file_path: Path to a ``.vtds``, ``.vtds.zst`` or legacy ``.pkl``
+            dataset file.
+        clips: Dict to populate in-place.
+        ids: When given, load only the clips with these IDs (IDs not in the
+            file are ignored).
+
+    Returns:
+        The ``creation_info`` dict stored in the file (if any), or ``None``.
+    """
+    with uncompressed_path(file_path) as path:
+        if is_dataset_file(path):
+            return _load_vtds(path, clips, ids)
+
+        creation_info = load_dataset_from_pickle(path, clips)
+        if ids is not None:
+            wanted = set(ids)
+            for clip_id in [cid for cid in clips if cid not in wanted]:
+                del clips[clip_id]
+        return creation_info
+
+
+def _load_vtds(
+    file_path: Path,
+    clips: dict[int, dict[str, Any]],
+    ids: Optional[Iterable[int]],
+) -> dict[str, Any] | None:
+    """Body of :func:`load_dataset_from_file` for (uncompressed) ``.vtds`` files."""
+    clips.clear()
+    missing_media = 0
+    with DatasetReader(file_path) as reader:
+        selected = list(reader.iter_ids(ids))
+        embeddings = reader.gather_embeddings(selected)
+        media_dir = reader.media_dir
+        needs_media = not reader.embeddings_only
+        for clip_id, embedding in zip(selected, embeddings):
+            clip_data: dict[str, Any] = {
+                "wav_bytes": None,
+                "video_bytes": None,
+                "image_bytes": None,
+                "text_content": None,
+                **reader.metadata(clip_id),
+                "embedding": embedding,
+            }
+            segments = reader.segments_of(clip_id)
+            if segments is not None:
+                clip_data["segment_offsets"], clip_data["segment_embeddings"] = segments
+
+            if needs_media and clip_data.get("type", "audio") in MEDIA_FIELDS:
+                view = reader.media(clip_id)
+                if view is not None:
+                    with view:
+                        attach_clip_media(clip_data, view)
+                elif media_dir is not None and (media_dir / clip_data.get("filename", "")).is_file():
+                    attach_clip_file(clip_data, media_dir / clip_data["filename"])
+                else:
+                    missing_media += 1
+                    continue
 
             clips[clip_id] = clip_data
+        creation_info = reader.creation_info
 
     if missing_media > 0:
         print(f"WARNING: {missing_media} media files missing from {file_path}", flush=True)
@@ -505,6 +663,19 @@ def load_dataset_from_pickle(
     return creation_info
 
 
+def demo_cache_file(dataset_name: str) -> Optional[Path]:
+    """Return the cached embeddings file of demo *dataset_name*, if there is one.
+
+    Prefers ``EMBEDDINGS_DIR/<name>.vtds`` and falls back to a ``.pkl``
+    cache written by earlier versions.
+    """
+    for suffix in (DATASET_SUFFIX, ".pkl"):
+        path = EMBEDDINGS_DIR / f"{dataset_name}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
 def embed_image_file_from_pil(image: Image.Image) -> Optional[np.ndarray]:
     """Generate a CLIP embedding vector for a PIL Image object.
 
@@ -533,8 +704,8 @@ def load_demo_dataset(
 ) -> None:
     """Load a named demo dataset into the clips dict, downloading and embedding as needed.
 
-    Checks for a cached ``.pkl`` file in ``EMBEDDINGS_DIR``; if found, loads
-    from that file. If the cache is missing or the media bytes it references can
+    Checks for a cached ``.vtds`` (or legacy ``.pkl``) file in
+    ``EMBEDDINGS_DIR``; if found, loads from that file. If the cache is missing or the media bytes it references can
     no longer be found on disk, the raw data is re-downloaded and re-embedded.
 
     Supported datasets and their sources:
@@ -574,16 +745,16 @@ def load_demo_dataset(
     demo_origin: dict[str, Any] = {"importer": "demo", "params": {"name": dataset_name}}
 
     # Check if already embedded
-    pkl_file = EMBEDDINGS_DIR / f"{dataset_name}.pkl"
-    if pkl_file.exists():
+    cache_file = demo_cache_file(dataset_name)
+    if cache_file is not None:
         on_progress("loading", f"Loading {dataset_name} dataset...", 0, 0)
-        load_dataset_from_pickle(pkl_file, clips)
+        load_dataset_from_file(cache_file, clips)
 
         # Check if any clips were actually loaded
         if len(clips) == 0:
-            # Pickle file exists but media files are missing, delete and re-embed
+            # Cache file exists but media files are missing, delete and re-embed
             on_progress("loading", f"Media files missing, re-embedding {dataset_name}...", 0, 0)
-            pkl_file.unlink()
+            cache_file.unlink()
         else:
             on_progress("idle", f"Loaded {dataset_name} dataset")
             return
@@ -624,65 +795,51 @@ def load_demo_dataset(
             total = len(selected_images)
             on_progress("embedding", f"Starting embedding for {total} images...", 0, total)
 
-            for i, (image_array, category) in enumerate(zip(selected_images, selected_labels)):
-                on_progress(
-                    "embedding",
-                    f"Embedding {category}: image {i + 1}/{total}",
-                    i + 1,
-                    total,
-                )
+            # Convert numpy arrays to PIL Images and embed them in micro-batches
+            from vtsearch.media import get as media_get
+
+            image_mt = media_get("image")
+            pil_images = [Image.fromarray(image_array.astype("uint8"), "RGB") for image_array in selected_images]
+            embeddings: list[Optional[np.ndarray]] = []
+            for start in range(0, total, image_mt.embed_batch_size):
+                embeddings.extend(image_mt.embed_pil_images(pil_images[start : start + image_mt.embed_batch_size]))
+                on_progress("embedding", f"Embedding images ({len(embeddings)}/{total})", len(embeddings), total)
 
-                # Convert numpy array to PIL Image
-                img = Image.fromarray(image_array.astype("uint8"), "RGB")
+            for img, category, embedding in zip(pil_images, selected_labels, embeddings):
+                if embedding is None:
+                    continue
 
                 # Convert to bytes
                 img_buffer = io.BytesIO()
                 img.save(img_buffer, format="PNG")
                 image_bytes = img_buffer.getvalue()
 
-                # Get embedding via registry
-                embedding = embed_image_file_from_pil(img)
-                if embedding is None:
-                    continue
-
                 fname = f"{category}_{clip_id}.png"
-                clips[clip_id] = {
-                    "id": clip_id,
-                    "type": "image",
-                    "duration": 0,  # Images don't have duration
-                    "file_size": len(image_bytes),
-                    "md5": hashlib.md5(image_bytes).hexdigest(),
-                    "embedding": embedding,
-                    "wav_bytes": None,
-                    "video_bytes": None,
-                    "image_bytes": image_bytes,
-                    "text_content": None,
-                    "filename": fname,
-                    "category": category,
-                    "width": img.width,
-                    "height": img.height,
-                    "origin": demo_origin,
-                    "origin_name": fname,
-                }
+                clips[clip_id] = store_clip_media(
+                    {
+                        "id": clip_id,
+                        "type": "image",
+                        "duration": 0,  # Images don't have duration
+                        "file_size": len(image_bytes),
+                        "md5": hashlib.md5(image_bytes).hexdigest(),
+                        "embedding": embedding,
+                        "wav_bytes": None,
+                        "video_bytes": None,
+                        "image_bytes": image_bytes,
+                        "text_content": None,
+                        "filename": fname,
+                        "category": category,
+                        "width": img.width,
+                        "height": img.height,
+                        "origin": demo_origin,
+                        "origin_name": fname,
+                    }
+                )
                 clip_id += 1
 
             # Save for future use
             EMBEDDINGS_DIR.mkdir(parents=True, exist_ok=True)
-            with open(pkl_file, "wb") as f:
-                pickle.dump(
-                    {
-                        "name": dataset_name,
-                        "clips": {
-                            cid: {
-                                k: v.tolist() if isinstance(v, np.ndarray) else v
-                                for k, v in clip.items()
-                                if k not in ["wav_bytes", "video_bytes"]
-                            }
-                            for cid, clip in clips.items()
-                        },
-                    },
-                    f,
-                )
+            write_dataset(EMBEDDINGS_DIR / f"{dataset_name}{DATASET_SUFFIX}", clips, name=dataset_name)
 
             on_progress("idle", f"Loaded {dataset_name} dataset")
             return
@@ -713,64 +870,34 @@ def load_demo_dataset(
             total = len(selected)
             on_progress("embedding", f"Starting embedding for {total} images...", 0, total)
 
-            for i, (img_path, category) in enumerate(selected):
-                on_progress(
-                    "embedding",
-                    f"Embedding {category}: {img_path.name} ({i + 1}/{total})",
-                    i + 1,
-                    total,
-                )
+            ingested = _ingest_in_blocks(image_mt, [img_path for img_path, _ in selected], on_progress, "images")
 
-                embedding = image_mt.embed_media(img_path)
-                if embedding is None:
+            for (img_path, category), item in zip(selected, ingested):
+                if item is None or item.embedding is None:
                     continue
 
-                with open(img_path, "rb") as f:
-                    image_bytes = f.read()
-
-                try:
-                    img = Image.open(img_path)
-                    width, height = img.width, img.height
-                except Exception:
-                    width, height = None, None
-
-                clips[clip_id] = {
-                    "id": clip_id,
-                    "type": "image",
-                    "duration": 0,
-                    "file_size": len(image_bytes),
-                    "md5": hashlib.md5(image_bytes).hexdigest(),
-                    "embedding": embedding,
-                    "wav_bytes": None,
-                    "video_bytes": None,
-                    "image_bytes": image_bytes,
-                    "text_content": None,
-                    "filename": img_path.name,
-                    "category": category,
-                    "width": width,
-                    "height": height,
-                    "origin": demo_origin,
-                    "origin_name": img_path.name,
-                }
+                clips[clip_id] = store_clip_media(
+                    {
+                        "id": clip_id,
+                        "type": "image",
+                        "file_size": len(item.data),
+                        "md5": item.md5,
+                        "embedding": item.embedding,
+                        "wav_bytes": None,
+                        "video_bytes": None,
+                        "text_content": None,
+                        "filename": img_path.name,
+                        "category": category,
+                        "origin": demo_origin,
+                        "origin_name": img_path.name,
+                        **item.clip_data,
+                    }
+                )
                 clip_id += 1
 
             # Save for future use
             EMBEDDINGS_DIR.mkdir(parents=True, exist_ok=True)
-            with open(pkl_file, "wb") as f:
-                pickle.dump(
-                    {
-                        "name": dataset_name,
-                        "clips": {
-                            cid: {
-                                k: v.tolist() if isinstance(v, np.ndarray) else v
-                                for k, v in clip.items()
-                                if k not in ["wav_bytes", "video_bytes"]
-                            }
-                            for cid, clip in clips.items()
-                        },
-                    },
-                    f,
-                )
+            write_dataset(EMBEDDINGS_DIR / f"{dataset_name}{DATASET_SUFFIX}", clips, name=dataset_name)
 
             on_progress("idle", f"Loaded {dataset_name} dataset")
             return
@@ -812,27 +939,20 @@ def load_demo_dataset(
                 total,
             )
 
-            for i, (text_content, category) in enumerate(zip(selected_texts, selected_categories)):
-                on_progress(
-                    "embedding",
-                    f"Embedding {category}: paragraph {i + 1}/{total}",
-                    i + 1,
-                    total,
-                )
+            passages = [(text.strip(), category) for text, category in zip(selected_texts, selected_categories)]
+            passages = [(text, category) for text, category in passages if text]
 
-                # Truncate very long texts (keep first 1000 chars for demo)
-                text_content = text_content[:1000].strip()
-                if not text_content:
-                    continue
+            # Embed via text media type; long articles are chunked and pooled,
+            # and all chunks are embedded in length-sorted batches
+            chunked = text_mt.embed_passage_chunks(
+                [text for text, _ in passages],
+                on_batch=lambda done, chunks: on_progress(
+                    "embedding", f"Embedding paragraphs ({done}/{chunks} chunks)", done, chunks
+                ),
+            )
 
-                # Embed via text media type
-                try:
-                    embedding = text_mt.embed_text_passage(text_content)
-                except Exception as e:
-                    print(f"Error embedding paragraph: {e}")
-                    continue
-
-                if embedding is None:
+            for (text_content, category), segments in zip(passages, chunked):
+                if segments is None:
                     continue
 
                 word_count = len(text_content.split())
@@ -846,7 +966,7 @@ def load_demo_dataset(
                     "duration": 0,  # Paragraphs don't have duration
                     "file_size": len(text_bytes),
                     "md5": hashlib.md5(text_bytes).hexdigest(),
-                    "embedding": embedding,
+                    "embedding": segments.pooled,
                     "wav_bytes": None,
                     "video_bytes": None,
                     "image_bytes": None,
@@ -858,25 +978,14 @@ def load_demo_dataset(
                     "origin": demo_origin,
                     "origin_name": fname,
                 }
+                if TEXT_CHUNK_EMBEDDINGS and len(segments.offsets) > 1:
+                    clips[clip_id]["segment_offsets"] = segments.offsets
+                    clips[clip_id]["segment_embeddings"] = segments.embeddings
                 clip_id += 1
 
             # Save for future use
             EMBEDDINGS_DIR.mkdir(parents=True, exist_ok=True)
-            with open(pkl_file, "wb") as f:
-                pickle.dump(
-                    {
-                        "name": dataset_name,
-                        "clips": {
-                            cid: {
-                                k: v.tolist() if isinstance(v, np.ndarray) else v
-                                for k, v in clip.items()
-                                if k not in ["wav_bytes", "video_bytes", "image_bytes"]
-                            }
-                            for cid, clip in clips.items()
-                        },
-                    },
-                    f,
-                )
+            write_dataset(EMBEDDINGS_DIR / f"{dataset_name}{DATASET_SUFFIX}", clips, name=dataset_name)
 
             on_progress("idle", f"Loaded {dataset_name} dataset")
             return
@@ -906,57 +1015,37 @@ def load_demo_dataset(
             total = len(video_files)
             on_progress("embedding", f"Starting embedding for {total} video files...", 0, total)
 
-            for i, (video_path, meta) in enumerate(video_files):
-                on_progress(
-                    "embedding",
-                    f"Embedding {meta['category']}: {video_path.name} ({i + 1}/{total})",
-                    i + 1,
-                    total,
-                )
+            ingested = _ingest_in_blocks(video_mt, [video_path for video_path, _ in video_files], on_progress, "videos")
 
-                embedding = video_mt.embed_media(video_path)
-                if embedding is None:
+            for (video_path, meta), item in zip(video_files, ingested):
+                if item is None or item.embedding is None:
                     continue
 
-                with open(video_path, "rb") as f:
-                    video_bytes = f.read()
-
-                media_fields = video_mt.load_clip_data(video_path)
-
-                clips[clip_id] = {
-                    "id": clip_id,
-                    "type": "video",
-                    "duration": media_fields["duration"],
-                    "file_size": len(video_bytes),
-                    "md5": hashlib.md5(video_bytes).hexdigest(),
-                    "embedding": embedding,
-                    "wav_bytes": None,
-                    "video_bytes": video_bytes,
-                    "filename": video_path.name,
-                    "category": meta["category"],
-                    "origin": demo_origin,
-                    "origin_name": video_path.name,
-                }
+                clips[clip_id] = store_clip_media(
+                    {
+                        "id": clip_id,
+                        "type": "video",
+                        "file_size": len(item.data),
+                        "md5": item.md5,
+                        "embedding": item.embedding,
+                        "wav_bytes": None,
+                        "filename": video_path.name,
+                        "category": meta["category"],
+                        "origin": demo_origin,
+                        "origin_name": video_path.name,
+                        **item.clip_data,
+                    }
+                )
                 clip_id += 1
 
             # Save for future use
             EMBEDDINGS_DIR.mkdir(parents=True, exist_ok=True)
-            with open(pkl_file, "wb") as f:
-                pickle.dump(
-                    {
-                        "name": dataset_name,
-                        "clips": {
-                            cid: {
-                                k: v.tolist() if isinstance(v, np.ndarray) else v
-                                for k, v in clip.items()
-                                if k not in ["wav_bytes", "video_bytes"]
-                            }
-                            for cid, clip in clips.items()
-                        },
-                        "video_dir": str(video_dir.absolute()),
-                    },
-                    f,
-                )
+            write_dataset(
+                EMBEDDINGS_DIR / f"{dataset_name}{DATASET_SUFFIX}",
+                clips,
+                name=dataset_name,
+                media_dir=video_dir.absolute(),
+            )
 
             on_progress("idle", f"Loaded {dataset_name} dataset")
             return
@@ -983,59 +1072,42 @@ def load_demo_dataset(
     total = len(audio_files)
     on_progress("embedding", f"Starting embedding for {total} audio files...", 0, total)
 
-    for i, (audio_path, meta) in enumerate(audio_files):
-        on_progress(
-            "embedding",
-            f"Embedding {meta['category']}: {audio_path.name} ({i + 1}/{total})",
-            i + 1,
-            total,
-        )
+    ingested = _ingest_in_blocks(audio_mt, [audio_path for audio_path, _ in audio_files], on_progress, "audio files")
 
-        embedding = audio_mt.embed_media(audio_path)
-        if embedding is None:
+    for (audio_path, meta), item in zip(audio_files, ingested):
+        if item is None or item.embedding is None:
             continue
 
-        with open(audio_path, "rb") as f:
-            wav_bytes = f.read()
-
-        media_fields = audio_mt.load_clip_data(audio_path)
-
-        clips[clip_id] = {
-            "id": clip_id,
-            "type": "audio",
-            "duration": media_fields["duration"],
-            "file_size": len(wav_bytes),
-            "md5": hashlib.md5(wav_bytes).hexdigest(),
-            "embedding": embedding,
-            "wav_bytes": wav_bytes,
-            "video_bytes": None,
-            "filename": audio_path.name,
-            "category": meta["category"],
-            "origin": demo_origin,
-            "origin_name": audio_path.name,
-        }
+        clips[clip_id] = store_clip_media(
+            {
+                "id": clip_id,
+                "type": "audio",
+                "file_size": len(item.data),
+                "md5": item.md5,
+                "embedding": item.embedding,
+                "video_bytes": None,
+                "filename": audio_path.name,
+                "category": meta["category"],
+                "origin": demo_origin,
+                "origin_name": audio_path.name,
+                **item.clip_data,
+            }
+        )
         clip_id += 1
 
     # Save for future use
     EMBEDDINGS_DIR.mkdir(parents=True, exist_ok=True)
-    with open(pkl_file, "wb") as f:
-        pickle.dump(
-            {
-                "name": dataset_name,
-                "clips": {
-                    cid: {
-                        k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in clip.items() if k != "wav_bytes"
-                    }
-                    for cid, clip in clips.items()
-                },
-                "audio_dir": str(audio_dir.absolute()),
-            },
-            f,
-        )
+    write_dataset(
+        EMBEDDINGS_DIR / f"{dataset_name}{DATASET_SUFFIX}", clips, name=dataset_name, media_dir=audio_dir.absolute()
+    )
 
     on_progress("idle", f"Loaded {dataset_name} dataset")
 
 
+def _as_list(value: Any) -> Any:
+    return value.tolist() if isinstance(value, np.ndarray) else value
+
+
 def export_dataset_to_file(
     clips: dict[int, dict[str, Any]],
     creation_info: dict[str, Any] | None = None,
@@ -1045,6 +1117,8 @@ def export_dataset_to_file(
     Converts the in-memory ``clips`` dict to a portable format (converting any
     ``numpy.ndarray`` embeddings to plain Python lists) and returns it as bytes
     suitable for writing to a ``.pkl`` file or sending as an HTTP response.
+    Media held in the media store is read back in, so the pickle carries
+    every clip's bytes inline.
 
     The resulting bytes can be reloaded with :func:`load_dataset_from_pickle`.
 
@@ -1073,14 +1147,14 @@ def export_dataset_to_file(
                 "category": clip.get("category", "unknown"),
                 "origin": clip.get("origin"),
                 "origin_name": clip.get("origin_name", clip.get("filename", "")),
-                "wav_bytes": clip.get("wav_bytes"),
-                "video_bytes": clip.get("video_bytes"),
-                "image_bytes": clip.get("image_bytes"),
+                **inline_media(clip),
                 "text_content": clip.get("text_content"),
                 "word_count": clip.get("word_count"),
                 "character_count": clip.get("character_count"),
                 "width": clip.get("width"),
                 "height": clip.get("height"),
+                "segment_offsets": _as_list(clip.get("segment_offsets")),
+                "segment_embeddings": _as_list(clip.get("segment_embeddings")),
             }
             for cid, clip in clips.items()
         }
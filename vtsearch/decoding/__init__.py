@@ -0,0 +1,33 @@
+"""Media decoding that can run in worker processes ahead of the embedding models.
+
+* :mod:`~vtsearch.decoding.decoders` — picklable file-to-array decoders
+  returning :class:`Decoded` (array plus clip fields), and streaming
+  windowed audio for files too long for one model input.
+* :mod:`~vtsearch.decoding.pipeline` — :func:`decode_and_embed`, which runs a
+  decoder in a process pool and feeds a single embedding consumer.
+
+Nothing here imports the models, so worker processes stay light.
+"""
+
+from vtsearch.decoding.decoders import (
+    Decoded,
+    audio_duration,
+    decode_audio,
+    decode_image,
+    decode_video_frames,
+    sliding_windows,
+    stream_audio,
+)
+from vtsearch.decoding.pipeline import decode_and_embed, default_workers
+
+__all__ = [
+    "Decoded",
+    "audio_duration",
+    "decode_and_embed",
+    "decode_audio",
+    "decode_image",
+    "decode_video_frames",
+    "default_workers",
+    "sliding_windows",
+    "stream_audio",
+]
@@ -0,0 +1,241 @@
+"""Decoders that turn media files into ready-to-embed arrays.
+
+Each decoder is a plain module-level function of a file path (bind extra
+arguments with :func:`functools.partial`) so that it can be pickled and run
+in a worker process by :func:`~vtsearch.decoding.pipeline.decode_and_embed`.
+Heavy libraries are imported inside the functions, and this module must not
+import :mod:`vtsearch.media` or :mod:`vtsearch.models`: worker processes
+import it and nothing else.
+
+Decoders return a :class:`Decoded` pair: the array for the model and the
+clip fields that fall out of the same decode (duration, image size), so the
+file does not have to be decoded again to fill in the clip.  Callers that
+already hold the file's bytes can pass them as *data* to avoid reopening it.
+Decoders return ``None`` (after printing the error) for files they cannot
+read, mirroring :meth:`~vtsearch.media.base.MediaType.embed_media`.
+
+Audio too long for one model input is instead streamed with
+:func:`stream_audio` and cut into overlapping windows by
+:func:`sliding_windows`, holding only a window and a block at a time.
+"""
+
+from __future__ import annotations
+
+import io
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
+
+
+class Decoded(NamedTuple):
+    """A decoded file: the array to embed and clip fields found while decoding it."""
+
+    array: np.ndarray
+    info: dict[str, Any]
+
+
+def decode_audio(file_path: Path, sample_rate: int, data: bytes | None = None) -> Decoded | None:
+    """Decode *file_path* to a mono float32 signal at *sample_rate*; ``info`` has its ``duration``."""
+    import librosa
+
+    try:
+        try:
+            signal, _sr = librosa.load(io.BytesIO(data) if data is not None else file_path, sr=sample_rate, mono=True)
+        except Exception:
+            if data is None:
+                raise
+            # Formats only audioread can open (e.g. m4a) need a real path
+            signal, _sr = librosa.load(file_path, sr=sample_rate, mono=True)
+    except Exception as e:
+        print(f"Error decoding {file_path}: {e}")
+        return None
+    return Decoded(signal, {"duration": len(signal) / sample_rate})
+
+
+def decode_image(file_path: Path, data: bytes | None = None) -> Decoded | None:
+    """Decode *file_path* to an ``(H, W, 3)`` uint8 RGB array; ``info`` has ``width`` and ``height``."""
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(data) if data is not None else file_path) as image:
+            return Decoded(np.asarray(image.convert("RGB")), {"width": image.width, "height": image.height})
+    except Exception as e:
+        print(f"Error decoding {file_path}: {e}")
+        return None
+
+
+def decode_video_frames(
+    file_path: Path, num_frames: int, size: int | None = None, data: bytes | None = None
+) -> Decoded | None:
+    """Decode up to *num_frames* evenly spaced RGB frames as an ``(F, H, W, 3)`` uint8 array.
+
+    Frames are read front to back in one pass.  Between targets the reader
+    either grabs forward (decoding frames without converting them to RGB)
+    or seeks, which decodes again from the previous keyframe.  Which is
+    cheaper depends on the keyframe spacing, which OpenCV does not expose,
+    so both are timed on the file and each gap uses whichever is expected
+    to cost less (see :func:`_should_seek`).
+    With *size*, each kept frame is shrunk so its shorter side is *size*
+    pixels before colour conversion.  ``info`` has the video's ``duration``.
+    OpenCV only reads from paths, so *data* is accepted for symmetry with
+    the other decoders but not used.
+    """
+    try:
+        import cv2  # noqa: PLC0415  (lazy import — cv2 is optional)
+
+        cap = cv2.VideoCapture(str(file_path))
+        if not cap.isOpened():
+            print(f"Error opening video {file_path}")
+            return None
+
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            count = min(num_frames, max(1, frame_count))
+            targets = np.linspace(0, max(0, frame_count - 1), count, dtype=int)
+
+            frames = []
+            position = 0
+            grab_cost = seek_cost = None  # measured seconds per grabbed frame / per seek
+            for target in targets:
+                gap = int(target) - position
+                if gap > 1 and _should_seek(gap, grab_cost, seek_cost):
+                    started = time.perf_counter()
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, int(target))
+                    seek_cost = time.perf_counter() - started
+                    position = int(target)
+                elif gap > 0:
+                    started = time.perf_counter()
+                    while position < target and cap.grab():
+                        position += 1
+                    grab_cost = (time.perf_counter() - started) / gap
+                if position < target:
+                    break  # the container has fewer frames than it reported
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                position += 1
+                frames.append(cv2.cvtColor(_shrink(cv2, frame, size), cv2.COLOR_BGR2RGB))
+        finally:
+            cap.release()
+    except Exception as e:
+        print(f"Error decoding {file_path}: {e}")
+        return None
+
+    if not frames:
+        print(f"Error: could not extract frames from {file_path}")
+        return None
+    return Decoded(np.stack(frames), {"duration": frame_count / fps if fps > 0 else 0.0})
+
+
+def _should_seek(gap: int, grab_cost: float | None, seek_cost: float | None) -> bool:
+    """Whether to seek over *gap* frames rather than grab through them.
+
+    The first gap is always grabbed and the next one seeked, to measure
+    both; after that a seek wins when grabbing the gap would take longer
+    than the last seek did.  With sparse keyframes (one per file is common
+    for short clips) seeks cost about as much as decoding from the start,
+    so the reader settles on a single sequential pass.
+    """
+    if grab_cost is None:
+        return False
+    if seek_cost is None:
+        return True
+    return gap * grab_cost > seek_cost
+
+
+def _shrink(cv2: Any, frame: np.ndarray, size: int | None) -> np.ndarray:
+    """Resize *frame* so its shorter side is *size* pixels; frames already that small are kept."""
+    height, width = frame.shape[:2]
+    if size is None or min(height, width) <= size:
+        return frame
+    scale = size / min(height, width)
+    # Area averaging avoids aliasing on large reductions but costs several
+    # times more than bilinear, which is enough for reductions under 2x
+    interpolation = cv2.INTER_AREA if scale < 0.5 else cv2.INTER_LINEAR
+    return cv2.resize(frame, (round(width * scale), round(height * scale)), interpolation=interpolation)
+
+
+def audio_duration(file_path: Path) -> float | None:
+    """Return the length of an audio file in seconds from its header, or ``None`` if unreadable."""
+    import soundfile as sf
+
+    try:
+        return float(sf.info(str(file_path)).duration)
+    except Exception:
+        pass
+    import librosa
+
+    try:
+        return float(librosa.get_duration(path=file_path))
+    except Exception:
+        return None
+
+
+def stream_audio(file_path: Path, sample_rate: int, block_frames: int) -> Iterator[np.ndarray]:
+    """Yield the mono signal of *file_path* at *sample_rate* in consecutive float32 blocks.
+
+    The file is read *block_frames* source frames at a time and resampled
+    incrementally, so memory does not grow with the file's length.  Formats
+    that :mod:`soundfile` cannot open are decoded whole with
+    :func:`decode_audio` and yielded as a single block.
+    """
+    import soundfile as sf
+
+    try:
+        f = sf.SoundFile(str(file_path))
+    except Exception:
+        decoded = decode_audio(file_path, sample_rate)
+        if decoded is not None:
+            yield decoded.array
+        return
+
+    with f:
+        resampler = None
+        if f.samplerate != sample_rate:
+            import soxr
+
+            resampler = soxr.ResampleStream(f.samplerate, sample_rate, 1, dtype="float32")
+        while True:
+            block = f.read(block_frames, dtype="float32", always_2d=True)
+            last = len(block) < block_frames
+            mono = block.mean(axis=1)
+            if resampler is not None:
+                mono = resampler.resample_chunk(mono, last=last)
+            if len(mono):
+                yield mono
+            if last:
+                return
+
+
+def sliding_windows(blocks: Iterable[np.ndarray], window: int, hop: int) -> Iterator[tuple[int, np.ndarray]]:
+    """Cut a stream of signal *blocks* into windows of *window* samples every *hop* samples.
+
+    Yields ``(start, samples)`` pairs, where *start* is the window's first
+    sample.  The first window is always yielded; later ones only while they
+    reach past the end of the previous window, so the last window may be
+    shorter than *window*.  Only about one window plus one block is held at
+    a time.
+    """
+    buf = np.zeros(0, dtype=np.float32)
+    buf_start = start = 0
+    blocks = iter(blocks)
+    exhausted = False
+    while True:
+        while not exhausted and buf_start + len(buf) < start + window:
+            block = next(blocks, None)
+            if block is None:
+                exhausted = True
+            else:
+                buf = np.concatenate([buf, np.asarray(block, dtype=np.float32)])
+        end = buf_start + len(buf)
+        if start >= end or (start > 0 and end <= start + window - hop):
+            return
+        yield start, buf[start - buf_start : start - buf_start + window].copy()
+        start += hop
+        if start > buf_start:
+            buf = buf[start - buf_start :]
+            buf_start = start
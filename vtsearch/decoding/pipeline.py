@@ -0,0 +1,231 @@
+"""Producer/consumer pipeline: decode in worker processes, embed on one consumer.
+
+Decoding (``librosa`` resampling, video frame seeking, image decompression)
+is CPU-bound and independent per file, while inference runs on a single
+model.  :func:`decode_and_embed` therefore runs a picklable *decoder* (see
+:mod:`vtsearch.decoding.decoders`) in a process pool and feeds its output to
+an *embed* function on the calling thread in batches, together with the
+clip fields each decoder reports (:class:`~vtsearch.decoding.decoders.Decoded`).
+
+Workers write each decoded array into a :mod:`multiprocessing.shared_memory`
+block and only send its name, shape and dtype back, so large signals and
+frame stacks are not pickled through a pipe.  At most ``max_pending`` files
+are being decoded or waiting for the consumer at any time, which bounds
+memory when decoding outpaces inference.
+
+Workers are started with the ``forkserver`` method where available, with
+only :mod:`vtsearch.decoding.decoders` preloaded, so they neither inherit
+the parent's threads nor import the models.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from config import INGEST_DECODE_WORKERS, INGEST_QUEUE_SIZE
+from vtsearch.decoding.decoders import Decoded
+
+Decoder = Callable[[Path], "Decoded | None"]
+EmbedBatch = Callable[[list[np.ndarray]], "list[np.ndarray | None]"]
+StageCallback = Callable[[str, int, int], None]
+
+
+class _SharedArray(NamedTuple):
+    """Handle to a decoded array a worker left in shared memory."""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+    info: dict[str, Any]
+
+
+def _decode_to_shared_memory(decoder: Decoder, file_path: Path) -> _SharedArray | None:
+    """Worker side: decode *file_path* and copy the result into a new shared-memory block."""
+    decoded = decoder(file_path)
+    if decoded is None:
+        return None
+    array = np.ascontiguousarray(decoded.array)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    try:
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    finally:
+        shm.close()
+    return _SharedArray(shm.name, array.shape, array.dtype.str, decoded.info)
+
+
+def _attach(ref: _SharedArray) -> tuple[shared_memory.SharedMemory, np.ndarray]:
+    shm = shared_memory.SharedMemory(name=ref.name)
+    return shm, np.ndarray(ref.shape, dtype=np.dtype(ref.dtype), buffer=shm.buf)
+
+
+def _release(shm: shared_memory.SharedMemory) -> None:
+    shm.close()
+    shm.unlink()
+
+
+def _discard(future: Future) -> None:
+    """Free the shared memory of a finished but unconsumed decode."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    ref = future.result()
+    if ref is not None:
+        shm = shared_memory.SharedMemory(name=ref.name)
+        _release(shm)
+
+
+def default_workers() -> int:
+    """Number of decode processes to use: ``INGEST_DECODE_WORKERS`` or all but one CPU."""
+    if INGEST_DECODE_WORKERS is not None:
+        return max(0, INGEST_DECODE_WORKERS)
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def _context() -> multiprocessing.context.BaseContext:
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["vtsearch.decoding.decoders"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def decode_and_embed(
+    decoder: Decoder,
+    embed_batch: EmbedBatch,
+    file_paths: Sequence[Path],
+    batch_size: int,
+    workers: int | None = None,
+    max_pending: int = INGEST_QUEUE_SIZE,
+    on_stage: StageCallback | None = None,
+    datas: Sequence[bytes | memoryview | None] | None = None,
+) -> Iterator[tuple[list[int], list[np.ndarray | None], list[dict[str, Any] | None]]]:
+    """Decode *file_paths* in worker processes and embed them in batches.
+
+    Args:
+        decoder: Picklable function mapping a path to a
+            :class:`~vtsearch.decoding.decoders.Decoded` (or ``None``).
+        embed_batch: Called on the calling thread with up to *batch_size*
+            decoded arrays; returns one embedding (or ``None``) per array.
+        file_paths: Files to process.
+        batch_size: Maximum number of arrays per *embed_batch* call.
+        workers: Decode processes; defaults to :func:`default_workers`.
+            With fewer than two, files are decoded on the calling thread.
+        max_pending: Upper bound on files being decoded or waiting to be
+            embedded (the queue between the two stages).
+        on_stage: Called as ``on_stage(stage, done, total)`` with stage
+            ``"decoded"`` after each file is decoded and ``"embedded"`` after
+            each batch is embedded.
+        datas: Contents of each file the caller already holds, passed to
+            *decoder* as ``data=`` when files are decoded on the calling
+            thread so they are not read again.  Worker processes always
+            open the paths.
+
+    Yields:
+        ``(indices, embeddings, infos)`` per batch, where *indices* are
+        positions in *file_paths* and *infos* are the decoders' clip fields.
+        Files that fail to decode are yielded on their own with ``None``
+        for both.  Batches arrive in completion order.
+    """
+    total = len(file_paths)
+    batch_size = max(1, batch_size)
+    workers = default_workers() if workers is None else workers
+    report = on_stage or (lambda stage, done, total: None)
+
+    if workers < 2 or total <= batch_size:
+        yield from _decode_and_embed_serial(decoder, embed_batch, file_paths, batch_size, report, datas)
+        return
+
+    decoded = embedded = 0
+    upcoming = iter(enumerate(file_paths))
+    pending: dict[Future, int] = {}
+    ready: list[tuple[int, shared_memory.SharedMemory, np.ndarray, dict[str, Any]]] = []
+    executor = ProcessPoolExecutor(max_workers=min(workers, total), mp_context=_context())
+
+    def fill() -> None:
+        while len(pending) + len(ready) < max(max_pending, batch_size):
+            item = next(upcoming, None)
+            if item is None:
+                return
+            pending[executor.submit(_decode_to_shared_memory, decoder, item[1])] = item[0]
+
+    try:
+        fill()
+        while pending or ready:
+            # Wait for a full batch unless every remaining file is already decoded
+            while pending and len(ready) < batch_size:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    decoded += 1
+                    report("decoded", decoded, total)
+                    try:
+                        ref = future.result()
+                    except Exception as e:
+                        print(f"Error decoding {file_paths[index]}: {e}")
+                        ref = None
+                    if ref is None:
+                        embedded += 1
+                        yield [index], [None], [None]
+                        continue
+                    shm, array = _attach(ref)
+                    ready.append((index, shm, array, ref.info))
+                fill()
+
+            batch, ready = ready[:batch_size], ready[batch_size:]
+            if not batch:
+                continue
+            try:
+                embeddings = embed_batch([array for _, _, array, _ in batch])
+            finally:
+                for _, shm, _, _ in batch:
+                    _release(shm)
+            embedded += len(batch)
+            report("embedded", embedded, total)
+            fill()
+            yield [item[0] for item in batch], embeddings, [item[3] for item in batch]
+    finally:
+        for _, shm, _, _ in ready:
+            _release(shm)
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+        for future in pending:
+            _discard(future)
+
+
+def _decode_and_embed_serial(
+    decoder: Decoder,
+    embed_batch: EmbedBatch,
+    file_paths: Sequence[Path],
+    batch_size: int,
+    report: StageCallback,
+    datas: Sequence[bytes | memoryview | None] | None = None,
+) -> Iterator[tuple[list[int], list[np.ndarray | None], list[dict[str, Any] | None]]]:
+    total = len(file_paths)
+    for start in range(0, total, batch_size):
+        indices, arrays, infos = [], [], []
+        for index in range(start, min(start + batch_size, total)):
+            try:
+                data = datas[index] if datas is not None else None
+                decoded = decoder(file_paths[index]) if data is None else decoder(file_paths[index], data=data)
+            except Exception as e:
+                print(f"Error decoding {file_paths[index]}: {e}")
+                decoded = None
+            report("decoded", index + 1, total)
+            if decoded is None:
+                yield [index], [None], [None]
+            else:
+                indices.append(index)
+                arrays.append(decoded.array)
+                infos.append(decoded.info)
+        if arrays:
+            embeddings = embed_batch(arrays)
+            report("embedded", start + len(indices), total)
+            yield indices, embeddings, infos
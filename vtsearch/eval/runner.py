@@ -40,14 +40,18 @@ def _run_text_sort_query(
     query: EvalQuery,
     clips: dict[int, dict[str, Any]],
     media_type: str,
+    text_vec: np.ndarray | None = None,
 ) -> list[dict[str, Any]]:
     """Embed the query text and rank clips by cosine similarity.
 
+    Pass *text_vec* when the query has already been embedded.
+
     Returns a list of ``{"id": int, "similarity": float}`` sorted descending.
     """
     from vtsearch.models.embeddings import embed_text_query
 
-    text_vec = embed_text_query(query.text, media_type)
+    if text_vec is None:
+        text_vec = embed_text_query(query.text, media_type)
     if text_vec is None:
         raise RuntimeError(f"Could not embed query {query.text!r} for media type {media_type}")
 
@@ -81,10 +85,12 @@ def eval_text_sort(
         List of :class:`~vtsearch.eval.metrics.QueryMetrics`.
     """
     from vtsearch.eval.metrics import QueryMetrics
+    from vtsearch.models.embeddings import embed_text_queries
 
     results: list[QueryMetrics] = []
-    for query in queries:
-        ranked = _run_text_sort_query(query, clips, media_type)
+    text_vecs = embed_text_queries([query.text for query in queries], media_type)
+    for query, text_vec in zip(queries, text_vecs):
+        ranked = _run_text_sort_query(query, clips, media_type, text_vec)
         ranked_ids = [r["id"] for r in ranked]
         relevant_ids = {cid for cid, c in clips.items() if c.get("category") == query.target_category}
 
@@ -25,10 +25,12 @@ import numpy as np
 import pandas as pd
 import torch
 
-from vtsearch.models.training import (
-    calculate_cross_calibration_threshold,
-    train_model,
-)
+from vtsearch.models.training import train_calibrated_models
+from vtsearch.utils.clip_store import gather_embeddings
+
+# Voting steps trained together (three models each: two calibration halves
+# plus the final model).
+_STEPS_PER_BATCH = 16
 
 
 # ------------------------------------------------------------------
@@ -79,8 +81,7 @@ def _evaluate_on_test(
     if not test_ids:
         return {"cost": float("nan"), "fpr": float("nan"), "fnr": float("nan")}
 
-    embs = np.array([clips_dict[cid]["embedding"] for cid in test_ids])
-    X = torch.tensor(embs, dtype=torch.float32)
+    X = torch.from_numpy(gather_embeddings(clips_dict, test_ids))
 
     with torch.no_grad():
         scores = model(X).squeeze(1).tolist()
@@ -149,8 +150,15 @@ def simulate_voting_iterations(
 
     good_votes: dict[int, None] = {}
     bad_votes: dict[int, None] = {}
-    rows: list[dict[str, Any]] = []
 
+    # Every voted clip gets one row of the training matrix; each step trains
+    # on an (ordered) subset of those rows.
+    row_of = {cid: row for row, (cid, _) in enumerate(vote_seq)}
+    X = gather_embeddings(clips_dict, list(row_of))
+    y = np.array([1.0 if label == "good" else 0.0 for _, label in vote_seq])
+
+    steps: list[int] = []
+    subsets: list[np.ndarray] = []
     for t, (cid, label) in enumerate(vote_seq, start=1):
         if label == "good":
             good_votes[cid] = None
@@ -161,36 +169,32 @@ def simulate_voting_iterations(
         if not good_votes or not bad_votes:
             continue
 
-        # Build training data
-        X_list: list[np.ndarray] = []
-        y_list: list[float] = []
-        for vid in good_votes:
-            X_list.append(clips_dict[vid]["embedding"])
-            y_list.append(1.0)
-        for vid in bad_votes:
-            X_list.append(clips_dict[vid]["embedding"])
-            y_list.append(0.0)
-
-        X = torch.tensor(np.array(X_list), dtype=torch.float32)
-        y = torch.tensor(y_list, dtype=torch.float32).unsqueeze(1)
-        input_dim = X.shape[1]
-
-        # Train and find threshold (mirrors train_and_score)
-        threshold = calculate_cross_calibration_threshold(X_list, y_list, input_dim, inclusion, rng=rng)
-        model = train_model(X, y, input_dim, inclusion)
-
-        # Evaluate on held-out test set
-        metrics = _evaluate_on_test(model, threshold, clips_dict, test_ids, target_category, inclusion)
-
-        rows.append(
-            {
-                "seed": seed,
-                "dataset": dataset_name,
-                "category": target_category,
-                "t": t,
-                **metrics,
-            }
-        )
+        steps.append(t)
+        subsets.append(np.array([row_of[vid] for vid in list(good_votes) + list(bad_votes)], dtype=np.intp))
+
+    if not steps:
+        return []
+
+    rows: list[dict[str, Any]] = []
+    for start in range(0, len(steps), _STEPS_PER_BATCH):
+        stop = start + _STEPS_PER_BATCH
+
+        # Train and find thresholds for a batch of steps at once (mirrors train_and_score)
+        trained = train_calibrated_models(X, y, subsets[start:stop], X.shape[1], inclusion, rng=rng)
+
+        for t, (model, threshold) in zip(steps[start:stop], trained):
+            # Evaluate on held-out test set
+            metrics = _evaluate_on_test(model, threshold, clips_dict, test_ids, target_category, inclusion)
+
+            rows.append(
+                {
+                    "seed": seed,
+                    "dataset": dataset_name,
+                    "category": target_category,
+                    "t": t,
+                    **metrics,
+                }
+            )
 
     return rows
 
@@ -255,10 +259,10 @@ def run_voting_iterations_eval_from_pickles(
     inclusion: int = 0,
     sim_fraction: float = 0.5,
 ) -> pd.DataFrame:
-    """Convenience wrapper that loads datasets from pickle files.
+    """Convenience wrapper that loads datasets from ``.vtds`` (or legacy pickle) files.
 
     Args:
-        dataset_paths: Mapping of dataset name to pickle file path.
+        dataset_paths: Mapping of dataset name to dataset file path.
         seeds: List of random seeds.
         categories: Optional category filter (see :func:`run_voting_iterations_eval`).
         inclusion: Inclusion setting in ``[-10, 10]``.
@@ -267,12 +271,12 @@ def run_voting_iterations_eval_from_pickles(
     Returns:
         A :class:`~pandas.DataFrame` identical to :func:`run_voting_iterations_eval`.
     """
-    from vtsearch.datasets.loader import load_dataset_from_pickle
+    from vtsearch.datasets.loader import load_dataset_from_file
 
     dataset_clips: dict[str, dict[int, dict[str, Any]]] = {}
     for name, path in dataset_paths.items():
         clips: dict[int, dict[str, Any]] = {}
-        load_dataset_from_pickle(Path(path), clips)
+        load_dataset_from_file(Path(path), clips)
         dataset_clips[name] = clips
 
     return run_voting_iterations_eval(
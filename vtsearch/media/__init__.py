@@ -11,25 +11,251 @@ Third-party or project-specific types can be added by calling
 
 The new type will then be picked up automatically by model initialisation,
 dataset loading, HTTP routing, and the demo-dataset listing.
+
+Every registered type loads its embedding models through the process-wide
+:class:`ModelManager`, which tracks their size and last use and unloads idle
+ones to stay under ``MODEL_MEMORY_BUDGET_BYTES`` (see :func:`model_report`).
 """
 
 from __future__ import annotations
 
+import gc
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from config import MODEL_EVICT_MIN_IDLE_SECONDS, MODEL_IDLE_UNLOAD_SECONDS, MODEL_MEMORY_BUDGET_BYTES
 from vtsearch.media.base import (
     DemoDataset,
     Detector,
     Extractor,
+    IngestedFile,
     MediaResponse,
     MediaType,
     Processor,
     ProgressCallback,
+    Segments,
 )
+from vtsearch.media.onnx_backend import drop_onnx_encoders
 
 _registry: dict[str, "MediaType"] = {}
 
 
+# ------------------------------------------------------------------
+# Embedding model memory
+# ------------------------------------------------------------------
+
+
+@dataclass
+class _ModelUsage:
+    """What the :class:`ModelManager` knows about one media type's models."""
+
+    bytes: int = 0
+    last_used: float = 0.0
+    loads: int = 0
+    unloads: int = 0
+
+
+class ModelManager:
+    """Loads media types' embedding models on demand and unloads idle ones.
+
+    :meth:`MediaType.ensure_models` calls :meth:`use` before every model
+    call.  Loading a model that does not fit in *budget_bytes* first
+    unloads the least recently used other models, but only those idle for
+    at least *min_idle_seconds*, so a model in the middle of a batch is
+    never taken away.  A background sweep unloads any model unused for
+    *idle_unload_seconds*.  Sizes are the models' parameter and buffer bytes
+    (:meth:`MediaType.model_bytes`) as measured after loading.
+
+    Args:
+        budget_bytes: Total model bytes to stay under; ``None`` for no limit.
+        idle_unload_seconds: Unload models unused for this long; ``None``
+            never unloads idle models.
+        min_idle_seconds: Only models idle for this long are unloaded to
+            make room for another.
+        clock: Monotonic time source (replaceable in tests).
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int | None = MODEL_MEMORY_BUDGET_BYTES,
+        idle_unload_seconds: float | None = MODEL_IDLE_UNLOAD_SECONDS,
+        min_idle_seconds: float = MODEL_EVICT_MIN_IDLE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.budget_bytes = budget_bytes
+        self.idle_unload_seconds = idle_unload_seconds
+        self.min_idle_seconds = min_idle_seconds
+        self._clock = clock
+        self._usage: dict[str, _ModelUsage] = {}
+        self._types: dict[str, MediaType] = {}
+        self._lock = threading.RLock()
+        self._load_locks: dict[str, threading.Lock] = {}
+        self._sweeper: threading.Timer | None = None
+
+    def use(self, mt: MediaType) -> None:
+        """Load *mt*'s models if they are not loaded, making room first, and mark them used now."""
+        with self._lock:
+            usage = self._usage.setdefault(mt.type_id, _ModelUsage())
+            self._types[mt.type_id] = mt
+            load_lock = self._load_locks.setdefault(mt.type_id, threading.Lock())
+        if mt.models_loaded and not usage.bytes:
+            # Loaded before it was registered, or by calling load_models() directly
+            with self._lock:
+                usage.bytes = mt.model_bytes()
+        if not mt.models_loaded:
+            with load_lock:
+                if not mt.models_loaded:
+                    # The size from an earlier load tells how much room to make
+                    self._make_room(usage.bytes, keep=mt)
+                    mt.load_models()
+                    if mt.models_loaded:
+                        with self._lock:
+                            usage.bytes = mt.model_bytes()
+                            usage.loads += 1
+                        self._make_room(0, keep=mt)
+        with self._lock:
+            usage.last_used = self._clock()
+        self._schedule_sweep()
+
+    def unload(self, mt: MediaType) -> bool:
+        """Unload *mt*'s models now; return whether anything was loaded."""
+        if not mt.models_loaded:
+            return False
+        mt.unload_models()
+        model_id = mt.embedding_model_id
+        if model_id:
+            drop_onnx_encoders(model_id)
+        with self._lock:
+            self._usage.setdefault(mt.type_id, _ModelUsage()).unloads += 1
+        gc.collect()
+        return True
+
+    def resident_bytes(self) -> int:
+        """Total size of the models currently loaded."""
+        with self._lock:
+            return sum(self._usage[type_id].bytes for type_id, mt in self._types.items() if mt.models_loaded)
+
+    def unload_idle(self) -> list[str]:
+        """Unload every model unused for ``idle_unload_seconds``; return their type IDs."""
+        if self.idle_unload_seconds is None:
+            return []
+        now = self._clock()
+        with self._lock:
+            idle = [
+                mt
+                for type_id, mt in self._types.items()
+                if mt.models_loaded and now - self._usage[type_id].last_used >= self.idle_unload_seconds
+            ]
+        unloaded = [mt.type_id for mt in idle if self.unload(mt)]
+        for type_id in unloaded:
+            print(f"Unloaded idle {type_id} embedding model")
+        return unloaded
+
+    def _make_room(self, needed: int, keep: MediaType) -> None:
+        """Unload idle models, least recently used first, until *needed* more bytes fit the budget."""
+        if self.budget_bytes is None:
+            return
+        now = self._clock()
+        with self._lock:
+            candidates = sorted(
+                (
+                    mt
+                    for type_id, mt in self._types.items()
+                    if mt is not keep
+                    and mt.models_loaded
+                    and now - self._usage[type_id].last_used >= self.min_idle_seconds
+                ),
+                key=lambda mt: self._usage[mt.type_id].last_used,
+            )
+        for mt in candidates:
+            if self.resident_bytes() + needed <= self.budget_bytes:
+                return
+            if self.unload(mt):
+                print(f"Unloaded {mt.type_id} embedding model to stay under the model memory budget")
+        if self.resident_bytes() + needed > self.budget_bytes:
+            print(
+                f"Embedding models need {(self.resident_bytes() + needed) / 1024**2:.0f} MiB, over the "
+                f"{self.budget_bytes / 1024**2:.0f} MiB budget; no other model is idle enough to unload"
+            )
+
+    def _schedule_sweep(self) -> None:
+        """Start the idle sweep timer unless it is already pending."""
+        if self.idle_unload_seconds is None:
+            return
+        with self._lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._sweeper = threading.Timer(self.idle_unload_seconds, self._sweep)
+            self._sweeper.daemon = True
+            self._sweeper.start()
+
+    def _sweep(self) -> None:
+        self.unload_idle()
+        with self._lock:
+            self._sweeper = None
+            still_loaded = any(mt.models_loaded for mt in self._types.values())
+        if still_loaded:
+            self._schedule_sweep()
+
+    def report(self, media_types: list[MediaType] | None = None) -> dict[str, Any]:
+        """Return the budget and, per media type, whether its models are loaded, their size and idle time."""
+        now = self._clock()
+        with self._lock:
+            types = media_types if media_types is not None else list(self._types.values())
+            models = []
+            for mt in types:
+                usage = self._usage.get(mt.type_id)
+                loaded = mt.models_loaded
+                models.append(
+                    {
+                        "media_type": mt.type_id,
+                        "model_id": mt.embedding_model_id,
+                        "loaded": loaded,
+                        "bytes": usage.bytes if usage else 0,
+                        "idle_seconds": now - usage.last_used if loaded and usage else None,
+                        "loads": usage.loads if usage else 0,
+                        "unloads": usage.unloads if usage else 0,
+                    }
+                )
+        return {
+            "budget_bytes": self.budget_bytes,
+            "resident_bytes": self.resident_bytes(),
+            "idle_unload_seconds": self.idle_unload_seconds,
+            "models": models,
+        }
+
+
+_model_manager = ModelManager()
+
+
+def get_model_manager() -> ModelManager:
+    """Return the process-wide :class:`ModelManager`."""
+    return _model_manager
+
+
+def set_model_manager(manager: ModelManager) -> None:
+    """Replace the process-wide :class:`ModelManager` for every registered type."""
+    global _model_manager
+    _model_manager = manager
+    for mt in _registry.values():
+        mt._model_manager = manager
+
+
+def model_report() -> dict[str, Any]:
+    """Return :meth:`ModelManager.report` covering every registered media type."""
+    return _model_manager.report(list(_registry.values()))
+
+
 def register(media_type: "MediaType") -> None:
-    """Add *media_type* to the registry, keyed by :attr:`~MediaType.type_id`."""
+    """Add *media_type* to the registry, keyed by :attr:`~MediaType.type_id`.
+
+    Its models are loaded and unloaded through the process-wide
+    :class:`ModelManager` from then on.
+    """
+    media_type._model_manager = _model_manager
     _registry[media_type.type_id] = media_type
 
 
@@ -117,11 +343,17 @@ def set_progress_callback(callback: "ProgressCallback") -> None:
 __all__ = [
     "MediaType",
     "MediaResponse",
+    "IngestedFile",
     "DemoDataset",
     "Processor",
     "Detector",
     "Extractor",
     "ProgressCallback",
+    "Segments",
+    "ModelManager",
+    "get_model_manager",
+    "set_model_manager",
+    "model_report",
     "register",
     "get",
     "get_by_folder_name",
@@ -2,22 +2,50 @@
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable, Sequence
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import librosa
 import numpy as np
 import torch
-from transformers import ClapModel, ClapProcessor
 
-from config import CLAP_MODEL_ID, DATA_DIR, MODELS_CACHE_DIR, SAMPLE_RATE
-from vtsearch.media.base import DemoDataset, MediaResponse, MediaType, ProgressCallback, _noop_progress
+from config import (
+    AUDIO_EMBED_BATCH_SIZE,
+    AUDIO_SEGMENT_HOP_SECONDS,
+    AUDIO_STREAM_BLOCK_SECONDS,
+    CLAP_MODEL_ID,
+    DATA_DIR,
+    MODELS_CACHE_DIR,
+    SAMPLE_RATE,
+)
+from vtsearch.decoding.decoders import Decoded, audio_duration, decode_audio, sliding_windows, stream_audio
+from vtsearch.media.base import DemoDataset, MediaResponse, MediaType, ProgressCallback, Segments, _noop_progress
+from vtsearch.media.onnx_backend import BATCH, BATCH_AND_SEQUENCE, embed_with_backend
+from vtsearch.utils.media_store import clip_media_bytes
+
+if TYPE_CHECKING:
+    from transformers import ClapModel, ClapProcessor
+
+# CLAP input length in samples (10 s at 48 kHz); longer audio is embedded as
+# overlapping windows of this length (see embed_segments)
+_MAX_LENGTH = 480000
+
+
+def _encode_audio(model: ClapModel, **inputs: torch.Tensor) -> torch.Tensor:
+    return model.audio_projection(model.audio_model(**inputs).pooler_output)
+
+
+def _encode_text(model: ClapModel, **inputs: torch.Tensor) -> torch.Tensor:
+    return model.text_projection(model.text_model(**inputs).pooler_output)
 
 
 class AudioMediaType(MediaType):
     """Handles audio clips using the CLAP model (laion/clap-htsat-unfused).
 
     * Embeds audio files via CLAP's audio encoder + projection head.
+    * Files longer than one 10 s CLAP input are streamed and embedded as
+      overlapping windows; the clip embedding is their mean.
     * Embeds text queries via CLAP's text encoder + projection head, so
       queries land in the same 512-dimensional space as audio embeddings.
     * Serves clips as ``audio/wav`` streams.
@@ -27,6 +55,7 @@ class AudioMediaType(MediaType):
         self._model: Optional[ClapModel] = None
         self._processor: Optional[ClapProcessor] = None
         self._on_progress: ProgressCallback = _noop_progress
+        self.embed_batch_size = AUDIO_EMBED_BATCH_SIZE
 
     # ------------------------------------------------------------------
     # Identity
@@ -145,11 +174,21 @@ class AudioMediaType(MediaType):
     # Embeddings
     # ------------------------------------------------------------------
 
+    @property
+    def embedding_model_id(self) -> str:
+        return CLAP_MODEL_ID
+
+    @property
+    def embedding_params(self) -> dict:
+        return {"sample_rate": SAMPLE_RATE, "max_length": _MAX_LENGTH, "segment_hop": AUDIO_SEGMENT_HOP_SECONDS}
+
     def load_models(self) -> None:
         if self._model is not None:
             return
         import gc
 
+        from transformers import ClapModel, ClapProcessor
+
         gc.collect()
         cache_dir = str(MODELS_CACHE_DIR)
         self._on_progress("loading", "Loading audio embedder (CLAP model)...", 0, 0)
@@ -157,62 +196,152 @@ class AudioMediaType(MediaType):
         self._processor = ClapProcessor.from_pretrained(CLAP_MODEL_ID, cache_dir=cache_dir)
 
     def embed_media(self, file_path: Path) -> Optional[np.ndarray]:
-        if self._model is None:
-            self.load_models()
-        if self._model is None or self._processor is None:
-            return None
+        return self.embed_media_batch([file_path])[0]
+
+    @property
+    def decoder(self) -> Callable[..., Optional[Decoded]]:
+        return functools.partial(decode_audio, sample_rate=SAMPLE_RATE)
+
+    def embed_media_batch(self, file_paths: Sequence[Path]) -> list[Optional[np.ndarray]]:
+        results: list[Optional[np.ndarray]] = [None] * len(file_paths)
+        decoded = []
+        for i, file_path in enumerate(file_paths):
+            if self.needs_segments(file_path):
+                segments = self.embed_segments(file_path)
+                results[i] = segments.pooled if segments is not None else None
+            else:
+                decoded.append((i, self.decoder(file_path)))
+        decoded = [(i, d.array) for i, d in decoded if d is not None]
+        if decoded:
+            embeddings = self.embed_decoded_batch([signal for _, signal in decoded])
+            for (i, _), embedding in zip(decoded, embeddings):
+                results[i] = embedding
+        return results
+
+    def embed_decoded_batch(self, arrays: Sequence[np.ndarray]) -> list[Optional[np.ndarray]]:
+        self.ensure_models()
+        if self._model is None or self._processor is None or not arrays:
+            return [None] * len(arrays)
+        signals = list(arrays)
         try:
-            audio_data, _sr = librosa.load(file_path, sr=SAMPLE_RATE, mono=True)
-            inputs = self._processor(
-                audio=audio_data,
-                sampling_rate=SAMPLE_RATE,
-                return_tensors="pt",
-                padding="max_length",
-                max_length=480000,
-                truncation=True,
-            )
-            with torch.no_grad():
-                outputs = self._model.audio_model(**inputs)
-                embedding = self._model.audio_projection(outputs.pooler_output).detach().cpu().numpy()
-            return embedding[0]
+            return list(self._embed_signals(signals))
+        except Exception:
+            # Retry one by one so a single bad file does not sink the batch
+            embeddings: list[Optional[np.ndarray]] = []
+            for signal in signals:
+                try:
+                    embeddings.append(self._embed_signals([signal])[0])
+                except Exception as e:
+                    print(f"Error embedding audio signal: {e}")
+                    embeddings.append(None)
+            return embeddings
+
+    def needs_segments(self, file_path: Path) -> bool:
+        duration = audio_duration(file_path)
+        return duration is not None and duration * SAMPLE_RATE > _MAX_LENGTH
+
+    def embed_segments(self, file_path: Path) -> Optional[Segments]:
+        hop = int(AUDIO_SEGMENT_HOP_SECONDS * SAMPLE_RATE)
+        block_frames = int(AUDIO_STREAM_BLOCK_SECONDS * SAMPLE_RATE)
+        offsets: list[float] = []
+        embeddings: list[np.ndarray] = []
+        starts: list[int] = []
+        windows: list[np.ndarray] = []
+        end = 0
+
+        def flush() -> None:
+            for start, embedding in zip(starts, self.embed_decoded_batch(windows)):
+                if embedding is not None:
+                    offsets.append(start / SAMPLE_RATE)
+                    embeddings.append(embedding)
+            starts.clear()
+            windows.clear()
+
+        try:
+            blocks = stream_audio(file_path, SAMPLE_RATE, block_frames)
+            for start, window in sliding_windows(blocks, _MAX_LENGTH, hop):
+                starts.append(start)
+                windows.append(window)
+                end = start + len(window)
+                if len(windows) >= self.embed_batch_size:
+                    flush()
+            flush()
         except Exception as e:
             print(f"Error embedding {file_path}: {e}")
             return None
+        if not embeddings:
+            return None
+        return Segments(
+            offsets=np.asarray(offsets, dtype=np.float32),
+            embeddings=np.stack(embeddings).astype(np.float32),
+            duration=end / SAMPLE_RATE,
+        )
+
+    def _embed_signals(self, signals: list[np.ndarray]) -> np.ndarray:
+        # Every signal is padded or cut to _MAX_LENGTH samples, so the batch
+        # is rectangular and each row matches a batch of one.  Cutting here
+        # rather than via the processor's truncation, which CLAP does not
+        # implement for boolean values.
+        inputs = self._processor(
+            audio=[signal[:_MAX_LENGTH] for signal in signals],
+            sampling_rate=SAMPLE_RATE,
+            return_tensors="pt",
+            padding="max_length",
+            max_length=_MAX_LENGTH,
+            truncation=True,
+        )
+        axes = {"input_features": BATCH, "is_longer": BATCH}
+        return embed_with_backend(CLAP_MODEL_ID, "audio", self._model, _encode_audio, inputs, axes)
 
     def embed_text(self, text: str) -> Optional[np.ndarray]:
-        if self._model is None:
-            self.load_models()
-        if self._model is None or self._processor is None:
-            return None
+        return self.embed_text_batch([text])[0]
+
+    def embed_text_batch(self, texts: Sequence[str]) -> list[Optional[np.ndarray]]:
+        self.ensure_models()
+        if self._model is None or self._processor is None or not texts:
+            return [None] * len(texts)
         try:
-            inputs = self._processor(text=[text], return_tensors="pt")
-            with torch.no_grad():
-                outputs = self._model.text_model(**inputs)
-                text_vec = self._model.text_projection(outputs.pooler_output).detach().cpu().numpy()[0]
-            return text_vec
+            inputs = self._processor(text=list(texts), return_tensors="pt", padding=True, truncation=True)
+            axes = {"input_ids": BATCH_AND_SEQUENCE, "attention_mask": BATCH_AND_SEQUENCE}
+            return list(embed_with_backend(CLAP_MODEL_ID, "text", self._model, _encode_text, inputs, axes))
         except Exception as e:
             print(f"Error embedding text query for audio: {e}")
-            return None
+            return [None] * len(texts)
 
     # internal helpers used by loader.py's get_clap_model() bridge
     def _get_model_and_processor(self):
-        if self._model is None:
-            self.load_models()
+        self.ensure_models()
         return self._model, self._processor
 
     # ------------------------------------------------------------------
     # Clip data
     # ------------------------------------------------------------------
 
+    def clip_data_from(self, file_path: Path, data: bytes, info: Optional[dict] = None) -> dict:
+        if info is not None and info.get("segments") is not None:
+            segments = info["segments"]
+            return {
+                "wav_bytes": data,
+                "duration": segments.duration,
+                "segment_offsets": segments.offsets,
+                "segment_embeddings": segments.embeddings,
+            }
+        if info is not None:
+            duration = info["duration"]
+        else:
+            # Read the length from the header rather than decoding the signal
+            try:
+                import librosa
+
+                duration = librosa.get_duration(path=file_path)
+            except Exception:
+                duration = 0.0
+        return {"wav_bytes": data, "duration": duration}
+
     def load_clip_data(self, file_path: Path) -> dict:
         with open(file_path, "rb") as f:
             wav_bytes = f.read()
-        try:
-            audio_data, sr = librosa.load(file_path, sr=SAMPLE_RATE, mono=True)
-            duration = len(audio_data) / sr
-        except Exception:
-            duration = 0.0
-        return {"wav_bytes": wav_bytes, "duration": duration}
+        return self.clip_data_from(file_path, wav_bytes)
 
     # ------------------------------------------------------------------
     # HTTP serving
@@ -220,7 +349,7 @@ class AudioMediaType(MediaType):
 
     def clip_response(self, clip: dict) -> MediaResponse:
         return MediaResponse(
-            data=clip["wav_bytes"],
+            data=clip_media_bytes(clip),
             mimetype="audio/wav",
             download_name=f"clip_{clip['id']}.wav",
         )
@@ -17,13 +17,18 @@ the registry.
 
 from __future__ import annotations
 
+import hashlib
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 import numpy as np
 
+if TYPE_CHECKING:
+    from vtsearch.decoding.decoders import Decoded
+
 # Type alias for progress callbacks.  Modules that accept an ``on_progress``
 # parameter use this signature so callers can report status without depending
 # on ``vtsearch.utils.progress``.
@@ -33,10 +38,12 @@ __all__ = [
     "DemoDataset",
     "Detector",
     "Extractor",
+    "IngestedFile",
     "MediaResponse",
     "MediaType",
     "Processor",
     "ProgressCallback",
+    "Segments",
 ]
 
 
@@ -53,16 +60,73 @@ class MediaResponse:
     ``flask.Response`` via :func:`media_response_to_flask`.
 
     Attributes:
-        data: The payload — ``bytes`` for binary media, ``dict`` for JSON.
+        data: The payload — ``bytes`` (or a ``memoryview`` into the media
+            store) for binary media, ``dict`` for JSON.
         mimetype: MIME type string (e.g. ``"audio/wav"``, ``"application/json"``).
         download_name: Suggested filename for the ``Content-Disposition`` header.
     """
 
-    data: bytes | dict
+    data: bytes | memoryview | dict
     mimetype: str
     download_name: str = ""
 
 
+@dataclass
+class IngestedFile:
+    """Everything an importer needs from one media file, gathered in one pass.
+
+    Returned by :meth:`MediaType.ingest` and
+    :func:`~vtsearch.models.embedding_cache.ingest_files_cached`.
+
+    Attributes:
+        data: Raw file contents; a read-only view of the stored blob for
+            files :func:`~vtsearch.models.embedding_cache.ingest_files_cached`
+            copied into the media store.
+        md5: Hex MD5 of ``data``.
+        embedding: Embedding vector, or ``None`` if the file could not be embedded.
+        clip_data: Media-specific clip fields, as :meth:`MediaType.load_clip_data`
+            returns them.
+        decoded: The array the embedding was computed from, when it was
+            decoded in this process; ``None`` otherwise (decoded in a worker
+            process, served from the embedding cache, or no decoder).
+    """
+
+    data: bytes | memoryview
+    md5: str
+    embedding: Optional[np.ndarray]
+    clip_data: dict
+    decoded: Optional[np.ndarray] = None
+
+
+@dataclass
+class Segments:
+    """Embeddings of overlapping windows of one long media file.
+
+    Attributes:
+        offsets: Start of each window, shape ``(n,)``: seconds for audio,
+            characters for text.
+        embeddings: One embedding per window, shape ``(n, D)``.
+        duration: Length of the whole file in seconds (``0`` for text).
+    """
+
+    offsets: np.ndarray
+    embeddings: np.ndarray
+    duration: float
+
+    @property
+    def pooled(self) -> np.ndarray:
+        """Clip-level embedding: the mean window direction, at the windows' mean length.
+
+        Rescaling keeps the pooled embedding on the same scale as a single
+        window, so unit-length windows (E5) give a unit-length clip.
+        """
+        mean = self.embeddings.mean(axis=0)
+        norm = float(np.linalg.norm(mean))
+        if norm == 0:
+            return mean
+        return mean * (float(np.linalg.norm(self.embeddings, axis=1).mean()) / norm)
+
+
 @dataclass
 class DemoDataset:
     """Metadata describing one demo dataset that belongs to a media type."""
@@ -84,14 +148,14 @@ class DemoDataset:
     Leave empty for sources that don't require an explicit identifier."""
 
     required_folder: Optional[Path] = None
-    """Local directory that must exist for a cached ``.pkl`` to be usable.
+    """Local directory that must exist for a cached demo dataset file to be usable.
 
     Audio and video datasets store references to external media files rather
-    than inlining the bytes, so a stale ``.pkl`` left behind after the source
+    than inlining the bytes, so a stale cache file left behind after the source
     directory was removed would incorrectly appear ready.  Set this to the
     directory that the importer places the source files into (e.g.
     ``DATA_DIR / "ESC-50-master" / "audio"``).  Leave ``None`` for datasets
-    whose ``.pkl`` is entirely self-contained (images, text)."""
+    whose cache file is entirely self-contained (images, text)."""
 
 
 class MediaType(ABC):
@@ -102,12 +166,19 @@ class MediaType(ABC):
 
     * How to embed a file into a fixed-size vector (:meth:`embed_media`).
     * How to embed a text query into the **same** vector space (:meth:`embed_text`).
+    * Optionally, how to embed several files or queries in one model call
+      (:meth:`embed_media_batch`, :meth:`embed_text_batch`), and how to decode
+      files in worker processes ahead of the model (:attr:`decoder`,
+      :meth:`embed_decoded_batch`), and how to embed files too long for one
+      model input window by window (:meth:`needs_segments`, :meth:`embed_segments`).
     * Human-readable identity: :attr:`name` and :attr:`icon`.
     * Which file extensions to scan when importing a folder (:attr:`file_extensions`).
     * Whether the viewer should loop (:attr:`loops`).
     * Which demo datasets are available (:attr:`demo_datasets`).
     * How to serve a clip over HTTP (:meth:`clip_response`).
-    * How to load media-specific clip fields from a file (:meth:`load_clip_data`).
+    * How to load media-specific clip fields from a file (:meth:`load_clip_data`),
+      or from bytes and decode results already in hand (:meth:`clip_data_from`),
+      and how to do all of it in one pass (:meth:`ingest`).
     * An optional folder-import alias (:attr:`folder_import_name`) for the
       ``/api/dataset/load-folder`` endpoint.
 
@@ -184,6 +255,53 @@ class MediaType(ABC):
         Implementations must be idempotent — a second call should be a no-op.
         """
 
+    def ensure_models(self) -> None:
+        """Load the embedding models if needed and record that they are in use.
+
+        Built-in media types call this before every model call.  Once the
+        type is registered, loading and use go through the
+        :class:`~vtsearch.media.ModelManager`, which may unload other types'
+        idle models to stay under ``MODEL_MEMORY_BUDGET_BYTES``.
+        """
+        manager = getattr(self, "_model_manager", None)
+        if manager is not None:
+            manager.use(self)
+        elif not self.models_loaded:
+            self.load_models()
+
+    @property
+    def models_loaded(self) -> bool:
+        """Whether :meth:`load_models` has loaded the models (default: ``_model`` is set)."""
+        return getattr(self, "_model", None) is not None
+
+    def unload_models(self) -> None:
+        """Drop the models loaded by :meth:`load_models` so their memory can be freed.
+
+        The default clears the ``_model`` and ``_processor`` attributes the
+        built-in types use; override it if the models live elsewhere.  The
+        next :meth:`ensure_models` loads them again.
+        """
+        for attr in ("_model", "_processor"):
+            if getattr(self, attr, None) is not None:
+                setattr(self, attr, None)
+
+    def model_bytes(self) -> int:
+        """Bytes held by the parameters and buffers of the loaded models.
+
+        Counts every ``torch.nn.Module`` attribute of the instance, each
+        shared tensor once; 0 when nothing is loaded.
+        """
+        seen: set[int] = set()
+        total = 0
+        for value in vars(self).values():
+            if not (hasattr(value, "parameters") and hasattr(value, "buffers")):
+                continue
+            for tensor in [*value.parameters(), *value.buffers()]:
+                if tensor.data_ptr() not in seen:
+                    seen.add(tensor.data_ptr())
+                    total += tensor.numel() * tensor.element_size()
+        return total
+
     @abstractmethod
     def embed_media(self, file_path: Path) -> Optional[np.ndarray]:
         """Return a fixed-size embedding vector for the media file at *file_path*.
@@ -192,6 +310,27 @@ class MediaType(ABC):
         corrupt file, etc.).
         """
 
+    @property
+    def embedding_model_id(self) -> Optional[str]:
+        """Identifier of the model behind :meth:`embed_media`.
+
+        Together with :attr:`embedding_params` and the file's content hash it
+        keys the persistent embedding cache
+        (:mod:`vtsearch.models.embedding_cache`).  The default ``None``
+        disables caching for this media type.
+        """
+        return None
+
+    @property
+    def embedding_params(self) -> dict:
+        """Preprocessing parameters that change what :meth:`embed_media` returns.
+
+        Cached embeddings are only reused when these match, so include
+        anything (sample rate, frame count, prompt prefix, ...) that would
+        give a different vector for the same file and model.
+        """
+        return {}
+
     @abstractmethod
     def embed_text(self, text: str) -> Optional[np.ndarray]:
         """Return an embedding of *text* in the **same vector space** as :meth:`embed_media`.
@@ -202,10 +341,113 @@ class MediaType(ABC):
         Returns ``None`` if the model is not loaded or encoding fails.
         """
 
+    #: Number of files (or texts) the loaders pass to :meth:`embed_media_batch`
+    #: (or :meth:`embed_text_batch`) at a time.  Built-in types set this from
+    #: ``config``; it can be changed per instance.
+    embed_batch_size: int = 1
+
+    def embed_media_batch(self, file_paths: Sequence[Path]) -> list[Optional[np.ndarray]]:
+        """Return one embedding per file in *file_paths*, in order.
+
+        Entries are ``None`` for files that could not be embedded.  The
+        default implementation calls :meth:`embed_media` once per file;
+        override it to run the model on the whole batch at once.
+        """
+        return [self.embed_media(p) for p in file_paths]
+
+    def embed_text_batch(self, texts: Sequence[str]) -> list[Optional[np.ndarray]]:
+        """Return one :meth:`embed_text` embedding per entry in *texts*, in order.
+
+        The default implementation calls :meth:`embed_text` once per text.
+        """
+        return [self.embed_text(t) for t in texts]
+
+    @property
+    def decoder(self) -> Optional[Callable[..., Optional[Decoded]]]:
+        """Picklable function that decodes a file for :meth:`embed_decoded_batch`.
+
+        Called as ``decoder(file_path)`` or ``decoder(file_path, data=raw_bytes)``
+        and returns a :class:`~vtsearch.decoding.decoders.Decoded` (the array
+        plus clip fields such as the duration) or ``None``.  When set,
+        importers decode files in a pool of worker processes ahead of the
+        model (:mod:`vtsearch.decoding.pipeline`), so it must not depend on
+        the loaded model; see :mod:`vtsearch.decoding.decoders`.  The default
+        ``None`` keeps decoding inside :meth:`embed_media_batch`.
+        """
+        return None
+
+    def embed_decoded_batch(self, arrays: Sequence[np.ndarray]) -> list[Optional[np.ndarray]]:
+        """Return one embedding per array produced by :attr:`decoder`, in order.
+
+        Only called for media types that set :attr:`decoder`.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not define a decoder")
+
+    def needs_segments(self, file_path: Path) -> bool:
+        """Return ``True`` if *file_path* is too long for one model input.
+
+        Such files are embedded window by window with :meth:`embed_segments`
+        instead of :meth:`embed_media_batch`.  Implementations should only
+        read the file header.  The default is ``False``.
+        """
+        return False
+
+    def embed_segments(self, file_path: Path) -> Optional[Segments]:
+        """Embed overlapping windows of a long file, streaming it from disk.
+
+        Only called when :meth:`needs_segments` is true.  Returns ``None``
+        if no window could be embedded.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not embed segments")
+
+    def embed_segments_batch(self, file_paths: Sequence[Path]) -> list[Optional[Segments]]:
+        """Return :meth:`embed_segments` for each of *file_paths*, in order.
+
+        The default embeds the files one after another, so only one file is
+        streamed at a time; override it to share model batches between files.
+        """
+        return [self.embed_segments(file_path) for file_path in file_paths]
+
     # ------------------------------------------------------------------
     # Clip data
     # ------------------------------------------------------------------
 
+    def ingest(self, file_path: Path) -> IngestedFile:
+        """Read, hash, decode and embed *file_path* in a single pass.
+
+        The file is read once and its bytes feed the MD5, the :attr:`decoder`
+        and :meth:`clip_data_from`, so the clip fields come from the same
+        decode as the embedding.  Media types without a decoder fall back to
+        :meth:`embed_media` and :meth:`clip_data_from`.  Files for which
+        :meth:`needs_segments` is true are embedded with :meth:`embed_segments`.
+        """
+        data = Path(file_path).read_bytes()
+        md5 = hashlib.md5(data).hexdigest()
+        if self.needs_segments(file_path):
+            segments = self.embed_segments(file_path)
+            if segments is None:
+                return IngestedFile(data, md5, None, self.clip_data_from(file_path, data))
+            info = {"duration": segments.duration, "segments": segments}
+            return IngestedFile(data, md5, segments.pooled, self.clip_data_from(file_path, data, info))
+        decoder = self.decoder
+        if decoder is None:
+            return IngestedFile(data, md5, self.embed_media(file_path), self.clip_data_from(file_path, data))
+        decoded = decoder(file_path, data=data)
+        if decoded is None:
+            return IngestedFile(data, md5, None, self.clip_data_from(file_path, data))
+        embedding = self.embed_decoded_batch([decoded.array])[0]
+        return IngestedFile(data, md5, embedding, self.clip_data_from(file_path, data, decoded.info), decoded.array)
+
+    def clip_data_from(self, file_path: Path, data: bytes, info: Optional[dict] = None) -> dict:
+        """Return :meth:`load_clip_data` fields from bytes and decode results already in hand.
+
+        *data* is the file's contents and *info* the clip fields reported by
+        :attr:`decoder` (``None`` when the file was not decoded, e.g. on an
+        embedding-cache hit).  Override this to avoid reading or decoding
+        the file again; the default calls :meth:`load_clip_data`.
+        """
+        return self.load_clip_data(file_path)
+
     @abstractmethod
     def load_clip_data(self, file_path: Path) -> dict:
         """Load and return media-specific fields for a clip dict.
@@ -233,8 +475,10 @@ class MediaType(ABC):
         """Return a :class:`MediaResponse` with the clip's media content.
 
         For binary media, set ``data`` to raw bytes with an appropriate
-        ``mimetype``.  For structured data (e.g. text paragraphs), set
-        ``data`` to a JSON-serialisable dict with ``mimetype="application/json"``.
+        ``mimetype``; :func:`~vtsearch.utils.media_store.clip_media_bytes` returns
+        them whether the clip holds them inline or in the media store.  For
+        structured data (e.g. text paragraphs), set ``data`` to a
+        JSON-serialisable dict with ``mimetype="application/json"``.
         """
 
 
@@ -8,6 +8,7 @@ from typing import Any, Optional
 from PIL import Image
 
 from vtsearch.media.base import Extractor
+from vtsearch.utils.media_store import clip_media_bytes
 
 
 class ImageClassExtractor(Extractor):
@@ -83,7 +84,8 @@ class ImageClassExtractor(Extractor):
     def extract(self, clip: dict[str, Any]) -> list[dict[str, Any]]:
         """Detect ``target_class`` objects in *clip* and return bounding boxes.
 
-        The *clip* dict must contain ``"image_bytes"`` (raw image bytes).
+        The *clip* dict must carry raw image bytes, inline in
+        ``"image_bytes"`` or in the media store.
 
         Returns a list of dicts, each with keys ``"confidence"``, ``"bbox"``
         (``[x1, y1, x2, y2]`` in pixels), and ``"label"``.
@@ -91,7 +93,7 @@ class ImageClassExtractor(Extractor):
         self.load_model()
         assert self._model is not None
 
-        image_bytes = clip.get("image_bytes")
+        image_bytes = clip_media_bytes(clip)
         if image_bytes is None:
             return []
 
@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
+import io
+from collections.abc import Callable, Sequence
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
 import torch
 from PIL import Image
-from transformers import CLIPModel, CLIPProcessor
 
-from config import CLIP_MODEL_ID, DATA_DIR, MODELS_CACHE_DIR
+from config import CLIP_MODEL_ID, DATA_DIR, IMAGE_EMBED_BATCH_SIZE, MODELS_CACHE_DIR
+from vtsearch.decoding.decoders import Decoded, decode_image
 from vtsearch.media.base import DemoDataset, MediaResponse, MediaType, ProgressCallback, _noop_progress
+from vtsearch.media.onnx_backend import BATCH, BATCH_AND_SEQUENCE, embed_with_backend
+from vtsearch.utils.media_store import clip_media_bytes
+
+if TYPE_CHECKING:
+    from transformers import CLIPModel, CLIPProcessor
 
 
 def _extract_tensor(output: object) -> torch.Tensor:
@@ -31,6 +38,14 @@ def _extract_tensor(output: object) -> torch.Tensor:
     return output[0]  # type: ignore[index]
 
 
+def _encode_image(model: CLIPModel, **inputs: torch.Tensor) -> torch.Tensor:
+    return _extract_tensor(model.get_image_features(**inputs))
+
+
+def _encode_text(model: CLIPModel, **inputs: torch.Tensor) -> torch.Tensor:
+    return _extract_tensor(model.get_text_features(**inputs))
+
+
 _IMAGE_MIME_TYPES: dict[str, str] = {
     ".png": "image/png",
     ".gif": "image/gif",
@@ -53,6 +68,7 @@ class ImageMediaType(MediaType):
         self._model: Optional[CLIPModel] = None
         self._processor: Optional[CLIPProcessor] = None
         self._on_progress: ProgressCallback = _noop_progress
+        self.embed_batch_size = IMAGE_EMBED_BATCH_SIZE
 
     # ------------------------------------------------------------------
     # Identity
@@ -161,11 +177,21 @@ class ImageMediaType(MediaType):
     # Embeddings
     # ------------------------------------------------------------------
 
+    @property
+    def embedding_model_id(self) -> str:
+        return CLIP_MODEL_ID
+
+    @property
+    def embedding_params(self) -> dict:
+        return {"mode": "RGB"}
+
     def load_models(self) -> None:
         if self._model is not None:
             return
         import gc
 
+        from transformers import CLIPModel, CLIPProcessor
+
         gc.collect()
         cache_dir = str(MODELS_CACHE_DIR)
         self._on_progress("loading", "Loading image embedder (CLIP model)...", 0, 0)
@@ -176,73 +202,97 @@ class ImageMediaType(MediaType):
         self._processor = CLIPProcessor.from_pretrained(CLIP_MODEL_ID, cache_dir=cache_dir, use_fast=True)
 
     def embed_media(self, file_path: Path) -> Optional[np.ndarray]:
-        if self._model is None:
-            self.load_models()
-        if self._model is None or self._processor is None:
-            return None
-        try:
-            image = Image.open(file_path).convert("RGB")
-            return self.embed_pil_image(image)
-        except Exception as e:
-            print(f"Error embedding {file_path}: {e}")
-            return None
+        return self.embed_media_batch([file_path])[0]
+
+    @property
+    def decoder(self) -> Callable[..., Optional[Decoded]]:
+        return decode_image
+
+    def embed_media_batch(self, file_paths: Sequence[Path]) -> list[Optional[np.ndarray]]:
+        results: list[Optional[np.ndarray]] = [None] * len(file_paths)
+        decoded = [(i, decode_image(p)) for i, p in enumerate(file_paths)]
+        decoded = [(i, d.array) for i, d in decoded if d is not None]
+        if decoded:
+            embeddings = self.embed_decoded_batch([pixels for _, pixels in decoded])
+            for (i, _), embedding in zip(decoded, embeddings):
+                results[i] = embedding
+        return results
+
+    def embed_decoded_batch(self, arrays: Sequence[np.ndarray]) -> list[Optional[np.ndarray]]:
+        return self.embed_pil_images([Image.fromarray(pixels) for pixels in arrays])
 
     def embed_pil_image(self, image: Image.Image) -> Optional[np.ndarray]:
         """Embed a PIL Image that is already in memory (e.g. from CIFAR-10)."""
-        if self._model is None:
-            self.load_models()
-        if self._model is None or self._processor is None:
-            return None
+        return self.embed_pil_images([image])[0]
+
+    def embed_pil_images(self, images: Sequence[Image.Image]) -> list[Optional[np.ndarray]]:
+        """Embed several in-memory PIL Images in one forward pass.
+
+        The processor resizes and centre-crops every image to the model's
+        input size, so images of any size can share a batch.  If the batch
+        fails, the images are retried one at a time.
+        """
+        self.ensure_models()
+        if self._model is None or self._processor is None or not images:
+            return [None] * len(images)
         try:
-            image = image.convert("RGB")
-            inputs = self._processor(images=image, return_tensors="pt")
-            with torch.no_grad():
-                outputs = self._model.get_image_features(**inputs)
-                embedding = _extract_tensor(outputs).detach().cpu().numpy()
-            return embedding[0]
+            return list(self._embed_images([image.convert("RGB") for image in images]))
         except Exception as e:
-            print(f"Error embedding PIL image: {e}")
-            return None
+            if len(images) == 1:
+                print(f"Error embedding PIL image: {e}")
+                return [None]
+            return [self.embed_pil_image(image) for image in images]
+
+    def _embed_images(self, images: list[Image.Image]) -> np.ndarray:
+        inputs = self._processor(images=images, return_tensors="pt")
+        return embed_with_backend(CLIP_MODEL_ID, "image", self._model, _encode_image, inputs, {"pixel_values": BATCH})
 
     def embed_text(self, text: str) -> Optional[np.ndarray]:
-        if self._model is None:
-            self.load_models()
-        if self._model is None or self._processor is None:
-            return None
+        return self.embed_text_batch([text])[0]
+
+    def embed_text_batch(self, texts: Sequence[str]) -> list[Optional[np.ndarray]]:
+        self.ensure_models()
+        if self._model is None or self._processor is None or not texts:
+            return [None] * len(texts)
         try:
-            inputs = self._processor(text=[text], return_tensors="pt")
-            with torch.no_grad():
-                text_vec = _extract_tensor(self._model.get_text_features(**inputs)).detach().cpu().numpy()[0]
-            return text_vec
+            inputs = self._processor(text=list(texts), return_tensors="pt", padding=True, truncation=True)
+            axes = {"input_ids": BATCH_AND_SEQUENCE, "attention_mask": BATCH_AND_SEQUENCE}
+            return list(embed_with_backend(CLIP_MODEL_ID, "text", self._model, _encode_text, inputs, axes))
         except Exception as e:
             print(f"Error embedding text query for image: {e}")
-            return None
+            return [None] * len(texts)
 
     # internal helper used by loader.py's get_clip_model() bridge
     def _get_model_and_processor(self):
-        if self._model is None:
-            self.load_models()
+        self.ensure_models()
         return self._model, self._processor
 
     # ------------------------------------------------------------------
     # Clip data
     # ------------------------------------------------------------------
 
-    def load_clip_data(self, file_path: Path) -> dict:
-        with open(file_path, "rb") as f:
-            image_bytes = f.read()
-        try:
-            img = Image.open(file_path)
-            width, height = img.width, img.height
-        except Exception:
-            width, height = None, None
+    def clip_data_from(self, file_path: Path, data: bytes, info: Optional[dict] = None) -> dict:
+        if info is not None:
+            width, height = info["width"], info["height"]
+        else:
+            # Image.open only parses the header until pixels are requested
+            try:
+                with Image.open(io.BytesIO(data)) as img:
+                    width, height = img.width, img.height
+            except Exception:
+                width, height = None, None
         return {
-            "image_bytes": image_bytes,
+            "image_bytes": data,
             "duration": 0,
             "width": width,
             "height": height,
         }
 
+    def load_clip_data(self, file_path: Path) -> dict:
+        with open(file_path, "rb") as f:
+            image_bytes = f.read()
+        return self.clip_data_from(file_path, image_bytes)
+
     # ------------------------------------------------------------------
     # HTTP serving
     # ------------------------------------------------------------------
@@ -252,7 +302,7 @@ class ImageMediaType(MediaType):
         ext = Path(filename).suffix.lower() if filename else ".jpg"
         mimetype = _IMAGE_MIME_TYPES.get(ext, "image/jpeg")
         return MediaResponse(
-            data=clip["image_bytes"],
+            data=clip_media_bytes(clip),
             mimetype=mimetype,
             download_name=f"clip_{clip['id']}{ext}",
         )
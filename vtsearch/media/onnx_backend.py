@@ -0,0 +1,274 @@
+"""Optional ONNX Runtime backend for the media types' encoders.
+
+With ``EMBEDDING_BACKEND = "onnx"`` each encoder (CLAP audio and text, CLIP
+image and text, X-CLIP video and text, E5 passages and queries) is exported
+to ONNX the first time it runs, dynamically quantised to int8 weights
+(``ONNX_QUANTIZE``) and from then on run with ONNX Runtime.  Exports are
+kept under ``ONNX_MODELS_DIR``, one file per model ID and encoder, so later
+runs load them directly.
+
+Quantised vectors are only useful if they can sit next to the torch vectors
+already in the embedding cache.  So the first batch an encoder sees is run
+through both backends, and :func:`cosine_agreement` between the two is
+recorded; if the lowest agreement is under ``ONNX_PARITY_MIN_COSINE`` the
+encoder stays on torch.  The outcome for every encoder is reported by
+:func:`backend_report`.
+
+Anything that goes wrong (``onnxruntime`` not installed, an export or
+session error) is printed once and the encoder falls back to torch, so the
+backend setting can never stop embedding from working.  ``onnx`` and
+``onnxruntime`` are optional dependencies (``requirements-onnx.txt``).
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+import torch
+
+from config import EMBEDDING_BACKEND, ONNX_MODELS_DIR, ONNX_PARITY_MIN_COSINE, ONNX_QUANTIZE
+
+# Axis names for ONNX dynamic shapes
+BATCH = {0: "batch"}
+BATCH_AND_SEQUENCE = {0: "batch", 1: "sequence"}
+
+_encoders: dict[str, OnnxEncoder] = {}
+_encoders_lock = threading.Lock()
+
+
+def cosine_agreement(a: np.ndarray, b: np.ndarray) -> dict[str, float]:
+    """Return the minimum and mean row-wise cosine similarity of two embedding batches."""
+    a = np.asarray(a, dtype=np.float64).reshape(len(a), -1)
+    b = np.asarray(b, dtype=np.float64).reshape(len(b), -1)
+    norms = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+    norms[norms == 0] = 1.0
+    cosines = (a * b).sum(axis=1) / norms
+    return {"min_cosine": float(cosines.min()), "mean_cosine": float(cosines.mean())}
+
+
+def use_onnx() -> bool:
+    """Return whether ``EMBEDDING_BACKEND`` selects ONNX Runtime."""
+    return EMBEDDING_BACKEND == "onnx"
+
+
+def _to_numpy(value: Any) -> np.ndarray:
+    if isinstance(value, torch.Tensor):
+        return value.detach().cpu().numpy()
+    return np.asarray(value)
+
+
+class OnnxEncoder:
+    """One encoder that runs with ONNX Runtime once exported and verified.
+
+    Args:
+        model_id: Hugging Face model ID the encoder belongs to.
+        name: Encoder name within the model (e.g. ``"audio"``, ``"text"``).
+        build_module: Returns a :class:`torch.nn.Module` whose ``forward``
+            takes the inputs named in *input_names*, in order, and returns
+            the embeddings.  Only called when the encoder is exported.
+        input_names: Processor outputs the encoder consumes.
+        dynamic_axes: Dynamic dimensions of each input (batch, sequence).
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        name: str,
+        build_module: Callable[[], torch.nn.Module],
+        input_names: Sequence[str],
+        dynamic_axes: Mapping[str, Mapping[int, str]],
+    ) -> None:
+        self.model_id = model_id
+        self.name = name
+        self._build_module = build_module
+        self.input_names = list(input_names)
+        self.dynamic_axes = {key: dict(axes) for key, axes in dynamic_axes.items()}
+        self._session: Any = None
+        self._lock = threading.Lock()
+        self.status = "not used"
+        self.parity: dict[str, float] | None = None
+
+    @property
+    def path(self) -> Path:
+        """Where the exported (and, with ``ONNX_QUANTIZE``, quantised) model is kept."""
+        stem = re.sub(r"[^A-Za-z0-9._-]+", "--", self.model_id)
+        return ONNX_MODELS_DIR / f"{stem}.{self.name}{'.int8' if ONNX_QUANTIZE else ''}.onnx"
+
+    def run(self, inputs: Mapping[str, Any], reference: Callable[[], np.ndarray]) -> Optional[np.ndarray]:
+        """Embed *inputs* with ONNX Runtime, or return ``None`` to have the caller use torch.
+
+        *reference* computes the same batch with torch.  It is only called
+        for the first batch, whose two results are compared before the
+        ONNX session is trusted; if they disagree the torch result is
+        returned and the encoder stays on torch.
+        """
+        if not use_onnx() or self.status in ("torch", "failed"):
+            return None
+        with self._lock:
+            session = self._session
+            if session is None:
+                return self._start(inputs, reference)
+        try:
+            return session.run(None, self._feed(inputs))[0]
+        except Exception as e:
+            # e.g. a shape the export did not generalise to; torch handles it from now on
+            print(f"ONNX {self.model_id} {self.name} failed, using torch: {e}")
+            self.status = "failed"
+            self._session = None
+            return None
+
+    def _feed(self, inputs: Mapping[str, Any]) -> dict[str, np.ndarray]:
+        return {name: _to_numpy(inputs[name]) for name in self.input_names}
+
+    def _start(self, inputs: Mapping[str, Any], reference: Callable[[], np.ndarray]) -> np.ndarray:
+        """Export (if needed) and open the session, then check it against torch.  Caller holds the lock."""
+        try:
+            import onnxruntime as ort  # noqa: PLC0415  (optional dependency)
+
+            if not self.path.exists():
+                self._export(inputs)
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            session = ort.InferenceSession(str(self.path), options, providers=["CPUExecutionProvider"])
+            output = session.run(None, self._feed(inputs))[0]
+        except Exception as e:
+            print(f"ONNX backend unavailable for {self.model_id} {self.name}, using torch: {e}")
+            self.status = "failed"
+            return reference()
+
+        expected = reference()
+        self.parity = cosine_agreement(output, expected)
+        if self.parity["min_cosine"] < ONNX_PARITY_MIN_COSINE:
+            print(
+                f"ONNX {self.model_id} {self.name} agrees with torch only to cosine "
+                f"{self.parity['min_cosine']:.4f} (< {ONNX_PARITY_MIN_COSINE}); using torch"
+            )
+            self.status = "torch"
+            return expected
+        self._session = session
+        self.status = "onnx"
+        return output
+
+    def _export(self, inputs: Mapping[str, Any]) -> None:
+        """Trace the torch encoder on *inputs* and write it (quantised) to :attr:`path`."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        float_path = self.path.with_suffix(".float.onnx") if ONNX_QUANTIZE else self.path
+        module = self._build_module().eval()
+        args = tuple(torch.as_tensor(inputs[name]) for name in self.input_names)
+        with torch.no_grad():
+            torch.onnx.export(
+                module,
+                args,
+                str(float_path),
+                input_names=self.input_names,
+                output_names=["embeddings"],
+                dynamic_axes={**self.dynamic_axes, "embeddings": BATCH},
+                opset_version=17,
+                dynamo=False,
+            )
+        if ONNX_QUANTIZE:
+            from onnxruntime.quantization import QuantType, quantize_dynamic  # noqa: PLC0415
+
+            quantize_dynamic(str(float_path), str(self.path), weight_type=QuantType.QInt8)
+            float_path.unlink(missing_ok=True)
+
+    def report(self) -> dict[str, Any]:
+        """Return this encoder's backend, parity figures and export path."""
+        return {
+            "model_id": self.model_id,
+            "encoder": self.name,
+            "backend": self.status,
+            "parity": self.parity,
+            "path": str(self.path) if self.status == "onnx" else None,
+        }
+
+
+class EncoderModule(torch.nn.Module):
+    """Wraps ``encode(model, **inputs)`` as a module with positional inputs, for export."""
+
+    def __init__(self, model: torch.nn.Module, encode: Callable[..., torch.Tensor], input_names: Sequence[str]):
+        super().__init__()
+        self.model = model
+        self._encode = encode
+        self._input_names = list(input_names)
+
+    def forward(self, *args: torch.Tensor) -> torch.Tensor:
+        return self._encode(self.model, **dict(zip(self._input_names, args)))
+
+
+def onnx_encoder(
+    model_id: str,
+    name: str,
+    build_module: Callable[[], torch.nn.Module],
+    input_names: Sequence[str],
+    dynamic_axes: Mapping[str, Mapping[int, str]],
+) -> OnnxEncoder:
+    """Return the process-wide :class:`OnnxEncoder` for (*model_id*, *name*), creating it on first use."""
+    key = f"{model_id}:{name}"
+    with _encoders_lock:
+        encoder = _encoders.get(key)
+        if encoder is None:
+            encoder = _encoders[key] = OnnxEncoder(model_id, name, build_module, input_names, dynamic_axes)
+        return encoder
+
+
+def embed_with_backend(
+    model_id: str,
+    name: str,
+    model: torch.nn.Module,
+    encode: Callable[..., torch.Tensor],
+    inputs: Mapping[str, Any],
+    dynamic_axes: Mapping[str, Mapping[int, str]],
+) -> np.ndarray:
+    """Return ``encode(model, **inputs)`` as an array, run with the configured backend.
+
+    Args:
+        model_id: Hugging Face model ID of *model*.
+        name: Encoder name within the model.
+        model: The loaded torch model.
+        encode: Computes the embeddings from *model* and the processor
+            outputs; this is what gets exported.
+        inputs: Processor outputs for the batch.
+        dynamic_axes: Dynamic dimensions of each input the ONNX graph takes.
+    """
+    input_names = list(dynamic_axes)
+
+    def reference() -> np.ndarray:
+        with torch.no_grad():
+            return _to_numpy(encode(model, **inputs))
+
+    if not use_onnx():
+        return reference()
+    encoder = onnx_encoder(model_id, name, lambda: EncoderModule(model, encode, input_names), input_names, dynamic_axes)
+    output = encoder.run(inputs, reference)
+    return reference() if output is None else output
+
+
+def backend_report() -> dict[str, Any]:
+    """Return the configured backend and, for every encoder used so far, how it runs."""
+    with _encoders_lock:
+        encoders = [encoder.report() for encoder in _encoders.values()]
+    return {
+        "backend": EMBEDDING_BACKEND,
+        "quantize": ONNX_QUANTIZE,
+        "min_cosine": ONNX_PARITY_MIN_COSINE,
+        "encoders": encoders,
+    }
+
+
+def drop_onnx_encoders(model_id: str) -> None:
+    """Forget *model_id*'s encoders, which hold references to its torch model (e.g. when it is unloaded)."""
+    with _encoders_lock:
+        for key in [key for key, encoder in _encoders.items() if encoder.model_id == model_id]:
+            del _encoders[key]
+
+
+def reset_onnx_encoders() -> None:
+    """Forget every encoder and its session (e.g. after the models were reloaded)."""
+    with _encoders_lock:
+        _encoders.clear()
@@ -2,14 +2,37 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Sequence
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
+import torch
 
-from config import E5_MODEL_ID, MODELS_CACHE_DIR
-from vtsearch.media.base import DemoDataset, MediaResponse, MediaType, ProgressCallback, _noop_progress
+from config import (
+    E5_MODEL_ID,
+    MODELS_CACHE_DIR,
+    TEXT_CHUNK_EMBEDDINGS,
+    TEXT_CHUNK_OVERLAP_TOKENS,
+    TEXT_EMBED_BATCH_SIZE,
+)
+from vtsearch.media.base import DemoDataset, MediaResponse, MediaType, ProgressCallback, Segments, _noop_progress
+from vtsearch.media.onnx_backend import BATCH_AND_SEQUENCE, embed_with_backend, use_onnx
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+# Tokens kept free in each chunk besides the tokenizer's special tokens, in
+# case a chunk re-tokenises slightly longer once cut out of its document
+_CHUNK_MARGIN = 8
+
+
+def _encode_mean_pooled(model: torch.nn.Module, **inputs: torch.Tensor) -> torch.Tensor:
+    """E5's sentence embedding: the masked mean of the token states, L2-normalised."""
+    hidden = model(**inputs).last_hidden_state
+    mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+    pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+    return torch.nn.functional.normalize(pooled, dim=-1)
 
 
 class TextMediaType(MediaType):
@@ -17,6 +40,9 @@ class TextMediaType(MediaType):
 
     * Embeds text files with the ``"passage: "`` prefix required by E5's
       asymmetric retrieval design (768-dim, L2-normalised).
+    * Passages longer than the model window are split into overlapping
+      chunks and pooled; all chunks are embedded in token-length-sorted
+      batches to keep padding low.
     * Embeds text queries with the ``"query: "`` prefix so they land in the
       same space.
     * Serves clips as JSON objects containing the text content and word/
@@ -26,6 +52,7 @@ class TextMediaType(MediaType):
     def __init__(self) -> None:
         self._model: Optional[SentenceTransformer] = None
         self._on_progress: ProgressCallback = _noop_progress
+        self.embed_batch_size = TEXT_EMBED_BATCH_SIZE
 
     # ------------------------------------------------------------------
     # Identity
@@ -115,77 +142,239 @@ class TextMediaType(MediaType):
     # Embeddings
     # ------------------------------------------------------------------
 
+    @property
+    def embedding_model_id(self) -> str:
+        return E5_MODEL_ID
+
+    @property
+    def embedding_params(self) -> dict:
+        return {"prefix": "passage: ", "normalize": True, "chunk_overlap": TEXT_CHUNK_OVERLAP_TOKENS}
+
     def load_models(self) -> None:
         if self._model is not None:
             return
         import gc
 
+        from sentence_transformers import SentenceTransformer
+
         gc.collect()
         cache_dir = str(MODELS_CACHE_DIR)
         self._on_progress("loading", "Loading text embedder (E5 model)...", 0, 0)
         self._model = SentenceTransformer(E5_MODEL_ID, cache_folder=cache_dir)
 
     def embed_media(self, file_path: Path) -> Optional[np.ndarray]:
-        if self._model is None:
-            self.load_models()
-        if self._model is None:
-            return None
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                text_content = f.read().strip()
+        return self.embed_media_batch([file_path])[0]
+
+    def embed_media_batch(self, file_paths: Sequence[Path]) -> list[Optional[np.ndarray]]:
+        results: list[Optional[np.ndarray]] = [None] * len(file_paths)
+        texts, positions = self._read_texts(file_paths)
+        for i, embedding in zip(positions, self.embed_text_passages(texts)):
+            results[i] = embedding
+        return results
+
+    def needs_segments(self, file_path: Path) -> bool:
+        # Chunk embeddings are only kept when configured; otherwise every
+        # file goes through embed_media_batch and only the pooled vector stays
+        return TEXT_CHUNK_EMBEDDINGS
+
+    def embed_segments(self, file_path: Path) -> Optional[Segments]:
+        return self.embed_segments_batch([file_path])[0]
+
+    def embed_segments_batch(self, file_paths: Sequence[Path]) -> list[Optional[Segments]]:
+        results: list[Optional[Segments]] = [None] * len(file_paths)
+        texts, positions = self._read_texts(file_paths)
+        for i, segments in zip(positions, self.embed_passage_chunks(texts)):
+            results[i] = segments
+        return results
+
+    @staticmethod
+    def _read_texts(file_paths: Sequence[Path]) -> tuple[list[str], list[int]]:
+        texts, positions = [], []
+        for i, file_path in enumerate(file_paths):
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    text_content = f.read().strip()
+            except Exception as e:
+                print(f"Error embedding {file_path}: {e}")
+                continue
             if not text_content:
                 print(f"Warning: empty text file {file_path}")
-                return None
-            return self._model.encode(f"passage: {text_content}", normalize_embeddings=True)
-        except Exception as e:
-            print(f"Error embedding {file_path}: {e}")
-            return None
+                continue
+            texts.append(text_content)
+            positions.append(i)
+        return texts, positions
 
     def embed_text_passage(self, text: str) -> Optional[np.ndarray]:
         """Embed *text* as a passage (used when loading demo datasets in-memory)."""
-        if self._model is None:
-            self.load_models()
-        if self._model is None:
-            return None
+        return self.embed_text_passages([text])[0]
+
+    def embed_text_passages(
+        self, texts: Sequence[str], on_batch: Optional[Callable[[int, int], None]] = None
+    ) -> list[Optional[np.ndarray]]:
+        """Embed several passages at once; entries are ``None`` on failure.
+
+        Long passages are chunked and pooled (see :meth:`embed_passage_chunks`).
+        """
+        return [
+            segments.pooled if segments is not None else None for segments in self.embed_passage_chunks(texts, on_batch)
+        ]
+
+    def embed_passage_chunks(
+        self, texts: Sequence[str], on_batch: Optional[Callable[[int, int], None]] = None
+    ) -> list[Optional[Segments]]:
+        """Embed *texts* as passages, splitting any that overflow the model window.
+
+        Each passage is tokenised once and cut into chunks of at most the
+        model's sequence length, overlapping by ``TEXT_CHUNK_OVERLAP_TOKENS``.
+        The chunks of all passages are sorted by token count and embedded
+        ``embed_batch_size`` at a time, so each batch pads to a similar
+        length.
+
+        Args:
+            texts: Passages to embed.
+            on_batch: Called as ``on_batch(done, total)`` in chunks after
+                every model batch.
+
+        Returns:
+            One :class:`~vtsearch.media.base.Segments` per passage, whose
+            offsets are the chunks' first characters; ``None`` on failure.
+        """
+        self.ensure_models()
+        if self._model is None or not texts:
+            return [None] * len(texts)
         try:
-            return self._model.encode(f"passage: {text}", normalize_embeddings=True)
+            chunks = [
+                (i, start, end, length)
+                for i, text_chunks in enumerate(self._chunk(texts))
+                for start, end, length in text_chunks
+            ]
+            order = sorted(range(len(chunks)), key=lambda j: chunks[j][3])
+            vectors: list[np.ndarray] = [None] * len(chunks)  # type: ignore[list-item]
+            for start in range(0, len(order), self.embed_batch_size):
+                batch = order[start : start + self.embed_batch_size]
+                prefixed = [f"passage: {texts[chunks[j][0]][chunks[j][1] : chunks[j][2]]}" for j in batch]
+                encoded = self._run_model(prefixed, len(batch))
+                for j, vector in zip(batch, encoded):
+                    vectors[j] = vector
+                if on_batch is not None:
+                    on_batch(start + len(batch), len(order))
         except Exception as e:
             print(f"Error embedding passage: {e}")
-            return None
+            return [None] * len(texts)
+
+        offsets: list[list[int]] = [[] for _ in texts]
+        embeddings: list[list[np.ndarray]] = [[] for _ in texts]
+        for (i, start, _end, _length), vector in zip(chunks, vectors):
+            offsets[i].append(start)
+            embeddings[i].append(vector)
+        return [
+            Segments(
+                offsets=np.asarray(starts, dtype=np.float32),
+                embeddings=np.stack(vecs).astype(np.float32),
+                duration=0.0,
+            )
+            for starts, vecs in zip(offsets, embeddings)
+        ]
+
+    def _chunk(self, texts: Sequence[str]) -> list[list[tuple[int, int, int]]]:
+        """Split each of *texts* into ``(start_char, end_char, tokens)`` chunks that fit the model window."""
+        window = self._chunk_tokens()
+        hop = max(1, window - TEXT_CHUNK_OVERLAP_TOKENS)
+        tokenized = self._model.tokenizer(
+            list(texts), add_special_tokens=False, return_offsets_mapping=True, verbose=False
+        )
+        result = []
+        for text, spans in zip(texts, tokenized["offset_mapping"]):
+            if len(spans) <= window:
+                result.append([(0, len(text), len(spans))])
+                continue
+            chunks = []
+            for first in range(0, len(spans), hop):
+                piece = spans[first : first + window]
+                chunks.append((piece[0][0], piece[-1][1], len(piece)))
+                if first + window >= len(spans):
+                    break
+            result.append(chunks)
+        return result
+
+    def _chunk_tokens(self) -> int:
+        """Tokens of passage text that fit in one model input after the prefix and special tokens."""
+        tokenizer = self._model.tokenizer
+        prefix = len(tokenizer("passage: ", add_special_tokens=False)["input_ids"])
+        special = tokenizer.num_special_tokens_to_add(pair=False)
+        return max(1, self._model.max_seq_length - prefix - special - _CHUNK_MARGIN)
 
     def embed_text(self, text: str) -> Optional[np.ndarray]:
-        if self._model is None:
-            self.load_models()
-        if self._model is None:
-            return None
+        return self.embed_text_batch([text])[0]
+
+    def embed_text_batch(self, texts: Sequence[str]) -> list[Optional[np.ndarray]]:
+        return self._encode([f"query: {text}" for text in texts], "text query for text")
+
+    def _encode(self, prefixed: list[str], what: str) -> list[Optional[np.ndarray]]:
+        self.ensure_models()
+        if self._model is None or not prefixed:
+            return [None] * len(prefixed)
         try:
-            return self._model.encode(f"query: {text}", normalize_embeddings=True)
+            # SentenceTransformer pads each batch to its longest member and
+            # truncates to the model's maximum sequence length.
+            return list(self._run_model(prefixed, self.embed_batch_size))
         except Exception as e:
-            print(f"Error embedding text query for text: {e}")
-            return None
+            print(f"Error embedding {what}: {e}")
+            return [None] * len(prefixed)
+
+    def _run_model(self, prefixed: list[str], batch_size: int) -> np.ndarray:
+        """Embed already-prefixed strings, normalised, with the configured backend."""
+        if not use_onnx():
+            return self._model.encode(prefixed, batch_size=batch_size, normalize_embeddings=True)
+        encoder = self._model[0].auto_model
+        # preprocess() replaced tokenize() in newer sentence-transformers
+        tokenize = getattr(self._model, "preprocess", None) or self._model.tokenize
+        batches = []
+        for start in range(0, len(prefixed), batch_size):
+            features = {
+                name: value
+                for name, value in tokenize(prefixed[start : start + batch_size]).items()
+                if isinstance(value, torch.Tensor)
+            }
+            axes = {name: BATCH_AND_SEQUENCE for name in features}
+            batches.append(embed_with_backend(E5_MODEL_ID, "text", encoder, _encode_mean_pooled, features, axes))
+        return np.concatenate(batches)
 
     # internal helper used by loader.py's get_e5_model() bridge
     def _get_model(self) -> Optional[SentenceTransformer]:
-        if self._model is None:
-            self.load_models()
+        self.ensure_models()
         return self._model
 
     # ------------------------------------------------------------------
     # Clip data
     # ------------------------------------------------------------------
 
-    def load_clip_data(self, file_path: Path) -> dict:
+    def clip_data_from(self, file_path: Path, data: bytes, info: Optional[dict] = None) -> dict:
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                text_content = f.read().strip()
-        except Exception:
+            # Same newline handling as reading the file in text mode
+            text_content = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n").strip()
+        except UnicodeDecodeError:
             text_content = ""
-        return {
+        clip_data = {
             "text_content": text_content,
             "duration": 0,
             "word_count": len(text_content.split()),
             "character_count": len(text_content),
         }
+        segments = info.get("segments") if info is not None else None
+        # A passage that fit in one chunk has nothing to add to its embedding
+        if segments is not None and len(segments.offsets) > 1:
+            clip_data["segment_offsets"] = segments.offsets
+            clip_data["segment_embeddings"] = segments.embeddings
+        return clip_data
+
+    def load_clip_data(self, file_path: Path) -> dict:
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+        except Exception:
+            data = b""
+        return self.clip_data_from(file_path, data)
 
     # ------------------------------------------------------------------
     # HTTP serving
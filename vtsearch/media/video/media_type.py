@@ -2,16 +2,30 @@
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable, Sequence
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
 import torch
 from PIL import Image
-from transformers import XCLIPModel, XCLIPProcessor
 
-from config import MODELS_CACHE_DIR, VIDEO_DIR, XCLIP_MODEL_ID
+from config import MODELS_CACHE_DIR, VIDEO_DIR, VIDEO_EMBED_BATCH_SIZE, XCLIP_MODEL_ID
+from vtsearch.decoding.decoders import Decoded, decode_video_frames
 from vtsearch.media.base import DemoDataset, MediaResponse, MediaType, ProgressCallback, _noop_progress
+from vtsearch.media.onnx_backend import BATCH_AND_SEQUENCE, embed_with_backend
+from vtsearch.utils.media_store import clip_media_bytes
+
+if TYPE_CHECKING:
+    from transformers import XCLIPModel, XCLIPProcessor
+
+# Frames sampled evenly across a video for the X-CLIP embedding
+_NUM_FRAMES = 8
+
+# X-CLIP's processor resizes frames to 224 px on the shorter side; frames
+# are shrunk to that while decoding so workers hand back small arrays
+_FRAME_SIZE = 224
 
 
 def _extract_tensor(output: object) -> torch.Tensor:
@@ -31,6 +45,14 @@ def _extract_tensor(output: object) -> torch.Tensor:
     return output[0]  # type: ignore[index]
 
 
+def _encode_video(model: XCLIPModel, **inputs: torch.Tensor) -> torch.Tensor:
+    return _extract_tensor(model.get_video_features(**inputs))
+
+
+def _encode_text(model: XCLIPModel, **inputs: torch.Tensor) -> torch.Tensor:
+    return _extract_tensor(model.get_text_features(**inputs))
+
+
 _VIDEO_MIME_TYPES: dict[str, str] = {
     ".webm": "video/webm",
     ".mov": "video/quicktime",
@@ -41,8 +63,8 @@ _VIDEO_MIME_TYPES: dict[str, str] = {
 class VideoMediaType(MediaType):
     """Handles video clips using the X-CLIP model (microsoft/xclip-base-patch32).
 
-    * Embeds videos by sampling 8 evenly-spaced frames and running them through
-      X-CLIP's video encoder.
+    * Embeds videos by sampling 8 evenly-spaced frames in one pass over the
+      file and running them through X-CLIP's video encoder.
     * Embeds text queries via X-CLIP's text encoder (same 768-dim space).
     * Serves clips with MIME types inferred from the file extension.
     """
@@ -51,6 +73,7 @@ class VideoMediaType(MediaType):
         self._model: Optional[XCLIPModel] = None
         self._processor: Optional[XCLIPProcessor] = None
         self._on_progress: ProgressCallback = _noop_progress
+        self.embed_batch_size = VIDEO_EMBED_BATCH_SIZE
 
     # ------------------------------------------------------------------
     # Identity
@@ -135,11 +158,21 @@ class VideoMediaType(MediaType):
     # Embeddings
     # ------------------------------------------------------------------
 
+    @property
+    def embedding_model_id(self) -> str:
+        return XCLIP_MODEL_ID
+
+    @property
+    def embedding_params(self) -> dict:
+        return {"frames": _NUM_FRAMES, "frame_size": _FRAME_SIZE}
+
     def load_models(self) -> None:
         if self._model is not None:
             return
         import gc
 
+        from transformers import XCLIPModel, XCLIPProcessor
+
         gc.collect()
         cache_dir = str(MODELS_CACHE_DIR)
         self._on_progress("loading", "Loading video embedder (X-CLIP model)...", 0, 0)
@@ -147,71 +180,81 @@ class VideoMediaType(MediaType):
         self._processor = XCLIPProcessor.from_pretrained(XCLIP_MODEL_ID, cache_dir=cache_dir, use_fast=False)
 
     def embed_media(self, file_path: Path) -> Optional[np.ndarray]:
-        if self._model is None:
-            self.load_models()
-        if self._model is None or self._processor is None:
-            return None
-        try:
-            import cv2  # noqa: PLC0415  (lazy import — cv2 is optional)
-
-            cap = cv2.VideoCapture(str(file_path))
-            if not cap.isOpened():
-                print(f"Error opening video {file_path}")
-                return None
-
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            num_frames = min(8, max(1, frame_count))
-            indices = np.linspace(0, frame_count - 1, num_frames, dtype=int)
-
-            frames = []
-            for idx in indices:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-                ret, frame = cap.read()
-                if ret:
-                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    frames.append(Image.fromarray(frame))
-            cap.release()
+        return self.embed_media_batch([file_path])[0]
 
-            if not frames:
-                print(f"Error: could not extract frames from {file_path}")
-                return None
-
-            inputs = self._processor(videos=list(frames), return_tensors="pt")
-            with torch.no_grad():
-                outputs = self._model.get_video_features(**inputs)
-                embedding = _extract_tensor(outputs).detach().cpu().numpy()
-            return embedding[0]
-        except Exception as e:
-            print(f"Error embedding {file_path}: {e}")
-            return None
+    @property
+    def decoder(self) -> Callable[..., Optional[Decoded]]:
+        return functools.partial(decode_video_frames, num_frames=_NUM_FRAMES, size=_FRAME_SIZE)
+
+    def embed_media_batch(self, file_paths: Sequence[Path]) -> list[Optional[np.ndarray]]:
+        results: list[Optional[np.ndarray]] = [None] * len(file_paths)
+        decoded = [(i, self.decoder(p)) for i, p in enumerate(file_paths)]
+        decoded = [(i, d.array) for i, d in decoded if d is not None]
+        if decoded:
+            embeddings = self.embed_decoded_batch([frames for _, frames in decoded])
+            for (i, _), embedding in zip(decoded, embeddings):
+                results[i] = embedding
+        return results
+
+    def embed_decoded_batch(self, arrays: Sequence[np.ndarray]) -> list[Optional[np.ndarray]]:
+        results: list[Optional[np.ndarray]] = [None] * len(arrays)
+        self.ensure_models()
+        if self._model is None or self._processor is None:
+            return results
+        # X-CLIP needs the same number of frames for every video in a batch;
+        # videos shorter than _NUM_FRAMES frames are batched by frame count.
+        by_length: dict[int, list[tuple[int, list[Image.Image]]]] = {}
+        for i, stack in enumerate(arrays):
+            frames = [Image.fromarray(frame) for frame in stack]
+            by_length.setdefault(len(frames), []).append((i, frames))
+        for group in by_length.values():
+            try:
+                embeddings = list(self._embed_frame_sets([frames for _, frames in group]))
+            except Exception:
+                # Retry one by one so a single bad video does not sink the batch
+                embeddings = []
+                for _, frames in group:
+                    try:
+                        embeddings.append(self._embed_frame_sets([frames])[0])
+                    except Exception as e:
+                        print(f"Error embedding video frames: {e}")
+                        embeddings.append(None)
+            for (i, _), embedding in zip(group, embeddings):
+                results[i] = embedding
+        return results
+
+    def _embed_frame_sets(self, frame_sets: list[list[Image.Image]]) -> np.ndarray:
+        inputs = self._processor(videos=frame_sets, return_tensors="pt")
+        axes = {"pixel_values": {0: "batch", 1: "frames"}}
+        return embed_with_backend(XCLIP_MODEL_ID, "video", self._model, _encode_video, inputs, axes)
 
     def embed_text(self, text: str) -> Optional[np.ndarray]:
-        if self._model is None:
-            self.load_models()
-        if self._model is None or self._processor is None:
-            return None
+        return self.embed_text_batch([text])[0]
+
+    def embed_text_batch(self, texts: Sequence[str]) -> list[Optional[np.ndarray]]:
+        self.ensure_models()
+        if self._model is None or self._processor is None or not texts:
+            return [None] * len(texts)
         try:
-            inputs = self._processor(text=[text], return_tensors="pt")
-            with torch.no_grad():
-                text_vec = _extract_tensor(self._model.get_text_features(**inputs)).detach().cpu().numpy()[0]
-            return text_vec
+            inputs = self._processor(text=list(texts), return_tensors="pt", padding=True, truncation=True)
+            axes = {"input_ids": BATCH_AND_SEQUENCE, "attention_mask": BATCH_AND_SEQUENCE}
+            return list(embed_with_backend(XCLIP_MODEL_ID, "text", self._model, _encode_text, inputs, axes))
         except Exception as e:
             print(f"Error embedding text query for video: {e}")
-            return None
+            return [None] * len(texts)
 
     # internal helper used by loader.py's get_xclip_model() bridge
     def _get_model_and_processor(self):
-        if self._model is None:
-            self.load_models()
+        self.ensure_models()
         return self._model, self._processor
 
     # ------------------------------------------------------------------
     # Clip data
     # ------------------------------------------------------------------
 
-    def load_clip_data(self, file_path: Path) -> dict:
-        with open(file_path, "rb") as f:
-            video_bytes = f.read()
+    def clip_data_from(self, file_path: Path, data: bytes, info: Optional[dict] = None) -> dict:
+        if info is not None:
+            return {"video_bytes": data, "duration": info["duration"]}
         try:
             import cv2  # noqa: PLC0415
 
@@ -222,7 +265,12 @@ class VideoMediaType(MediaType):
             cap.release()
         except Exception:
             duration = 0.0
-        return {"video_bytes": video_bytes, "duration": duration}
+        return {"video_bytes": data, "duration": duration}
+
+    def load_clip_data(self, file_path: Path) -> dict:
+        with open(file_path, "rb") as f:
+            video_bytes = f.read()
+        return self.clip_data_from(file_path, video_bytes)
 
     # ------------------------------------------------------------------
     # HTTP serving
@@ -233,7 +281,7 @@ class VideoMediaType(MediaType):
         ext = Path(filename).suffix.lower() if filename else ".mp4"
         mimetype = _VIDEO_MIME_TYPES.get(ext, "video/mp4")
         return MediaResponse(
-            data=clip["video_bytes"],
+            data=clip_media_bytes(clip),
             mimetype=mimetype,
             download_name=f"clip_{clip['id']}{ext}",
         )
@@ -1,20 +1,51 @@
 """Model loading, embeddings, and training utilities."""
 
+from vtsearch.models.background import BackgroundTrainer, TrainingResult, TrainingSnapshot
+from vtsearch.models.embedding_cache import (
+    EmbeddingCache,
+    embed_file_cached,
+    embed_files_cached,
+    embedding_cache_stats,
+    get_embedding_cache,
+    ingest_files_cached,
+)
 from vtsearch.models.embeddings import (
     embed_audio_file,
     embed_image_file,
     embed_paragraph_file,
+    embed_text_queries,
     embed_text_query,
     embed_video_file,
 )
-from vtsearch.models.loader import get_clap_model, get_clip_model, get_e5_model, get_xclip_model, initialize_models
+from vtsearch.models.loader import (
+    get_clap_model,
+    get_clip_model,
+    get_e5_model,
+    get_xclip_model,
+    initialize_models,
+    warm_models,
+)
 from vtsearch.models.progress import analyze_labeling_progress, clear_progress_cache, compute_labeling_status
+from vtsearch.models.query_cache import QueryCache, clear_query_cache, get_query_cache, query_cache_stats
+from vtsearch.models.similarity import (
+    clear_similarity_cache,
+    cosine_similarities,
+    rank_by_similarity,
+    similarity_cache_stats,
+    similarity_sort,
+)
 from vtsearch.models.training import (
+    WarmStartState,
     calculate_cross_calibration_threshold,
     calculate_gmm_threshold,
+    clear_warm_start_cache,
     find_optimal_threshold,
+    find_optimal_thresholds,
     train_and_score,
+    train_calibrated_models,
     train_model,
+    train_model_incremental,
+    train_models,
 )
 
 __all__ = [
@@ -24,20 +55,50 @@ __all__ = [
     "embed_image_file",
     "embed_paragraph_file",
     "embed_text_query",
+    "embed_text_queries",
+    # Embedding cache
+    "EmbeddingCache",
+    "embed_file_cached",
+    "embed_files_cached",
+    "embedding_cache_stats",
+    "get_embedding_cache",
+    "ingest_files_cached",
+    # Query cache
+    "QueryCache",
+    "clear_query_cache",
+    "get_query_cache",
+    "query_cache_stats",
     # Loader
     "initialize_models",
+    "warm_models",
     "get_clap_model",
     "get_xclip_model",
     "get_clip_model",
     "get_e5_model",
     # Training
     "train_model",
+    "train_models",
+    "train_model_incremental",
+    "train_calibrated_models",
     "train_and_score",
     "calculate_gmm_threshold",
     "find_optimal_threshold",
+    "find_optimal_thresholds",
     "calculate_cross_calibration_threshold",
+    "WarmStartState",
+    "clear_warm_start_cache",
+    # Similarity
+    "cosine_similarities",
+    "rank_by_similarity",
+    "similarity_sort",
+    "similarity_cache_stats",
+    "clear_similarity_cache",
     # Progress
     "analyze_labeling_progress",
     "clear_progress_cache",
     "compute_labeling_status",
+    # Background training
+    "BackgroundTrainer",
+    "TrainingSnapshot",
+    "TrainingResult",
 ]
@@ -0,0 +1,222 @@
+"""Speculative background retraining after votes.
+
+Voting only mutates the vote dicts; training used to wait until the frontend
+asked for ``/api/learned-sort`` or ``/api/labeling-status``.  A
+:class:`BackgroundTrainer` is notified on every vote or label import instead.
+It waits for a burst of votes to settle, then trains the learned-sort model
+and extends the progress cache on its own thread, and publishes the outcome
+tagged with the key of the state it was trained on.  Until the run for the
+latest votes finishes, requests are answered from the previous run, flagged
+stale, rather than waiting for it.
+
+The trainer never reads global state itself: the caller supplies a
+``snapshot`` function that copies whatever it needs (see
+:class:`TrainingSnapshot`), so this module stays independent of
+:mod:`vtsearch.utils.state`.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, replace
+from typing import Any
+
+from vtsearch.models.progress import compute_labeling_status
+from vtsearch.models.training import train_and_score
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TrainingSnapshot:
+    """A consistent copy of the state one background training run works on.
+
+    Attributes:
+        key: Identifies the state the snapshot was taken from (the routes use
+            the state version); results are only served for an equal key.
+        clips: Mapping of clip ID to clip data.  Not copied; the trainer only
+            reads embeddings from it.
+        good_votes: Copy of the good votes.
+        bad_votes: Copy of the bad votes.
+        label_history: Copy of the label history.
+        inclusion: Inclusion value to train with.
+    """
+
+    key: Hashable
+    clips: dict[int, dict[str, Any]]
+    good_votes: dict[int, None]
+    bad_votes: dict[int, None]
+    label_history: list[tuple[int, str, float]]
+    inclusion: int
+
+
+@dataclass
+class TrainingResult:
+    """Outcome of one background training run.
+
+    Attributes:
+        key: Key of the :class:`TrainingSnapshot` the run trained on.
+        results: Learned-sort results (see :func:`train_and_score`), or
+            ``None`` when there was not at least one good and one bad vote.
+        threshold: Learned-sort threshold, or ``None`` with *results*.
+        status: Output of :func:`compute_labeling_status` for the snapshot.
+        stale: Set on the copy :meth:`BackgroundTrainer.result_for` returns
+            when the run was for an earlier key than the one asked for.
+    """
+
+    key: Hashable
+    results: list[dict[str, Any]] | None
+    threshold: float | None
+    status: dict[str, Any]
+    stale: bool = False
+
+
+class BackgroundTrainer:
+    """Retrain the learned-sort model and progress cache off the request path.
+
+    The worker thread is started lazily by the first :meth:`notify`.  Each
+    notification restarts a short *debounce* window; once no new notification
+    has arrived for *debounce* seconds the worker takes a snapshot and trains
+    on it, so a burst of votes costs one training run.
+
+    Args:
+        snapshot: Called on the worker thread to copy the current state.
+            Returns ``None`` when there is nothing to train on.
+        debounce: Seconds of quiet to wait for before training.
+    """
+
+    def __init__(self, snapshot: Callable[[], TrainingSnapshot | None], debounce: float = 0.25) -> None:
+        self._snapshot = snapshot
+        self.debounce = debounce
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._pending = False
+        self._notified_at = 0.0
+        self._in_flight: Hashable | None = None
+        self._result: TrainingResult | None = None
+        # Bumped by clear(); a run only publishes if it is unchanged
+        self._generation = 0
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def notify(self) -> None:
+        """Signal that votes changed; schedules a (coalesced) training run."""
+        with self._cond:
+            self._pending = True
+            self._notified_at = time.monotonic()
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="vtsearch-trainer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the worker thread after its current run, if any."""
+        with self._cond:
+            self._stopping = True
+            self._pending = False
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def clear(self) -> None:
+        """Drop the published result and the result of any run in flight.
+
+        Call when the clips are replaced, so that a model trained on the old
+        dataset is never served as a stale result for the new one.
+        """
+        with self._cond:
+            self._result = None
+            self._generation += 1
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def result_for(self, key: Hashable, timeout: float = 0.0) -> TrainingResult | None:
+        """Return the published result for *key*, or the previous one while it trains.
+
+        Returns immediately if a result for *key* has been published.  If a
+        run is scheduled or in flight, waits up to *timeout* seconds (by
+        default not at all) for it to publish a matching result, then falls
+        back to the last published result with ``stale`` set.  Returns
+        ``None`` when nothing is scheduled or no run has finished yet; the
+        caller should then train synchronously.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._result is not None and self._result.key == key:
+                    return self._result
+                if not self._pending and self._in_flight is None:
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return replace(self._result, stale=True) if self._result is not None else None
+                self._cond.wait(remaining)
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                # Coalesce a burst: wait until no notification arrived for `debounce` seconds
+                while (remaining := self._notified_at + self.debounce - time.monotonic()) > 0:
+                    self._cond.wait(remaining)
+                    if self._stopping:
+                        return
+                notified_at = self._notified_at
+
+            try:
+                snapshot = self._snapshot()
+            except Exception:
+                logger.exception("Could not snapshot state for background training")
+                snapshot = None
+
+            with self._cond:
+                # Stay pending (so waiters keep waiting) if a vote arrived while snapshotting
+                if self._notified_at == notified_at:
+                    self._pending = False
+                if snapshot is None or (self._result is not None and self._result.key == snapshot.key):
+                    self._cond.notify_all()
+                    continue
+                self._in_flight = snapshot.key
+                generation = self._generation
+
+            result = None
+            try:
+                result = self._train(snapshot)
+            except Exception:
+                logger.exception("Background training failed")
+            finally:
+                with self._cond:
+                    self._in_flight = None
+                    if result is not None and generation == self._generation:
+                        self._result = result
+                    self._cond.notify_all()
+
+    @staticmethod
+    def _train(snapshot: TrainingSnapshot) -> TrainingResult:
+        results = threshold = None
+        if snapshot.good_votes and snapshot.bad_votes:
+            results, threshold = train_and_score(
+                snapshot.clips, snapshot.good_votes, snapshot.bad_votes, snapshot.inclusion, warm_start=True
+            )
+        status = compute_labeling_status(
+            snapshot.clips, snapshot.label_history, snapshot.good_votes, snapshot.bad_votes, snapshot.inclusion
+        )
+        return TrainingResult(key=snapshot.key, results=results, threshold=threshold, status=status)
@@ -0,0 +1,574 @@
+"""Persistent, content-addressed cache of media embeddings.
+
+Every importer ends up calling :meth:`~vtsearch.media.base.MediaType.embed_media`
+once per file, so re-importing a folder or feed that was seen before used to
+re-run model inference on every file.  Embeddings are stored here instead,
+keyed by the file's content MD5 together with the embedding model ID and
+the preprocessing parameters the media type declares
+(:attr:`~vtsearch.media.base.MediaType.embedding_model_id` and
+:attr:`~vtsearch.media.base.MediaType.embedding_params`), so a renamed or
+moved file still hits while a model or preprocessing change misses.
+
+The store is a single SQLite file (``EMBEDDING_CACHE_PATH``).  Each lookup
+refreshes the entry's position in a least-recently-used order, and once the
+stored vectors exceed ``EMBEDDING_CACHE_MAX_BYTES`` the oldest entries are
+evicted.
+
+Callers normally go through :func:`embed_files_cached`, which looks many
+files up at once and embeds the misses in micro-batches (decoding them in
+worker processes where the media type supports it), or
+:func:`embed_file_cached` for a single file.  Importers that also need each
+file's bytes, hash and clip fields use :func:`ingest_files_cached`, which
+gathers all of them while reading and decoding every file once, copying
+media files into the media store as they are read.
+Audio too long for a single model input is embedded as overlapping windows
+(:meth:`~vtsearch.media.base.MediaType.embed_segments`); its segments are
+cached together, flattened by :func:`pack_segments`, so a re-import also
+restores the per-segment embeddings used for segment-level search.
+Media types that do not declare an ``embedding_model_id`` are never cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from config import (
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_LOOKUP_BATCH,
+    EMBEDDING_CACHE_MAX_BYTES,
+    EMBEDDING_CACHE_PATH,
+)
+from vtsearch.utils.media_store import MEDIA_FIELDS, MediaRef, get_media_store, store_file_media
+
+if TYPE_CHECKING:
+    from vtsearch.media.base import IngestedFile, MediaType, Segments
+
+# SQLite limits the number of bound parameters per statement
+_SQL_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    dtype TEXT NOT NULL,
+    dim INTEGER NOT NULL,
+    vector BLOB NOT NULL,
+    nbytes INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used);
+"""
+
+
+def cache_key(md5: str, model_id: str, params: dict[str, Any] | None = None) -> str:
+    """Return the cache key for content *md5* embedded by *model_id* with *params*."""
+    spec = json.dumps([model_id, params or {}], sort_keys=True, default=str)
+    return f"{md5}:{hashlib.md5(spec.encode('utf-8')).hexdigest()}"
+
+
+def file_md5(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the hex MD5 of the file at *path*, read in chunks."""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """Size-bounded LRU store of embedding vectors backed by SQLite.
+
+    Safe to share between threads; one connection is used under a lock.
+
+    Args:
+        path: SQLite database file.  Parent directories are created.
+        max_bytes: Upper bound on the total size of the stored vectors.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = EMBEDDING_CACHE_MAX_BYTES) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(nbytes), 0), COALESCE(MAX(last_used), 0) FROM embeddings"
+        ).fetchone()
+        self._entries, self._bytes, self._clock = int(row[0]), int(row[1]), int(row[2])
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Return the vector stored under *key*, or ``None``."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, np.ndarray]:
+        """Return the stored vectors for whichever of *keys* are cached.
+
+        Counts one hit or miss per distinct key and marks every hit as
+        recently used.
+        """
+        wanted = list(dict.fromkeys(keys))
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(wanted), _SQL_BATCH):
+                batch = wanted[start : start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, dtype, dim, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, dtype, dim, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.dtype(dtype), count=dim).copy()
+            if found:
+                self._clock += 1
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?", [(self._clock, key) for key in found]
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+        return found
+
+    # ------------------------------------------------------------------
+    # Stores
+    # ------------------------------------------------------------------
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        """Store *vector* under *key*."""
+        self.put_many({key: vector})
+
+    def put_many(self, items: dict[str, np.ndarray]) -> None:
+        """Store several vectors at once, then evict down to ``max_bytes``."""
+        if not items:
+            return
+        with self._lock:
+            self._clock += 1
+            for key, vector in items.items():
+                arr = np.ascontiguousarray(np.asarray(vector).reshape(-1))
+                old = self._conn.execute("SELECT nbytes FROM embeddings WHERE key = ?", (key,)).fetchone()
+                if old is not None:
+                    self._entries -= 1
+                    self._bytes -= int(old[0])
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, dtype, dim, vector, nbytes, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, arr.dtype.str, arr.size, arr.tobytes(), arr.nbytes, self._clock),
+                )
+                self._entries += 1
+                self._bytes += arr.nbytes
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under ``max_bytes``.  Caller holds the lock."""
+        while self._bytes > self.max_bytes and self._entries:
+            rows = self._conn.execute(
+                "SELECT key, nbytes FROM embeddings ORDER BY last_used LIMIT ?", (_SQL_BATCH,)
+            ).fetchall()
+            victims = []
+            for key, nbytes in rows:
+                if self._bytes <= self.max_bytes:
+                    break
+                victims.append((key,))
+                self._bytes -= int(nbytes)
+                self._entries -= 1
+            self._conn.executemany("DELETE FROM embeddings WHERE key = ?", victims)
+            self.evictions += len(victims)
+
+    # ------------------------------------------------------------------
+    # Housekeeping
+    # ------------------------------------------------------------------
+
+    def clear(self) -> None:
+        """Delete every entry and reset the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._entries = self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def stats(self) -> dict[str, Any]:
+        """Return entry count, size, and hit/miss counters since the cache was opened."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "path": str(self.path),
+                "entries": self._entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Process-wide cache
+# ---------------------------------------------------------------------------
+
+_cache: EmbeddingCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Return the process-wide cache, opening it on first use.
+
+    Returns ``None`` when ``EMBEDDING_CACHE_ENABLED`` is off.
+    """
+    global _cache
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache(EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_BYTES)
+        return _cache
+
+
+def set_embedding_cache(cache: EmbeddingCache | None) -> None:
+    """Replace the process-wide cache (e.g. to point it at a temporary file)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+
+def embedding_cache_stats() -> dict[str, Any]:
+    """Return :meth:`EmbeddingCache.stats` for the process-wide cache."""
+    cache = get_embedding_cache()
+    if cache is None:
+        return {"enabled": False}
+    return cache.stats()
+
+
+def pack_segments(segments: Segments) -> np.ndarray:
+    """Flatten *segments* into one float32 vector for the cache.
+
+    The layout is ``[duration, n, offsets (n), embeddings (n * dim)]``.
+    """
+    n = len(segments.offsets)
+    return np.concatenate(
+        [
+            np.array([segments.duration, n], dtype=np.float32),
+            np.asarray(segments.offsets, dtype=np.float32),
+            np.asarray(segments.embeddings, dtype=np.float32).reshape(-1),
+        ]
+    )
+
+
+def unpack_segments(vector: np.ndarray) -> Segments:
+    """Inverse of :func:`pack_segments`."""
+    from vtsearch.media.base import Segments
+
+    n = int(vector[1])
+    offsets = vector[2 : 2 + n].copy()
+    return Segments(offsets=offsets, embeddings=vector[2 + n :].reshape(n, -1).copy(), duration=float(vector[0]))
+
+
+def _model_spec(mt: MediaType) -> tuple[str, dict[str, Any]] | None:
+    model_id = getattr(mt, "embedding_model_id", None)
+    if not isinstance(model_id, str):
+        return None
+    return model_id, dict(mt.embedding_params)
+
+
+def embed_file_cached(mt: MediaType, file_path: Path, md5: str | None = None) -> np.ndarray | None:
+    """Embed *file_path* with *mt*, consulting the embedding cache first.
+
+    Args:
+        mt: Media type whose :meth:`~vtsearch.media.base.MediaType.embed_media`
+            produces the embedding on a miss.
+        file_path: File to embed.
+        md5: Hex MD5 of the file contents, if the caller already has it.
+
+    Returns:
+        The embedding, or ``None`` if the model could not embed the file.
+        Failures are not cached.
+    """
+    spec = _model_spec(mt)
+    cache = get_embedding_cache() if spec is not None else None
+    if cache is None:
+        return mt.embed_media(file_path)
+    try:
+        key = cache_key(md5 or file_md5(file_path), *spec)
+    except OSError:
+        return mt.embed_media(file_path)
+    embedding = cache.get(key)
+    if embedding is None:
+        embedding = mt.embed_media(file_path)
+        if embedding is not None:
+            cache.put(key, embedding)
+    return embedding
+
+
+def embed_files_cached(
+    mt: MediaType,
+    file_paths: Sequence[Path],
+    md5s: Sequence[str | None] | None = None,
+    on_batch: Callable[[int, int], None] | None = None,
+    on_decode: Callable[[int, int], None] | None = None,
+) -> list[np.ndarray | None]:
+    """Embed *file_paths* with *mt* in micro-batches, consulting the cache first.
+
+    Files already in the cache are fetched with batched lookups.  The rest
+    are embedded ``mt.embed_batch_size`` at a time and their embeddings are
+    stored.  Media types with a :attr:`~vtsearch.media.base.MediaType.decoder`
+    have their files decoded in worker processes
+    (:func:`~vtsearch.decoding.pipeline.decode_and_embed`) and embedded with
+    :meth:`~vtsearch.media.base.MediaType.embed_decoded_batch`; others go
+    through :meth:`~vtsearch.media.base.MediaType.embed_media_batch`.
+
+    Args:
+        mt: Media type that embeds the files.
+        file_paths: Files to embed.
+        md5s: Hex MD5 of each file, if the caller already has them.
+        on_batch: Called as ``on_batch(done, total)`` after the cache lookup
+            and after every micro-batch.
+        on_decode: Called as ``on_decode(decoded, total)`` as files are
+            decoded ahead of the model (cache hits count as decoded).
+
+    Returns:
+        One embedding per file, in order; ``None`` where embedding failed.
+    """
+    embeddings, _infos = _embed_with_cache(mt, file_paths, md5s, on_batch, on_decode)
+    return embeddings
+
+
+def ingest_files_cached(
+    mt: MediaType,
+    file_paths: Sequence[Path],
+    embeddings: Sequence[np.ndarray | None] | None = None,
+    on_batch: Callable[[int, int], None] | None = None,
+    on_decode: Callable[[int, int], None] | None = None,
+) -> list[IngestedFile | None]:
+    """Read, hash, decode and embed *file_paths* with each file opened once.
+
+    The batched, cached counterpart of
+    :meth:`~vtsearch.media.base.MediaType.ingest`.  Audio, video and image
+    files are copied into the media store (:mod:`vtsearch.utils.media_store`)
+    in slices and hashed as they are copied, so no file is held in memory
+    whole; their clip fields carry a ``"media_ref"`` in place of the bytes,
+    as :func:`~vtsearch.utils.media_store.store_clip_media` leaves them, and
+    blobs this call added for files that then fail to embed are discarded.
+    Other files (and all files when the store is off) are read into memory,
+    and their bytes give the MD5 and the clip's contents.  Cache misses are
+    decoded once (see :func:`embed_files_cached`), from the stored blob or
+    bytes when decoded in this process, and the clip fields, such as the
+    duration, come from that same decode through
+    :meth:`~vtsearch.media.base.MediaType.clip_data_from`.
+
+    Args:
+        mt: Media type that embeds the files.
+        file_paths: Files to ingest.
+        embeddings: Embeddings already known for some files (e.g. content
+            vectors); ``None`` entries are looked up or embedded.
+        on_batch: As for :func:`embed_files_cached`.
+        on_decode: As for :func:`embed_files_cached`.
+
+    Returns:
+        One :class:`~vtsearch.media.base.IngestedFile` per file, in order;
+        ``None`` for files that could not be read.  Its ``data`` is a
+        read-only view of the stored blob for files in the media store.
+    """
+    from vtsearch.media.base import IngestedFile
+
+    total = len(file_paths)
+    media_field = MEDIA_FIELDS.get(mt.type_id)
+    md5s: list[str | None] = [None] * total
+    refs: list[MediaRef | None] = [None] * total
+    added: list[bool] = [False] * total
+    datas: list[bytes | memoryview | None] = [None] * total
+    for i, path in enumerate(file_paths):
+        try:
+            stored = store_file_media(path) if media_field is not None else None
+            if stored is not None:
+                refs[i], added[i] = stored
+                md5s[i] = refs[i].md5
+                datas[i] = get_media_store().view(refs[i])
+            else:
+                datas[i] = Path(path).read_bytes()
+                md5s[i] = hashlib.md5(datas[i]).hexdigest()
+        except OSError as e:
+            print(f"Error reading {path}: {e}")
+            md5s[i] = None
+
+    known = list(embeddings) if embeddings is not None else [None] * total
+    pending = [i for i, md5 in enumerate(md5s) if md5 is not None and known[i] is None]
+    fresh, infos = _embed_with_cache(
+        mt,
+        [file_paths[i] for i in pending],
+        [md5s[i] for i in pending],
+        on_batch,
+        on_decode,
+        [datas[i] for i in pending],
+    )
+    found_infos: list[dict[str, Any] | None] = [None] * total
+    for i, embedding, info in zip(pending, fresh, infos):
+        known[i] = embedding
+        found_infos[i] = info
+
+    # Drop blobs added for files that failed, unless a duplicate file embedded
+    kept = {ref for ref, embedding in zip(refs, known) if ref is not None and embedding is not None}
+    for ref in {ref for ref, is_new in zip(refs, added) if is_new} - kept:
+        get_media_store().discard(ref)
+
+    results: list[IngestedFile | None] = []
+    for path, md5, ref, data, embedding, info in zip(file_paths, md5s, refs, datas, known, found_infos):
+        if md5 is None:
+            results.append(None)
+            continue
+        clip_data = mt.clip_data_from(path, data, info) if embedding is not None else {}
+        if ref is not None and clip_data:
+            clip_data[media_field] = None
+            clip_data["media_ref"] = ref
+        results.append(IngestedFile(data, md5, embedding, clip_data))
+    return results
+
+
+def _embed_with_cache(
+    mt: MediaType,
+    file_paths: Sequence[Path],
+    md5s: Sequence[str | None] | None,
+    on_batch: Callable[[int, int], None] | None,
+    on_decode: Callable[[int, int], None] | None,
+    datas: Sequence[bytes | memoryview | None] | None = None,
+) -> tuple[list[np.ndarray | None], list[dict[str, Any] | None]]:
+    """Shared body of :func:`embed_files_cached` and :func:`ingest_files_cached`.
+
+    *datas* are the files' contents, when the caller holds them, for the
+    decoder to use instead of reopening the files.  Returns the embeddings
+    and, for files decoded here, the clip fields the decoder reported.
+    """
+    total = len(file_paths)
+    results: list[np.ndarray | None] = [None] * total
+    infos: list[dict[str, Any] | None] = [None] * total
+    spec = _model_spec(mt)
+    cache = get_embedding_cache() if spec is not None else None
+
+    # Files too long for one model input are embedded as windows and cached
+    # with their segments under a key of their own
+    needs_segments = getattr(mt, "needs_segments", None) if spec is not None else None
+    segmented = {i for i, path in enumerate(file_paths) if needs_segments is not None and needs_segments(path)}
+
+    keys: list[str | None] = [None] * total
+    if cache is not None:
+        for i, path in enumerate(file_paths):
+            md5 = md5s[i] if md5s is not None else None
+            if md5 is None:
+                try:
+                    md5 = file_md5(path)
+                except OSError:
+                    continue
+            model_id, params = spec
+            keys[i] = cache_key(md5, model_id, {**params, "segments": True} if i in segmented else params)
+        wanted = [key for key in keys if key is not None]
+        found: dict[str, np.ndarray] = {}
+        for start in range(0, len(wanted), EMBEDDING_CACHE_LOOKUP_BATCH):
+            found.update(cache.get_many(wanted[start : start + EMBEDDING_CACHE_LOOKUP_BATCH]))
+        for i, key in enumerate(keys):
+            if key is None or key not in found:
+                continue
+            if i in segmented:
+                segments = unpack_segments(found[key])
+                results[i] = segments.pooled
+                infos[i] = {"duration": segments.duration, "segments": segments}
+            else:
+                results[i] = found[key]
+
+    missing = [i for i in range(total) if results[i] is None and i not in segmented]
+    long_missing = [i for i in sorted(segmented) if results[i] is None]
+    done = total - len(missing) - len(long_missing)
+    if on_batch is not None:
+        on_batch(done, total)
+    if on_decode is not None:
+        on_decode(done, total)
+
+    # Segmented files are embedded in this process rather than the decode
+    # pool; audio is streamed so only a window of each file is in memory
+    batch_size = max(1, int(mt.embed_batch_size))
+    for start in range(0, len(long_missing), batch_size):
+        batch = long_missing[start : start + batch_size]
+        fresh_segments: dict[str, np.ndarray] = {}
+        for i, segments in zip(batch, mt.embed_segments_batch([file_paths[i] for i in batch])):
+            if segments is None:
+                continue
+            results[i] = segments.pooled
+            infos[i] = {"duration": segments.duration, "segments": segments}
+            if keys[i] is not None:
+                fresh_segments[keys[i]] = pack_segments(segments)
+        if cache is not None:
+            cache.put_many(fresh_segments)
+        done += len(batch)
+        if on_decode is not None:
+            on_decode(done, total)
+        if on_batch is not None:
+            on_batch(done, total)
+
+    decoder = getattr(mt, "decoder", None) if spec is not None else None
+    if decoder is not None:
+        from vtsearch.decoding.pipeline import decode_and_embed
+
+        skipped = done
+
+        def on_stage(stage: str, count: int, _total: int) -> None:
+            if stage == "decoded" and on_decode is not None:
+                on_decode(skipped + count, total)
+
+        batches = (
+            ([missing[j] for j in indices], embeddings, batch_infos)
+            for indices, embeddings, batch_infos in decode_and_embed(
+                decoder,
+                mt.embed_decoded_batch,
+                [file_paths[i] for i in missing],
+                batch_size,
+                on_stage=on_stage,
+                datas=[datas[i] for i in missing] if datas is not None else None,
+            )
+        )
+    else:
+        batches = (
+            (
+                missing[start : start + batch_size],
+                mt.embed_media_batch([file_paths[i] for i in missing[start : start + batch_size]]),
+                [None] * len(missing[start : start + batch_size]),
+            )
+            for start in range(0, len(missing), batch_size)
+        )
+
+    for batch, embeddings, batch_infos in batches:
+        fresh: dict[str, np.ndarray] = {}
+        for i, embedding, info in zip(batch, embeddings, batch_infos):
+            results[i] = embedding
+            infos[i] = info
+            key = keys[i]
+            if embedding is not None and key is not None:
+                fresh[key] = embedding
+        if cache is not None:
+            cache.put_many(fresh)
+        done += len(batch)
+        if on_batch is not None:
+            on_batch(done, total)
+    return results, infos
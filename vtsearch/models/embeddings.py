@@ -5,6 +5,12 @@ The actual embedding logic now lives inside each
 its original public API as thin wrappers so that existing callers
 (``datasets/loader.py``, ``routes/sorting.py``, etc.) continue to work
 without modification.
+
+File embeddings go through the persistent embedding cache
+(:mod:`vtsearch.models.embedding_cache`), so a file whose contents were
+embedded before by the same model is not run through the model again.
+Text queries go through the in-memory query cache
+(:mod:`vtsearch.models.query_cache`) for the same reason.
 """
 
 from pathlib import Path
@@ -12,6 +18,9 @@ from typing import Optional
 
 import numpy as np
 
+from vtsearch.models.embedding_cache import embed_file_cached
+from vtsearch.models.query_cache import embed_queries_cached
+
 
 def embed_audio_file(audio_path: Path) -> Optional[np.ndarray]:
     """Generate a CLAP audio embedding for *audio_path*.
@@ -20,7 +29,7 @@ def embed_audio_file(audio_path: Path) -> Optional[np.ndarray]:
     """
     from vtsearch.media import get as media_get
 
-    return media_get("audio").embed_media(audio_path)
+    return embed_file_cached(media_get("audio"), audio_path)
 
 
 def embed_video_file(video_path: Path) -> Optional[np.ndarray]:
@@ -30,7 +39,7 @@ def embed_video_file(video_path: Path) -> Optional[np.ndarray]:
     """
     from vtsearch.media import get as media_get
 
-    return media_get("video").embed_media(video_path)
+    return embed_file_cached(media_get("video"), video_path)
 
 
 def embed_image_file(image_path: Path) -> Optional[np.ndarray]:
@@ -40,7 +49,7 @@ def embed_image_file(image_path: Path) -> Optional[np.ndarray]:
     """
     from vtsearch.media import get as media_get
 
-    return media_get("image").embed_media(image_path)
+    return embed_file_cached(media_get("image"), image_path)
 
 
 def embed_paragraph_file(text_path: Path) -> Optional[np.ndarray]:
@@ -50,14 +59,15 @@ def embed_paragraph_file(text_path: Path) -> Optional[np.ndarray]:
     """
     from vtsearch.media import get as media_get
 
-    return media_get("paragraph").embed_media(text_path)
+    return embed_file_cached(media_get("paragraph"), text_path)
 
 
 def embed_text_query(text: str, media_type: str) -> Optional[np.ndarray]:
     """Embed *text* in the vector space of the given *media_type*.
 
     Delegates to the registered :class:`~vtsearch.media.base.MediaType`'s
-    :meth:`~vtsearch.media.base.MediaType.embed_text` method, so the
+    text encoder through the query cache
+    (:func:`~vtsearch.models.query_cache.embed_queries_cached`), so the
     resulting vector can be compared against media embeddings via cosine
     similarity.
 
@@ -73,6 +83,25 @@ def embed_text_query(text: str, media_type: str) -> Optional[np.ndarray]:
     from vtsearch.media import get as media_get
 
     try:
-        return media_get(media_type).embed_text(text)
+        mt = media_get(media_type)
     except KeyError:
         return None
+    return embed_queries_cached(mt, [text])[0]
+
+
+def embed_text_queries(texts: list[str], media_type: str) -> list[Optional[np.ndarray]]:
+    """Embed several queries at once; see :func:`embed_text_query`.
+
+    Runs :meth:`~vtsearch.media.base.MediaType.embed_text_batch` in batches
+    of the media type's ``embed_batch_size`` on the queries that are not
+    already in the query cache.  Returns one entry per text,
+    ``None`` where embedding failed (or for every text if *media_type* is not
+    registered).
+    """
+    from vtsearch.media import get as media_get
+
+    try:
+        mt = media_get(media_type)
+    except KeyError:
+        return [None] * len(texts)
+    return embed_queries_cached(mt, texts)
@@ -11,6 +11,7 @@ to work unchanged.
 """
 
 import gc
+from collections.abc import Sequence
 
 from config import MODELS_CACHE_DIR
 
@@ -32,6 +33,28 @@ def initialize_models() -> None:
     gc.collect()
 
 
+def warm_models(type_ids: Sequence[str]) -> list[str]:
+    """Load the embedding models of the media types in *type_ids* ahead of first use.
+
+    Meant to run on a background thread while the server already answers
+    requests.  Unknown type IDs are skipped.  Returns the type IDs whose
+    models are loaded afterwards.
+    """
+    from vtsearch.media import get as media_get
+
+    warmed = []
+    for type_id in type_ids:
+        try:
+            mt = media_get(type_id)
+        except KeyError:
+            print(f"Not warming unknown media type {type_id!r}")
+            continue
+        mt.ensure_models()
+        if mt.models_loaded:
+            warmed.append(type_id)
+    return warmed
+
+
 # ---------------------------------------------------------------------------
 # Backward-compatible getter functions
 #
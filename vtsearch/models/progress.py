@@ -5,43 +5,260 @@ repeated queries (the progress button, the auto-indicator) never retrain
 models that have already been computed.
 """
 
-from typing import Any, Optional
+import functools
+import threading
+from collections.abc import Callable
+from typing import Any, Optional, TypeVar
 
 import numpy as np
 import torch
 import torch.nn as nn
 
-from vtsearch.models.training import find_optimal_threshold, train_model
+from config import STABILITY_SAMPLE_SIZE
+from vtsearch.models.training import (
+    WarmStartState,
+    find_optimal_threshold,
+    train_model_incremental,
+    train_models,
+)
+from vtsearch.utils.clip_store import embedding_matrix, gather_embeddings
 
 # ---------------------------------------------------------------------------
 # Module-level cache
 # ---------------------------------------------------------------------------
 # Each entry in ``_cached_steps`` corresponds to one index in ``label_history``
-# and stores the model, threshold, label sets, and stability result for that
-# step.  ``_cache_good_ids`` / ``_cache_bad_ids`` track the running label sets
-# so the next step only needs to apply a single delta.
+# and stores the model, threshold, label sets, stability result and history
+# event for that step.  The newest entry also keeps its ``WarmStartState`` so
+# the next vote fine-tunes that model instead of training from scratch.
+# ``_cache_good_ids`` / ``_cache_bad_ids`` track the running label sets so the
+# next step only needs to apply a single delta.
 
 _cache_inclusion: Optional[int] = None
 _cached_steps: list[dict[str, Any]] = []
 _cache_good_ids: set[int] = set()
 _cache_bad_ids: set[int] = set()
-_cache_prev_predictions: Optional[dict[int, int]] = None
+# Predictions of the last step with a model, over the stability evaluation
+# rows: ``(clip_ids, predicted_positive, unlabeled)`` as parallel arrays.
+_cache_prev_predictions: Optional[tuple[np.ndarray, np.ndarray, np.ndarray]] = None
 
+# Parameters of every cached step model, stacked along a leading step axis so
+# one batched forward pass scores a set of clips under all of them.  Built
+# lazily from ``_cached_steps``; ``_stack_upto`` is the number of cached
+# steps already folded in and ``_stack_steps`` the time index of each row.
+_stack_upto: int = 0
+_stack_steps: np.ndarray = np.empty(0, dtype=np.int64)
+_stack_params: Optional[tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]] = None
 
+# Upper bound on the hidden activations (N x T x hidden floats) materialised
+# at once by _score_stacked
+_STACK_EVAL_MAX_ELEMENTS = 1 << 20
+
+# Upper bound on the (steps x clips) prediction matrix built at once when
+# tracking prediction stability
+_STABILITY_MAX_ELEMENTS = 1 << 24
+
+# The cache is shared by request threads and the background trainer; every
+# public entry point holds this lock while it reads or extends the cache.
+_cache_lock = threading.RLock()
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _with_cache_lock(func: _F) -> _F:
+    """Run *func* while holding the progress cache lock."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with _cache_lock:
+            return func(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+@_with_cache_lock
 def clear_progress_cache() -> None:
     """Clear all cached progress data.
 
     Must be called whenever votes are cleared, clips change, or inclusion
     is altered so that stale models are not reused.
     """
-    global _cache_inclusion, _cache_prev_predictions
+    global _cache_inclusion, _cache_prev_predictions, _stack_upto, _stack_steps, _stack_params
     _cached_steps.clear()
     _cache_good_ids.clear()
     _cache_bad_ids.clear()
     _cache_prev_predictions = None
     _cache_inclusion = None
+    _stack_upto = 0
+    _stack_steps = np.empty(0, dtype=np.int64)
+    _stack_params = None
+
 
+def _train_step_models(
+    clips_dict: dict[int, dict[str, Any]],
+    steps: list[tuple[int, set[int], set[int], list[int], list[int]]],
+    inclusion_value: int,
+) -> list[Optional[nn.Sequential]]:
+    """Train the model of every history step in *steps* in one batched pass.
+
+    Each step is ``(t, good_set, bad_set, train_good, train_bad)``.  Steps
+    with fewer than two training examples get ``None``.
+    """
+    trainable = [i for i, (_, _, _, good, bad) in enumerate(steps) if len(good) + len(bad) >= 2]
+    models: list[Optional[nn.Sequential]] = [None] * len(steps)
+    if not trainable:
+        return models
+
+    # One row per clip labelled in any step; labels may differ between steps
+    row_of: dict[int, int] = {}
+    for i in trainable:
+        for cid in steps[i][3] + steps[i][4]:
+            row_of.setdefault(cid, len(row_of))
+    X = torch.from_numpy(gather_embeddings(clips_dict, list(row_of)))
+
+    masks = torch.zeros((len(trainable), len(row_of)), dtype=torch.bool)
+    y = torch.zeros((len(trainable), len(row_of)), dtype=torch.float32)
+    for k, i in enumerate(trainable):
+        good_rows = [row_of[cid] for cid in steps[i][3]]
+        bad_rows = [row_of[cid] for cid in steps[i][4]]
+        masks[k, good_rows + bad_rows] = True
+        y[k, good_rows] = 1.0
+
+    for i, model in zip(trainable, train_models(X, y, masks, X.shape[1], inclusion_value)):
+        models[i] = model
+    return models
+
+
+def _step_labels(step: tuple[int, set[int], set[int], list[int], list[int]]) -> dict[int, float]:
+    """Return the training labels of a pending history *step* by clip ID."""
+    _, _, _, train_good, train_bad = step
+    labels = {cid: 1.0 for cid in train_good}
+    labels.update({cid: 0.0 for cid in train_bad})
+    return labels
+
+
+def _train_step_incremental(
+    clips_dict: dict[int, dict[str, Any]],
+    step: tuple[int, set[int], set[int], list[int], list[int]],
+    inclusion_value: int,
+) -> Optional[WarmStartState]:
+    """Train the model of a single new history *step*, warm-started from the previous step."""
+    _, _, _, train_good, train_bad = step
+    if len(train_good) + len(train_bad) < 2:
+        return None
+
+    previous = None
+    if _cached_steps:
+        previous = _cached_steps[-1].get("train_state")
+
+    labeled_ids = train_good + train_bad
+    X = torch.from_numpy(gather_embeddings(clips_dict, labeled_ids))
+    y = torch.tensor([1.0] * len(train_good) + [0.0] * len(train_bad), dtype=torch.float32).unsqueeze(1)
+    return train_model_incremental(X, y, labeled_ids, X.shape[1], inclusion_value, previous=previous)
+
+
+def _stability_rows(num_clips: int) -> Optional[np.ndarray]:
+    """Return the fixed row sample used for stability, or ``None`` to use every row."""
+    if STABILITY_SAMPLE_SIZE is None or num_clips <= STABILITY_SAMPLE_SIZE:
+        return None
+    rng = np.random.default_rng(0)
+    return np.sort(rng.choice(num_clips, size=STABILITY_SAMPLE_SIZE, replace=False))
+
+
+def _track_stability(
+    clips_dict: dict[int, dict[str, Any]],
+    label_history: list[tuple[int, str, float]],
+    labeled_before: set[int],
+    pending: list[tuple[int, set[int], set[int], list[int], list[int]]],
+    models: list[Optional[nn.Sequential]],
+    thresholds: list[Optional[float]],
+) -> list[Optional[dict[str, Any]]]:
+    """Compute the prediction-stability entry of every pending step.
+
+    Predictions are boolean arrays over the clip matrix rows (or a fixed
+    random sample of them when the dataset exceeds ``STABILITY_SAMPLE_SIZE``),
+    and the labelled set is a boolean mask updated one history event at a
+    time.  A step's flips are the rows that are unlabelled at both this step
+    and the previous step with a model and whose predictions differ.  In
+    sampled mode the flip count is scaled up to all unlabelled clips.
+    """
+    global _cache_prev_predictions
+
+    results: list[Optional[dict[str, Any]]] = [None] * len(pending)
+    with_model = [i for i, model in enumerate(models) if model is not None]
+    if not with_model:
+        return results
+
+    all_ids, all_embs = embedding_matrix(clips_dict)
+    rows = _stability_rows(len(all_ids))
+    eval_ids = all_ids if rows is None else all_ids[rows]
+    X_eval = torch.from_numpy(all_embs if rows is None else all_embs[rows])
+
+    # Masks over every row (exact unlabelled counts) and over the evaluation rows
+    labeled_all = np.isin(all_ids, np.fromiter(labeled_before, dtype=np.int64, count=len(labeled_before)))
+    labeled_eval = labeled_all if rows is None else labeled_all[rows]
+    row_of = {clip_id: row for row, clip_id in enumerate(all_ids.tolist())}
+    next_event = pending[0][0]
+
+    chunk = max(1, _STABILITY_MAX_ELEMENTS // max(1, len(eval_ids)))
+    for lo in range(0, len(with_model), chunk):
+        idx = with_model[lo : lo + chunk]
+        params = _stack_model_params([models[i] for i in idx], [thresholds[i] for i in idx])
+        predicted = _score_stacked(X_eval, params).double() >= params[4][:, None]
+        predicted = predicted.numpy()
+
+        for row, i in enumerate(idx):
+            t = pending[i][0]
+            # Replay history events up to and including this step
+            events = label_history[next_event : t + 1]
+            for clip_id, label, _ in events:
+                clip_row = row_of.get(clip_id)
+                if clip_row is not None:
+                    labeled_all[clip_row] = label != "unlabel"
+            if rows is not None and events:
+                labeled_eval = labeled_all[rows]
+            next_event = t + 1
+
+            num_unlabeled = int(len(all_ids) - labeled_all.sum())
+            stability: dict[str, Any] = {
+                "time_index": t,
+                "num_labels": len(pending[i][1]) + len(pending[i][2]),
+                "num_flips": 0,
+                "num_unlabeled": num_unlabeled,
+            }
+            results[i] = stability
+            if not num_unlabeled:
+                continue  # nothing to predict; keep comparing against the previous predictions
+
+            unlabeled = ~labeled_eval
+            current = (eval_ids, predicted[row], unlabeled)
+            num_flips = _count_flips(_cache_prev_predictions, current) if _cache_prev_predictions else 0
+            stability["num_flips"] = num_flips
+            if rows is not None:
+                sampled_unlabeled = int(unlabeled.sum())
+                if sampled_unlabeled:
+                    stability["num_flips"] = round(num_flips * num_unlabeled / sampled_unlabeled)
+                stability["sample_size"] = len(rows)
+            # Copy the row so the chunk's prediction matrix can be freed
+            _cache_prev_predictions = (eval_ids, predicted[row].copy(), unlabeled)
+
+    return results
 
+
+def _count_flips(
+    previous: tuple[np.ndarray, np.ndarray, np.ndarray], current: tuple[np.ndarray, np.ndarray, np.ndarray]
+) -> int:
+    """Count rows unlabelled in both *previous* and *current* whose prediction changed."""
+    prev_ids, prev_pred, prev_unl = previous
+    ids, pred, unl = current
+    if prev_ids is not ids and not np.array_equal(prev_ids, ids):
+        # Clips changed between the two steps: align the common clip IDs
+        _, cur_idx, prev_idx = np.intersect1d(ids, prev_ids, assume_unique=True, return_indices=True)
+        pred, unl = pred[cur_idx], unl[cur_idx]
+        prev_pred, prev_unl = prev_pred[prev_idx], prev_unl[prev_idx]
+    return int(np.count_nonzero((pred ^ prev_pred) & unl & prev_unl))
+
+
+@_with_cache_lock
 def _ensure_cache(
     clips_dict: dict[int, dict[str, Any]],
     label_history: list[tuple[int, str, float]],
@@ -53,11 +270,18 @@ def _ensure_cache(
     differs from the value used for existing cache entries the entire cache
     is rebuilt.
     """
-    global _cache_inclusion, _cache_prev_predictions
+    global _cache_inclusion
 
     if _cache_inclusion is not None and _cache_inclusion != inclusion_value:
         clear_progress_cache()
 
+    # Rebuild if the history is not an extension of the one the cache was
+    # built from (e.g. a background run finished after the votes were cleared)
+    if _cached_steps:
+        last = len(_cached_steps) - 1
+        if last >= len(label_history) or label_history[last] != _cached_steps[last]["event"]:
+            clear_progress_cache()
+
     if _cache_inclusion is None:
         _cache_inclusion = inclusion_value
 
@@ -65,8 +289,12 @@ def _ensure_cache(
     if start >= len(label_history):
         return  # already up to date
 
-    all_clip_ids = sorted(clips_dict.keys())
+    # Labelled clips before the pending steps, for the stability masks
+    labeled_before = _cache_good_ids | _cache_bad_ids
 
+    # First pass: replay the pending history to get the label sets of each
+    # step, so that every model to backfill can be trained in one batch.
+    pending: list[tuple[int, set[int], set[int], list[int], list[int]]] = []
     for t in range(start, len(label_history)):
         clip_id, label, _ = label_history[t]
 
@@ -81,91 +309,131 @@ def _ensure_cache(
             _cache_good_ids.discard(clip_id)
             _cache_bad_ids.add(clip_id)
 
-        good_ids = list(_cache_good_ids)
-        bad_ids = list(_cache_bad_ids)
+        train_good: list[int] = []
+        train_bad: list[int] = []
+        if _cache_good_ids and _cache_bad_ids:
+            train_good = [cid for cid in _cache_good_ids if cid in clips_dict]
+            train_bad = [cid for cid in _cache_bad_ids if cid in clips_dict]
+        pending.append((t, set(_cache_good_ids), set(_cache_bad_ids), train_good, train_bad))
 
-        model: Optional[nn.Sequential] = None
+    if len(pending) == 1:
+        # A single new step (one vote): fine-tune the previous step's model
+        states = [_train_step_incremental(clips_dict, pending[0], inclusion_value)]
+    else:
+        # Backfill: train every pending step from scratch in one batch
+        models = _train_step_models(clips_dict, pending, inclusion_value)
+        states = [
+            None
+            if model is None
+            else WarmStartState(
+                model=model,
+                optimizer_state=None,
+                inclusion_value=inclusion_value,
+                labels=_step_labels(step),
+            )
+            for step, model in zip(pending, models)
+        ]
+
+    # Second pass: thresholds, which need each model's scores on its own
+    # training set
+    thresholds: list[Optional[float]] = []
+    for (_, _, _, train_good, train_bad), state in zip(pending, states):
         threshold: Optional[float] = None
-        stability: Optional[dict[str, Any]] = None
-
-        if _cache_good_ids and _cache_bad_ids:
-            # Build training data
-            X_list: list[np.ndarray] = []
-            y_list: list[float] = []
-            for cid in _cache_good_ids:
-                if cid in clips_dict:
-                    X_list.append(clips_dict[cid]["embedding"])
-                    y_list.append(1.0)
-            for cid in _cache_bad_ids:
-                if cid in clips_dict:
-                    X_list.append(clips_dict[cid]["embedding"])
-                    y_list.append(0.0)
-
-            if len(X_list) >= 2:
-                X = torch.tensor(np.array(X_list), dtype=torch.float32)
-                y = torch.tensor(y_list, dtype=torch.float32).unsqueeze(1)
-                input_dim = X.shape[1]
-
-                model = train_model(X, y, input_dim, inclusion_value)
-
-                with torch.no_grad():
-                    scores = model(X).squeeze(1).tolist()
-                threshold = find_optimal_threshold(scores, y_list, inclusion_value)
-
-                # --- Stability ---
-                labeled_ids = _cache_good_ids | _cache_bad_ids
-                unlabeled_ids = [cid for cid in all_clip_ids if cid not in labeled_ids]
-
-                if not unlabeled_ids:
-                    stability = {
-                        "time_index": t,
-                        "num_labels": len(good_ids) + len(bad_ids),
-                        "num_flips": 0,
-                        "num_unlabeled": 0,
-                    }
-                else:
-                    unlabeled_embs = np.array([clips_dict[cid]["embedding"] for cid in unlabeled_ids])
-                    X_unlabeled = torch.tensor(unlabeled_embs, dtype=torch.float32)
-
-                    with torch.no_grad():
-                        scores_unl = model(X_unlabeled).squeeze(1).tolist()
-
-                    predictions: dict[int, int] = {
-                        cid: 1 if score >= threshold else 0 for cid, score in zip(unlabeled_ids, scores_unl)
-                    }
-
-                    num_flips = 0
-                    if _cache_prev_predictions is not None:
-                        common = predictions.keys() & _cache_prev_predictions.keys()
-                        for cid in common:
-                            if predictions[cid] != _cache_prev_predictions[cid]:
-                                num_flips += 1
-
-                    stability = {
-                        "time_index": t,
-                        "num_labels": len(good_ids) + len(bad_ids),
-                        "num_flips": num_flips,
-                        "num_unlabeled": len(unlabeled_ids),
-                    }
-
-                    _cache_prev_predictions = predictions
+        if state is not None:
+            y_list: list[float] = [1.0] * len(train_good) + [0.0] * len(train_bad)
+            X = torch.from_numpy(gather_embeddings(clips_dict, train_good + train_bad))
+            with torch.no_grad():
+                scores = state.model(X).squeeze(1).numpy()
+            threshold = find_optimal_threshold(scores, y_list, inclusion_value)
+        thresholds.append(threshold)
+
+    # Third pass: prediction stability, in chunks of steps whose predictions
+    # on the evaluation rows come from one batched forward pass
+    stabilities = _track_stability(
+        clips_dict,
+        label_history,
+        labeled_before,
+        pending,
+        [s.model if s is not None else None for s in states],
+        thresholds,
+    )
 
+    for (t, good_set, bad_set, _, _), state, threshold, stability in zip(pending, states, thresholds, stabilities):
         _cached_steps.append(
             {
-                "model": model,
+                "model": state.model if state is not None else None,
                 "threshold": threshold,
-                "good_ids": good_ids,
-                "bad_ids": bad_ids,
+                "good_ids": list(good_set),
+                "bad_ids": list(bad_set),
                 "stability": stability,
+                "train_state": state,
+                "event": label_history[t],
             }
         )
 
+    # Only the newest step is ever warm-started from; drop older optimiser state
+    if start > 0 and _cached_steps[start - 1].get("train_state") is not None:
+        _cached_steps[start - 1]["train_state"] = None
+
 
 # ---------------------------------------------------------------------------
 # Helper: evaluate cached models against a label set
 # ---------------------------------------------------------------------------
 
 
+def _stack_model_params(models: list[nn.Sequential], thresholds: list[float]) -> tuple[torch.Tensor, ...]:
+    """Stack the parameters of *models* (see :func:`_stacked_models` for the layout)."""
+    with torch.no_grad():
+        return (
+            torch.stack([m[0].weight for m in models]),
+            torch.stack([m[0].bias for m in models]),
+            torch.stack([m[2].weight[0] for m in models]),
+            torch.stack([m[2].bias[0] for m in models]),
+            torch.tensor(thresholds, dtype=torch.float64),
+        )
+
+
+def _stacked_models() -> tuple[np.ndarray, tuple[torch.Tensor, ...] | None]:
+    """Return ``(steps, params)`` for every cached step that has a model.
+
+    ``params`` is ``(W1, b1, W2, b2, thresholds)`` with shapes ``(T, H, D)``,
+    ``(T, H)``, ``(T, H)``, ``(T,)`` and ``(T,)`` (thresholds in ``float64``),
+    or ``None`` when no step has a model.  Steps cached since the last call
+    are appended to the existing stack.
+    """
+    global _stack_upto, _stack_steps, _stack_params
+
+    new_steps = [t for t in range(_stack_upto, len(_cached_steps)) if _cached_steps[t]["model"] is not None]
+    _stack_upto = len(_cached_steps)
+    if new_steps:
+        added = _stack_model_params(
+            [_cached_steps[t]["model"] for t in new_steps], [_cached_steps[t]["threshold"] for t in new_steps]
+        )
+        if _stack_params is None:
+            _stack_params = added
+        else:
+            _stack_params = tuple(torch.cat([old, new]) for old, new in zip(_stack_params, added))
+        _stack_steps = np.concatenate([_stack_steps, np.asarray(new_steps, dtype=np.int64)])
+    return _stack_steps, _stack_params
+
+
+def _score_stacked(X: torch.Tensor, params: tuple[torch.Tensor, ...]) -> torch.Tensor:
+    """Score the rows of *X* under every stacked model; returns a ``(T, N)`` tensor."""
+    W1, b1, W2, b2 = params[:4]
+    num_models, hidden = b1.shape
+    chunk = max(1, _STACK_EVAL_MAX_ELEMENTS // max(1, X.shape[0] * hidden))
+    out = []
+    with torch.no_grad():
+        for lo in range(0, num_models, chunk):
+            hi = min(lo + chunk, num_models)
+            # One (N, D) x (D, k*H) GEMM for the first layer of k models
+            k = hi - lo
+            h = torch.relu(X @ W1[lo:hi].reshape(k * hidden, -1).T + b1[lo:hi].reshape(-1))
+            logits = torch.einsum("nkh,kh->kn", h.view(-1, k, hidden), W2[lo:hi]) + b2[lo:hi, None]
+            out.append(torch.sigmoid(logits))
+    return torch.cat(out) if out else torch.empty((0, X.shape[0]))
+
+
 def _eval_cached_models(
     clips_dict: dict[int, dict[str, Any]],
     current_good_votes: dict[int, None],
@@ -176,6 +444,10 @@ def _eval_cached_models(
 ) -> list[dict[str, Any]]:
     """Score cached models against the current labelset (forward passes only).
 
+    All step models in range are evaluated in one batched forward pass over
+    their stacked parameters, and false positives / negatives are counted
+    with vectorised comparisons against the per-step thresholds.
+
     Returns a list of error-cost dicts for every cached step in
     ``[start, end)`` that has a trained model.
     """
@@ -196,42 +468,37 @@ def _eval_cached_models(
     if not current_labels:
         return []
 
-    eval_embs: list[np.ndarray] = []
-    eval_labels: list[float] = []
-    for cid, lbl in current_labels.items():
-        if cid in clips_dict:
-            eval_embs.append(clips_dict[cid]["embedding"])
-            eval_labels.append(lbl)
-
-    if not eval_embs:
+    eval_ids = [cid for cid in current_labels if cid in clips_dict]
+    if not eval_ids:
         return []
 
-    X_eval = torch.tensor(np.array(eval_embs), dtype=torch.float32)
-    total_positives = sum(1 for lbl in eval_labels if lbl == 1)
-    total_negatives = len(eval_labels) - total_positives
-
     if end is None:
         end = len(_cached_steps)
 
+    steps, params = _stacked_models()
+    if params is None:
+        return []
+    lo, hi = np.searchsorted(steps, [start, end])
+    if lo >= hi:
+        return []
+    params = tuple(p[lo:hi] for p in params)
+    steps = steps[lo:hi]
+
+    X_eval = torch.from_numpy(gather_embeddings(clips_dict, eval_ids))
+    y_true = torch.tensor([current_labels[cid] == 1.0 for cid in eval_ids])
+    total_positives = int(y_true.sum())
+    total_negatives = len(eval_ids) - total_positives
+
+    # Compare in float64 against the float64 thresholds, as the scalar path did
+    predicted = _score_stacked(X_eval, params).double() >= params[4][:, None]
+    fp = (predicted & ~y_true).sum(dim=1).tolist()
+    fn = (~predicted & y_true).sum(dim=1).tolist()
+
     results: list[dict[str, Any]] = []
-    for t in range(start, end):
+    for t, n_fp, n_fn in zip(steps.tolist(), fp, fn):
         step = _cached_steps[t]
-        if step["model"] is None:
-            continue
-
-        with torch.no_grad():
-            scores = step["model"](X_eval).squeeze(1).tolist()
-
-        fp = fn = 0
-        for score, true_label in zip(scores, eval_labels):
-            predicted = 1 if score >= step["threshold"] else 0
-            if predicted == 1 and true_label == 0:
-                fp += 1
-            elif predicted == 0 and true_label == 1:
-                fn += 1
-
-        fpr = fp / total_negatives if total_negatives > 0 else 0.0
-        fnr = fn / total_positives if total_positives > 0 else 0.0
+        fpr = n_fp / total_negatives if total_negatives > 0 else 0.0
+        fnr = n_fn / total_positives if total_positives > 0 else 0.0
         error_cost = fpr_weight * fpr + fnr_weight * fnr
 
         results.append(
@@ -252,6 +519,7 @@ def _eval_cached_models(
 # ---------------------------------------------------------------------------
 
 
+@_with_cache_lock
 def recreate_model_at_time(
     clips_dict: dict[int, dict[str, Any]],
     label_history: list[tuple[int, str, float]],
@@ -278,6 +546,7 @@ def recreate_model_at_time(
     return step["model"], step["threshold"], step["good_ids"], step["bad_ids"]
 
 
+@_with_cache_lock
 def calculate_error_cost_over_time(
     clips_dict: dict[int, dict[str, Any]],
     label_history: list[tuple[int, str, float]],
@@ -293,6 +562,7 @@ def calculate_error_cost_over_time(
     return _eval_cached_models(clips_dict, current_good_votes, current_bad_votes, inclusion_value)
 
 
+@_with_cache_lock
 def calculate_prediction_stability_over_time(
     clips_dict: dict[int, dict[str, Any]],
     label_history: list[tuple[int, str, float]],
@@ -303,6 +573,7 @@ def calculate_prediction_stability_over_time(
     return [step["stability"] for step in _cached_steps if step["stability"] is not None]
 
 
+@_with_cache_lock
 def compute_labeling_status(
     clips_dict: dict[int, dict[str, Any]],
     label_history: list[tuple[int, str, float]],
@@ -383,6 +654,7 @@ def compute_labeling_status(
         }
 
 
+@_with_cache_lock
 def analyze_labeling_progress(
     clips_dict: dict[int, dict[str, Any]],
     label_history: list[tuple[int, str, float]],
@@ -0,0 +1,199 @@
+"""In-process LRU cache of text-query embeddings.
+
+``/api/sort`` embeds the search box's text on every debounced keystroke,
+and the same queries come back constantly: a user backspacing to an earlier
+query, several users searching the same dataset, evaluation runs repeating
+their query lists.  Each query's embedding is kept here, keyed by the media
+type, its embedding model ID and the query text with whitespace collapsed,
+so a repeat skips the text encoder.
+
+The cache holds the ``QUERY_CACHE_SIZE`` most recently used queries.  With
+``QUERY_CACHE_PERSIST`` on, queries are also written to the persistent
+embedding cache (:mod:`vtsearch.models.embedding_cache`) and survive
+restarts.  The ranking computed from a query for the current dataset
+version is cached separately by :mod:`vtsearch.models.similarity`.
+
+Callers normally go through
+:func:`~vtsearch.models.embeddings.embed_text_query` and
+:func:`~vtsearch.models.embeddings.embed_text_queries`, which use
+:func:`embed_queries_cached`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from config import QUERY_CACHE_PERSIST, QUERY_CACHE_SIZE
+from vtsearch.models.embedding_cache import cache_key, get_embedding_cache
+
+if TYPE_CHECKING:
+    from vtsearch.media.base import MediaType
+
+QueryKey = tuple[str, str, str]
+
+
+def normalize_query(text: str) -> str:
+    """Return *text* in NFC form with runs of whitespace collapsed to one space.
+
+    Case is kept: not every text encoder lowercases its input.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def query_key(mt: MediaType, text: str) -> QueryKey:
+    """Return the cache key for embedding *text* with *mt*'s text encoder."""
+    model_id = getattr(mt, "embedding_model_id", None)
+    return mt.type_id, model_id if isinstance(model_id, str) else "", normalize_query(text)
+
+
+class QueryCache:
+    """Thread-safe, size-bounded LRU map from :func:`query_key` to embedding.
+
+    Args:
+        max_entries: Number of queries kept; the least recently used one is
+            dropped when a new query would exceed it.
+    """
+
+    def __init__(self, max_entries: int = QUERY_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[QueryKey, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: QueryKey) -> np.ndarray | None:
+        """Return a copy of the embedding stored under *key*, or ``None``."""
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector.copy()
+
+    def put(self, key: QueryKey, vector: np.ndarray) -> None:
+        """Store *vector* under *key*, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = np.array(vector, copy=True)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        """Return entry count and hit/miss counters since the cache was created."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "persist": QUERY_CACHE_PERSIST,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Process-wide cache
+# ---------------------------------------------------------------------------
+
+_cache: QueryCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryCache | None:
+    """Return the process-wide query cache, or ``None`` when ``QUERY_CACHE_SIZE`` is 0."""
+    global _cache
+    if QUERY_CACHE_SIZE <= 0:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = QueryCache(QUERY_CACHE_SIZE)
+        return _cache
+
+
+def set_query_cache(cache: QueryCache | None) -> None:
+    """Replace the process-wide query cache."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+
+def clear_query_cache() -> None:
+    """Empty the process-wide query cache."""
+    cache = get_query_cache()
+    if cache is not None:
+        cache.clear()
+
+
+def query_cache_stats() -> dict[str, Any]:
+    """Return :meth:`QueryCache.stats` for the process-wide cache."""
+    cache = get_query_cache()
+    if cache is None:
+        return {"enabled": False}
+    return cache.stats()
+
+
+def _persistent_key(key: QueryKey) -> str:
+    media_type, model_id, text = key
+    return cache_key(hashlib.md5(text.encode("utf-8")).hexdigest(), model_id, {"query": media_type})
+
+
+def embed_queries_cached(mt: MediaType, texts: Sequence[str]) -> list[np.ndarray | None]:
+    """Embed *texts* with *mt*'s text encoder, reusing cached query embeddings.
+
+    Each distinct query that is not cached is embedded once, in batches of
+    ``mt.embed_batch_size``.  Failures are not cached.
+
+    Returns:
+        One embedding per text, in order; ``None`` where embedding failed.
+    """
+    cache = get_query_cache()
+    keys = [query_key(mt, text) for text in texts]
+    found: dict[QueryKey, np.ndarray | None] = {}
+    for key in dict.fromkeys(keys):
+        found[key] = cache.get(key) if cache is not None else None
+
+    missing = [key for key, vector in found.items() if vector is None]
+    store = get_embedding_cache() if QUERY_CACHE_PERSIST and missing else None
+    if store is not None:
+        stored = store.get_many(_persistent_key(key) for key in missing)
+        for key in missing:
+            vector = stored.get(_persistent_key(key))
+            if vector is not None:
+                found[key] = vector
+                if cache is not None:
+                    cache.put(key, vector)
+        missing = [key for key in missing if found[key] is None]
+
+    batch_size = max(1, int(mt.embed_batch_size))
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start : start + batch_size]
+        # Embed the normalised text, so every spelling of a key gets one vector
+        for key, vector in zip(batch, mt.embed_text_batch([key[2] for key in batch])):
+            found[key] = vector
+            if vector is None:
+                continue
+            if cache is not None:
+                cache.put(key, vector)
+            if store is not None:
+                store.put(_persistent_key(key), vector)
+    return [found[key].copy() if found[key] is not None else None for key in keys]
@@ -0,0 +1,297 @@
+"""Vectorised cosine-similarity search over the loaded clips.
+
+Text sort and example sort rank every clip by cosine similarity to a query
+vector.  Instead of looping over clips in Python, the embeddings are
+L2-normalised once into a ``float32`` matrix and each query is answered with
+a single matrix-vector product.
+
+The normalised matrix is cached for the most recently used
+:class:`~vtsearch.utils.clip_store.ClipStore` and reused until the store's
+version changes (clips added, replaced or removed).  Plain dicts are
+normalised on every call.
+
+Long audio clips also carry per-window ``"segment_embeddings"`` (with their
+start times in ``"segment_offsets"``).  :func:`similarity_sort` scores such a
+clip by its best-matching segment and reports where that segment starts, so
+a short event inside a long recording is not averaged away.  The stacked,
+normalised segment matrix is cached alongside the clip matrix.
+
+The last ``SIMILARITY_RESULT_CACHE_SIZE`` rankings of a
+:class:`~vtsearch.utils.clip_store.ClipStore` are cached too, keyed by the
+query vector and ``top_k``, so a repeated query against an unchanged
+dataset (the same text query, whose embedding comes from
+:mod:`vtsearch.models.query_cache`) skips the matrix product entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from config import SIMILARITY_RESULT_CACHE_SIZE
+from vtsearch.utils.clip_store import ClipStore, embedding_matrix
+
+# ---------------------------------------------------------------------------
+# Module-level cache
+# ---------------------------------------------------------------------------
+# Keyed on the identity and version of the ClipStore it was built from.
+
+_cache_lock = threading.Lock()
+_cache_key: tuple[int, int] | None = None
+_cache_ids: np.ndarray | None = None
+_cache_normed: np.ndarray | None = None
+_segment_key: tuple[int, int] | None = None
+_segment_index: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+
+# Rankings by (store identity, store version, query digest, top_k)
+_results: OrderedDict[tuple[int, int, str, int | None], tuple[list[dict[str, Any]], np.ndarray]] = OrderedDict()
+_results_hits = 0
+_results_misses = 0
+
+
+def clear_similarity_cache() -> None:
+    """Drop the cached normalised embedding and segment matrices and rankings."""
+    global _cache_key, _cache_ids, _cache_normed, _segment_key, _segment_index, _results_hits, _results_misses
+    with _cache_lock:
+        _cache_key = None
+        _cache_ids = None
+        _cache_normed = None
+        _segment_key = None
+        _segment_index = None
+        _results.clear()
+        _results_hits = _results_misses = 0
+
+
+def similarity_cache_stats() -> dict[str, Any]:
+    """Return the number of cached rankings and their hit/miss counters."""
+    with _cache_lock:
+        lookups = _results_hits + _results_misses
+        return {
+            "entries": len(_results),
+            "max_entries": SIMILARITY_RESULT_CACHE_SIZE,
+            "hits": _results_hits,
+            "misses": _results_misses,
+            "hit_rate": _results_hits / lookups if lookups else 0.0,
+        }
+
+
+def _results_key(
+    clips_dict: dict[int, dict[str, Any]], query: np.ndarray, top_k: int | None
+) -> tuple[int, int, str, int | None] | None:
+    if not isinstance(clips_dict, ClipStore) or SIMILARITY_RESULT_CACHE_SIZE <= 0:
+        return None
+    q = np.ascontiguousarray(query, dtype=np.float32).reshape(-1)
+    return id(clips_dict), clips_dict.version, hashlib.md5(q.tobytes()).hexdigest(), top_k
+
+
+def _normalize_rows(X: np.ndarray) -> np.ndarray:
+    """Return a ``float32`` copy of *X* with unit-length rows (zero rows stay zero)."""
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(X / norms, dtype=np.float32)
+
+
+def normalized_embeddings(clips_dict: dict[int, dict[str, Any]]) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(ids, Xn)`` where row *i* of *Xn* is the unit-normalised embedding of ``ids[i]``.
+
+    Rows follow the dict's insertion order.  The result is cached when
+    *clips_dict* is a :class:`~vtsearch.utils.clip_store.ClipStore`; callers
+    must treat both arrays as read-only.
+    """
+    global _cache_key, _cache_ids, _cache_normed
+
+    if not isinstance(clips_dict, ClipStore):
+        ids, X = embedding_matrix(clips_dict)
+        return ids, _normalize_rows(X)
+
+    with _cache_lock:
+        key = (id(clips_dict), clips_dict.version)
+        if _cache_key != key or _cache_ids is None or _cache_normed is None:
+            ids, X = clips_dict.embedding_matrix()
+            _cache_ids, _cache_normed = ids, _normalize_rows(X)
+            _cache_key = key
+        return _cache_ids, _cache_normed
+
+
+def cosine_similarities(clips_dict: dict[int, dict[str, Any]], query: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the cosine similarity between *query* and every clip.
+
+    Args:
+        clips_dict: Mapping of clip ID to clip data (must contain ``"embedding"``).
+        query: 1-D query embedding with the same dimension as the clips.
+
+    Returns:
+        ``(ids, similarities)`` — an ``int64`` array of clip IDs in dict order
+        and a ``float64`` array of the matching similarities.  Clips (or a
+        query) with zero norm get a similarity of ``0.0``.
+    """
+    ids, Xn = normalized_embeddings(clips_dict)
+    if len(ids) == 0:
+        return ids, np.empty(0, dtype=np.float64)
+
+    q = np.asarray(query, dtype=np.float32).reshape(-1)
+    q_norm = float(np.linalg.norm(q))
+    if q_norm == 0:
+        return ids, np.zeros(len(ids), dtype=np.float64)
+    sims = Xn @ (q / q_norm)
+    return ids, sims.astype(np.float64)
+
+
+def _build_segment_index(
+    clips_dict: dict[int, dict[str, Any]], ids: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rows_of = {int(clip_id): row for row, clip_id in enumerate(ids)}
+    owners: list[np.ndarray] = []
+    offsets: list[np.ndarray] = []
+    matrices: list[np.ndarray] = []
+    for clip_id, clip in clips_dict.items():
+        segs = clip.get("segment_embeddings")
+        if segs is None or int(clip_id) not in rows_of:
+            continue
+        segs = np.asarray(segs, dtype=np.float32)
+        if segs.ndim != 2 or len(segs) == 0:
+            continue
+        owners.append(np.full(len(segs), rows_of[int(clip_id)], dtype=np.intp))
+        offsets.append(np.asarray(clip["segment_offsets"], dtype=np.float32).reshape(-1))
+        matrices.append(segs)
+    if not matrices:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32), np.empty((0, 0), dtype=np.float32)
+    return np.concatenate(owners), np.concatenate(offsets), _normalize_rows(np.concatenate(matrices))
+
+
+def segment_index(clips_dict: dict[int, dict[str, Any]], ids: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return ``(owners, offsets, Sn)`` for every segment of the clips in *clips_dict*.
+
+    Row *j* of *Sn* is the unit-normalised embedding of a segment that starts
+    ``offsets[j]`` seconds into the clip at row ``owners[j]`` of *ids*.
+    Cached per :class:`~vtsearch.utils.clip_store.ClipStore` version like
+    :func:`normalized_embeddings`.
+    """
+    global _segment_key, _segment_index
+
+    if not isinstance(clips_dict, ClipStore):
+        return _build_segment_index(clips_dict, ids)
+
+    with _cache_lock:
+        key = (id(clips_dict), clips_dict.version)
+        if _segment_key != key or _segment_index is None:
+            _segment_index = _build_segment_index(clips_dict, ids)
+            _segment_key = key
+        return _segment_index
+
+
+def best_segments(
+    clips_dict: dict[int, dict[str, Any]], ids: np.ndarray, query: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find the segment of each segmented clip that best matches *query*.
+
+    Returns:
+        ``(rows, similarities, offsets)`` — the rows of *ids* that have
+        segments, the cosine similarity of each one's best segment, and that
+        segment's start time in seconds.
+    """
+    owners, offsets, Sn = segment_index(clips_dict, ids)
+    q = np.asarray(query, dtype=np.float32).reshape(-1)
+    q_norm = float(np.linalg.norm(q))
+    if len(owners) == 0 or q_norm == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float32)
+    sims = Sn @ (q / q_norm)
+    # Group segments by clip with the best one first, then take each group's head
+    order = np.lexsort((-sims, owners))
+    heads = order[np.flatnonzero(np.r_[True, owners[order][1:] != owners[order][:-1]])]
+    return owners[heads], sims[heads].astype(np.float64), offsets[heads]
+
+
+def rank_by_similarity(similarities: np.ndarray, top_k: int | None = None) -> np.ndarray:
+    """Return row indices ordered by descending similarity.
+
+    Similarities are compared after rounding to four decimals, the precision
+    reported to clients, and ties keep their original row order.  When
+    *top_k* is given only the best *top_k* rows are selected (via
+    :func:`numpy.argpartition`) and sorted, so the full ordering is never
+    computed.
+
+    Args:
+        similarities: 1-D array of similarity scores.
+        top_k: Number of rows to return, or ``None`` for all rows.
+
+    Returns:
+        An integer array of row indices into *similarities*.
+    """
+    n = len(similarities)
+    key = -np.round(similarities, 4)
+    if top_k is None or top_k >= n:
+        return np.argsort(key, kind="stable")
+    if top_k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    # Everything strictly better than the k-th key, plus enough rows tied
+    # with it (lowest row index first) to make up top_k.
+    kth = key[np.argpartition(key, top_k - 1)[top_k - 1]]
+    candidates = np.flatnonzero(key <= kth)
+    order = candidates[np.lexsort((candidates, key[candidates]))]
+    return order[:top_k]
+
+
+def similarity_sort(
+    clips_dict: dict[int, dict[str, Any]],
+    query: np.ndarray,
+    top_k: int | None = None,
+) -> tuple[list[dict[str, Any]], np.ndarray]:
+    """Rank clips by cosine similarity to *query*.
+
+    Args:
+        clips_dict: Mapping of clip ID to clip data.
+        query: 1-D query embedding.
+        top_k: Return only the *top_k* most similar clips; ``None`` returns
+            every clip.
+
+    Returns:
+        ``(results, similarities)`` — ``results`` is a list of
+        ``{"id": int, "similarity": float}`` dicts in descending order of
+        similarity (rounded to four decimals) and ``similarities`` holds the
+        raw similarity of every clip, suitable for threshold estimation.
+        Clips with segments score as their best segment when it beats the
+        whole clip, and their result also has that segment's ``"offset"``
+        (seconds for audio, characters for text).  For a
+        :class:`~vtsearch.utils.clip_store.ClipStore` the pair is cached per
+        store version; ``similarities`` is then read-only.
+    """
+    global _results_hits, _results_misses
+
+    key = _results_key(clips_dict, query, top_k)
+    if key is not None:
+        with _cache_lock:
+            cached = _results.get(key)
+            if cached is not None:
+                _results.move_to_end(key)
+                _results_hits += 1
+                return [dict(result) for result in cached[0]], cached[1]
+            _results_misses += 1
+
+    ids, sims = cosine_similarities(clips_dict, query)
+    rows, segment_sims, segment_offsets = best_segments(clips_dict, ids, query)
+    offset_of: dict[int, float] = {}
+    if len(rows):
+        sims = sims.copy()
+        sims[rows] = np.maximum(sims[rows], segment_sims)
+        offset_of = {int(row): round(float(offset), 2) for row, offset in zip(rows, segment_offsets)}
+    order = rank_by_similarity(sims, top_k)
+    results = []
+    for i in order:
+        result = {"id": int(ids[i]), "similarity": round(float(sims[i]), 4)}
+        if int(i) in offset_of:
+            result["offset"] = offset_of[int(i)]
+        results.append(result)
+
+    if key is not None:
+        sims.flags.writeable = False
+        with _cache_lock:
+            _results[key] = ([dict(result) for result in results], sims)
+            while len(_results) > SIMILARITY_RESULT_CACHE_SIZE:
+                _results.popitem(last=False)
+    return results, sims
@@ -1,16 +1,30 @@
 """ML training utilities for learned sorting."""
 
+import copy
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Any
 
 import numpy as np
 import torch
 import torch.nn as nn
-from sklearn.mixture import GaussianMixture
+import torch.nn.functional as F
 
-from config import TRAIN_EPOCHS
+from config import (
+    TRAIN_EPOCHS,
+    WARM_START_MAX_EPOCHS,
+    WARM_START_MAX_LABEL_CHANGE,
+    WARM_START_MIN_DELTA,
+    WARM_START_PATIENCE,
+)
+from vtsearch.utils.clip_store import embedding_matrix, gather_embeddings
 
+# Upper bound on the number of models :func:`train_models` stacks into one pass
+MODELS_PER_BATCH = 16
 
-def calculate_gmm_threshold(scores: list[float]) -> float:
+
+def calculate_gmm_threshold(scores: list[float] | np.ndarray) -> float:
     """Use a Gaussian Mixture Model to find a threshold between two score distributions.
 
     Fits a 2-component GMM to the provided scores, assuming a bimodal distribution
@@ -18,7 +32,7 @@ def calculate_gmm_threshold(scores: list[float]) -> float:
     two component means as the decision threshold.
 
     Args:
-        scores: List of model confidence scores, expected to follow a bimodal distribution.
+        scores: Model confidence scores, expected to follow a bimodal distribution.
 
     Returns:
         A float threshold. Scores at or above this value are classified as Good.
@@ -28,6 +42,9 @@ def calculate_gmm_threshold(scores: list[float]) -> float:
     if len(scores) < 2:
         return 0.5
 
+    # Imported here: scikit-learn is slow to import and only needed for this
+    from sklearn.mixture import GaussianMixture
+
     # Reshape for sklearn
     X = np.array(scores).reshape(-1, 1)
 
@@ -53,6 +70,37 @@ def calculate_gmm_threshold(scores: list[float]) -> float:
         return float(np.median(scores))
 
 
+def _new_mlp(input_dim: int) -> nn.Sequential:
+    """Return a freshly initialised ``Linear(input_dim, 64) -> ReLU -> Linear(64, 1) -> Sigmoid`` model."""
+    return nn.Sequential(
+        nn.Linear(input_dim, 64),
+        nn.ReLU(),
+        nn.Linear(64, 1),
+        nn.Sigmoid(),
+    )
+
+
+def _class_weights(num_true: float, num_false: float, inclusion_value: int) -> tuple[float, float]:
+    """Return ``(weight_true, weight_false)`` for the weighted BCE loss."""
+    # Base weights for balanced classes
+    if num_true > 0 and num_false > 0:
+        weight_true = num_false / num_true
+        weight_false = 1.0
+    else:
+        weight_true = 1.0
+        weight_false = 1.0
+
+    # Adjust weights based on inclusion
+    if inclusion_value >= 0:
+        # Increase weight for True samples
+        weight_true *= 2.0**inclusion_value
+    else:
+        # Increase weight for False samples
+        weight_false *= 2.0 ** (-inclusion_value)
+
+    return weight_true, weight_false
+
+
 def train_model(
     X_train: torch.Tensor,
     y_train: torch.Tensor,
@@ -81,63 +129,317 @@ def train_model(
         A trained ``nn.Sequential`` model in eval mode with layers:
         ``Linear(input_dim, 64) -> ReLU -> Linear(64, 1) -> Sigmoid``.
     """
-    model = nn.Sequential(
-        nn.Linear(input_dim, 64),
-        nn.ReLU(),
-        nn.Linear(64, 1),
-        nn.Sigmoid(),
-    )
-
+    model = _new_mlp(input_dim)
     optimizer = torch.optim.Adam(model.parameters(), lr=0.01)
+    _fit(model, optimizer, X_train, y_train, inclusion_value, TRAIN_EPOCHS)
+    return model
 
+
+def _fit(
+    model: nn.Sequential,
+    optimizer: torch.optim.Optimizer,
+    X_train: torch.Tensor,
+    y_train: torch.Tensor,
+    inclusion_value: int,
+    max_epochs: int,
+    patience: int | None = None,
+    min_delta: float = 0.0,
+) -> int:
+    """Run the weighted-BCE training loop shared by all single-model trainers.
+
+    Trains for *max_epochs*, or stops early once the loss has not improved by
+    more than *min_delta* for *patience* consecutive epochs (when *patience*
+    is given).  Leaves *model* in eval mode and returns the number of epochs
+    run.
+    """
     # Calculate class weights based on inclusion
     num_true = y_train.sum().item()
     num_false = len(y_train) - num_true
-
-    # Base weights for balanced classes
-    if num_true > 0 and num_false > 0:
-        weight_true = num_false / num_true
-        weight_false = 1.0
-    else:
-        weight_true = 1.0
-        weight_false = 1.0
-
-    # Adjust weights based on inclusion
-    if inclusion_value >= 0:
-        # Increase weight for True samples
-        weight_true *= 2.0**inclusion_value
-    else:
-        # Increase weight for False samples
-        weight_false *= 2.0 ** (-inclusion_value)
+    weight_true, weight_false = _class_weights(num_true, num_false, inclusion_value)
 
     # Create sample weights
     weights = torch.where(y_train == 1, weight_true, weight_false).squeeze()
     loss_fn = nn.BCELoss(reduction="none")
 
+    best_loss = float("inf")
+    stale_epochs = 0
+    epochs = 0
+
     model.train()
-    for _ in range(TRAIN_EPOCHS):
+    for _ in range(max_epochs):
         optimizer.zero_grad()
         predictions = model(X_train)
         losses = loss_fn(predictions, y_train)
         weighted_loss = (losses.squeeze() * weights).mean()
         weighted_loss.backward()
         optimizer.step()
+        epochs += 1
+
+        if patience is not None:
+            loss = weighted_loss.item()
+            if best_loss - loss > min_delta:
+                best_loss = loss
+                stale_epochs = 0
+            else:
+                stale_epochs += 1
+                if stale_epochs >= patience:
+                    break
 
     model.eval()
-    return model
+    return epochs
+
+
+@dataclass
+class WarmStartState:
+    """Model and optimiser state carried from one incremental training run to the next.
+
+    Attributes:
+        model: The trained model (eval mode).  Never modified by later runs.
+        optimizer_state: ``state_dict()`` of the Adam optimiser after training,
+            or ``None`` if it is not available (e.g. the model came from
+            :func:`train_models`); a warm start then uses a fresh optimiser.
+        inclusion_value: Inclusion value the model was trained with.
+        labels: Training labels by clip ID (1.0 good, 0.0 bad).
+        warm_started: ``True`` if this run fine-tuned a previous model,
+            ``False`` if it trained from scratch.
+        epochs: Number of epochs the run took.
+    """
+
+    model: nn.Sequential
+    optimizer_state: dict[str, Any] | None
+    inclusion_value: int
+    labels: dict[int, float]
+    warm_started: bool = False
+    epochs: int = 0
+
+
+# Final model of the last warm-started train_and_score call, keyed by the
+# identity and version of the clips dict it was trained on.
+_warm_start_lock = threading.Lock()
+_warm_start_key: tuple[int, int | None] | None = None
+_warm_start_state: WarmStartState | None = None
+
+
+def clear_warm_start_cache() -> None:
+    """Forget the model kept for warm-starting :func:`train_and_score`."""
+    global _warm_start_key, _warm_start_state
+    with _warm_start_lock:
+        _warm_start_key = None
+        _warm_start_state = None
+
+
+def _label_change_fraction(previous: dict[int, float], current: dict[int, float]) -> float:
+    """Fraction of *current* labels that were added, removed or flipped since *previous*."""
+    changed = sum(1 for cid in previous.keys() | current.keys() if previous.get(cid) != current.get(cid))
+    return changed / max(len(current), 1)
+
+
+def train_model_incremental(
+    X_train: torch.Tensor,
+    y_train: torch.Tensor,
+    labeled_ids: Sequence[int],
+    input_dim: int,
+    inclusion_value: int = 0,
+    previous: WarmStartState | None = None,
+) -> WarmStartState:
+    """Train a model, warm-starting from a previous run when the labels are similar.
+
+    When *previous* is compatible (same input dimension and inclusion value)
+    and at most ``WARM_START_MAX_LABEL_CHANGE`` of the labels were added,
+    removed or flipped, a copy of the previous model is fine-tuned with the
+    previous Adam state for at most ``WARM_START_MAX_EPOCHS`` epochs, stopping
+    early once the loss converges.  Otherwise — no previous run, or a drastic
+    change such as a bulk label import — it falls back to a cold start with
+    the full :func:`train_model` schedule.
+
+    Args:
+        X_train: Float tensor of shape ``(N, input_dim)`` containing training embeddings.
+        y_train: Float tensor of shape ``(N, 1)`` containing binary labels.
+        labeled_ids: Clip ID of each training row, used to compare label sets
+            between runs.
+        input_dim: Dimensionality of the input embeddings.
+        inclusion_value: Integer in ``[-10, 10]``; see :func:`train_model`.
+        previous: State returned by the previous call, or ``None``.
+
+    Returns:
+        A new :class:`WarmStartState`; pass it as *previous* to the next call.
+    """
+    labels = {int(cid): float(label) for cid, label in zip(labeled_ids, y_train.view(-1).tolist())}
+
+    warm = (
+        previous is not None
+        and previous.inclusion_value == inclusion_value
+        and previous.model[0].in_features == input_dim
+        and _label_change_fraction(previous.labels, labels) <= WARM_START_MAX_LABEL_CHANGE
+    )
+
+    if warm:
+        model = copy.deepcopy(previous.model)
+        optimizer = torch.optim.Adam(model.parameters(), lr=0.01)
+        if previous.optimizer_state is not None:
+            optimizer.load_state_dict(copy.deepcopy(previous.optimizer_state))
+        epochs = _fit(
+            model,
+            optimizer,
+            X_train,
+            y_train,
+            inclusion_value,
+            WARM_START_MAX_EPOCHS,
+            patience=WARM_START_PATIENCE,
+            min_delta=WARM_START_MIN_DELTA,
+        )
+    else:
+        model = _new_mlp(input_dim)
+        optimizer = torch.optim.Adam(model.parameters(), lr=0.01)
+        epochs = _fit(model, optimizer, X_train, y_train, inclusion_value, TRAIN_EPOCHS)
+
+    return WarmStartState(
+        model=model,
+        optimizer_state=optimizer.state_dict(),
+        inclusion_value=inclusion_value,
+        labels=labels,
+        warm_started=warm,
+        epochs=epochs,
+    )
+
+
+def train_models(
+    X_train: torch.Tensor,
+    y_train: torch.Tensor,
+    masks: torch.Tensor,
+    input_dim: int,
+    inclusion_values: int | Sequence[int] = 0,
+    chunk_size: int = MODELS_PER_BATCH,
+) -> list[nn.Sequential]:
+    """Train ``K`` independent MLPs at once, each on its own subset of the rows.
+
+    Equivalent to calling :func:`train_model` once per row of *masks* (same
+    architecture, loss, class weighting, optimiser and epoch count), but the
+    ``K`` models are trained together: their parameters are stacked so every
+    epoch is a single batched forward/backward pass instead of ``K`` small,
+    overhead-bound ones.  Models are initialised in order, so the result is
+    reproducible under the same ``torch`` seed as the sequential loop.
+
+    Args:
+        X_train: Float tensor of shape ``(N, input_dim)`` holding every row any
+            model trains on.
+        y_train: Binary labels, either shape ``(N,)`` / ``(N, 1)`` shared by
+            all models or ``(K, N)`` with one label vector per model.
+        masks: Boolean tensor of shape ``(K, N)``; ``masks[k]`` selects the
+            training rows of model *k*.
+        input_dim: Dimensionality of the input embeddings.
+        inclusion_values: One inclusion value for all models, or a sequence
+            with one value per model.  See :func:`train_model`.
+        chunk_size: Maximum number of models trained in one batched pass;
+            bounds peak memory for large ``K``.
+
+    Returns:
+        A list of ``K`` trained ``nn.Sequential`` models in eval mode, in the
+        order of *masks*.
+
+    Raises:
+        ValueError: If the shapes of *y_train*, *masks* or *inclusion_values*
+            do not match.
+    """
+    masks = torch.as_tensor(masks, dtype=torch.bool)
+    if masks.dim() != 2 or masks.shape[1] != X_train.shape[0]:
+        raise ValueError(f"masks must have shape (K, {X_train.shape[0]}), got {tuple(masks.shape)}")
+    k_total, n = masks.shape
+
+    y_train = y_train.to(torch.float32)
+    if y_train.dim() == 2 and y_train.shape == (n, 1):
+        y_train = y_train.squeeze(1)
+    if y_train.dim() == 1:
+        y_train = y_train.expand(k_total, n)
+    if y_train.shape != (k_total, n):
+        raise ValueError(f"y_train must have shape ({n},) or ({k_total}, {n}), got {tuple(y_train.shape)}")
+
+    if isinstance(inclusion_values, int):
+        inclusions = [inclusion_values] * k_total
+    else:
+        inclusions = [int(v) for v in inclusion_values]
+        if len(inclusions) != k_total:
+            raise ValueError(f"Expected {k_total} inclusion values, got {len(inclusions)}")
+
+    models: list[nn.Sequential] = []
+    step = max(1, chunk_size)
+    for start in range(0, k_total, step):
+        stop = min(start + step, k_total)
+        # Initialise in order so the RNG is consumed exactly as by sequential train_model calls
+        chunk = [_new_mlp(input_dim) for _ in range(start, stop)]
+        _train_stacked(chunk, X_train, y_train[start:stop], masks[start:stop], inclusions[start:stop])
+        for model in chunk:
+            model.eval()
+        models.extend(chunk)
+    return models
+
+
+def _train_stacked(
+    models: list[nn.Sequential],
+    X_train: torch.Tensor,
+    y_train: torch.Tensor,
+    masks: torch.Tensor,
+    inclusions: list[int],
+) -> None:
+    """Train *models* in place as one stacked network (see :func:`train_models`)."""
+    # Only the rows used by at least one model in this chunk take part
+    rows = masks.any(dim=0).nonzero(as_tuple=True)[0]
+    X = X_train[rows].to(torch.float32)
+    Y = y_train[:, rows]
+    M = masks[:, rows].to(torch.float32)
+    n, d = X.shape
+    k = len(models)
+
+    # Stacked parameters: W1 (D, K, 64), b1 (K, 64), W2 (K, 64), b2 (K,)
+    with torch.no_grad():
+        W1 = torch.stack([m[0].weight.T for m in models], dim=1).contiguous().requires_grad_()
+        b1 = torch.stack([m[0].bias for m in models]).requires_grad_()
+        W2 = torch.stack([m[2].weight[0] for m in models]).requires_grad_()
+        b2 = torch.stack([m[2].bias[0] for m in models]).requires_grad_()
+    hidden = W1.shape[2]
+
+    # Per-model sample weights, divided by each model's own row count so the
+    # summed loss equals the sum of the per-model mean losses.
+    counts = M.sum(dim=1)
+    num_true = (M * Y).sum(dim=1)
+    class_weights = [_class_weights(t, c - t, inc) for t, c, inc in zip(num_true.tolist(), counts.tolist(), inclusions)]
+    weight_true = torch.tensor([w[0] for w in class_weights], dtype=torch.float32).unsqueeze(1)
+    weight_false = torch.tensor([w[1] for w in class_weights], dtype=torch.float32).unsqueeze(1)
+    sample_weights = torch.where(Y == 1, weight_true, weight_false) * M / counts.clamp(min=1).unsqueeze(1)
+
+    optimizer = torch.optim.Adam([W1, b1, W2, b2], lr=0.01)
+    for _ in range(TRAIN_EPOCHS):
+        optimizer.zero_grad()
+        h = torch.relu((X @ W1.view(d, k * hidden)).view(n, k, hidden) + b1)
+        predictions = torch.sigmoid(torch.einsum("nkh,kh->kn", h, W2) + b2.unsqueeze(1))
+        losses = F.binary_cross_entropy(predictions, Y, reduction="none")
+        weighted_loss = (losses * sample_weights).sum()
+        weighted_loss.backward()
+        optimizer.step()
+
+    with torch.no_grad():
+        for i, model in enumerate(models):
+            model[0].weight.copy_(W1[:, i, :].T)
+            model[0].bias.copy_(b1[i])
+            model[2].weight.copy_(W2[i].unsqueeze(0))
+            model[2].bias.copy_(b2[i : i + 1])
 
 
 def find_optimal_threshold(
-    scores: list[float],
-    labels: list[float],
+    scores: list[float] | np.ndarray,
+    labels: list[float] | np.ndarray,
     inclusion_value: int = 0,
 ) -> float:
     """Find the score threshold that best separates good (1) from bad (0) examples.
 
-    Iterates over all candidate thresholds (each unique score value) and picks the
+    Considers every unique score value as a candidate threshold and picks the
     one that minimises a weighted combination of false-positive rate (FPR) and
     false-negative rate (FNR). The relative weight of FPR vs. FNR is governed by
-    ``inclusion_value``.
+    ``inclusion_value``.  When several candidates tie on cost the highest one
+    wins.
+
+    Runs in ``O(n log n)``: see :func:`find_optimal_thresholds`, which this
+    wraps for a single score vector and a single inclusion value.
 
     Args:
         scores: List of model output scores, one per example.
@@ -154,57 +456,89 @@ def find_optimal_threshold(
         The float threshold that achieves the lowest weighted cost.
         Defaults to 0.5 if the score list is empty.
     """
-    sorted_pairs = sorted(zip(scores, labels), reverse=True)
-    best_threshold = 0.5
-    best_cost = float("inf")
+    return float(find_optimal_thresholds(scores, labels, inclusion_value))
 
-    # Calculate weights based on inclusion
-    if inclusion_value >= 0:
-        fpr_weight = 1.0
-        fnr_weight = 2.0**inclusion_value
-    else:
-        fpr_weight = 2.0 ** (-inclusion_value)
-        fnr_weight = 1.0
 
-    for i in range(len(sorted_pairs)):
-        threshold = sorted_pairs[i][0]
+def find_optimal_thresholds(
+    scores: list[float] | np.ndarray,
+    labels: list[float] | np.ndarray,
+    inclusion_values: int | list[int] | np.ndarray = 0,
+) -> np.ndarray:
+    """Batched form of :func:`find_optimal_threshold`.
 
-        # Calculate FPR and FNR at this threshold
-        fp = 0  # false positives
-        fn = 0  # false negatives
-        tp = 0  # true positives
-        tn = 0  # true negatives
+    Scores are sorted once per vector and the false-positive / false-negative
+    counts for every candidate threshold are read off cumulative sums, so each
+    vector costs ``O(n log n)``.  Any number of inclusion weightings can then
+    be evaluated against the same counts.
 
-        for score, label in sorted_pairs:
-            predicted = 1 if score >= threshold else 0
-            if predicted == 1 and label == 0:
-                fp += 1
-            elif predicted == 0 and label == 1:
-                fn += 1
-            elif predicted == 1 and label == 1:
-                tp += 1
-            else:  # predicted == 0 and label == 0
-                tn += 1
-
-        # Calculate rates
-        total_positives = sum(1 for _, label in sorted_pairs if label == 1)
-        total_negatives = len(sorted_pairs) - total_positives
+    Args:
+        scores: Score vector of shape ``(n,)``, or a stack of score vectors of
+            shape ``(..., n)`` (e.g. one row per model).
+        labels: Binary labels (1.0 for good, 0.0 for bad), either shape
+            ``(n,)`` shared by every score vector or the same shape as
+            ``scores``.
+        inclusion_values: A single inclusion value, or a sequence of ``K``
+            values to evaluate in one call.
 
-        fpr = fp / total_negatives if total_negatives > 0 else 0
-        fnr = fn / total_positives if total_positives > 0 else 0
+    Returns:
+        An array of thresholds with shape ``scores.shape[:-1]`` for a single
+        inclusion value, or ``scores.shape[:-1] + (K,)`` for a sequence.
+        Entries are 0.5 when ``n`` is 0.
+    """
+    S = np.asarray(scores, dtype=np.float64)
+    L = np.broadcast_to(np.asarray(labels, dtype=np.float64), S.shape)
+    single = np.ndim(inclusion_values) == 0
+    inclusion = np.atleast_1d(np.asarray(inclusion_values, dtype=np.float64))
 
-        # Calculate weighted cost
-        cost = fpr_weight * fpr + fnr_weight * fnr
+    batch_shape = S.shape[:-1]
+    n = S.shape[-1] if S.ndim else 0
+    out_shape = batch_shape if single else batch_shape + (len(inclusion),)
+    if n == 0:
+        return np.full(out_shape, 0.5)
 
-        if cost < best_cost:
-            best_cost = cost
-            best_threshold = threshold
+    S2 = S.reshape(-1, n)
+    L2 = L.reshape(-1, n)
 
-    return best_threshold
+    # Calculate weights based on inclusion
+    fpr_weight = np.where(inclusion >= 0, 1.0, 2.0 ** (-inclusion))
+    fnr_weight = np.where(inclusion >= 0, 2.0**inclusion, 1.0)
+
+    # Sort each vector by descending score
+    order = np.argsort(-S2, axis=1, kind="stable")
+    s_sorted = np.take_along_axis(S2, order, axis=1)
+    l_sorted = np.take_along_axis(L2, order, axis=1)
+    cum_pos = np.cumsum(l_sorted == 1, axis=1)
+    cum_neg = np.cumsum(l_sorted == 0, axis=1)
+
+    # Predicting "good" for score >= threshold includes every tied score, so
+    # read the counts at the last position of each run of equal scores.
+    positions = np.arange(n)
+    last_of_run = np.ones_like(s_sorted, dtype=bool)
+    last_of_run[:, :-1] = s_sorted[:, :-1] != s_sorted[:, 1:]
+    run_end = np.where(last_of_run, positions, n)
+    run_end = np.minimum.accumulate(run_end[:, ::-1], axis=1)[:, ::-1]
+    tp = np.take_along_axis(cum_pos, run_end, axis=1)
+    fp = np.take_along_axis(cum_neg, run_end, axis=1)
+
+    total_positives = cum_pos[:, -1:]
+    total_negatives = n - total_positives
+    fn = total_positives - tp
+
+    # Calculate rates
+    fpr = np.where(total_negatives > 0, fp / np.maximum(total_negatives, 1), 0.0)
+    fnr = np.where(total_positives > 0, fn / np.maximum(total_positives, 1), 0.0)
+
+    # Weighted cost per (vector, weighting, candidate); argmin keeps the first
+    # (i.e. highest) threshold among equal costs.
+    cost = fpr_weight[None, :, None] * fpr[:, None, :] + fnr_weight[None, :, None] * fnr[:, None, :]
+    best = np.argmin(cost, axis=2)
+    thresholds = np.take_along_axis(s_sorted, best, axis=1)
+
+    return thresholds.reshape(out_shape)
 
 
 def calculate_cross_calibration_threshold(
-    X_list: list[np.ndarray],
+    X_list: list[np.ndarray] | np.ndarray,
     y_list: list[float],
     input_dim: int,
     inclusion_value: int = 0,
@@ -223,8 +557,11 @@ def calculate_cross_calibration_threshold(
         3. Train M2 on D2; find threshold t2 by evaluating M2 on D1.
         4. Return ``(t1 + t2) / 2``.
 
+    ``M1`` and ``M2`` are trained together by :func:`train_models`.
+
     Args:
-        X_list: List of embedding arrays (one per labelled example).
+        X_list: List of embedding arrays (one per labelled example), or an
+            ``(N, D)`` matrix with one row per labelled example.
         y_list: List of binary labels (1.0 for good, 0.0 for bad),
             aligned with ``X_list``.
         input_dim: Dimensionality of the embeddings.
@@ -237,43 +574,93 @@ def calculate_cross_calibration_threshold(
         A float threshold. Returns 0.5 if fewer than 4 examples are provided
         (insufficient data for cross-calibration).
     """
-    n = len(X_list)
-    if n < 4:
-        # Not enough data for cross-calibration
-        return 0.5
-
-    # Split data in half
-    mid = n // 2
-    _rng = rng if rng is not None else np.random
-    indices = _rng.permutation(n)
-    idx1 = indices[:mid]
-    idx2 = indices[mid:]
-
-    X_np = np.array(X_list)
-    y_np = np.array(y_list)
+    X_np = np.asarray(X_list, dtype=np.float32)
+    ((_, threshold),) = train_calibrated_models(
+        X_np, y_list, [np.arange(len(X_np))], input_dim, inclusion_value, rng=rng, train_final=False
+    )
+    return threshold
 
-    # Train M1 on D1
-    X1 = torch.tensor(X_np[idx1], dtype=torch.float32)
-    y1 = torch.tensor(y_np[idx1], dtype=torch.float32).unsqueeze(1)
-    M1 = train_model(X1, y1, input_dim, inclusion_value)
 
-    # Train M2 on D2
-    X2 = torch.tensor(X_np[idx2], dtype=torch.float32)
-    y2 = torch.tensor(y_np[idx2], dtype=torch.float32).unsqueeze(1)
-    M2 = train_model(X2, y2, input_dim, inclusion_value)
+def train_calibrated_models(
+    X: np.ndarray,
+    y: list[float] | np.ndarray,
+    subsets: Sequence[Sequence[int] | np.ndarray],
+    input_dim: int,
+    inclusion_value: int = 0,
+    rng: np.random.RandomState | None = None,
+    train_final: bool = True,
+) -> list[tuple[nn.Sequential | None, float]]:
+    """Cross-calibrate and train a final model for each of several training sets.
 
-    # Find t1: use M1 on D2
-    with torch.no_grad():
-        scores1_on_2 = M1(X2).squeeze(1).tolist()
-    t1 = find_optimal_threshold(scores1_on_2, y_np[idx2].tolist(), inclusion_value)
+    For every entry of *subsets* this performs exactly what
+    :func:`calculate_cross_calibration_threshold` followed by
+    :func:`train_model` would do, but all models for all subsets (two halves
+    plus the final model each) are trained together by :func:`train_models`.
+    Splits are drawn from *rng* in subset order and models are initialised in
+    the same order as the sequential code, so seeded runs stay reproducible.
 
-    # Find t2: use M2 on D1
-    with torch.no_grad():
-        scores2_on_1 = M2(X1).squeeze(1).tolist()
-    t2 = find_optimal_threshold(scores2_on_1, y_np[idx1].tolist(), inclusion_value)
+    Args:
+        X: ``(N, D)`` embedding matrix shared by every subset.
+        y: Binary label per row of *X* (1.0 for good, 0.0 for bad).
+        subsets: One ordered sequence of row indices into *X* per training set.
+        input_dim: Dimensionality of the embeddings.
+        inclusion_value: Integer in ``[-10, 10]`` controlling the FPR/FNR trade-off.
+        rng: Optional seeded RandomState for reproducible splits. Falls back
+            to the global ``np.random`` state when ``None``.
+        train_final: Also train a model on each full subset.  When ``False``
+            the returned models are ``None``.
 
-    # Return mean
-    return (t1 + t2) / 2.0
+    Returns:
+        One ``(model, threshold)`` tuple per subset.  The threshold is 0.5 for
+        subsets with fewer than 4 examples.
+    """
+    _rng = rng if rng is not None else np.random
+    X_np = np.asarray(X, dtype=np.float32)
+    y_np = np.asarray(y, dtype=np.float64)
+
+    # Plan every model first: (d1, d2) halves for cross-calibration and the
+    # final model, recorded as positions in the list of training sets.
+    training_sets: list[np.ndarray] = []
+    plan: list[tuple[tuple[int, np.ndarray, np.ndarray] | None, int | None]] = []
+    for subset in subsets:
+        subset = np.asarray(subset, dtype=np.intp)
+        halves = None
+        if len(subset) >= 4:
+            # Split data in half
+            mid = len(subset) // 2
+            indices = _rng.permutation(len(subset))
+            d1, d2 = subset[indices[:mid]], subset[indices[mid:]]
+            halves = (len(training_sets), d1, d2)
+            training_sets.extend([d1, d2])
+        final = None
+        if train_final:
+            final = len(training_sets)
+            training_sets.append(subset)
+        plan.append((halves, final))
+
+    X_t = torch.from_numpy(X_np)
+    models: list[nn.Sequential] = []
+    if training_sets:
+        masks = torch.zeros((len(training_sets), len(X_np)), dtype=torch.bool)
+        for i, rows in enumerate(training_sets):
+            masks[i, torch.from_numpy(rows)] = True
+        y_t = torch.from_numpy(y_np.astype(np.float32))
+        models = train_models(X_t, y_t, masks, input_dim, inclusion_value)
+
+    results: list[tuple[nn.Sequential | None, float]] = []
+    for halves, final in plan:
+        threshold = 0.5
+        if halves is not None:
+            i, d1, d2 = halves
+            with torch.no_grad():
+                # t1: M1 (trained on D1) evaluated on D2, and vice versa
+                scores1_on_2 = models[i](X_t[torch.from_numpy(d2)]).squeeze(1).numpy()
+                scores2_on_1 = models[i + 1](X_t[torch.from_numpy(d1)]).squeeze(1).numpy()
+            t1 = find_optimal_threshold(scores1_on_2, y_np[d2], inclusion_value)
+            t2 = find_optimal_threshold(scores2_on_1, y_np[d1], inclusion_value)
+            threshold = (t1 + t2) / 2.0
+        results.append((models[final] if final is not None else None, threshold))
+    return results
 
 
 def train_and_score(
@@ -281,6 +668,7 @@ def train_and_score(
     good_votes: dict[int, None],
     bad_votes: dict[int, None],
     inclusion_value: int = 0,
+    warm_start: bool = False,
 ) -> tuple[list[dict[str, Any]], float]:
     """Train a small MLP on voted clip embeddings and score every clip.
 
@@ -288,13 +676,22 @@ def train_and_score(
     trains a final model on all labelled data and scores every clip in
     ``clips_dict``.
 
+    With *warm_start* the final model is fine-tuned from the one trained by
+    the previous warm-started call on the same ``clips_dict`` (see
+    :func:`train_model_incremental`).  The two cross-calibration models are
+    always trained from scratch, since their random split changes per call.
+
     Args:
         clips_dict: Mapping of clip ID to clip data dict. Each value must contain
             an ``"embedding"`` key with a ``numpy.ndarray`` embedding vector.
+            A :class:`~vtsearch.utils.clip_store.ClipStore` is read through its
+            cached embedding matrix.
         good_votes: Dict whose keys are clip IDs labelled as good (values are ``None``).
         bad_votes: Dict whose keys are clip IDs labelled as bad (values are ``None``).
         inclusion_value: Integer in ``[-10, 10]`` passed to the training and
             threshold-finding functions to control the inclusion/exclusion bias.
+        warm_start: Reuse the previous call's final model and optimiser state
+            when the labels changed only slightly.
 
     Returns:
         A tuple ``(results, threshold)`` where:
@@ -303,35 +700,44 @@ def train_and_score(
           by score in descending order (highest confidence first).
         - ``threshold`` is the cross-calibrated decision boundary as a float.
     """
-    X_list = []
-    y_list = []
-    for cid in good_votes:
-        X_list.append(clips_dict[cid]["embedding"])
-        y_list.append(1.0)
-    for cid in bad_votes:
-        X_list.append(clips_dict[cid]["embedding"])
-        y_list.append(0.0)
-
-    X = torch.tensor(np.array(X_list), dtype=torch.float32)
-    y = torch.tensor(y_list, dtype=torch.float32).unsqueeze(1)
-
-    input_dim = X.shape[1]
-
-    # Calculate threshold using cross-calibration
-    threshold = calculate_cross_calibration_threshold(X_list, y_list, input_dim, inclusion_value)
-
-    # Train final model on all data
-    model = train_model(X, y, input_dim, inclusion_value)
-
-    # Score every clip
-    all_ids = sorted(clips_dict.keys())
-    all_embs = np.array([clips_dict[cid]["embedding"] for cid in all_ids])
-    X_all = torch.tensor(all_embs, dtype=torch.float32)
+    global _warm_start_key, _warm_start_state
+
+    labeled_ids = list(good_votes) + list(bad_votes)
+    y_list = [1.0] * len(good_votes) + [0.0] * len(bad_votes)
+    X_np = gather_embeddings(clips_dict, labeled_ids)
+
+    input_dim = X_np.shape[1]
+
+    if warm_start:
+        ((_, threshold),) = train_calibrated_models(
+            X_np, y_list, [np.arange(len(labeled_ids))], input_dim, inclusion_value, train_final=False
+        )
+
+        key = (id(clips_dict), getattr(clips_dict, "version", None))
+        with _warm_start_lock:
+            previous = _warm_start_state if _warm_start_key == key else None
+        y = torch.tensor(y_list, dtype=torch.float32).unsqueeze(1)
+        state = train_model_incremental(
+            torch.from_numpy(X_np), y, labeled_ids, input_dim, inclusion_value, previous=previous
+        )
+        with _warm_start_lock:
+            _warm_start_key, _warm_start_state = key, state
+        model = state.model
+    else:
+        # Cross-calibrate the threshold and train the final model on all data
+        # (all three models are trained in one batched pass)
+        ((model, threshold),) = train_calibrated_models(
+            X_np, y_list, [np.arange(len(labeled_ids))], input_dim, inclusion_value
+        )
+
+    # Score every clip straight from the columnar embedding matrix
+    all_ids, all_embs = embedding_matrix(clips_dict)
     with torch.no_grad():
-        scores = model(X_all).squeeze(1).tolist()
+        scores = model(torch.from_numpy(all_embs)).squeeze(1).numpy()
 
     # Sort by raw scores (full precision) so that tiny differences still
-    # affect ordering.  Round only for the JSON response values.
-    paired = sorted(zip(all_ids, scores), key=lambda x: x[1], reverse=True)
-    results = [{"id": cid, "score": round(s, 4)} for cid, s in paired]
+    # affect ordering; ties fall back to ascending clip ID.  Round only for
+    # the JSON response values.
+    order = np.lexsort((all_ids, -scores))
+    results = [{"id": int(all_ids[i]), "score": round(float(scores[i]), 4)} for i in order]
     return results, threshold
@@ -143,9 +143,8 @@ def _embed(media_type: str, p: Path):
 def _train_from_labels(raw: bytes, media_type_hint: str) -> dict[str, Any]:
     """Parse label JSON, embed referenced files, and train an MLP detector."""
     import numpy as np
-    import torch
 
-    from vtsearch.models import calculate_cross_calibration_threshold, train_model
+    from vtsearch.models import train_calibrated_models
     from vtsearch.utils import get_inclusion
 
     try:
@@ -209,12 +208,10 @@ def _train_from_labels(raw: bytes, media_type_hint: str) -> dict[str, Any]:
     if num_good == 0 or num_bad == 0:
         raise ValueError("Need at least one good and one bad labeled example")
 
-    X = torch.tensor(np.array(X_list), dtype=torch.float32)
-    y = torch.tensor(y_list, dtype=torch.float32).unsqueeze(1)
-    input_dim = X.shape[1]
+    X_np = np.asarray(X_list, dtype=np.float32)
+    input_dim = X_np.shape[1]
 
-    threshold = calculate_cross_calibration_threshold(X_list, y_list, input_dim, get_inclusion())
-    model = train_model(X, y, input_dim, get_inclusion())
+    ((model, threshold),) = train_calibrated_models(X_np, y_list, [np.arange(len(X_np))], input_dim, get_inclusion())
 
     state_dict = model.state_dict()
     weights = {}
@@ -0,0 +1,84 @@
+"""Route-side wiring of the background trainer and the response memo.
+
+Blueprints that change votes call :func:`notify_votes_changed`; the
+learned-sort and labelling routes look up finished results with
+:func:`current_training_result` and cache their responses with
+:func:`memoized`.  This is the only place that hands global state to
+:class:`~vtsearch.models.background.BackgroundTrainer`.
+
+Both are keyed on :func:`~vtsearch.utils.state.get_state_version` alone, so
+votes must change through the state helpers (``add_label_to_history``,
+``clear_votes``), which bump it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TypeVar
+
+from config import BACKGROUND_TRAINING, BACKGROUND_TRAINING_DEBOUNCE
+from vtsearch.models.background import BackgroundTrainer, TrainingResult, TrainingSnapshot
+from vtsearch.utils import bad_votes, clips, get_inclusion, get_state_version, good_votes, label_history
+from vtsearch.utils.memo import VersionedMemo
+
+_T = TypeVar("_T")
+
+# Route responses memoised per state version
+response_memo = VersionedMemo()
+
+
+def memoized(name: str, compute: Callable[[], _T], keep: Callable[[_T], bool] | None = None) -> _T:
+    """Return ``compute()``, memoised under *name* for the current state version.
+
+    Values for which ``keep(value)`` is false (answers built from a stale
+    background result) are returned without being memoised, so the next
+    request picks up the run that is still training.
+    """
+    version = get_state_version()
+    missing = object()
+    value = response_memo.get(name, version, missing)
+    if value is missing:
+        value = compute()
+        if keep is None or keep(value):
+            response_memo.put(name, version, value)
+    return value
+
+
+def _snapshot() -> TrainingSnapshot | None:
+    # Read the version first: if votes change while copying, the snapshot is
+    # tagged with an older version and simply never matches a newer request.
+    version = get_state_version()
+    inclusion = get_inclusion()
+    good, bad, history = dict(good_votes), dict(bad_votes), list(label_history)
+    if not good and not bad:
+        return None
+    return TrainingSnapshot(
+        key=version,
+        clips=clips,
+        good_votes=good,
+        bad_votes=bad,
+        label_history=history,
+        inclusion=inclusion,
+    )
+
+
+background_trainer = BackgroundTrainer(_snapshot, BACKGROUND_TRAINING_DEBOUNCE)
+
+
+def notify_votes_changed() -> None:
+    """Schedule a background retrain after votes, labels or inclusion changed."""
+    if BACKGROUND_TRAINING:
+        background_trainer.notify()
+
+
+def current_training_result() -> TrainingResult | None:
+    """Return the background result for the current state, without waiting.
+
+    While the run for the current state is scheduled or in flight this is
+    the previous run's result with ``stale`` set.  Returns ``None`` when no
+    run has finished or none is scheduled, in which case the caller computes
+    the answer itself.
+    """
+    if not BACKGROUND_TRAINING:
+        return None
+    return background_trainer.result_for(get_state_version())
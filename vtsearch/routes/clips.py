@@ -1,22 +1,103 @@
 """Blueprint for clip-related routes."""
 
-import io
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
-from flask import Blueprint, Response, jsonify, request, send_file
+from flask import Blueprint, Response, jsonify, request
 
 from vtsearch.media.base import MediaResponse
-from vtsearch.utils import add_label_to_history, bad_votes, clips, good_votes
+from vtsearch.routes.background import notify_votes_changed
+from vtsearch.utils import add_label_to_history, bad_votes, clip_media_bytes, clips, good_votes
 
 clips_bp = Blueprint("clips", __name__)
 
+# Media bodies are written out this many bytes at a time
+_MEDIA_CHUNK_BYTES = 1 << 20
 
-def _flask_response(mr: MediaResponse) -> Response:
+# Cache-Control for media URLs that carry the clip's MD5 (``?v=<md5>``):
+# such a URL always names the same bytes, so browsers may keep it for good.
+# Bare URLs are revalidated on every use (a cheap 304 via the ETag), since
+# the next dataset loaded may reuse the clip ID for different media.
+_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def _iter_chunks(view: memoryview) -> Iterator[bytes]:
+    for start in range(0, len(view), _MEDIA_CHUNK_BYTES):
+        yield view[start : start + _MEDIA_CHUNK_BYTES].tobytes()
+
+
+def _requested_span(length: int, etag: str | None) -> tuple[int, int] | None:
+    """Return the ``(start, stop)`` byte span asked for by the ``Range`` header.
+
+    Returns ``None`` to send the whole body: no (or an unsupported
+    multi-part) ``Range``, or an ``If-Range`` that does not match *etag*.
+
+    Raises:
+        ValueError: If the single requested range lies past the end of the media.
+    """
+    byte_range = request.range
+    if byte_range is None or byte_range.units != "bytes" or len(byte_range.ranges) != 1:
+        return None
+    if_range = request.if_range
+    if (if_range.etag is not None or if_range.date is not None) and (etag is None or if_range.etag != etag):
+        return None
+    span = byte_range.range_for_length(length)
+    if span is None:
+        raise ValueError("range not satisfiable")
+    return span
+
+
+def _send_media(data: bytes | memoryview, mimetype: str, download_name: str, etag: str | None = None) -> Response:
+    """Stream *data*, honouring ``Range``, ``If-Range`` and ``If-None-Match``.
+
+    The body is written a chunk at a time from a view of *data*, so media in
+    the store is never copied whole and a seek only reads the bytes it asks
+    for.  *etag* (the clip's content MD5) is sent as a strong ETag.
+
+    Returns:
+        A 200 response with the whole media, a 206 with the requested byte
+        range, a 304 when ``If-None-Match`` matches *etag*, or a 416 when the
+        range lies past the end.
+    """
+    view = memoryview(data)
+    length = view.nbytes
+    cacheable = etag is not None and request.args.get("v") == etag
+
+    response = Response(mimetype=mimetype, direct_passthrough=True)
+    response.accept_ranges = "bytes"
+    response.headers["Cache-Control"] = _IMMUTABLE_CACHE_CONTROL if cacheable else _REVALIDATE_CACHE_CONTROL
+    if etag is not None:
+        response.set_etag(etag)
+        if request.if_none_match.contains_weak(etag):
+            response.status_code = 304
+            return response
+    if download_name:
+        response.headers.set("Content-Disposition", "inline", filename=download_name)
+
+    try:
+        span = _requested_span(length, etag)
+    except ValueError:
+        response.status_code = 416
+        response.headers["Content-Range"] = f"bytes */{length}"
+        return response
+    if span is not None:
+        start, stop = span
+        view = view[start:stop]
+        response.status_code = 206
+        response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{length}"
+
+    response.response = _iter_chunks(view)
+    response.content_length = view.nbytes
+    return response
+
+
+def _flask_response(mr: MediaResponse, etag: str | None = None) -> Response:
     """Convert a framework-agnostic :class:`MediaResponse` to a Flask response."""
     if isinstance(mr.data, dict):
         return jsonify(mr.data)
-    return send_file(io.BytesIO(mr.data), mimetype=mr.mimetype, download_name=mr.download_name)
+    return _send_media(mr.data, mr.mimetype, mr.download_name, etag)
 
 
 @clips_bp.route("/api/clips")
@@ -24,7 +105,7 @@ def list_clips() -> Response:
     """Return metadata for all loaded clips as a JSON array.
 
     Excludes heavyweight fields (``embedding``, ``wav_bytes``, ``video_bytes``,
-    ``image_bytes``, ``text_content``) from the response. Only includes the
+    ``image_bytes``, ``media_ref``, ``text_content``) from the response. Only includes the
     ``frequency`` field when it is present (synthetic clips only).
 
     Returns:
@@ -54,6 +135,9 @@ def list_clips() -> Response:
 def clip_audio(clip_id: int) -> tuple[Response, int] | Response:
     """Stream the WAV audio bytes for a single clip.
 
+    Honours ``Range`` (HTTP 206) and ``If-None-Match`` (HTTP 304) against
+    the clip's MD5 ETag; see :func:`_send_media`.
+
     Args:
         clip_id: Integer clip ID from the URL path.
 
@@ -64,17 +148,16 @@ def clip_audio(clip_id: int) -> tuple[Response, int] | Response:
     c = clips.get(clip_id)
     if not c:
         return jsonify({"error": "not found"}), 404
-    return send_file(
-        io.BytesIO(c["wav_bytes"]),
-        mimetype="audio/wav",
-        download_name=f"clip_{clip_id}.wav",
-    )
+    return _send_media(clip_media_bytes(c) or b"", "audio/wav", f"clip_{clip_id}.wav", c.get("md5"))
 
 
 @clips_bp.route("/api/clips/<int:clip_id>/video")
 def clip_video(clip_id: int) -> tuple[Response, int] | Response:
     """Stream the video bytes for a single video clip.
 
+    Honours ``Range`` (HTTP 206) and ``If-None-Match`` (HTTP 304) against
+    the clip's MD5 ETag; see :func:`_send_media`.
+
     Determines the MIME type from the clip's filename extension, defaulting to
     ``video/mp4`` for unrecognised extensions.
 
@@ -89,7 +172,8 @@ def clip_video(clip_id: int) -> tuple[Response, int] | Response:
     c = clips.get(clip_id)
     if not c:
         return jsonify({"error": "not found"}), 404
-    if c.get("type") != "video" or not c.get("video_bytes"):
+    data = clip_media_bytes(c)
+    if c.get("type") != "video" or not data:
         return jsonify({"error": "not a video clip"}), 400
 
     # Determine mimetype based on filename extension
@@ -104,17 +188,16 @@ def clip_video(clip_id: int) -> tuple[Response, int] | Response:
         mimetype = "video/mp4"
 
     ext = Path(filename).suffix if filename else ".mp4"
-    return send_file(
-        io.BytesIO(c["video_bytes"]),
-        mimetype=mimetype,
-        download_name=f"clip_{clip_id}{ext}",
-    )
+    return _send_media(data, mimetype, f"clip_{clip_id}{ext}", c.get("md5"))
 
 
 @clips_bp.route("/api/clips/<int:clip_id>/image")
 def clip_image(clip_id: int) -> tuple[Response, int] | Response:
     """Stream the image bytes for a single image clip.
 
+    Honours ``Range`` (HTTP 206) and ``If-None-Match`` (HTTP 304) against
+    the clip's MD5 ETag; see :func:`_send_media`.
+
     Determines the MIME type from the clip's filename extension, defaulting to
     ``image/jpeg`` for unrecognised extensions.
 
@@ -129,7 +212,8 @@ def clip_image(clip_id: int) -> tuple[Response, int] | Response:
     c = clips.get(clip_id)
     if not c:
         return jsonify({"error": "not found"}), 404
-    if c.get("type") != "image" or not c.get("image_bytes"):
+    data = clip_media_bytes(c)
+    if c.get("type") != "image" or not data:
         return jsonify({"error": "not an image clip"}), 400
 
     # Determine mimetype based on filename extension
@@ -145,11 +229,7 @@ def clip_image(clip_id: int) -> tuple[Response, int] | Response:
     else:
         mimetype = "image/jpeg"
 
-    return send_file(
-        io.BytesIO(c["image_bytes"]),
-        mimetype=mimetype,
-        download_name=f"clip_{clip_id}.jpg",
-    )
+    return _send_media(data, mimetype, f"clip_{clip_id}.jpg", c.get("md5"))
 
 
 @clips_bp.route("/api/clips/<int:clip_id>/paragraph")
@@ -189,6 +269,9 @@ def clip_media(clip_id: int) -> tuple[Response, int] | Response:
     :meth:`~vtsearch.media.base.MediaType.clip_response` method.  This
     endpoint works for all current and future media types without modification.
 
+    Honours ``Range`` (HTTP 206) and ``If-None-Match`` (HTTP 304) against
+    the clip's MD5 ETag; see :func:`_send_media`.
+
     Args:
         clip_id: Integer clip ID from the URL path.
 
@@ -208,7 +291,7 @@ def clip_media(clip_id: int) -> tuple[Response, int] | Response:
     except KeyError:
         return jsonify({"error": f"unsupported media type: {c.get('type')}"}), 400
 
-    return _flask_response(mt.clip_response(c))
+    return _flask_response(mt.clip_response(c), c.get("md5"))
 
 
 @clips_bp.route("/api/clips/<int:clip_id>/vote", methods=["POST"])
@@ -269,4 +352,5 @@ def vote_clip(clip_id: int) -> tuple[Response, int] | Response:
             bad_votes[clip_id] = None
             add_label_to_history(clip_id, "bad")
 
+    notify_votes_changed()
     return jsonify({"ok": True})
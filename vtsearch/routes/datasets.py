@@ -1,17 +1,15 @@
 """Blueprint for dataset management routes."""
 
-import io
 import threading
 from pathlib import Path
 
-from flask import Blueprint, jsonify, request, send_file
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 
 from config import (
     CALTECH101_DOWNLOAD_SIZE_MB,
     CIFAR10_DOWNLOAD_SIZE_MB,
     CLIPS_PER_CATEGORY,
     CLIPS_PER_VIDEO_CATEGORY,
-    EMBEDDINGS_DIR,
     ESC50_DOWNLOAD_SIZE_MB,
     IMAGES_PER_CALTECH101_CATEGORY,
     IMAGES_PER_CIFAR10_CATEGORY,
@@ -19,15 +17,28 @@ from config import (
     TEXTS_PER_CATEGORY,
     VIDEO_DIR,
 )
-from vtsearch.datasets import DEMO_DATASETS, export_dataset_to_file, get_importer, list_importers, load_demo_dataset
-from vtsearch.models.progress import clear_progress_cache
+from vtsearch.datasets import (
+    COMPRESSION_SUFFIXES,
+    DATASET_SUFFIX,
+    DEMO_DATASETS,
+    demo_cache_file,
+    get_importer,
+    iter_dataset,
+    list_importers,
+    load_demo_dataset,
+)
+from vtsearch.media import model_report
+from vtsearch.media.onnx_backend import backend_report
+from vtsearch.models.embedding_cache import embedding_cache_stats
+from vtsearch.routes.background import background_trainer
 from vtsearch.utils import (
     bad_votes,
+    clear_votes,
     clips,
     get_dataset_creation_info,
     get_progress,
     good_votes,
-    label_history,
+    media_store_stats,
     set_dataset_creation_info,
     update_progress,
 )
@@ -44,9 +55,9 @@ def _load_embedder_for_clips() -> None:
     """Eagerly load the embedder for the current dataset's media type.
 
     Called right after a dataset finishes loading so the first text sort
-    doesn't have to wait for the model download.  ``load_models()`` is
-    idempotent, so this is a no-op when the model is already warm (e.g.
-    after a folder import that already called ``embed_media()``).
+    doesn't have to wait for the model download.  ``ensure_models()`` is
+    a no-op when the model is already warm (e.g. after a folder import
+    that already called ``embed_media()``), apart from marking it used.
     """
     if not clips:
         return
@@ -57,18 +68,16 @@ def _load_embedder_for_clips() -> None:
         mt = media_get(media_type)
     except KeyError:
         return
-    mt.load_models()
+    mt.ensure_models()
     update_progress("idle", "Ready")
 
 
 def clear_dataset():
     """Clear the current dataset."""
     clips.clear()
-    good_votes.clear()
-    bad_votes.clear()
-    label_history.clear()
+    clear_votes()
+    background_trainer.clear()
     set_dataset_creation_info(None)
-    clear_progress_cache()
 
 
 def _set_clip_origins(clips_dict: dict, origin: dict) -> None:
@@ -130,6 +139,30 @@ def dataset_progress():
     return jsonify(get_progress())
 
 
+@datasets_bp.route("/api/dataset/embedding-cache")
+def embedding_cache_status():
+    """Return size and hit-rate statistics of the persistent embedding cache."""
+    return jsonify(embedding_cache_stats())
+
+
+@datasets_bp.route("/api/dataset/media-store")
+def media_store_status():
+    """Return the blob count and size of the on-disk media store."""
+    return jsonify(media_store_stats())
+
+
+@datasets_bp.route("/api/dataset/embedding-backend")
+def embedding_backend_status():
+    """Return the inference backend and, per encoder, whether it runs on ONNX and its parity with torch."""
+    return jsonify(backend_report())
+
+
+@datasets_bp.route("/api/dataset/models")
+def embedding_models_status():
+    """Return which embedding models are loaded, their size and idle time, and the memory budget."""
+    return jsonify(model_report())
+
+
 # ---------------------------------------------------------------------------
 # Importer discovery
 # ---------------------------------------------------------------------------
@@ -216,13 +249,13 @@ def demo_dataset_list():
     """List available demo datasets."""
     demos = []
     for name, dataset_info in DEMO_DATASETS.items():
-        pkl_file = EMBEDDINGS_DIR / f"{name}.pkl"
-        is_ready = pkl_file.exists()
+        cache_file = demo_cache_file(name)
+        is_ready = cache_file is not None
 
         media_type = dataset_info.get("media_type", "audio")
 
-        # Some pkl files reference external media directories rather than
-        # inlining bytes.  If that directory has been removed since the pkl
+        # Some cache files reference external media directories rather than
+        # inlining bytes.  If that directory has been removed since the cache
         # was created, the dataset can't actually be loaded — don't show it
         # as ready.  Each demo dataset declares its own required_folder so
         # this check stays generic as new demo datasets are added.
@@ -249,8 +282,8 @@ def demo_dataset_list():
 
         # Calculate download size
         if is_ready:
-            # If ready, show the actual .pkl file size
-            download_size_mb = pkl_file.stat().st_size / (1024 * 1024)
+            # If ready, show the actual cache file size
+            download_size_mb = cache_file.stat().st_size / (1024 * 1024)
         else:
             # If not ready, estimate download size
             if media_type == "video":
@@ -387,20 +420,35 @@ def load_dataset_folder():
 
 @datasets_bp.route("/api/dataset/export")
 def export_dataset():
-    """Export the current dataset to a pickle file."""
+    """Stream the current dataset as a ``.vtds`` file.
+
+    Query parameters: ``media=0`` for an embeddings-only file and
+    ``compress=zstd`` for a ``.vtds.zst``.  The file is generated a clip at
+    a time while the response is sent, so the export is never held in
+    memory whole.
+    """
     if not clips:
         return jsonify({"error": "No dataset loaded"}), 400
 
+    include_media = request.args.get("media", "1") not in ("0", "false")
+    compress = request.args.get("compress") or None
     try:
-        dataset_bytes = export_dataset_to_file(clips, get_dataset_creation_info())
-        return send_file(
-            io.BytesIO(dataset_bytes),
-            mimetype="application/octet-stream",
-            download_name="vtsearch_dataset.pkl",
-            as_attachment=True,
+        chunks = iter_dataset(
+            list(clips.values()),
+            get_dataset_creation_info(),
+            include_media=include_media,
+            compress=compress,
         )
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    response = Response(
+        stream_with_context(chunks),
+        mimetype="application/zstd" if compress else "application/octet-stream",
+    )
+    download_name = f"vtsearch_dataset{DATASET_SUFFIX}{COMPRESSION_SUFFIXES.get(compress, '')}"
+    response.headers.set("Content-Disposition", "attachment", filename=download_name)
+    return response
 
 
 @datasets_bp.route("/api/dataset/clear", methods=["POST"])
@@ -9,17 +9,18 @@ import torch.nn as nn
 from flask import Blueprint, jsonify, request
 
 from vtsearch.models import (
-    calculate_cross_calibration_threshold,
     embed_audio_file,
     embed_image_file,
     embed_paragraph_file,
     embed_video_file,
-    train_model,
+    train_calibrated_models,
 )
 from vtsearch.utils import (
     add_favorite_detector,
     add_favorite_extractor,
     clips,
+    embedding_matrix,
+    gather_embeddings,
     get_favorite_detectors,
     get_favorite_detectors_by_media,
     get_favorite_extractors,
@@ -48,25 +49,13 @@ def export_detector():
         return jsonify({"error": "need at least one good and one bad vote"}), 400
 
     # Train the model
-    X_list = []
-    y_list = []
-    for cid in good_votes:
-        X_list.append(clips[cid]["embedding"])
-        y_list.append(1.0)
-    for cid in bad_votes:
-        X_list.append(clips[cid]["embedding"])
-        y_list.append(0.0)
+    X_np = gather_embeddings(clips, list(good_votes) + list(bad_votes))
+    y_list = [1.0] * len(good_votes) + [0.0] * len(bad_votes)
 
-    X = torch.tensor(np.array(X_list), dtype=torch.float32)
-    y = torch.tensor(y_list, dtype=torch.float32).unsqueeze(1)
+    input_dim = X_np.shape[1]
 
-    input_dim = X.shape[1]
-
-    # Calculate threshold using cross-calibration with inclusion
-    threshold = calculate_cross_calibration_threshold(X_list, y_list, input_dim, get_inclusion())
-
-    # Train final model on all data with inclusion
-    model = train_model(X, y, input_dim, get_inclusion())
+    # Cross-calibrate the threshold and train the final model on all data with inclusion
+    ((model, threshold),) = train_calibrated_models(X_np, y_list, [np.arange(len(X_np))], input_dim, get_inclusion())
 
     # Extract model weights
     state_dict = model.state_dict()
@@ -113,14 +102,13 @@ def detector_sort():
     model.eval()
 
     # Score every clip
-    all_ids = sorted(clips.keys())
-    all_embs = np.array([clips[cid]["embedding"] for cid in all_ids])
-    X_all = torch.tensor(all_embs, dtype=torch.float32)
+    all_ids, all_embs = embedding_matrix(clips)
     with torch.no_grad():
-        scores = model(X_all).squeeze(1).tolist()
+        scores = model(torch.from_numpy(all_embs)).squeeze(1).numpy().astype(np.float64)
 
-    results = [{"id": cid, "score": round(s, 4)} for cid, s in zip(all_ids, scores)]
-    results.sort(key=lambda x: x["score"], reverse=True)
+    # Order by rounded score (descending), ties by ascending clip ID
+    order = np.lexsort((all_ids, -np.round(scores, 4)))
+    results = [{"id": int(all_ids[i]), "score": round(float(scores[i]), 4)} for i in order]
     return jsonify({"results": results, "threshold": round(threshold, 4)})
 
 
@@ -347,12 +335,12 @@ def import_detector_labels():
                 400,
             )
 
-        X = torch.tensor(np.array(X_list), dtype=torch.float32)
-        y = torch.tensor(y_list, dtype=torch.float32).unsqueeze(1)
-        input_dim = X.shape[1]
+        X_np = np.asarray(X_list, dtype=np.float32)
+        input_dim = X_np.shape[1]
 
-        threshold = calculate_cross_calibration_threshold(X_list, y_list, input_dim, get_inclusion())
-        model = train_model(X, y, input_dim, get_inclusion())
+        ((model, threshold),) = train_calibrated_models(
+            X_np, y_list, [np.arange(len(X_np))], input_dim, get_inclusion()
+        )
 
         state_dict = model.state_dict()
         weights = {}
@@ -397,9 +385,8 @@ def auto_detect():
 
     # Run each detector and collect positive hits
     results = {}
-    all_ids = sorted(clips.keys())
-    all_embs = np.array([clips[cid]["embedding"] for cid in all_ids])
-    X_all = torch.tensor(all_embs, dtype=torch.float32)
+    all_ids, all_embs = embedding_matrix(clips)
+    X_all = torch.from_numpy(all_embs)
 
     for detector_name, detector_data in detectors.items():
         weights = detector_data["weights"]
@@ -424,21 +411,24 @@ def auto_detect():
 
         # Score all clips
         with torch.no_grad():
-            scores = model(X_all).squeeze(1).tolist()
+            scores = model(X_all).squeeze(1).numpy().astype(np.float64)
 
-        # Collect positive hits (score >= threshold)
+        # Collect positive hits (score >= threshold) in ascending ID order
+        hit_rows = np.flatnonzero(scores >= threshold)
+        hit_rows = hit_rows[np.argsort(all_ids[hit_rows], kind="stable")]
         positive_hits = []
-        for cid, score in zip(all_ids, scores):
-            if score >= threshold:
-                clip_info = clips[cid].copy()
-                # Don't include embedding or raw media in response
-                clip_info.pop("embedding", None)
-                clip_info.pop("wav_bytes", None)
-                clip_info.pop("video_bytes", None)
-                clip_info.pop("image_bytes", None)
-                clip_info.pop("text_content", None)
-                clip_info["score"] = round(score, 4)
-                positive_hits.append(clip_info)
+        for row in hit_rows:
+            cid, score = int(all_ids[row]), float(scores[row])
+            clip_info = clips[cid].copy()
+            # Don't include embedding or raw media in response
+            clip_info.pop("embedding", None)
+            clip_info.pop("wav_bytes", None)
+            clip_info.pop("video_bytes", None)
+            clip_info.pop("image_bytes", None)
+            clip_info.pop("media_ref", None)
+            clip_info.pop("text_content", None)
+            clip_info["score"] = round(score, 4)
+            positive_hits.append(clip_info)
 
         # Sort by score descending
         positive_hits.sort(key=lambda x: x["score"], reverse=True)
@@ -589,7 +579,7 @@ def run_extract():
             clip_info = {
                 k: v
                 for k, v in clip.items()
-                if k not in ("embedding", "wav_bytes", "video_bytes", "image_bytes", "text_content")
+                if k not in ("embedding", "wav_bytes", "video_bytes", "image_bytes", "media_ref", "text_content")
             }
             clip_info["extractions"] = extractions
             results.append(clip_info)
@@ -631,7 +621,7 @@ def auto_extract():
                 clip_info = {
                     k: v
                     for k, v in clip.items()
-                    if k not in ("embedding", "wav_bytes", "video_bytes", "image_bytes", "text_content")
+                    if k not in ("embedding", "wav_bytes", "video_bytes", "image_bytes", "media_ref", "text_content")
                 }
                 clip_info["extractions"] = extractions
                 ext_results.append(clip_info)
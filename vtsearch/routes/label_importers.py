@@ -35,6 +35,7 @@ from __future__ import annotations
 from flask import Blueprint, jsonify, request
 
 from vtsearch.labels.importers import get_label_importer, list_label_importers
+from vtsearch.routes.background import notify_votes_changed
 from vtsearch.utils import (
     add_label_to_history,
     bad_votes,
@@ -81,6 +82,8 @@ def _apply_labels(
                 add_label_to_history(cid, "bad")
         applied += 1
 
+    if applied:
+        notify_votes_changed()
     return applied, skipped
 
 
@@ -10,20 +10,24 @@ from flask import Blueprint, jsonify, request
 from config import DATA_DIR
 from vtsearch.models import (
     analyze_labeling_progress,
-    calculate_cross_calibration_threshold,
     calculate_gmm_threshold,
     compute_labeling_status,
     embed_audio_file,
     embed_text_query,
     get_clap_model,
+    query_cache_stats,
+    similarity_cache_stats,
+    similarity_sort,
     train_and_score,
-    train_model,
+    train_calibrated_models,
 )
+from vtsearch.routes.background import current_training_result, memoized, notify_votes_changed
 from vtsearch.utils import (
     add_label_to_history,
     bad_votes,
     build_clip_lookup,
     clips,
+    embedding_matrix,
     get_dataset_creation_info,
     get_inclusion,
     get_sort_progress,
@@ -37,12 +41,35 @@ from vtsearch.utils import (
 sorting_bp = Blueprint("sorting", __name__)
 
 
+def _parse_top_k(value) -> tuple[int | None, str | None]:
+    """Parse the optional ``top_k`` request parameter.
+
+    Returns ``(top_k, error)``; ``top_k`` is ``None`` when the parameter is
+    absent, meaning every clip is returned.
+    """
+    if value is None or value == "":
+        return None, None
+    try:
+        top_k = int(value)
+    except (TypeError, ValueError):
+        return None, "top_k must be a positive integer"
+    if isinstance(value, bool) or top_k <= 0:
+        return None, "top_k must be a positive integer"
+    return top_k, None
+
+
 @sorting_bp.route("/api/sort/progress")
 def sort_progress():
     """Return the current progress of a text sort operation."""
     return jsonify(get_sort_progress())
 
 
+@sorting_bp.route("/api/sort/cache")
+def sort_cache_status():
+    """Return hit/miss statistics of the text-query embedding and ranking caches."""
+    return jsonify({"queries": query_cache_stats(), "rankings": similarity_cache_stats()})
+
+
 @sorting_bp.route("/api/sort", methods=["POST"])
 def sort_clips():
     """Return clips sorted by cosine similarity to a text query."""
@@ -69,8 +96,13 @@ def sort_clips():
 
     media_type = next(iter(clips.values())).get("type", "audio")
 
-    # Total steps: 1 (embed) + len(clips) (similarities) + 1 (threshold)
-    total_steps = 1 + len(clips) + 1
+    top_k, top_k_error = _parse_top_k(data.get("top_k"))
+    if top_k_error:
+        update_sort_progress("idle")
+        return jsonify({"error": top_k_error}), 400
+
+    # Total steps: 1 (embed) + 1 (similarities) + 1 (threshold)
+    total_steps = 3
 
     # Check if the embedder needs loading (first use of this media type)
     from vtsearch.media import get as media_get
@@ -95,26 +127,12 @@ def sort_clips():
         )
 
     update_sort_progress("sorting", "Computing similarities…", 1, total_steps)
-
-    results = []
-    scores = []
-    for i, (clip_id, clip) in enumerate(clips.items()):
-        media_vec = clip["embedding"]
-        norm_product = np.linalg.norm(media_vec) * np.linalg.norm(text_vec)
-        if norm_product == 0:
-            similarity = 0.0
-        else:
-            similarity = float(np.dot(media_vec, text_vec) / norm_product)
-        results.append({"id": clip_id, "similarity": round(similarity, 4)})
-        scores.append(similarity)
-        if (i + 1) % 50 == 0 or i + 1 == len(clips):
-            update_sort_progress("sorting", "Computing similarities…", 1 + i + 1, total_steps)
+    results, scores = similarity_sort(clips, text_vec, top_k)
 
     # Calculate GMM-based threshold
     update_sort_progress("sorting", "Calculating threshold…", total_steps - 1, total_steps)
     threshold = calculate_gmm_threshold(scores)
 
-    results.sort(key=lambda x: x["similarity"], reverse=True)
     update_sort_progress("idle")
     return jsonify({"results": results, "threshold": round(threshold, 4)})
 
@@ -124,8 +142,17 @@ def learned_sort():
     """Train MLP on voted clips, return all clips sorted by predicted score."""
     if not good_votes or not bad_votes:
         return jsonify({"error": "need at least one good and one bad vote"}), 400
-    results, threshold = train_and_score(clips, good_votes, bad_votes, get_inclusion())
-    return jsonify({"results": results, "threshold": round(threshold, 4)})
+    results, threshold, stale = memoized("learned-sort", _learned_sort_results, keep=lambda value: not value[2])
+    return jsonify({"results": results, "threshold": round(threshold, 4), "stale": stale})
+
+
+def _learned_sort_results() -> tuple[list[dict], float, bool]:
+    # Serve the model trained in the background after the last vote or, while
+    # that run is still training, the one before it
+    finished = current_training_result()
+    if finished is not None and finished.results is not None:
+        return finished.results, finished.threshold, finished.stale
+    return (*train_and_score(clips, good_votes, bad_votes, get_inclusion(), warm_start=True), False)
 
 
 @sorting_bp.route("/api/votes")
@@ -195,6 +222,8 @@ def import_labels():
                 add_label_to_history(cid, "bad")
         applied += 1
 
+    if applied:
+        notify_votes_changed()
     return jsonify({"applied": applied, "skipped": skipped})
 
 
@@ -218,7 +247,9 @@ def set_inclusion_route():
 
     # Clamp to -10 to +10 range
     new_inclusion = int(max(-10, min(10, new_inclusion)))
-    set_inclusion(new_inclusion)
+    if new_inclusion != get_inclusion():
+        set_inclusion(new_inclusion)
+        notify_votes_changed()
 
     return jsonify({"inclusion": get_inclusion()})
 
@@ -233,6 +264,10 @@ def example_sort():
     if not file.filename:
         return jsonify({"error": "No file selected"}), 400
 
+    top_k, top_k_error = _parse_top_k(request.form.get("top_k"))
+    if top_k_error:
+        return jsonify({"error": top_k_error}), 400
+
     clap_model, clap_processor = get_clap_model()
     if clap_model is None or clap_processor is None:
         return jsonify({"error": "CLAP model not loaded"}), 500
@@ -253,22 +288,11 @@ def example_sort():
             return jsonify({"error": "Failed to embed audio file"}), 500
 
         # Calculate cosine similarity with all clips
-        results = []
-        scores = []
-        for clip_id, clip in clips.items():
-            audio_vec = clip["embedding"]
-            norm_product = np.linalg.norm(audio_vec) * np.linalg.norm(example_embedding)
-            if norm_product == 0:
-                similarity = 0.0
-            else:
-                similarity = float(np.dot(audio_vec, example_embedding) / norm_product)
-            results.append({"id": clip_id, "similarity": round(similarity, 4)})
-            scores.append(similarity)
+        results, scores = similarity_sort(clips, example_embedding, top_k)
 
         # Calculate GMM-based threshold
         threshold = calculate_gmm_threshold(scores)
 
-        results.sort(key=lambda x: x["similarity"], reverse=True)
         return jsonify({"results": results, "threshold": round(threshold, 4)})
 
     except Exception as e:
@@ -353,27 +377,22 @@ def label_file_sort():
             )
 
         # Train MLP using the same approach as learned sort
-        X = torch.tensor(np.array(X_list), dtype=torch.float32)
-        y = torch.tensor(y_list, dtype=torch.float32).unsqueeze(1)
-
-        input_dim = X.shape[1]
+        X_np = np.asarray(X_list, dtype=np.float32)
+        input_dim = X_np.shape[1]
 
-        # Calculate threshold using cross-calibration
-        threshold = calculate_cross_calibration_threshold(X_list, y_list, input_dim, get_inclusion())
-
-        # Train final model on all data
-        model = train_model(X, y, input_dim, get_inclusion())
+        # Cross-calibrate the threshold and train the final model on all data
+        ((model, threshold),) = train_calibrated_models(
+            X_np, y_list, [np.arange(len(X_np))], input_dim, get_inclusion()
+        )
 
         # Score every clip in the dataset
-        all_ids = sorted(clips.keys())
-        all_embs = np.array([clips[cid]["embedding"] for cid in all_ids])
-        X_all = torch.tensor(all_embs, dtype=torch.float32)
+        all_ids, all_embs = embedding_matrix(clips)
         with torch.no_grad():
-            scores = model(X_all).squeeze(1).tolist()
+            scores = model(torch.from_numpy(all_embs)).squeeze(1).numpy()
 
         # Sort by raw scores (full precision) before rounding for display.
-        paired = sorted(zip(all_ids, scores), key=lambda x: x[1], reverse=True)
-        results = [{"id": cid, "score": round(s, 4)} for cid, s in paired]
+        order = np.lexsort((all_ids, -scores))
+        results = [{"id": int(all_ids[i]), "score": round(float(scores[i]), 4)} for i in order]
 
         return jsonify(
             {
@@ -398,7 +417,10 @@ def labeling_progress():
         return jsonify({"error": "no label history available"}), 400
 
     try:
-        analysis = analyze_labeling_progress(clips, label_history, good_votes, bad_votes, get_inclusion())
+        analysis = memoized(
+            "labeling-progress",
+            lambda: analyze_labeling_progress(clips, label_history, good_votes, bad_votes, get_inclusion()),
+        )
         return jsonify(analysis)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -413,7 +435,18 @@ def labeling_status_indicator():
     Green  – minimum counts met and error cost has leveled off (safe to stop).
     """
     try:
-        status = compute_labeling_status(clips, label_history, good_votes, bad_votes, get_inclusion())
+        status = memoized("labeling-status", _labeling_status, keep=lambda value: not value.get("stale"))
         return jsonify(status)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+def _labeling_status() -> dict:
+    finished = current_training_result()
+    if finished is None:
+        return compute_labeling_status(clips, label_history, good_votes, bad_votes, get_inclusion())
+    if not finished.stale:
+        return finished.status
+    # The trend comes from the previous run; the counts are always current
+    good, bad = len(good_votes), len(bad_votes)
+    return {**finished.status, "good_count": good, "bad_count": bad, "total_count": good + bad, "stale": True}
@@ -1,5 +1,21 @@
 """Utility modules for progress tracking and state management."""
 
+from vtsearch.utils.clip_record import CLIP_FIELDS, ClipRecord
+from vtsearch.utils.clip_store import ClipStore, embedding_matrix, gather_embeddings
+from vtsearch.utils.media_store import (
+    MediaRef,
+    MediaStore,
+    attach_clip_file,
+    attach_clip_media,
+    clip_media_bytes,
+    get_media_store,
+    inline_media,
+    media_store_stats,
+    set_media_store,
+    store_clip_media,
+    store_file_media,
+    temporary_media_store,
+)
 from vtsearch.utils.progress import get_progress, get_sort_progress, update_progress, update_sort_progress
 from vtsearch.utils.state import (
     add_favorite_detector,
@@ -21,6 +37,7 @@ from vtsearch.utils.state import (
     get_favorite_extractors,
     get_favorite_extractors_by_media,
     get_inclusion,
+    get_state_version,
     good_votes,
     inclusion,
     label_history,
@@ -40,6 +57,25 @@ __all__ = [
     "get_progress",
     "update_sort_progress",
     "get_sort_progress",
+    # Clip store
+    "ClipStore",
+    "ClipRecord",
+    "CLIP_FIELDS",
+    "embedding_matrix",
+    "gather_embeddings",
+    # Media store
+    "MediaRef",
+    "MediaStore",
+    "clip_media_bytes",
+    "inline_media",
+    "store_clip_media",
+    "store_file_media",
+    "temporary_media_store",
+    "attach_clip_media",
+    "attach_clip_file",
+    "get_media_store",
+    "set_media_store",
+    "media_store_stats",
     # State
     "clips",
     "good_votes",
@@ -55,6 +91,7 @@ __all__ = [
     "get_inclusion",
     "set_inclusion",
     "add_label_to_history",
+    "get_state_version",
     "set_dataset_creation_info",
     "get_dataset_creation_info",
     "add_favorite_detector",
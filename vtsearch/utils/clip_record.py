@@ -0,0 +1,157 @@
+"""Compact, dict-compatible clip records.
+
+A clip used to be a plain ``dict`` of about 15 keys, which costs several
+hundred bytes of hash table per clip before counting any values.
+:class:`ClipRecord` keeps the standard clip keys (:data:`CLIP_FIELDS`) in
+``__slots__`` instead, and any other key in a small per-record dict that
+is only created when needed.  It implements the full
+:class:`~collections.abc.MutableMapping` interface, so routes, processors
+and plugins keep using ``clip["md5"]``, ``clip.get("origin")``,
+``"width" in clip``, ``clip.items()`` and ``{**clip}`` unchanged.  A slot
+that was never set reads as a missing key, exactly as with a dict.
+
+``"type"`` and ``"category"`` strings are interned on assignment, so a
+million clips share a handful of string objects.
+
+:class:`~vtsearch.utils.clip_store.ClipStore` converts plain dicts to
+records when they are stored (and shares identical ``"origin"`` dicts
+between them), so loaders keep building ordinary dicts.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
+from typing import Any
+
+#: Clip keys stored in slots; any other key goes to the record's extra dict.
+CLIP_FIELDS = (
+    "id",
+    "type",
+    "duration",
+    "file_size",
+    "md5",
+    "embedding",
+    "filename",
+    "category",
+    "origin",
+    "origin_name",
+    "wav_bytes",
+    "video_bytes",
+    "image_bytes",
+    "text_content",
+    "media_ref",
+    "width",
+    "height",
+    "word_count",
+    "character_count",
+    "segment_offsets",
+    "segment_embeddings",
+    "frequency",
+)
+
+_FIELD_SET = frozenset(CLIP_FIELDS)
+_INTERNED_FIELDS = frozenset({"type", "category"})
+_MISSING = object()
+
+
+class ClipRecord(MutableMapping):
+    """A clip stored in slots that behaves like ``dict[str, Any]``.
+
+    Args:
+        data: Initial keys and values (a mapping or an iterable of pairs),
+            as for ``dict()``.
+        **kwargs: More keys and values.
+    """
+
+    __slots__ = (*CLIP_FIELDS, "_extra")
+
+    def __init__(self, data: Mapping[str, Any] | Iterable[tuple[str, Any]] = (), /, **kwargs: Any) -> None:
+        self._extra: dict[str, Any] | None = None
+        items = data.items() if isinstance(data, Mapping) else data
+        for key, value in items:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELD_SET:
+            if key in _INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _FIELD_SET:
+            if getattr(self, key, _MISSING) is _MISSING:
+                raise KeyError(key)
+            delattr(self, key)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in CLIP_FIELDS:
+            if getattr(self, key, _MISSING) is not _MISSING:
+                yield key
+        if self._extra:
+            yield from list(self._extra)
+
+    def __len__(self) -> int:
+        count = sum(getattr(self, key, _MISSING) is not _MISSING for key in CLIP_FIELDS)
+        return count + (len(self._extra) if self._extra else 0)
+
+    # Faster than the MutableMapping defaults, which go through KeyError.
+
+    def __contains__(self, key: object) -> bool:
+        if key in _FIELD_SET:
+            return getattr(self, key, _MISSING) is not _MISSING  # type: ignore[arg-type]
+        return self._extra is not None and key in self._extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def copy(self) -> ClipRecord:
+        """Return a shallow copy (like ``dict.copy()``)."""
+        return ClipRecord(self)
+
+    def __repr__(self) -> str:
+        return f"ClipRecord({dict(self)!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (ClipRecord, (dict(self),))
+
+
+def _freeze(value: Any) -> Any:
+    """Return a hashable equivalent of a JSON-like *value* (raises TypeError if there is none)."""
+    if isinstance(value, dict):
+        return (dict, tuple(sorted((k, _freeze(v)) for k, v in value.items())))
+    if isinstance(value, list):
+        return (list, tuple(_freeze(v) for v in value))
+    hash(value)
+    return value
+
+
+def origin_key(origin: dict[str, Any]) -> Any:
+    """Return a hashable key identifying *origin* by value, or ``None`` if it has none."""
+    try:
+        return _freeze(origin)
+    except TypeError:
+        return None
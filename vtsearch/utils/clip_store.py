@@ -0,0 +1,256 @@
+"""Columnar embedding storage behind the clips dict.
+
+:class:`ClipStore` is a drop-in ``dict[int, dict]`` that additionally keeps
+every clip's ``"embedding"`` in one contiguous ``float32`` matrix of shape
+``(N, D)`` together with an id → row index.  Hot paths (learned sort,
+detector scoring, the progress cache) read the matrix instead of stacking
+per-clip arrays on every request.
+
+The matrix is synchronised lazily: inserting new clip IDs queues them for an
+amortised append, while replacing or deleting an existing clip marks the
+matrix stale so it is rebuilt on next access.  Matrices handed out to callers
+are never written to afterwards, so they can be used as zero-copy snapshots
+(e.g. via :func:`torch.from_numpy`).
+
+Plain dict values are stored as compact
+:class:`~vtsearch.utils.clip_record.ClipRecord` objects (a dict-compatible
+mapping backed by ``__slots__``), and equal ``"origin"`` dicts are replaced
+by one shared instance, so per-clip overhead stays small at millions of
+clips.  Code that keeps a reference to the dict it stored must therefore
+re-read it from the store before mutating it.
+
+Only top-level mutations of the store are tracked.  Re-assigning
+``clip["embedding"]`` on a clip that is already stored is not detected; call
+:meth:`ClipStore.invalidate` after doing so.
+
+The module-level helpers :func:`embedding_matrix` and
+:func:`gather_embeddings` accept either a :class:`ClipStore` or a plain dict,
+so code that builds its own clips dicts keeps working unchanged.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import numpy as np
+
+from vtsearch.utils.clip_record import ClipRecord, origin_key
+
+_MIN_CAPACITY = 64
+
+
+class ClipStore(dict):
+    """A clips dict that maintains a contiguous embedding matrix.
+
+    Behaves like ``dict[int, dict[str, Any]]`` for reading and writing,
+    except that stored dicts come back as :class:`ClipRecord` mappings;
+    the extra methods expose the columnar view of the embeddings.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._origins: dict[Any, dict[str, Any]] = {}
+        super().__init__((key, self._compact(value)) for key, value in dict(*args, **kwargs).items())
+        self._lock = threading.RLock()
+        self._buf: np.ndarray | None = None
+        self._ids: list[int] = []
+        self._ids_array: np.ndarray | None = None
+        self._row_of: dict[int, int] = {}
+        self._pending: list[int] = []
+        self._stale = bool(self)
+        self._version = 0
+
+    # ------------------------------------------------------------------
+    # Mutation tracking
+    # ------------------------------------------------------------------
+
+    def _compact(self, value: Any) -> Any:
+        """Return *value* as a :class:`ClipRecord` with a shared origin (other values as they are)."""
+        if type(value) is dict:
+            value = ClipRecord(value)
+        elif not isinstance(value, ClipRecord):
+            return value
+        origin = value.get("origin")
+        if type(origin) is dict:
+            key = origin_key(origin)
+            if key is not None:
+                value["origin"] = self._origins.setdefault(key, origin)
+        return value
+
+    def _mark_stale(self) -> None:
+        with self._lock:
+            self._stale = True
+            self._pending.clear()
+            self._version += 1
+
+    def __setitem__(self, key: int, value: dict[str, Any]) -> None:
+        with self._lock:
+            is_new = key not in self
+            super().__setitem__(key, self._compact(value))
+            if is_new and not self._stale:
+                self._pending.append(key)
+                self._version += 1
+            else:
+                self._mark_stale()
+
+    def __delitem__(self, key: int) -> None:
+        super().__delitem__(key)
+        self._mark_stale()
+
+    def __ior__(self, other: Any) -> ClipStore:  # noqa: PYI034
+        self.update(other)
+        return self
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key: int, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return super().__getitem__(key)
+
+    def pop(self, key: int, *default: Any) -> Any:
+        present = key in self
+        value = super().pop(key, *default)
+        if present:
+            self._mark_stale()
+        return value
+
+    def popitem(self) -> tuple[int, Any]:
+        item = super().popitem()
+        self._mark_stale()
+        return item
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._origins.clear()
+            self._buf = None
+            self._ids = []
+            self._ids_array = None
+            self._row_of = {}
+            self._pending.clear()
+            self._stale = False
+            self._version += 1
+
+    def invalidate(self) -> None:
+        """Force a rebuild of the embedding matrix on next access.
+
+        Needed only after mutating an embedding of a clip that is already
+        stored (``store[cid]["embedding"] = ...``), which cannot be observed.
+        """
+        self._mark_stale()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (ClipStore, (dict(self),))
+
+    @property
+    def version(self) -> int:
+        """Counter incremented on every tracked mutation of the store."""
+        return self._version
+
+    # ------------------------------------------------------------------
+    # Matrix maintenance
+    # ------------------------------------------------------------------
+
+    def _rebuild(self) -> None:
+        ids = list(super().keys())
+        if ids:
+            buf = np.asarray([self[cid]["embedding"] for cid in ids], dtype=np.float32)
+            buf = np.ascontiguousarray(buf.reshape(len(ids), -1))
+        else:
+            buf = None
+        self._buf = buf
+        self._ids = ids
+        self._ids_array = None
+        self._row_of = {cid: row for row, cid in enumerate(ids)}
+        self._pending.clear()
+        self._stale = False
+
+    def _append(self, new_ids: list[int]) -> None:
+        rows = np.asarray([self[cid]["embedding"] for cid in new_ids], dtype=np.float32)
+        rows = rows.reshape(len(new_ids), -1)
+        n = len(self._ids)
+        need = n + len(new_ids)
+        if self._buf is None or need > self._buf.shape[0] or rows.shape[1] != self._buf.shape[1]:
+            if self._buf is not None and n and rows.shape[1] != self._buf.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension mismatch: store has {self._buf.shape[1]}, new clips have {rows.shape[1]}"
+                )
+            capacity = max(need, _MIN_CAPACITY, 0 if self._buf is None else 2 * self._buf.shape[0])
+            grown = np.empty((capacity, rows.shape[1]), dtype=np.float32)
+            if n:
+                grown[:n] = self._buf[:n]
+            self._buf = grown
+        self._buf[n:need] = rows
+        for offset, cid in enumerate(new_ids):
+            self._row_of[cid] = n + offset
+        self._ids.extend(new_ids)
+        self._ids_array = None
+        self._pending.clear()
+
+    def _sync(self) -> None:
+        if self._stale:
+            self._rebuild()
+        elif self._pending:
+            self._append(list(self._pending))
+
+    def embedding_matrix(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(ids, X)`` for every stored clip, in row order.
+
+        ``ids`` is an ``int64`` array of clip IDs and ``X`` a ``float32``
+        view of shape ``(N, D)`` whose row *i* is the embedding of ``ids[i]``.
+        Rows follow insertion order, not sorted ID order.  Callers must treat
+        both arrays as read-only.
+        """
+        with self._lock:
+            self._sync()
+            n = len(self._ids)
+            if self._ids_array is None or len(self._ids_array) != n:
+                self._ids_array = np.asarray(self._ids, dtype=np.int64)
+            if self._buf is None or n == 0:
+                return self._ids_array, np.empty((0, 0), dtype=np.float32)
+            return self._ids_array, self._buf[:n]
+
+    def row_indices(self, ids: Iterable[int]) -> np.ndarray:
+        """Return the matrix row index for each clip ID in *ids*.
+
+        Raises:
+            KeyError: If any ID is not in the store.
+        """
+        with self._lock:
+            self._sync()
+            ids = list(ids)
+            return np.fromiter((self._row_of[cid] for cid in ids), dtype=np.intp, count=len(ids))
+
+
+def embedding_matrix(clips_dict: dict[int, dict[str, Any]]) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(ids, X)`` — all clip IDs and their ``float32`` embedding matrix.
+
+    Zero-copy when *clips_dict* is a :class:`ClipStore`; otherwise the matrix
+    is stacked from the per-clip arrays in dict order.
+    """
+    if isinstance(clips_dict, ClipStore):
+        return clips_dict.embedding_matrix()
+    ids = np.fromiter(clips_dict.keys(), dtype=np.int64, count=len(clips_dict))
+    if not len(ids):
+        return ids, np.empty((0, 0), dtype=np.float32)
+    X = np.asarray([clip["embedding"] for clip in clips_dict.values()], dtype=np.float32)
+    return ids, X.reshape(len(ids), -1)
+
+
+def gather_embeddings(clips_dict: dict[int, dict[str, Any]], ids: Sequence[int]) -> np.ndarray:
+    """Return a ``float32`` matrix with the embeddings of *ids*, in that order.
+
+    Raises:
+        KeyError: If any ID is not present in *clips_dict*.
+    """
+    if isinstance(clips_dict, ClipStore):
+        _, X = clips_dict.embedding_matrix()
+        return X[clips_dict.row_indices(ids)]
+    if not len(ids):
+        return np.empty((0, 0), dtype=np.float32)
+    X = np.asarray([clips_dict[cid]["embedding"] for cid in ids], dtype=np.float32)
+    return X.reshape(len(ids), -1)
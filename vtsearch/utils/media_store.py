@@ -0,0 +1,483 @@
+"""Disk-backed, content-addressed store for clip media.
+
+Loaded clips used to keep their whole file in ``wav_bytes``,
+``video_bytes`` or ``image_bytes``, so resident memory grew with the size
+of the media rather than with the number of clips.  The loaders now write
+each file's bytes once into an append-only pack file and keep only a
+:class:`MediaRef` — ``(offset, length, md5)`` — on the clip, under
+``"media_ref"``, with the bytes field set to ``None``.
+
+The pack is a short magic header followed by records of a 16-byte MD5
+digest, an 8-byte little-endian length and the data.  Blobs are
+deduplicated by MD5, so re-importing the same files does not grow it; the
+record headers are scanned when the pack is opened, so it is reused across
+restarts.  Importers copy files in with :meth:`MediaStore.put_file`, which
+never holds a whole file in memory.  Reads are served from a read-only
+memory map of the pack: :meth:`MediaStore.view` returns a
+:class:`memoryview` and copies nothing.
+
+Code that needs a clip's media calls :func:`clip_media_bytes`, which returns
+inline bytes when the clip still has them (synthetic clips, clips built by
+hand) and a view into the pack otherwise.  :func:`inline_media` resolves
+the bytes fields for writers that need real ``bytes`` (e.g. the pickle
+export).
+
+The pack is never compacted while the app runs; delete
+``MEDIA_STORE_PATH`` while the app is stopped to reclaim the space.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from config import MEDIA_STORE_ENABLED, MEDIA_STORE_PATH
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialised within the process
+    fcntl = None  # type: ignore[assignment]
+
+_MAGIC = b"VTSMPK01"
+_RECORD = struct.Struct("<16sQ")
+_COPY_CHUNK_BYTES = 1 << 20
+# Digest of a record still being copied, or discarded; such records are not indexed
+_DEAD = bytes(16)
+
+# Clip type -> the clip field that holds its media bytes
+MEDIA_FIELDS = {"audio": "wav_bytes", "video": "video_bytes", "image": "image_bytes"}
+
+
+class MediaRef(NamedTuple):
+    """Location of one blob in the pack file."""
+
+    offset: int
+    length: int
+    md5: str
+
+
+class MediaStore:
+    """Append-only pack file of media blobs, read through a memory map.
+
+    Safe to share between threads; appends and remaps happen under a lock.
+    Appends also hold an exclusive ``flock`` on the pack and index any
+    records other processes appended first, so a CLI run next to the app
+    cannot make either one's offsets point at the wrong bytes.
+
+    Args:
+        path: Pack file.  Created (with parent directories) when missing;
+            an existing pack is indexed and appended to.
+
+    Raises:
+        ValueError: If *path* exists but is not a media pack.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Read/write rather than append, so put_file() can fill in a digest after the copy
+        self._file = open(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666), "r+b")  # noqa: SIM115 - kept open for the store's lifetime
+        self._index: dict[str, MediaRef] = {}
+        self._size = self._load_index()
+        self._map: mmap.mmap | None = None
+        self.puts = 0
+        self.dedup_hits = 0
+
+    def _load_index(self) -> int:
+        """Index the records in the pack and return the end of the last whole one."""
+        f = self._file
+        with _exclusive(f):
+            end = f.seek(0, 2)
+            if end == 0:
+                f.write(_MAGIC)
+                f.flush()
+                return len(_MAGIC)
+            f.seek(0)
+            if f.read(len(_MAGIC)) != _MAGIC:
+                f.close()
+                raise ValueError(f"{self.path} is not a media pack file")
+            return self._index_records(len(_MAGIC))
+
+    def _index_records(self, pos: int) -> int:
+        """Index the records from *pos* to the end of the pack and return the end of the last whole one.
+
+        Called with the file lock held, so records appended by other
+        processes sharing the pack are picked up before this one writes.
+        """
+        f = self._file
+        end = f.seek(0, 2)
+        while pos + _RECORD.size <= end:
+            f.seek(pos)
+            digest, length = _RECORD.unpack(f.read(_RECORD.size))
+            data_start = pos + _RECORD.size
+            if data_start + length > end:
+                break
+            if digest != _DEAD:
+                md5 = digest.hex()
+                self._index.setdefault(md5, MediaRef(data_start, length, md5))
+            pos = data_start + length
+        if pos != end:
+            # Drop a record cut short by a crash mid-write
+            f.truncate(pos)
+        f.seek(pos)
+        return pos
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def put(self, data: bytes | memoryview, md5: str | None = None) -> MediaRef:
+        """Store *data* (unless a blob with the same MD5 is stored) and return its ref.
+
+        Args:
+            data: The blob.
+            md5: Hex MD5 of *data*, when the caller already has it.
+        """
+        if md5 is None:
+            md5 = hashlib.md5(data).hexdigest()
+        with self._lock:
+            self.puts += 1
+            ref = self._stored(md5)
+            if ref is not None:
+                return ref
+            with _exclusive(self._file):
+                self._size = self._index_records(self._size)
+                ref = self._stored(md5)
+                if ref is not None:
+                    return ref
+                self._file.write(_RECORD.pack(bytes.fromhex(md5), len(data)))
+                self._file.write(data)
+                self._file.flush()
+                return self._added(md5, len(data))
+
+    def put_file(self, path: Path, md5: str | None = None) -> tuple[MediaRef, bool]:
+        """Copy the file at *path* into the store and return its ref and whether it was added.
+
+        The file is read once, in 1 MiB slices that are hashed and appended
+        as they are read, so it is never held in memory whole.  If its MD5
+        turns out to be stored already, the copy is dropped again.
+
+        Args:
+            path: File to store.
+            md5: Hex MD5 of the file's contents, when the caller already has
+                it; a file already stored is then not read at all.
+
+        Returns:
+            The blob's :class:`MediaRef`, and ``False`` if a blob with the
+            same MD5 was stored before (so other clips may share it).
+
+        Raises:
+            OSError: If the file cannot be read, or shrinks while it is copied.
+        """
+        with self._lock:
+            self.puts += 1
+            ref = self._stored(md5) if md5 is not None else None
+            if ref is not None:
+                return ref, False
+            with open(path, "rb") as src, _exclusive(self._file):
+                self._size = self._index_records(self._size)
+                ref = self._stored(md5) if md5 is not None else None
+                if ref is not None:
+                    return ref, False
+                length = os.fstat(src.fileno()).st_size
+                digest = hashlib.md5()
+                try:
+                    # Written as dead until the copy is complete and its digest known
+                    self._file.write(_RECORD.pack(_DEAD, length))
+                    remaining = length
+                    while remaining:
+                        chunk = src.read(min(_COPY_CHUNK_BYTES, remaining))
+                        if not chunk:
+                            raise OSError(f"{path} shrank while it was being stored")
+                        digest.update(chunk)
+                        self._file.write(chunk)
+                        remaining -= len(chunk)
+                    md5 = digest.hexdigest()
+                    ref = self._stored(md5)
+                    if ref is None:
+                        self._file.seek(self._size)
+                        self._file.write(digest.digest())
+                        self._file.seek(0, 2)
+                    self._file.flush()
+                except BaseException:
+                    self._file.flush()
+                    self._file.truncate(self._size)
+                    self._file.seek(self._size)
+                    raise
+                if ref is not None:
+                    self._file.truncate(self._size)
+                    self._file.seek(self._size)
+                    return ref, False
+                return self._added(md5, length), True
+
+    def discard(self, ref: MediaRef) -> None:
+        """Remove the blob at *ref*, which nothing may refer to any more.
+
+        Used for a blob :meth:`put_file` added for a file that then could not
+        be imported.  The record is marked dead rather than cut off, since
+        another process sharing the pack may already have indexed it; it is
+        no longer indexed once a pack is reopened.
+        """
+        with self._lock, _exclusive(self._file):
+            self._size = self._index_records(self._size)
+            if self._index.get(ref.md5) != ref:
+                return
+            del self._index[ref.md5]
+            self._file.seek(ref.offset - _RECORD.size)
+            self._file.write(_DEAD)
+            self._file.seek(self._size)
+            self._file.flush()
+
+    def _stored(self, md5: str) -> MediaRef | None:
+        """Return the ref of an indexed blob with *md5*, counting a dedup hit."""
+        ref = self._index.get(md5)
+        if ref is not None:
+            self.dedup_hits += 1
+        return ref
+
+    def _added(self, md5: str, length: int) -> MediaRef:
+        """Index the record of *length* bytes just appended at the end of the pack."""
+        ref = MediaRef(self._size + _RECORD.size, length, md5)
+        self._size = ref.offset + ref.length
+        self._index[md5] = ref
+        return ref
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def view(self, ref: MediaRef) -> memoryview:
+        """Return a zero-copy view of the blob at *ref*.
+
+        Raises:
+            ValueError: If *ref* lies outside the pack.
+        """
+        offset, length = ref[0], ref[1]
+        end = offset + length
+        with self._lock:
+            if end > self._size or offset < len(_MAGIC):
+                raise ValueError(f"Media ref {tuple(ref)} is outside {self.path}")
+            if self._map is None or len(self._map) < end:
+                # The old map stays alive for as long as views of it exist
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(self._map)[offset:end]
+
+    def read(self, ref: MediaRef) -> bytes:
+        """Return a copy of the blob at *ref*."""
+        return bytes(self.view(ref))
+
+    def __contains__(self, md5: object) -> bool:
+        return md5 in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    # ------------------------------------------------------------------
+    # Housekeeping
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        """Close the pack file.  Views handed out earlier stay readable."""
+        with self._lock:
+            self._map = None
+            self._file.close()
+
+    def stats(self) -> dict[str, Any]:
+        """Return blob count, pack size and dedup counters since the store was opened."""
+        with self._lock:
+            return {
+                "enabled": True,
+                "path": str(self.path),
+                "blobs": len(self._index),
+                "bytes": self._size,
+                "puts": self.puts,
+                "dedup_hits": self.dedup_hits,
+            }
+
+
+@contextmanager
+def _exclusive(f: Any) -> Iterator[None]:
+    """Hold an exclusive lock on the open file *f* against other processes."""
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide store
+# ---------------------------------------------------------------------------
+
+_store: MediaStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_media_store() -> MediaStore:
+    """Return the process-wide store, opening ``MEDIA_STORE_PATH`` on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MediaStore(MEDIA_STORE_PATH)
+        return _store
+
+
+def set_media_store(store: MediaStore | None) -> None:
+    """Replace the process-wide store (e.g. to point it at a temporary file)."""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+@contextmanager
+def temporary_media_store() -> Iterator[MediaStore]:
+    """Point the process-wide store at a fresh pack in a temporary directory for the block.
+
+    The previous store is restored and the temporary pack deleted
+    afterwards.  One-off commands (e.g. ``--export-dataset``) use this so
+    the media they load does not grow ``MEDIA_STORE_PATH``.
+    """
+    global _store
+    with tempfile.TemporaryDirectory(prefix="vtsearch-media-", ignore_cleanup_errors=True) as tmpdir:
+        store = MediaStore(Path(tmpdir) / "media.pack")
+        with _store_lock:
+            previous, _store = _store, store
+        try:
+            yield store
+        finally:
+            with _store_lock:
+                _store = previous
+            store.close()
+
+
+def media_store_stats() -> dict[str, Any]:
+    """Return :meth:`MediaStore.stats` for the process-wide store."""
+    if not MEDIA_STORE_ENABLED:
+        return {"enabled": False}
+    return get_media_store().stats()
+
+
+# ---------------------------------------------------------------------------
+# Clip helpers
+# ---------------------------------------------------------------------------
+
+
+def store_clip_media(clip: dict[str, Any], store: MediaStore | None = None) -> dict[str, Any]:
+    """Move *clip*'s inline media bytes into the store, in place.
+
+    The bytes field is set to ``None`` and a :class:`MediaRef` is stored
+    under ``"media_ref"``.  Clips without media bytes (paragraphs) are left
+    alone, as is every clip when ``MEDIA_STORE_ENABLED`` is off and no
+    *store* is given.
+
+    Returns:
+        *clip*, for chaining.
+    """
+    if store is None:
+        if not MEDIA_STORE_ENABLED:
+            return clip
+        store = get_media_store()
+    for field in MEDIA_FIELDS.values():
+        data = clip.get(field)
+        if data:
+            clip["media_ref"] = store.put(data, clip.get("md5"))
+            clip[field] = None
+            break
+    return clip
+
+
+def store_file_media(path: Path, md5: str | None = None) -> tuple[MediaRef, bool] | None:
+    """Copy the file at *path* into the process-wide store with :meth:`MediaStore.put_file`.
+
+    Returns:
+        What :meth:`MediaStore.put_file` returns, or ``None`` when
+        ``MEDIA_STORE_ENABLED`` is off.
+    """
+    if not MEDIA_STORE_ENABLED:
+        return None
+    return get_media_store().put_file(path, md5)
+
+
+def attach_clip_media(clip: dict[str, Any], data: bytes | memoryview) -> dict[str, Any]:
+    """Give *clip* the media *data*, stored when the store is enabled.
+
+    Used by readers that get *data* as a view of a file they are about to
+    close: the view is written straight into the store (under the clip's
+    ``"md5"``, which is trusted), or copied into the clip's bytes field when
+    ``MEDIA_STORE_ENABLED`` is off.  The caller may release *data* after.
+
+    Returns:
+        *clip*, for chaining.
+    """
+    field = MEDIA_FIELDS[clip.get("type", "audio")]
+    if MEDIA_STORE_ENABLED:
+        clip["media_ref"] = get_media_store().put(data, clip.get("md5"))
+        clip[field] = None
+    else:
+        clip[field] = bytes(data)
+    return clip
+
+
+def attach_clip_file(clip: dict[str, Any], path: Path) -> dict[str, Any]:
+    """Give *clip* the media in the file at *path*, stored when the store is enabled.
+
+    The file is copied into the store in slices with :meth:`MediaStore.put_file`
+    (skipped when a blob with the clip's ``"md5"`` is already stored), or read
+    into the clip's bytes field when ``MEDIA_STORE_ENABLED`` is off.
+
+    Returns:
+        *clip*, for chaining.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    field = MEDIA_FIELDS[clip.get("type", "audio")]
+    stored = store_file_media(path, clip.get("md5"))
+    if stored is not None:
+        clip["media_ref"] = stored[0]
+        clip[field] = None
+    else:
+        clip[field] = Path(path).read_bytes()
+    return clip
+
+
+def clip_media_bytes(clip: dict[str, Any]) -> bytes | memoryview | None:
+    """Return *clip*'s media bytes, inline or as a view into the store.
+
+    Returns ``None`` for clips without binary media.
+    """
+    for field in MEDIA_FIELDS.values():
+        data = clip.get(field)
+        if data:
+            return data
+    ref = clip.get("media_ref")
+    if ref is None:
+        return None
+    return get_media_store().view(ref)
+
+
+def inline_media(clip: dict[str, Any]) -> dict[str, bytes | None]:
+    """Return *clip*'s media bytes fields with any stored blob read back in.
+
+    The result maps each of ``wav_bytes``, ``video_bytes`` and
+    ``image_bytes`` to ``bytes`` or ``None``, as clips carried them before
+    the store existed.
+    """
+    fields: dict[str, bytes | None] = {field: clip.get(field) for field in MEDIA_FIELDS.values()}
+    ref = clip.get("media_ref")
+    field = MEDIA_FIELDS.get(clip.get("type", "audio"))
+    if ref is not None and field is not None and fields[field] is None:
+        fields[field] = get_media_store().read(ref)
+    return fields
@@ -0,0 +1,69 @@
+"""Memoisation of results keyed on a monotonically increasing state version.
+
+Routes that derive a response purely from the global state (learned sort,
+labelling status, labelling progress) store it here under the state version
+it was computed at (see :func:`vtsearch.utils.state.get_state_version`).
+Repeating the request before anything changes is then a dictionary lookup.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+
+class VersionedMemo:
+    """Thread-safe memo holding values for a single, most recent version.
+
+    Looking up or storing a value for a version newer than the current one
+    drops every older entry, so the memo never grows beyond one version's
+    worth of keys.  Values for older versions are ignored.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._values: dict[Hashable, Any] = {}
+
+    def _advance(self, version: int) -> bool:
+        """Move to *version* if it is newer; return whether it is current.  Caller holds the lock."""
+        if self._version is None or version > self._version:
+            self._version = version
+            self._values.clear()
+        return version == self._version
+
+    def get(self, key: Hashable, version: int, default: Any = None) -> Any:
+        """Return the value stored for *key* at *version*, or *default*."""
+        with self._lock:
+            if not self._advance(version):
+                return default
+            return self._values.get(key, default)
+
+    def put(self, key: Hashable, version: int, value: Any) -> None:
+        """Store *value* for *key* at *version* (ignored if *version* is stale)."""
+        with self._lock:
+            if self._advance(version):
+                self._values[key] = value
+
+    def get_or_compute(self, key: Hashable, version: int, compute: Callable[[], _T]) -> _T:
+        """Return the memoised value for *key* at *version*, computing it on a miss.
+
+        *compute* runs without the lock held; if two threads miss at the same
+        time both compute and the later result wins.  Exceptions propagate and
+        nothing is stored.
+        """
+        missing = object()
+        value = self.get(key, version, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, version, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every stored value."""
+        with self._lock:
+            self._version = None
+            self._values.clear()
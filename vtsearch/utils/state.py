@@ -3,13 +3,26 @@
 import json
 from typing import Any
 
-# Clips storage: id -> {id, type, duration, file_size, embedding, wav_bytes, video_bytes}
-clips: dict[int, dict[str, Any]] = {}
+from vtsearch.utils.clip_store import ClipStore
+
+# Clips storage: id -> {id, type, duration, file_size, embedding, wav_bytes, video_bytes, media_ref}
+# Loaded clips keep their media in the media store (see utils/media_store.py)
+# and only a MediaRef under "media_ref"; synthetic clips keep wav_bytes inline.
+# A ClipStore also keeps every embedding in one contiguous (N, D) float32
+# matrix so scoring code can read it without re-stacking per-clip arrays,
+# and stores each clip as a slotted ClipRecord (see utils/clip_record.py).
+clips: ClipStore = ClipStore()
 
 # Voting storage (OrderedDict behavior via dict in Python 3.7+)
 good_votes: dict[int, None] = {}
 bad_votes: dict[int, None] = {}
 
+# Incremented on every change to the votes (vote, un-vote, label import,
+# clear) and to the inclusion setting.  Together with ``clips.version`` it
+# forms the state version (see get_state_version) that cached training
+# results are keyed on.
+state_version: int = 0
+
 # Combined label history: [(clip_id, label, timestamp), ...]
 # Tracks the order of all labels across both categories
 label_history: list[tuple[int, str, float]] = []
@@ -33,14 +46,19 @@ def clear_votes() -> None:
 
     Removes all entries from ``good_votes``, ``bad_votes``, and
     ``label_history`` in place. Does not affect the ``clips`` dict.
-    Also clears the progress model cache.
+    Also clears the progress model cache and the warm-start state of the
+    learned-sort model.
     """
     from vtsearch.models.progress import clear_progress_cache
+    from vtsearch.models.training import clear_warm_start_cache
 
+    global state_version
     good_votes.clear()
     bad_votes.clear()
     label_history.clear()
+    state_version += 1
     clear_progress_cache()
+    clear_warm_start_cache()
 
 
 def clear_clips() -> None:
@@ -84,19 +102,20 @@ def set_inclusion(value: int) -> None:
     """Set the global inclusion value.
 
     Also clears the progress model cache since cached models were trained
-    with the old inclusion value.
+    with the old inclusion value, and bumps the state version.
 
     Args:
         value: New inclusion setting. Should be an integer in ``[-10, 10]``.
             Values outside this range are accepted but may produce unexpected
             results in model training weight calculations.
     """
-    global inclusion
+    global inclusion, state_version
     if value != inclusion:
         from vtsearch.models.progress import clear_progress_cache
 
         clear_progress_cache()
-    inclusion = value
+        inclusion = value
+        state_version += 1
 
 
 def add_label_to_history(clip_id: int, label: str) -> None:
@@ -108,7 +127,22 @@ def add_label_to_history(clip_id: int, label: str) -> None:
     """
     import time
 
+    global state_version
     label_history.append((clip_id, label, time.time()))
+    state_version += 1
+
+
+def get_state_version() -> int:
+    """Return a version number for everything a trained model depends on.
+
+    The version increases monotonically whenever a label is added to the
+    history (votes, un-votes and label imports all go through
+    :func:`add_label_to_history`), the votes are cleared, the inclusion
+    setting changes, or clips are added, replaced or removed.  Two equal
+    versions therefore mean learned-sort and labelling-status results can
+    be reused.
+    """
+    return state_version + clips.version
 
 
 def add_favorite_detector(name: str, media_type: str, weights: dict[str, Any], threshold: float) -> None: